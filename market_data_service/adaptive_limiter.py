@@ -11,6 +11,8 @@ Features:
 - Exponential backoff for 429 (Too Many Requests) responses
 - Configurable rate windows (per second, minute, hour, day)
 - Automatic rate recovery after cooldown periods
+- Request weight budgets shared by all endpoints (e.g. Binance REQUEST_WEIGHT,
+  kept in sync through X-MBX-USED-WEIGHT-* headers)
 - Redis state persistence for coordinated rate limiting across instances
 - Detailed statistics and health metrics
 
@@ -25,12 +27,17 @@ Usage:
     
     await limiter.wait(endpoint="/api/data")
     # Make API call
+
+    # Weighted APIs: budget 6000 weight per minute across all endpoints
+    limiter = RateLimiter(name="binance", weight_limit=6000, weight_window=60)
+    await limiter.wait(endpoint="/api/v3/klines", weight=2)
     
     # After getting response with rate limit headers:
     limiter.parse_rate_limit_headers(response.headers, endpoint="/api/data")
 """
 
 import asyncio
+import re
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Optional, Any
 from collections import deque
@@ -38,6 +45,10 @@ import structlog
 
 logger = structlog.get_logger()
 
+# Binance used-weight headers, e.g. X-MBX-USED-WEIGHT-1M
+_USED_WEIGHT_HEADER = re.compile(r'^x-mbx-used-weight-(\d+)([smhd])$', re.IGNORECASE)
+_WEIGHT_WINDOW_SECONDS = {'s': 1, 'm': 60, 'h': 3600, 'd': 86400}
+
 
 class RateLimiter:
     """
@@ -64,7 +75,9 @@ class RateLimiter:
         window_size: int = 60,  # 1 minute sliding window
         max_rate: float = 100.0,  # Maximum requests per second
         min_rate: float = 0.1,  # Minimum requests per second (aggressive throttle)
-        redis_cache=None
+        redis_cache=None,
+        weight_limit: Optional[int] = None,  # Request weight allowed per weight window
+        weight_window: float = 60.0  # seconds
     ):
         """
         Initialize adaptive rate limiter
@@ -76,6 +89,9 @@ class RateLimiter:
             max_rate: Maximum allowed rate (default: 100.0 req/s)
             min_rate: Minimum rate during aggressive throttling (default: 0.1 req/s)
             redis_cache: Optional Redis cache for distributed coordination
+            weight_limit: Optional request weight budget shared by all endpoints
+                (default: None, requests are not weighted)
+            weight_window: Window of the weight budget in seconds (default: 60)
         """
         self.name = name
         self.default_rate = default_rate
@@ -91,6 +107,14 @@ class RateLimiter:
         # Global request history (for fallback when endpoint not specified)
         self.request_times = deque(maxlen=1000)
         
+        # Request weight budget shared by all endpoints
+        self.weight_limit = weight_limit
+        self.weight_window = weight_window
+        self.weight_history = deque()  # (time, weight) of requests inside the window
+        self.server_used_weight: Optional[int] = None  # Last count reported by the API
+        self.server_weight_reset: Optional[datetime] = None
+        self._weight_lock = asyncio.Lock()
+        
         # Rate limit violation tracking
         self.violations = 0
         self.last_violation: Optional[datetime] = None
@@ -102,6 +126,7 @@ class RateLimiter:
             "total_requests": 0,
             "total_violations": 0,
             "total_wait_time": 0.0,  # seconds
+            "total_weight": 0,
             "rate_adjustments": 0,
             "min_rate_seen": default_rate,
             "max_rate_seen": default_rate,
@@ -131,23 +156,41 @@ class RateLimiter:
                 "violations": 0,
                 "last_violation": None,
                 "backoff_until": None,
-                "requests_made": 0
+                "requests_made": 0,
+                "lock": asyncio.Lock()  # Queues concurrent callers of this endpoint
             }
             self.stats["endpoints_tracked"] = len(self.endpoints)
         
         return self.endpoints[endpoint]
     
-    async def wait(self, endpoint: Optional[str] = None):
+    async def wait(self, endpoint: Optional[str] = None, weight: int = 1):
         """
         Wait if necessary to respect rate limits
         
         Checks both endpoint-specific and global rate limits, enforces backoff periods,
-        and tracks request timing for adaptive adjustment.
+        and tracks request timing for adaptive adjustment. Concurrent callers for the
+        same endpoint are queued, so each one is spaced from the previous request.
         
         Args:
             endpoint: API endpoint for endpoint-specific rate limiting (optional)
+            weight: Request weight charged against weight_limit (default: 1)
         """
         ep_data = self._get_endpoint_data(endpoint)
+        async with ep_data["lock"]:
+            await self._wait_for_endpoint(ep_data, endpoint)
+            if self.weight_limit:
+                await self._wait_for_weight(weight, endpoint)
+            
+            # Record request
+            now = datetime.now(timezone.utc)
+            ep_data["last_request"] = now
+            ep_data["request_times"].append(now)
+            ep_data["requests_made"] += 1
+            self.request_times.append(now)
+            self.stats["total_requests"] += 1
+    
+    async def _wait_for_endpoint(self, ep_data: Dict[str, Any], endpoint: Optional[str]):
+        """Wait out backoff periods, exhausted quotas and the endpoint's request spacing"""
         now = datetime.now(timezone.utc)
         
         # Check if we're in a backoff period
@@ -199,14 +242,53 @@ class RateLimiter:
                 )
                 self.stats["total_wait_time"] += wait_time
                 await asyncio.sleep(wait_time)
+    
+    def used_weight(self, now: Optional[datetime] = None) -> int:
+        """
+        Request weight used in the current window
         
-        # Record request
-        now = datetime.now(timezone.utc)
-        ep_data["last_request"] = now
-        ep_data["request_times"].append(now)
-        ep_data["requests_made"] += 1
-        self.request_times.append(now)
-        self.stats["total_requests"] += 1
+        The larger of the locally recorded weight and the last count reported by the
+        API (which also includes other clients sharing the same budget).
+        """
+        now = now or datetime.now(timezone.utc)
+        cutoff = now - timedelta(seconds=self.weight_window)
+        while self.weight_history and self.weight_history[0][0] <= cutoff:
+            self.weight_history.popleft()
+        used = sum(weight for _, weight in self.weight_history)
+        if self.server_weight_reset and now < self.server_weight_reset:
+            used = max(used, self.server_used_weight or 0)
+        return used
+    
+    async def _wait_for_weight(self, weight: int, endpoint: Optional[str]):
+        """Wait until the request's weight fits into the weight budget, then reserve it"""
+        async with self._weight_lock:
+            while True:
+                now = datetime.now(timezone.utc)
+                used = self.used_weight(now)
+                # A request heavier than the whole budget goes through once the window is empty
+                if used + weight <= self.weight_limit or used == 0:
+                    break
+                
+                # Sleep until the oldest request leaves the window or the API's counter resets
+                wake_times = []
+                if self.weight_history:
+                    wake_times.append(self.weight_history[0][0] + timedelta(seconds=self.weight_window))
+                if self.server_weight_reset and now < self.server_weight_reset:
+                    wake_times.append(self.server_weight_reset)
+                wait_seconds = max((min(wake_times) - now).total_seconds(), 0.01)
+                logger.debug(
+                    "Request weight budget exhausted, waiting",
+                    limiter=self.name,
+                    endpoint=endpoint,
+                    used_weight=used,
+                    weight=weight,
+                    wait_seconds=f"{wait_seconds:.2f}s"
+                )
+                self.stats["total_wait_time"] += wait_seconds
+                await asyncio.sleep(wait_seconds)
+            
+            self.weight_history.append((datetime.now(timezone.utc), weight))
+            self.stats["total_weight"] += weight
     
     def parse_rate_limit_headers(self, headers: Dict[str, str], endpoint: Optional[str] = None):
         """
@@ -288,6 +370,10 @@ class RateLimiter:
             except (ValueError, TypeError) as e:
                 logger.warning("Failed to parse RateLimit headers", error=str(e))
         
+        # Parse used request weight (X-MBX-USED-WEIGHT-<interval>)
+        if self.weight_limit:
+            self._parse_used_weight_headers(headers)
+        
         # Parse Retry-After header (explicit wait time)
         if "Retry-After" in headers or "retry-after" in headers:
             retry_after = headers.get("Retry-After") or headers.get("retry-after")
@@ -311,6 +397,27 @@ class RateLimiter:
                 except:
                     logger.warning("Failed to parse Retry-After header", value=retry_after)
     
+    def _parse_used_weight_headers(self, headers: Dict[str, str]):
+        """Sync the weight budget with the API's count for the matching window"""
+        for name, value in headers.items():
+            match = _USED_WEIGHT_HEADER.match(name)
+            if not match:
+                continue
+            window = int(match.group(1)) * _WEIGHT_WINDOW_SECONDS[match.group(2).lower()]
+            if window != self.weight_window:
+                continue
+            try:
+                used = int(value)
+            except (ValueError, TypeError):
+                logger.warning("Failed to parse used weight header", header=name, value=value)
+                continue
+            
+            # The API counts weight per fixed window (e.g. per calendar minute)
+            now = datetime.now(timezone.utc)
+            window_start = now.timestamp() - now.timestamp() % window
+            self.server_used_weight = used
+            self.server_weight_reset = datetime.fromtimestamp(window_start + window, tz=timezone.utc)
+    
     def adjust_rate(self, factor: float, endpoint: Optional[str] = None):
         """
         Manually adjust rate by a multiplicative factor
@@ -436,6 +543,11 @@ class RateLimiter:
             "endpoints": {}
         }
         
+        if self.weight_limit:
+            stats["weight_limit"] = self.weight_limit
+            stats["used_weight"] = self.used_weight()
+            stats["total_weight"] = self.stats["total_weight"]
+        
         # Add per-endpoint stats
         for endpoint, ep_data in self.endpoints.items():
             if endpoint == "__global__":
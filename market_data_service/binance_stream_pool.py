@@ -0,0 +1,292 @@
+"""
+Binance Combined-Stream Connection Pool
+
+Packs many Binance streams (e.g. btcusdc@kline_1m, ethusdc@ticker) onto a
+few combined-stream websocket connections (/stream?streams=a/b/c) instead
+of one socket per symbol and stream type:
+- Up to max_streams_per_connection streams share a connection, its ping
+  and its reconnect loop
+- Messages are demultiplexed by their ``stream`` field
+- Streams are added or removed live with SUBSCRIBE/UNSUBSCRIBE frames;
+  a reconnect resubscribes the connection's current stream set
+"""
+
+import asyncio
+import itertools
+import json
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set
+
+import structlog
+import websockets
+
+logger = structlog.get_logger()
+
+# Binance allows 1024 streams per connection; stay well below so URLs stay short
+DEFAULT_MAX_STREAMS_PER_CONNECTION = 200
+# Binance accepts at most 5 incoming (control) messages per second per connection
+CONTROL_MESSAGE_INTERVAL = 0.25
+
+StreamHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+
+class _CombinedStreamConnection:
+    """One combined-stream websocket and the streams assigned to it"""
+
+    def __init__(self, pool: 'BinanceStreamPool', connection_id: int):
+        self.pool = pool
+        self.connection_id = connection_id
+        self.streams: Set[str] = set()  # Streams assigned by the pool
+        self.subscribed: Set[str] = set()  # Streams the open websocket delivers
+        self.websocket = None
+        self.task: Optional[asyncio.Task] = None
+        self.messages_received = 0
+        self.reconnect_attempts = 0
+        self._request_ids = itertools.count(1)
+        self._control_lock = asyncio.Lock()
+        self._last_control_time = 0.0
+
+    @property
+    def is_connected(self) -> bool:
+        return self.websocket is not None
+
+    def start(self):
+        self.reconnect_attempts = 0
+        self.task = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def subscribe(self, streams: List[str]):
+        await self._send_control('SUBSCRIBE', [s for s in streams if s not in self.subscribed])
+
+    async def unsubscribe(self, streams: List[str]):
+        await self._send_control('UNSUBSCRIBE', [s for s in streams if s in self.subscribed])
+
+    async def _send_control(self, method: str, streams: List[str]):
+        """Send a (rate limited) control frame; skipped while disconnected"""
+        if not streams:
+            return
+        async with self._control_lock:
+            websocket = self.websocket
+            if websocket is None:
+                return  # Synced from self.streams on reconnect
+            loop = asyncio.get_running_loop()
+            wait = self._last_control_time + CONTROL_MESSAGE_INTERVAL - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                await websocket.send(json.dumps({
+                    'method': method,
+                    'params': streams,
+                    'id': next(self._request_ids)
+                }))
+            except websockets.ConnectionClosed:
+                return  # Synced from self.streams on reconnect
+            finally:
+                self._last_control_time = loop.time()
+            if method == 'SUBSCRIBE':
+                self.subscribed.update(streams)
+            else:
+                self.subscribed.difference_update(streams)
+
+    async def _run(self):
+        """Connect, sync subscriptions and dispatch until closed"""
+        while self.pool.running and self.streams:
+            initial_streams = sorted(self.streams)
+            try:
+                async with self.pool.connect(
+                    self.pool.combined_url(initial_streams),
+                    ping_interval=self.pool.ping_interval
+                ) as websocket:
+                    self.websocket = websocket
+                    self.subscribed = set(initial_streams)
+                    logger.info("Connected combined stream", connection_id=self.connection_id,
+                                streams=len(initial_streams))
+
+                    # Streams changed while connecting
+                    await self.subscribe(sorted(self.streams - self.subscribed))
+                    await self.unsubscribe(sorted(self.subscribed - self.streams))
+
+                    async for raw_message in websocket:
+                        await self._dispatch(raw_message)
+
+                # Server closed cleanly: Binance's 24h limit, or a rejection (e.g. the
+                # connection-rate limit) right after accepting
+                logger.info("Combined stream closed by server",
+                            connection_id=self.connection_id,
+                            attempt=self.reconnect_attempts + 1)
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Combined stream connection failed",
+                             connection_id=self.connection_id,
+                             error=str(e),
+                             attempt=self.reconnect_attempts + 1)
+            finally:
+                self.websocket = None
+                self.subscribed = set()
+
+            # Attempts only reset once a connection delivers data (see _dispatch)
+            self.reconnect_attempts += 1
+            if self.reconnect_attempts >= self.pool.max_reconnect_attempts:
+                logger.error("Max reconnection attempts reached for combined stream",
+                             connection_id=self.connection_id, streams=len(self.streams))
+                break
+            await asyncio.sleep(self.pool.reconnect_interval * self.reconnect_attempts)
+
+    async def _dispatch(self, raw_message):
+        try:
+            message = json.loads(raw_message)
+        except json.JSONDecodeError as e:
+            logger.error("Invalid JSON on combined stream", connection_id=self.connection_id, error=str(e))
+            return
+
+        stream = message.get('stream')
+        if stream is None:
+            # SUBSCRIBE/UNSUBSCRIBE response: {"result": null, "id": n} or an error
+            if message.get('error') or message.get('result') is not None:
+                logger.warning("Combined stream control request failed",
+                               connection_id=self.connection_id, response=message)
+            return
+
+        self.messages_received += 1
+        self.reconnect_attempts = 0
+        try:
+            await self.pool.handler(stream, message.get('data', {}))
+        except Exception as e:
+            logger.error("Error handling combined stream message", stream=stream, error=str(e))
+
+
+class BinanceStreamPool:
+    """
+    Pool of Binance combined-stream connections
+
+    Args:
+        base_url: Combined stream endpoint, e.g. wss://stream.binance.com:9443/stream
+        handler: Awaited with (stream name, payload) for every stream message
+        max_streams_per_connection: Streams packed onto one connection
+        ping_interval: Websocket keepalive ping interval in seconds
+        reconnect_interval: Base reconnect delay, multiplied by the attempt number
+        max_reconnect_attempts: Consecutive failures or closes without data before a connection gives up
+        connect: Websocket connect factory (websockets.connect)
+    """
+
+    def __init__(
+        self,
+        base_url: str,
+        handler: StreamHandler,
+        *,
+        max_streams_per_connection: int = DEFAULT_MAX_STREAMS_PER_CONNECTION,
+        ping_interval: float = 20,
+        reconnect_interval: float = 5,
+        max_reconnect_attempts: int = 10,
+        connect: Callable = websockets.connect,
+    ):
+        self.base_url = base_url.rstrip('/')
+        self.handler = handler
+        self.max_streams_per_connection = max_streams_per_connection
+        self.ping_interval = ping_interval
+        self.reconnect_interval = reconnect_interval
+        self.max_reconnect_attempts = max_reconnect_attempts
+        self.connect = connect
+        self.running = True
+        self._connections: List[_CombinedStreamConnection] = []
+        self._assignments: Dict[str, _CombinedStreamConnection] = {}
+        self._connection_ids = itertools.count(1)
+        self._closed = asyncio.Event()
+
+    @property
+    def connection_count(self) -> int:
+        return len(self._connections)
+
+    @property
+    def streams(self) -> Set[str]:
+        return set(self._assignments)
+
+    def combined_url(self, streams: Iterable[str]) -> str:
+        return f"{self.base_url}?streams={'/'.join(streams)}"
+
+    def is_connected(self, stream: str) -> bool:
+        """Whether an open connection currently delivers the stream"""
+        connection = self._assignments.get(stream)
+        return connection is not None and stream in connection.subscribed
+
+    async def subscribe(self, streams: Iterable[str]) -> int:
+        """Add streams, filling existing connections first; returns the number added"""
+        if not self.running:
+            raise RuntimeError("Stream pool is closed")
+
+        batches: Dict[_CombinedStreamConnection, List[str]] = {}
+        for stream in dict.fromkeys(streams):
+            if stream in self._assignments:
+                continue
+            connection = self._connection_with_capacity()
+            connection.streams.add(stream)
+            self._assignments[stream] = connection
+            batches.setdefault(connection, []).append(stream)
+
+        for connection, added in batches.items():
+            if connection.task is None or connection.task.done():
+                connection.start()  # New or given-up connection: streams go in the URL
+            else:
+                await connection.subscribe(added)
+        return sum(len(added) for added in batches.values())
+
+    async def unsubscribe(self, streams: Iterable[str]) -> int:
+        """Remove streams, closing connections left empty; returns the number removed"""
+        batches: Dict[_CombinedStreamConnection, List[str]] = {}
+        for stream in dict.fromkeys(streams):
+            connection = self._assignments.pop(stream, None)
+            if connection is None:
+                continue
+            connection.streams.discard(stream)
+            batches.setdefault(connection, []).append(stream)
+
+        for connection, removed in batches.items():
+            if connection.streams:
+                await connection.unsubscribe(removed)
+            else:
+                self._connections.remove(connection)
+                await connection.close()
+        return sum(len(removed) for removed in batches.values())
+
+    async def close(self):
+        """Close every connection"""
+        self.running = False
+        connections, self._connections = self._connections, []
+        self._assignments.clear()
+        await asyncio.gather(*(connection.close() for connection in connections), return_exceptions=True)
+        self._closed.set()
+
+    async def wait_closed(self):
+        await self._closed.wait()
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            'connections': len(self._connections),
+            'connected': sum(1 for c in self._connections if c.is_connected),
+            'streams': len(self._assignments),
+            'messages_received': sum(c.messages_received for c in self._connections),
+            'per_connection': [
+                {
+                    'connection_id': c.connection_id,
+                    'streams': len(c.streams),
+                    'connected': c.is_connected,
+                    'messages_received': c.messages_received,
+                    'reconnect_attempts': c.reconnect_attempts
+                }
+                for c in self._connections
+            ]
+        }
+
+    def _connection_with_capacity(self) -> _CombinedStreamConnection:
+        for connection in self._connections:
+            if len(connection.streams) < self.max_streams_per_connection:
+                return connection
+        connection = _CombinedStreamConnection(self, next(self._connection_ids))
+        self._connections.append(connection)
+        return connection
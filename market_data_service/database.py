@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import json
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Iterable, List, Optional, Union
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
 
 import structlog
 
@@ -15,6 +15,7 @@ from models import (
     MarketData,
     OrderBookData,
     SymbolTracking,
+    TradeBar,
     TradeData,
 )
 from shared.postgres_manager import PostgresManager, ensure_connection
@@ -52,6 +53,203 @@ def _prepare_document(document: Dict[str, Any]) -> str:
     return json.dumps(serialize_datetime_fields(dict(document)))
 
 
+MARKET_DATA_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+TRADE_DATA_TTL_SECONDS = 7 * 24 * 60 * 60  # 7 days
+TRADE_BAR_TTL_SECONDS = 30 * 24 * 60 * 60  # 30 days
+ORDERBOOK_DATA_TTL_SECONDS = 60 * 60  # 1 hour
+
+# market_data_ohlcv columns written per row; created_at/updated_at are set by the merge
+MARKET_DATA_COLUMNS = [
+    "id",
+    "partition_key",
+    "symbol",
+    "interval",
+    "ts",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "quote_volume",
+    "trades_count",
+    "asset_type",
+    "extra",
+]
+
+_MARKET_DATA_CONFLICT_SQL = "ON CONFLICT (id) DO UPDATE SET " + ", ".join(
+    [f"{column} = EXCLUDED.{column}" for column in MARKET_DATA_COLUMNS[1:]]
+    + ["updated_at = NOW()", "ttl_seconds = EXCLUDED.ttl_seconds"]
+)
+
+# Rebuilds the original JSON document from a market_data_ohlcv row
+MARKET_DATA_DOCUMENT_SQL = """
+    extra || jsonb_build_object(
+        'id', id,
+        'symbol', symbol,
+        'interval', interval,
+        'timestamp', to_char(ts AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+        'open_price', open_price,
+        'high_price', high_price,
+        'low_price', low_price,
+        'close_price', close_price,
+        'volume', volume,
+        'quote_volume', quote_volume,
+        'trades_count', trades_count,
+        'asset_type', asset_type
+    )
+"""
+
+MARKET_DATA_VIEW_SELECT = f"""
+    SELECT id, partition_key, {MARKET_DATA_DOCUMENT_SQL} AS data, created_at, updated_at, ttl_seconds
+    FROM market_data_ohlcv
+"""
+
+
+def _market_data_document(data: MarketData) -> Dict[str, Any]:
+    return {
+        "id": f"{data.symbol}_{data.interval}_{int(data.timestamp.timestamp())}",
+        "symbol": data.symbol,
+        "timestamp": _datetime_to_iso(data.timestamp),
+        "open_price": data.open_price,
+        "high_price": data.high_price,
+        "low_price": data.low_price,
+        "close_price": data.close_price,
+        "volume": data.volume,
+        "quote_volume": data.quote_volume,
+        "trades_count": data.trades_count,
+        "interval": data.interval,
+        "asset_type": getattr(data, "asset_type", "crypto"),
+        "created_at": _utc_now_iso(),
+    }
+
+
+def _market_data_row(data: MarketData) -> tuple:
+    """Typed market_data_ohlcv row (in MARKET_DATA_COLUMNS order) for one record."""
+    document = _market_data_document(data)
+    timestamp = data.timestamp
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return (
+        document["id"],
+        data.symbol,
+        data.symbol,
+        data.interval,
+        timestamp.replace(microsecond=0),
+        data.open_price,
+        data.high_price,
+        data.low_price,
+        data.close_price,
+        data.volume,
+        data.quote_volume,
+        data.trades_count,
+        document["asset_type"],
+        json.dumps({"created_at": document["created_at"]}),
+    )
+
+
+def market_data_rows(
+    symbol: str,
+    interval: str,
+    open_times: Sequence[int],
+    opens: Sequence[float],
+    highs: Sequence[float],
+    lows: Sequence[float],
+    closes: Sequence[float],
+    volumes: Sequence[float],
+    quote_volumes: Sequence[float],
+    trades_counts: Sequence[int],
+    asset_type: str = "crypto",
+) -> List[tuple]:
+    """Typed market_data_ohlcv rows for columns of klines (open times in epoch ms).
+
+    Produces the same rows as ``_market_data_row`` without building a
+    MarketData object per kline.
+    """
+    extra = json.dumps({"created_at": _utc_now_iso()})
+    return [
+        (
+            f"{symbol}_{interval}_{open_time // 1000}",
+            symbol,
+            symbol,
+            interval,
+            datetime.fromtimestamp(open_time // 1000, tz=timezone.utc),
+            open_price,
+            high_price,
+            low_price,
+            close_price,
+            volume,
+            quote_volume,
+            trades_count,
+            asset_type,
+            extra,
+        )
+        for open_time, open_price, high_price, low_price, close_price, volume, quote_volume, trades_count in zip(
+            open_times, opens, highs, lows, closes, volumes, quote_volumes, trades_counts
+        )
+    ]
+
+
+def _market_data_from_dict(record: Dict[str, Any]) -> MarketData:
+    """Convert a collector kline dict (Binance or normalised field names) to MarketData."""
+    timestamp = record.get('timestamp')
+    if isinstance(timestamp, str):
+        timestamp = datetime.fromisoformat(timestamp.rstrip('Z'))
+    elif not isinstance(timestamp, datetime):
+        raise ValueError(f"Invalid timestamp type: {type(timestamp)}")
+
+    return MarketData(
+        symbol=record['symbol'],
+        timestamp=timestamp,
+        open_price=float(record.get('open_price', 0)),
+        high_price=float(record.get('high_price', 0)),
+        low_price=float(record.get('low_price', 0)),
+        close_price=float(record.get('close_price', 0)),
+        volume=float(record.get('volume', 0)),
+        quote_volume=float(record.get('quote_asset_volume', record.get('quote_volume', 0))),
+        trades_count=int(record.get('number_of_trades', record.get('trades_count', 0))),
+        interval=record.get('interval', '1m')
+    )
+
+
+def _trade_record(data: TradeData) -> Tuple[str, str, Dict[str, Any]]:
+    """(id, partition key, document) for a trades_stream row."""
+    document = {
+        "id": f"{data.symbol}_{int(data.timestamp.timestamp() * 1_000_000)}",
+        "symbol": data.symbol,
+        "timestamp": _datetime_to_iso(data.timestamp),
+        "price": data.price,
+        "quantity": data.quantity,
+        "is_buyer_maker": data.is_buyer_maker,
+        "created_at": _utc_now_iso(),
+    }
+    return document["id"], data.symbol, document
+
+
+def _trade_bar_record(bar: TradeBar) -> Tuple[str, str, Dict[str, Any]]:
+    """(id, partition key, document) for a trade_bars row."""
+    document = bar.model_dump()
+    document.update({
+        "id": f"{bar.symbol}_{bar.interval}_{int(bar.open_time.timestamp() * 1000)}",
+        "timestamp": _datetime_to_iso(bar.open_time),
+        "vwap": bar.vwap,
+        "created_at": _utc_now_iso(),
+    })
+    return document["id"], bar.symbol, document
+
+
+def _orderbook_record(data: OrderBookData) -> Tuple[str, str, Dict[str, Any]]:
+    """(id, partition key, document) for an order_book row."""
+    document = {
+        "id": f"{data.symbol}_{int(data.timestamp.timestamp() * 1000)}",
+        "symbol": data.symbol,
+        "timestamp": _datetime_to_iso(data.timestamp),
+        "bids": data.bids,
+        "asks": data.asks,
+        "created_at": _utc_now_iso(),
+    }
+    return document["id"], data.symbol, document
+
+
 class Database:
     """PostgreSQL persistence helper for market data, sentiment, symbols, and indicators."""
 
@@ -80,26 +278,45 @@ class Database:
         """Create required tables and indexes if they do not already exist."""
         statements: List[str] = [
             """
-            CREATE TABLE IF NOT EXISTS market_data (
+            CREATE TABLE IF NOT EXISTS market_data_ohlcv (
                 id TEXT PRIMARY KEY,
                 partition_key TEXT NOT NULL,
-                data JSONB NOT NULL,
+                symbol TEXT NOT NULL,
+                interval TEXT NOT NULL,
+                ts TIMESTAMPTZ NOT NULL,
+                open_price DOUBLE PRECISION,
+                high_price DOUBLE PRECISION,
+                low_price DOUBLE PRECISION,
+                close_price DOUBLE PRECISION,
+                volume DOUBLE PRECISION,
+                quote_volume DOUBLE PRECISION,
+                trades_count BIGINT,
+                asset_type TEXT NOT NULL DEFAULT 'crypto',
+                extra JSONB NOT NULL DEFAULT '{}'::jsonb,
                 created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
                 updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
                 ttl_seconds INTEGER
             )
             """,
             """
-            CREATE INDEX IF NOT EXISTS idx_market_data_symbol_ts
-                ON market_data ((data->>'symbol'), (data->>'timestamp'))
+            CREATE INDEX IF NOT EXISTS idx_market_data_ohlcv_symbol_interval_ts
+                ON market_data_ohlcv (symbol, interval, ts)
             """,
             """
-            CREATE INDEX IF NOT EXISTS idx_market_data_interval
-                ON market_data ((data->>'interval'))
+            CREATE INDEX IF NOT EXISTS idx_market_data_ohlcv_asset_type_ts
+                ON market_data_ohlcv (asset_type, ts)
             """,
-            """
-            CREATE INDEX IF NOT EXISTS idx_market_data_asset_type
-                ON market_data ((data->>'asset_type'))
+            # JSON compatibility view for readers of the original document table.
+            # Deployments that still have the JSONB table keep it until
+            # migrations/market_data_typed_columns_cutover.sql replaces it.
+            f"""
+            DO $$
+            BEGIN
+                IF to_regclass('market_data') IS NULL THEN
+                    CREATE VIEW market_data AS {MARKET_DATA_VIEW_SELECT};
+                END IF;
+            END
+            $$
             """,
             """
             CREATE TABLE IF NOT EXISTS trades_stream (
@@ -107,23 +324,55 @@ class Database:
                 partition_key TEXT NOT NULL,
                 data JSONB NOT NULL,
                 created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
                 ttl_seconds INTEGER
             )
             """,
             """
+            ALTER TABLE trades_stream ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            """,
+            """
             CREATE INDEX IF NOT EXISTS idx_trades_stream_symbol_ts
                 ON trades_stream ((data->>'symbol'), (data->>'timestamp'))
             """,
             """
+            CREATE TABLE IF NOT EXISTS trade_bars (
+                id TEXT PRIMARY KEY,
+                partition_key TEXT NOT NULL,
+                data JSONB NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                ttl_seconds INTEGER
+            )
+            """,
+            """
+            CREATE INDEX IF NOT EXISTS idx_trade_bars_symbol_interval_ts
+                ON trade_bars ((data->>'symbol'), (data->>'interval'), (data->>'timestamp'))
+            """,
+            """
+            CREATE TABLE IF NOT EXISTS kline_backfill_checkpoints (
+                id TEXT PRIMARY KEY,
+                partition_key TEXT NOT NULL,
+                data JSONB NOT NULL,
+                created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                ttl_seconds INTEGER
+            )
+            """,
+            """
             CREATE TABLE IF NOT EXISTS order_book (
                 id TEXT PRIMARY KEY,
                 partition_key TEXT NOT NULL,
                 data JSONB NOT NULL,
                 created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+                updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
                 ttl_seconds INTEGER
             )
             """,
             """
+            ALTER TABLE order_book ADD COLUMN IF NOT EXISTS updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW()
+            """,
+            """
             CREATE INDEX IF NOT EXISTS idx_order_book_symbol_ts
                 ON order_book ((data->>'symbol'), (data->>'timestamp'))
             """,
@@ -452,94 +701,203 @@ class Database:
     # ------------------------------------------------------------------
 
     async def insert_market_data(self, data: MarketData) -> None:
-        document = {
-            "id": f"{data.symbol}_{data.interval}_{int(data.timestamp.timestamp())}",
-            "symbol": data.symbol,
-            "timestamp": _datetime_to_iso(data.timestamp),
-            "open_price": data.open_price,
-            "high_price": data.high_price,
-            "low_price": data.low_price,
-            "close_price": data.close_price,
-            "volume": data.volume,
-            "quote_volume": data.quote_volume,
-            "trades_count": data.trades_count,
-            "interval": data.interval,
-            "asset_type": getattr(data, "asset_type", "crypto"),
-            "created_at": _utc_now_iso(),
-        }
-        ttl_seconds = 30 * 24 * 60 * 60  # 30 days
-        await self._upsert_document("market_data", document["id"], data.symbol, document, ttl_seconds)
+        await self._postgres.execute(
+            f"""
+            INSERT INTO market_data_ohlcv ({', '.join(MARKET_DATA_COLUMNS)}, created_at, updated_at, ttl_seconds)
+            VALUES ({', '.join(f'${i}' for i in range(1, len(MARKET_DATA_COLUMNS) + 1))}, NOW(), NOW(), ${len(MARKET_DATA_COLUMNS) + 1})
+            {_MARKET_DATA_CONFLICT_SQL}
+            """,
+            *_market_data_row(data),
+            MARKET_DATA_TTL_SECONDS,
+        )
 
     async def upsert_market_data(self, data: MarketData) -> None:
         await self.insert_market_data(data)
 
-    async def upsert_market_data_batch(self, data_list: Iterable[Union[MarketData, Dict[str, Any]]]) -> None:
-        """Insert batch of market data - accepts both MarketData objects and dicts"""
+    async def upsert_market_data_batch(self, data_list: Iterable[Union[MarketData, Dict[str, Any]]]) -> int:
+        """Bulk upsert market data - accepts both MarketData objects and dicts.
+
+        Rows are COPYed into a session-local staging table and merged into
+        ``market_data_ohlcv`` with one ``INSERT ... ON CONFLICT`` in a single
+        transaction, so a page of klines costs a constant number of round trips.
+        Rows, TTL and conflict handling match ``insert_market_data``; dicts
+        that fail conversion are logged and skipped, and when an id repeats
+        within the batch the last record wins. Returns the number of rows merged.
+        """
+        rows = []
         for record in data_list:
             if isinstance(record, dict):
-                # Convert dict to MarketData object
                 try:
-                    # Handle timestamp conversion
-                    timestamp = record.get('timestamp')
-                    if isinstance(timestamp, str):
-                        timestamp = datetime.fromisoformat(timestamp.rstrip('Z'))
-                    elif not isinstance(timestamp, datetime):
-                        raise ValueError(f"Invalid timestamp type: {type(timestamp)}")
-                    
-                    market_data = MarketData(
-                        symbol=record['symbol'],
-                        timestamp=timestamp,
-                        open_price=float(record.get('open_price', 0)),
-                        high_price=float(record.get('high_price', 0)),
-                        low_price=float(record.get('low_price', 0)),
-                        close_price=float(record.get('close_price', 0)),
-                        volume=float(record.get('volume', 0)),
-                        quote_volume=float(record.get('quote_asset_volume', record.get('quote_volume', 0))),
-                        trades_count=int(record.get('number_of_trades', record.get('trades_count', 0))),
-                        interval=record.get('interval', '1m')
-                    )
-                    await self.insert_market_data(market_data)
+                    record = _market_data_from_dict(record)
                 except Exception as e:
                     logger.error(f"Error converting dict to MarketData: {e}", record=record)
                     continue
-            else:
-                await self.insert_market_data(record)
+            rows.append(_market_data_row(record))
+        return await self.upsert_market_data_rows(rows)
+
+    async def upsert_market_data_rows(self, row_list: Iterable[tuple]) -> int:
+        """Bulk upsert typed rows (``MARKET_DATA_COLUMNS`` order, see ``market_data_rows``).
+
+        Same COPY + merge as ``upsert_market_data_batch``; when an id repeats
+        the last row wins. Returns the number of rows merged.
+        """
+        rows: Dict[str, tuple] = {row[0]: row for row in row_list}
+        if not rows:
+            return 0
+
+        columns = ", ".join(MARKET_DATA_COLUMNS)
+        async with self._postgres.transaction() as conn:
+            await conn.execute(
+                """
+                CREATE TEMP TABLE IF NOT EXISTS market_data_staging
+                    (LIKE market_data_ohlcv INCLUDING DEFAULTS)
+                    ON COMMIT DELETE ROWS
+                """
+            )
+            await conn.copy_records_to_table(
+                "market_data_staging",
+                records=list(rows.values()),
+                columns=MARKET_DATA_COLUMNS,
+            )
+            await conn.execute(
+                f"""
+                INSERT INTO market_data_ohlcv ({columns}, created_at, updated_at, ttl_seconds)
+                SELECT {columns}, NOW(), NOW(), $1
+                FROM market_data_staging
+                {_MARKET_DATA_CONFLICT_SQL}
+                """,
+                MARKET_DATA_TTL_SECONDS,
+            )
+        return len(rows)
+
+    async def get_backfill_checkpoint(self, symbol: str, interval: str) -> Optional[Dict[str, Any]]:
+        """Kline backfill progress for one symbol and interval, if any."""
+        return await self._fetch_one_data(
+            "SELECT data FROM kline_backfill_checkpoints WHERE id = $1",
+            f"{symbol}_{interval}",
+        )
+
+    async def save_backfill_checkpoint(self, checkpoint: Dict[str, Any]) -> None:
+        """Store kline backfill progress (a dict with at least ``symbol`` and ``interval``)."""
+        await self._upsert_document(
+            "kline_backfill_checkpoints",
+            f"{checkpoint['symbol']}_{checkpoint['interval']}",
+            checkpoint["symbol"],
+            checkpoint,
+        )
+
+    async def _upsert_documents(
+        self,
+        table: str,
+        records: Iterable[Tuple[str, str, Dict[str, Any]]],
+        ttl_seconds: Optional[int] = None,
+    ) -> int:
+        """Upsert (record_id, partition_key, document) triples with one statement.
+
+        Matches ``_upsert_document`` row for row; when an id repeats within
+        the batch the last record wins. Returns the number of rows written.
+        """
+        rows: Dict[str, Tuple[str, str]] = {}
+        for record_id, partition_key, document in records:
+            document = dict(document)
+            document["id"] = record_id
+            rows[record_id] = (partition_key, _prepare_document(document))
+
+        if not rows:
+            return 0
+
+        query = f"""
+            INSERT INTO {table} (id, partition_key, data, created_at, updated_at, ttl_seconds)
+            SELECT id, partition_key, data, NOW(), NOW(), $4
+            FROM unnest($1::text[], $2::text[], $3::jsonb[]) AS batch(id, partition_key, data)
+            ON CONFLICT (id)
+            DO UPDATE SET data = EXCLUDED.data,
+                          updated_at = NOW(),
+                          ttl_seconds = EXCLUDED.ttl_seconds
+        """
+        await self._postgres.execute(
+            query,
+            list(rows),
+            [partition_key for partition_key, _ in rows.values()],
+            [payload for _, payload in rows.values()],
+            ttl_seconds,
+        )
+        return len(rows)
 
     async def insert_trade_data(self, data: TradeData) -> None:
-        document = {
-            "id": f"{data.symbol}_{int(data.timestamp.timestamp() * 1_000_000)}",
-            "symbol": data.symbol,
-            "timestamp": _datetime_to_iso(data.timestamp),
-            "price": data.price,
-            "quantity": data.quantity,
-            "is_buyer_maker": data.is_buyer_maker,
-            "created_at": _utc_now_iso(),
-        }
-        ttl_seconds = 7 * 24 * 60 * 60
-        await self._upsert_document("trades_stream", document["id"], data.symbol, document, ttl_seconds)
+        await self.insert_trade_data_batch([data])
+
+    async def insert_trade_data_batch(self, data_list: Iterable[TradeData]) -> int:
+        """Upsert trades with one statement; returns the number of rows written."""
+        return await self._upsert_documents(
+            "trades_stream",
+            (_trade_record(data) for data in data_list),
+            TRADE_DATA_TTL_SECONDS,
+        )
 
-    async def insert_orderbook_data(self, data: OrderBookData) -> None:
-        document = {
-            "id": f"{data.symbol}_{int(data.timestamp.timestamp() * 1000)}",
-            "symbol": data.symbol,
-            "timestamp": _datetime_to_iso(data.timestamp),
-            "bids": data.bids,
-            "asks": data.asks,
-            "created_at": _utc_now_iso(),
-        }
-        ttl_seconds = 60 * 60  # 1 hour
-        await self._upsert_document("order_book", document["id"], data.symbol, document, ttl_seconds)
+    async def insert_trade_bars_batch(self, bars: Iterable[TradeBar]) -> int:
+        """Upsert aggregated trade bars with one statement; returns the number of rows written."""
+        return await self._upsert_documents(
+            "trade_bars",
+            (_trade_bar_record(bar) for bar in bars),
+            TRADE_BAR_TTL_SECONDS,
+        )
 
-    async def get_latest_market_data(self, symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
+    async def get_trade_bars(self, symbol: str, interval: str = "1m", limit: int = 100) -> List[Dict[str, Any]]:
+        """Latest trade bars for a symbol and interval, newest first."""
         query = """
             SELECT data
-            FROM market_data
-            WHERE data->>'symbol' = $1
-            ORDER BY (data->>'timestamp')::timestamptz DESC
+            FROM trade_bars
+            WHERE data->>'symbol' = $1 AND data->>'interval' = $2
+            ORDER BY data->>'timestamp' DESC
+            LIMIT $3
+        """
+        return await self._fetch_data(query, symbol, interval, limit)
+
+    async def insert_orderbook_data(self, data: OrderBookData) -> None:
+        await self.insert_orderbook_data_batch([data])
+
+    async def insert_orderbook_data_batch(self, data_list: Iterable[OrderBookData]) -> int:
+        """Upsert order book snapshots with one statement; returns the number of rows written."""
+        return await self._upsert_documents(
+            "order_book",
+            (_orderbook_record(data) for data in data_list),
+            ORDERBOOK_DATA_TTL_SECONDS,
+        )
+
+    async def get_latest_market_data(self, symbol: str, limit: int = 100) -> List[Dict[str, Any]]:
+        query = f"""
+            SELECT {MARKET_DATA_DOCUMENT_SQL} AS data
+            FROM market_data_ohlcv
+            WHERE symbol = $1
+            ORDER BY ts DESC
             LIMIT $2
         """
         return await self._fetch_data(query, symbol, limit)
 
+    async def get_market_data(
+        self,
+        symbol: str,
+        interval: str = "1m",
+        hours_back: int = 24,
+        limit: int = 1000,
+    ) -> List[Dict[str, Any]]:
+        """Latest ``limit`` klines within ``hours_back``, oldest first"""
+        cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
+        query = f"""
+            SELECT data FROM (
+                SELECT ts, {MARKET_DATA_DOCUMENT_SQL} AS data
+                FROM market_data_ohlcv
+                WHERE symbol = $1
+                  AND interval = $2
+                  AND ts >= $3
+                ORDER BY ts DESC
+                LIMIT $4
+            ) AS latest
+            ORDER BY ts ASC
+        """
+        return await self._fetch_data(query, symbol, interval, cutoff, limit)
+
     async def get_market_data_for_analysis(
         self,
         symbol: str,
@@ -547,13 +905,13 @@ class Database:
         hours_back: int = 24,
     ) -> List[Dict[str, Any]]:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        query = """
-            SELECT data
-            FROM market_data
-            WHERE data->>'symbol' = $1
-              AND data->>'interval' = $2
-              AND (data->>'timestamp')::timestamptz >= $3
-            ORDER BY (data->>'timestamp')::timestamptz ASC
+        query = f"""
+            SELECT {MARKET_DATA_DOCUMENT_SQL} AS data
+            FROM market_data_ohlcv
+            WHERE symbol = $1
+              AND interval = $2
+              AND ts >= $3
+            ORDER BY ts ASC
         """
         return await self._fetch_data(query, symbol, interval, cutoff)
 
@@ -687,25 +1045,25 @@ class Database:
         limit: int = 100,
     ) -> List[Dict[str, Any]]:
         cutoff = datetime.now(timezone.utc) - timedelta(hours=hours_back)
-        conditions = ["data->>'asset_type' = $1", "(data->>'timestamp')::timestamptz >= $2"]
+        conditions = ["asset_type = $1", "ts >= $2"]
         params: List[Any] = [asset_type, cutoff]
         param_idx = 3
 
         if symbol:
-            conditions.append(f"data->>'symbol' = ${param_idx}")
+            conditions.append(f"symbol = ${param_idx}")
             params.append(symbol)
             param_idx += 1
         if interval:
-            conditions.append(f"data->>'interval' = ${param_idx}")
+            conditions.append(f"interval = ${param_idx}")
             params.append(interval)
             param_idx += 1
 
         params.append(limit)
         query = f"""
-            SELECT data
-            FROM market_data
+            SELECT {MARKET_DATA_DOCUMENT_SQL} AS data
+            FROM market_data_ohlcv
             WHERE {' AND '.join(conditions)}
-            ORDER BY (data->>'timestamp')::timestamptz DESC
+            ORDER BY ts DESC
             LIMIT ${param_idx}
         """
         return await self._fetch_data(query, *params)
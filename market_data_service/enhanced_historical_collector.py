@@ -9,7 +9,7 @@ Features:
 - Parallel data collection for multiple symbols
 - Gap detection and automatic backfilling
 - Data validation and quality checks
-- Progress tracking and resumable downloads
+- Progress tracking and resumable downloads (per symbol/timeframe checkpoints)
 - Efficient batch storage and indexing
 - Export capabilities for backtesting engines
 """
@@ -159,30 +159,27 @@ class EnhancedHistoricalDataCollector:
         
         results = {}
         
-        # Process symbols in batches
-        for i in range(0, len(symbols), parallel_symbols):
-            symbol_batch = symbols[i:i + parallel_symbols]
-            
-            # Collect data for this batch of symbols
-            batch_tasks = [
-                self._collect_symbol_all_timeframes(
+        # Pages are paced by the base collector's backfill pool and request
+        # weight budget, so no fixed delays are needed between symbols
+        symbol_slots = asyncio.Semaphore(parallel_symbols)
+        
+        async def collect_symbol(symbol: str) -> Dict[str, int]:
+            async with symbol_slots:
+                return await self._collect_symbol_all_timeframes(
                     symbol, timeframes, days_back, parallel_timeframes
                 )
-                for symbol in symbol_batch
-            ]
-            
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            # Store results
-            for symbol, result in zip(symbol_batch, batch_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Error collecting data for {symbol}: {result}")
-                    results[symbol] = {}
-                else:
-                    results[symbol] = result
-                    
-            # Delay between symbol batches to avoid rate limiting
-            await asyncio.sleep(5)
+        
+        symbol_results = await asyncio.gather(
+            *(collect_symbol(symbol) for symbol in symbols), return_exceptions=True
+        )
+        
+        # Store results
+        for symbol, result in zip(symbols, symbol_results):
+            if isinstance(result, Exception):
+                logger.error(f"Error collecting data for {symbol}: {result}")
+                results[symbol] = {}
+            else:
+                results[symbol] = result
             
         # Generate summary report
         await self._generate_collection_report(results)
@@ -201,29 +198,24 @@ class EnhancedHistoricalDataCollector:
         logger.info(f"Starting collection for {symbol}")
         
         results = {}
+        timeframe_slots = asyncio.Semaphore(parallel_timeframes)
         
-        # Process timeframes in batches
-        for i in range(0, len(timeframes), parallel_timeframes):
-            timeframe_batch = timeframes[i:i + parallel_timeframes]
-            
-            batch_tasks = [
-                self._collect_with_progress_tracking(
+        async def collect_timeframe(tf: str) -> int:
+            async with timeframe_slots:
+                return await self._collect_with_progress_tracking(
                     symbol, tf, days_back.get(tf, 365)
                 )
-                for tf in timeframe_batch
-            ]
-            
-            batch_results = await asyncio.gather(*batch_tasks, return_exceptions=True)
-            
-            for tf, result in zip(timeframe_batch, batch_results):
-                if isinstance(result, Exception):
-                    logger.error(f"Error collecting {symbol} {tf}: {result}")
-                    results[tf] = 0
-                else:
-                    results[tf] = result
-                    
-            # Small delay between timeframe batches
-            await asyncio.sleep(2)
+        
+        timeframe_results = await asyncio.gather(
+            *(collect_timeframe(tf) for tf in timeframes), return_exceptions=True
+        )
+        
+        for tf, result in zip(timeframes, timeframe_results):
+            if isinstance(result, Exception):
+                logger.error(f"Error collecting {symbol} {tf}: {result}")
+                results[tf] = 0
+            else:
+                results[tf] = result
             
         return results
     
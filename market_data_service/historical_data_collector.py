@@ -2,7 +2,8 @@
 Historical Data Collector for Market Data Service
 
 This module handles fetching historical market data from Binance REST API
-and populating the Azure Cosmos DB with historical OHLCV data.
+and populating the database with historical OHLCV data. Bulk collection goes
+through the concurrent, resumable KlineBackfill engine.
 """
 
 import asyncio
@@ -18,6 +19,7 @@ from shared.cache_decorators import cached, simple_key
 
 from config import settings
 from database import Database
+from kline_backfill import KlineBackfill
 
 logger = structlog.get_logger()
 
@@ -31,6 +33,7 @@ class HistoricalDataCollector:
         self.rate_limit_delay = 0.1  # 100ms between requests
         self.cache_hits = 0
         self.cache_misses = 0
+        self.backfill = KlineBackfill(database, concurrency=settings.HISTORICAL_BACKFILL_CONCURRENCY)
         
     async def __aenter__(self):
         """Async context manager entry"""
@@ -46,12 +49,14 @@ class HistoricalDataCollector:
         if not self.session:
             timeout = aiohttp.ClientTimeout(total=30)
             self.session = aiohttp.ClientSession(timeout=timeout)
+            self.backfill.session = self.session
             
     async def disconnect(self):
         """Close HTTP session"""
         if self.session:
             await self.session.close()
             self.session = None
+            self.backfill.session = None
             
     async def _make_request(self, url: str, params: Dict) -> Dict:
         """Make HTTP request with rate limiting"""
@@ -137,6 +142,7 @@ class HistoricalDataCollector:
         try:
             response = await self._make_request(url, params)
             
+            created_at = datetime.utcnow().isoformat() + "Z"
             market_data = []
             for kline in response:
                 # Binance kline format: [open_time, open, high, low, close, volume, close_time, ...]
@@ -159,7 +165,7 @@ class HistoricalDataCollector:
                     "taker_buy_quote_asset_volume": str(kline[10]),
                     "base_asset": symbol[:-4],  # Remove USDC suffix
                     "quote_asset": "USDC",
-                    "created_at": datetime.utcnow().isoformat() + "Z"
+                    "created_at": created_at
                 }
                 market_data.append(market_data_item)
                 
@@ -187,130 +193,37 @@ class HistoricalDataCollector:
         interval: str,
         days_back: int = None
     ) -> int:
-        """Collect historical data for a specific symbol and interval"""
+        """
+        Collect historical data for a specific symbol and interval
+        
+        Resumes from the pair's backfill checkpoint, so repeated calls only fetch
+        klines that are new since the last run. Returns the number of rows written.
+        """
         
         if days_back is None:
             days_back = settings.HISTORICAL_DATA_DAYS
             
-        end_time = datetime.utcnow()
-        start_time = end_time - timedelta(days=days_back)
-        
-        total_records = 0
-        interval_ms = self._convert_interval_to_ms(interval)
-        max_records_per_request = 1000
-        
-        logger.info(
-            "Starting historical data collection",
-            symbol=symbol,
-            interval=interval,
-            days_back=days_back,
-            start_time=start_time.isoformat(),
-            end_time=end_time.isoformat()
-        )
-        
-        current_start = start_time
-        
-        while current_start < end_time:
-            # Calculate end time for this batch (max 1000 records)
-            max_end_time = current_start + timedelta(milliseconds=interval_ms * max_records_per_request)
-            batch_end_time = min(max_end_time, end_time)
-            
-            try:
-                # Fetch data for this batch
-                klines = await self.fetch_historical_klines(
-                    symbol=symbol,
-                    interval=interval,
-                    start_time=current_start,
-                    end_time=batch_end_time,
-                    limit=max_records_per_request
-                )
-                
-                if not klines:
-                    logger.warning(
-                        "No historical data returned",
-                        symbol=symbol,
-                        interval=interval,
-                        start_time=current_start.isoformat()
-                    )
-                    break
-                    
-                # Store data in batches
-                batch_size = settings.HISTORICAL_BATCH_SIZE
-                for i in range(0, len(klines), batch_size):
-                    batch = klines[i:i + batch_size]
-                    await self.database.upsert_market_data_batch(batch)
-                    total_records += len(batch)
-                    
-                    logger.info(
-                        "Stored historical data batch",
-                        symbol=symbol,
-                        interval=interval,
-                        batch_size=len(batch),
-                        total_records=total_records
-                    )
-                
-                # Move to next batch
-                if klines:
-                    # Use the close time of the last kline as the start of the next batch
-                    last_kline_close_time = datetime.fromisoformat(klines[-1]["close_time"].rstrip("Z"))
-                    current_start = last_kline_close_time + timedelta(milliseconds=interval_ms)
-                else:
-                    current_start = batch_end_time
-                    
-            except Exception as e:
-                logger.error(
-                    "Error collecting historical data batch",
-                    symbol=symbol,
-                    interval=interval,
-                    start_time=current_start.isoformat(),
-                    error=str(e)
-                )
-                # Move forward to avoid infinite loop
-                current_start += timedelta(hours=1)
-                
-        logger.info(
-            "Historical data collection completed",
-            symbol=symbol,
-            interval=interval,
-            total_records=total_records
-        )
-        
-        return total_records
+        await self.connect()
+        start_time = datetime.utcnow() - timedelta(days=days_back)
+        return await self.backfill.backfill(symbol, interval, start_time)
         
     async def collect_all_historical_data(self, symbols: List[str] = None) -> Dict[str, Dict[str, int]]:
-        """Collect historical data for all symbols and intervals"""
+        """Collect historical data for all symbols and intervals (pairs are paged concurrently)"""
         
         if symbols is None:
             symbols = settings.DEFAULT_SYMBOLS
             
-        results = {}
+        await self.connect()
+        start_time = datetime.utcnow() - timedelta(days=settings.HISTORICAL_DATA_DAYS)
+        pairs = [(symbol, interval) for symbol in symbols for interval in settings.HISTORICAL_INTERVALS]
+        results = await self.backfill.run(pairs, start_time)
         
-        for symbol in symbols:
-            results[symbol] = {}
-            
-            for interval in settings.HISTORICAL_INTERVALS:
-                try:
-                    record_count = await self.collect_historical_data_for_symbol(
-                        symbol=symbol,
-                        interval=interval
-                    )
-                    results[symbol][interval] = record_count
-                    
-                    # Small delay between intervals to avoid rate limiting
-                    await asyncio.sleep(1)
-                    
-                except Exception as e:
-                    logger.error(
-                        "Failed to collect historical data",
-                        symbol=symbol,
-                        interval=interval,
-                        error=str(e)
-                    )
-                    results[symbol][interval] = 0
-                    
-            # Longer delay between symbols
-            await asyncio.sleep(2)
-            
+        logger.info(
+            "Historical data collection finished",
+            pairs=len(pairs),
+            rows_written=self.backfill.rows_written,
+            failed_pairs=self.backfill.pairs_failed
+        )
         return results
         
     async def backfill_missing_data(
@@ -381,8 +294,7 @@ class HistoricalDataCollector:
                 )
                 
                 if klines:
-                    await self.database.upsert_market_data_batch(klines)
-                    total_filled += len(klines)
+                    total_filled += await self.database.upsert_market_data_batch(klines)
                     
             except Exception as e:
                 logger.error(
@@ -0,0 +1,223 @@
+"""
+Staged Ingest Pipeline for Market Data Service
+
+Decouples websocket receive loops from database and RabbitMQ latency:
+
+    receive -> parse -> bounded queue -> writer task -> batch sink
+
+Each stage owns a bounded asyncio queue and writer task(s) that flush every
+``batch_size`` items or ``flush_interval_ms``, whichever comes first, through
+a batch sink (e.g. Database.upsert_market_data_batch). What happens when a
+queue is full is an explicit per-stage policy:
+- block: the producer waits for space (backpressure)
+- drop_newest: the incoming item is discarded
+- drop_oldest: the oldest queued item is discarded to make room
+
+Queue depth, drops, batch sizes and flush latency are exported to Prometheus.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from enum import Enum
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+import structlog
+from prometheus_client import Counter, Gauge, Histogram
+
+logger = structlog.get_logger()
+
+ingest_queue_depth = Gauge('ingest_queue_depth', 'Items waiting in an ingest stage queue', ['stage'])
+ingest_items = Counter('ingest_items_total', 'Items flushed by ingest stages', ['stage', 'status'])
+ingest_dropped = Counter('ingest_dropped_total', 'Items dropped by ingest stages', ['stage', 'reason'])
+ingest_backpressure = Counter('ingest_backpressure_total', 'Producer waits on a full ingest queue', ['stage'])
+ingest_batch_size = Histogram(
+    'ingest_batch_size', 'Items per ingest flush', ['stage'],
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500, 1000, 2500)
+)
+ingest_flush_seconds = Histogram('ingest_flush_seconds', 'Time spent in ingest batch sinks', ['stage'])
+
+BatchSink = Callable[[List[Any]], Awaitable[Any]]
+
+# Queued on stop: wakes a writer collecting a partial batch so it flushes now
+_FLUSH = object()
+
+
+class DropPolicy(str, Enum):
+    """What a full stage queue does with new items"""
+    BLOCK = "block"
+    DROP_NEWEST = "drop_newest"
+    DROP_OLDEST = "drop_oldest"
+
+
+@dataclass
+class StageConfig:
+    """Queue and flush settings for one ingest stage"""
+    max_queue_size: int = 10000
+    batch_size: int = 500  # Flush when this many items are collected...
+    flush_interval_ms: int = 250  # ...or this long after the first one arrived
+    drop_policy: DropPolicy = DropPolicy.BLOCK
+    workers: int = 1  # Concurrent writer tasks (order is only kept with one)
+
+
+class IngestStage:
+    """Bounded queue drained in micro-batches by writer tasks"""
+
+    def __init__(self, name: str, sink: BatchSink, config: Optional[StageConfig] = None):
+        self.name = name
+        self.sink = sink
+        self.config = config or StageConfig()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=self.config.max_queue_size)
+        self.items_flushed = 0
+        self.items_failed = 0
+        self.items_dropped = 0
+        self._workers: List[asyncio.Task] = []
+        self._draining = False
+
+    @property
+    def depth(self) -> int:
+        return self.queue.qsize()
+
+    @property
+    def running(self) -> bool:
+        return any(not worker.done() for worker in self._workers)
+
+    async def put(self, item: Any) -> bool:
+        """Queue an item under the stage's drop policy; returns False if it was dropped"""
+        policy = self.config.drop_policy
+        if self.queue.full():
+            if policy == DropPolicy.DROP_NEWEST:
+                self._record_drop('drop_newest')
+                return False
+            if policy == DropPolicy.DROP_OLDEST:
+                try:
+                    self.queue.get_nowait()
+                    self.queue.task_done()
+                    self._record_drop('drop_oldest')
+                except asyncio.QueueEmpty:
+                    pass
+            else:
+                ingest_backpressure.labels(self.name).inc()
+
+        await self.queue.put(item)
+        ingest_queue_depth.labels(self.name).set(self.queue.qsize())
+        return True
+
+    def start(self):
+        if self.running:
+            return
+        self._draining = False
+        self._workers = [
+            asyncio.create_task(self._run(), name=f"ingest-{self.name}-{i}")
+            for i in range(self.config.workers)
+        ]
+
+    async def stop(self, drain_timeout: Optional[float] = 10.0):
+        """Flush what is queued (up to drain_timeout seconds), then stop the writers"""
+        if self.running and drain_timeout:
+            try:
+                await asyncio.wait_for(self._drain(), drain_timeout)
+            except asyncio.TimeoutError:
+                logger.warning("Ingest stage stopped before draining", stage=self.name, pending=self.depth)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            'queue_depth': self.depth,
+            'max_queue_size': self.config.max_queue_size,
+            'drop_policy': self.config.drop_policy.value,
+            'items_flushed': self.items_flushed,
+            'items_failed': self.items_failed,
+            'items_dropped': self.items_dropped,
+            'running': self.running
+        }
+
+    async def _drain(self):
+        self._draining = True
+        for _ in self._workers:
+            await self.queue.put(_FLUSH)
+        await self.queue.join()
+
+    async def _run(self):
+        while True:
+            batch = await self._next_batch()
+            if not batch:
+                continue
+            try:
+                await self._flush(batch)
+            finally:
+                for _ in batch:
+                    self.queue.task_done()
+
+    async def _next_batch(self) -> List[Any]:
+        """Wait for one item, then collect more until the batch is full or the interval elapses"""
+        batch = []
+        item = await self.queue.get()
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.config.flush_interval_ms / 1000
+        while item is not _FLUSH:
+            batch.append(item)
+            if len(batch) >= self.config.batch_size:
+                break
+            try:
+                item = self.queue.get_nowait()
+                continue
+            except asyncio.QueueEmpty:
+                pass
+            timeout = deadline - loop.time()
+            if timeout <= 0 or self._draining:
+                break
+            try:
+                item = await asyncio.wait_for(self.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                break
+        else:
+            self.queue.task_done()
+        ingest_queue_depth.labels(self.name).set(self.queue.qsize())
+        return batch
+
+    async def _flush(self, batch: List[Any]):
+        ingest_batch_size.labels(self.name).observe(len(batch))
+        try:
+            with ingest_flush_seconds.labels(self.name).time():
+                await self.sink(batch)
+            self.items_flushed += len(batch)
+            ingest_items.labels(self.name, 'success').inc(len(batch))
+        except Exception as e:
+            self.items_failed += len(batch)
+            ingest_items.labels(self.name, 'error').inc(len(batch))
+            logger.error("Ingest stage flush failed", stage=self.name, items=len(batch), error=str(e))
+
+    def _record_drop(self, reason: str):
+        self.items_dropped += 1
+        ingest_dropped.labels(self.name, reason).inc()
+
+
+class IngestPipeline:
+    """Named ingest stages started and stopped together"""
+
+    def __init__(self):
+        self.stages: Dict[str, IngestStage] = {}
+
+    def add_stage(self, name: str, sink: BatchSink, config: Optional[StageConfig] = None) -> IngestStage:
+        if name in self.stages:
+            raise ValueError(f"Ingest stage {name} already exists")
+        stage = IngestStage(name, sink, config)
+        self.stages[name] = stage
+        return stage
+
+    async def submit(self, stage: str, item: Any) -> bool:
+        """Queue an item on a stage; returns False if the stage's policy dropped it"""
+        return await self.stages[stage].put(item)
+
+    def start(self):
+        for stage in self.stages.values():
+            stage.start()
+
+    async def stop(self, drain_timeout: Optional[float] = 10.0):
+        await asyncio.gather(*(stage.stop(drain_timeout) for stage in self.stages.values()))
+
+    def statistics(self) -> Dict[str, Dict[str, Any]]:
+        return {name: stage.statistics() for name, stage in self.stages.items()}
@@ -0,0 +1,300 @@
+"""
+Kline Backfill Engine for Market Data Service
+
+Pages Binance ``/api/v3/klines`` for many (symbol, interval) pairs at once
+instead of one pair after another:
+
+- Up to ``concurrency`` pairs are paged in parallel; every page request goes
+  through a shared RateLimiter that budgets Binance request weight (kept in
+  sync with the server's count through X-MBX-USED-WEIGHT-1M)
+- Pages are converted straight into numeric arrays (KlinePage) and written
+  with one COPY + merge per page (Database.upsert_market_data_rows)
+- After every page the pair's checkpoint records the next open time to fetch,
+  so an interrupted run resumes where it stopped and a repeated run only
+  fetches klines that are new since the last one
+"""
+
+import asyncio
+import time
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+import aiohttp
+import numpy as np
+import structlog
+from prometheus_client import Counter
+
+from adaptive_limiter import RateLimiter
+from config import settings
+from database import market_data_rows
+
+logger = structlog.get_logger()
+
+kline_backfill_pages = Counter('kline_backfill_pages_total', 'Kline pages fetched by the backfill', ['interval'])
+kline_backfill_rows = Counter('kline_backfill_rows_total', 'Kline rows written by the backfill', ['interval'])
+kline_backfill_retries = Counter('kline_backfill_retries_total', 'Kline page requests retried', ['reason'])
+
+KLINES_ENDPOINT = "/api/v3/klines"
+KLINES_REQUEST_WEIGHT = 2  # Binance request weight of one klines call
+KLINES_PAGE_LIMIT = 1000  # Max klines per request
+
+
+def _to_ms(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp() * 1000)
+
+
+@dataclass
+class KlinePage:
+    """One page of klines as numeric columns (times in epoch ms)"""
+    symbol: str
+    interval: str
+    open_time: np.ndarray  # int64
+    close_time: np.ndarray  # int64
+    open: np.ndarray  # float64
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    quote_volume: np.ndarray
+    trades_count: np.ndarray  # int64
+
+    @classmethod
+    def from_klines(cls, symbol: str, interval: str, klines: Sequence[Sequence[Any]]) -> "KlinePage":
+        """Parse a Binance klines response ([open_time, open, high, low, close, volume, close_time, quote_volume, trades, ...])"""
+        table = np.array([kline[:9] for kline in klines], dtype=object).reshape(len(klines), 9)
+        prices = table[:, 1:6].astype(np.float64)
+        return cls(
+            symbol=symbol,
+            interval=interval,
+            open_time=table[:, 0].astype(np.int64),
+            close_time=table[:, 6].astype(np.int64),
+            open=prices[:, 0],
+            high=prices[:, 1],
+            low=prices[:, 2],
+            close=prices[:, 3],
+            volume=prices[:, 4],
+            quote_volume=table[:, 7].astype(np.float64),
+            trades_count=table[:, 8].astype(np.int64)
+        )
+
+    def __len__(self) -> int:
+        return len(self.open_time)
+
+    def to_rows(self) -> List[tuple]:
+        """market_data_ohlcv rows for Database.upsert_market_data_rows"""
+        return market_data_rows(
+            self.symbol,
+            self.interval,
+            self.open_time.tolist(),
+            self.open.tolist(),
+            self.high.tolist(),
+            self.low.tolist(),
+            self.close.tolist(),
+            self.volume.tolist(),
+            self.quote_volume.tolist(),
+            self.trades_count.tolist()
+        )
+
+
+class KlineBackfill:
+    """
+    Concurrent, resumable kline backfill
+
+    Args:
+        database: Database with upsert_market_data_rows and backfill checkpoints
+        session: aiohttp session (created once per run if not given)
+        limiter: Shared rate limiter (default: weight-budgeted Binance limiter)
+        concurrency: (symbol, interval) pairs paged in parallel
+        page_limit: Klines per request
+        max_retries: Attempts per page after the first before a pair fails
+    """
+
+    def __init__(
+        self,
+        database,
+        session: Optional[aiohttp.ClientSession] = None,
+        limiter: Optional[RateLimiter] = None,
+        concurrency: int = 4,
+        page_limit: int = KLINES_PAGE_LIMIT,
+        max_retries: int = 5,
+        base_url: Optional[str] = None,
+    ):
+        self.database = database
+        self.session = session
+        self.limiter = limiter or RateLimiter(
+            name="binance_klines",
+            default_rate=20.0,
+            max_rate=50.0,
+            weight_limit=settings.HISTORICAL_BACKFILL_WEIGHT_LIMIT,
+            weight_window=60
+        )
+        self.concurrency = concurrency
+        self.page_limit = page_limit
+        self.max_retries = max_retries
+        self.url = f"{base_url or settings.BINANCE_REST_API_URL}{KLINES_ENDPOINT}"
+        self._slots = asyncio.Semaphore(concurrency)
+        self._own_session = False
+        self.pages_fetched = 0
+        self.rows_written = 0
+        self.pairs_completed = 0
+        self.pairs_failed = 0
+
+    def _ensure_session(self):
+        """Create the engine's session before any page requests fan out"""
+        if self.session is None:
+            self.session = aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=30))
+            self._own_session = True
+
+    async def close(self):
+        """Close the session if the engine created it"""
+        if self._own_session and self.session:
+            await self.session.close()
+            self.session = None
+
+    async def run(
+        self,
+        pairs: Iterable[Tuple[str, str]],
+        start_time: datetime,
+        end_time: Optional[datetime] = None
+    ) -> Dict[str, Dict[str, int]]:
+        """Backfill every (symbol, interval) pair; returns rows written per symbol and interval"""
+        pairs = list(pairs)
+        self._ensure_session()
+        results = await asyncio.gather(
+            *(self.backfill(symbol, interval, start_time, end_time) for symbol, interval in pairs),
+            return_exceptions=True
+        )
+
+        summary: Dict[str, Dict[str, int]] = {}
+        for (symbol, interval), result in zip(pairs, results):
+            if isinstance(result, Exception):
+                logger.error("Kline backfill failed", symbol=symbol, interval=interval, error=str(result))
+                result = 0
+            summary.setdefault(symbol, {})[interval] = result
+        return summary
+
+    async def backfill(
+        self,
+        symbol: str,
+        interval: str,
+        start_time: datetime,
+        end_time: Optional[datetime] = None
+    ) -> int:
+        """
+        Fetch and store one pair's klines from start_time to end_time (default: now)
+
+        Resumes from the pair's checkpoint when its fetched range covers
+        start_time, otherwise starts a new checkpoint at start_time. Returns the
+        number of rows written by this call; raises once a page keeps failing
+        (progress up to that page is kept in the checkpoint).
+        """
+        self._ensure_session()
+        async with self._slots:
+            start_ms = _to_ms(start_time)
+            end_ms = _to_ms(end_time or datetime.now(timezone.utc))
+
+            checkpoint = await self.database.get_backfill_checkpoint(symbol, interval)
+            if checkpoint and checkpoint['start_time'] <= start_ms <= checkpoint['next_time']:
+                next_ms = checkpoint['next_time']
+            else:
+                next_ms = start_ms
+                checkpoint = {'symbol': symbol, 'interval': interval, 'start_time': start_ms,
+                              'next_time': start_ms, 'rows_written': 0}
+            checkpoint['end_time'] = end_ms
+            checkpoint['completed'] = False
+
+            logger.info("Starting kline backfill",
+                        symbol=symbol,
+                        interval=interval,
+                        start_time=next_ms,
+                        end_time=end_ms,
+                        resumed=next_ms > start_ms)
+
+            rows = 0
+            try:
+                while next_ms <= end_ms:
+                    klines = await self._fetch_page(symbol, interval, next_ms, end_ms)
+                    if not klines:
+                        break
+                    page = KlinePage.from_klines(symbol, interval, klines)
+                    written = await self.database.upsert_market_data_rows(page.to_rows())
+                    rows += written
+                    self.pages_fetched += 1
+                    self.rows_written += written
+                    kline_backfill_pages.labels(interval).inc()
+                    kline_backfill_rows.labels(interval).inc(written)
+
+                    last_close = int(page.close_time[-1])
+                    in_progress = last_close >= int(time.time() * 1000)
+                    # A kline that has not closed yet is fetched again by the next run
+                    next_ms = int(page.open_time[-1]) if in_progress else last_close + 1
+                    checkpoint['next_time'] = next_ms
+                    checkpoint['rows_written'] += written
+                    await self.database.save_backfill_checkpoint(checkpoint)
+                    if in_progress or len(page) < self.page_limit:
+                        break
+            except Exception:
+                self.pairs_failed += 1
+                raise
+
+            checkpoint['completed'] = True
+            await self.database.save_backfill_checkpoint(checkpoint)
+            self.pairs_completed += 1
+            logger.info("Kline backfill completed", symbol=symbol, interval=interval, rows_written=rows)
+            return rows
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            'concurrency': self.concurrency,
+            'pages_fetched': self.pages_fetched,
+            'rows_written': self.rows_written,
+            'pairs_completed': self.pairs_completed,
+            'pairs_failed': self.pairs_failed,
+            'limiter': self.limiter.get_stats()
+        }
+
+    async def _fetch_page(self, symbol: str, interval: str, start_ms: int, end_ms: int) -> List[List[Any]]:
+        """One klines request, retried on rate limits, server errors, network errors and timeouts"""
+        params = {
+            "symbol": symbol,
+            "interval": interval,
+            "startTime": start_ms,
+            "endTime": end_ms,
+            "limit": self.page_limit
+        }
+        error = None
+        for attempt in range(self.max_retries + 1):
+            await self.limiter.wait(KLINES_ENDPOINT, weight=KLINES_REQUEST_WEIGHT)
+            try:
+                async with self.session.get(self.url, params=params) as response:
+                    self.limiter.parse_rate_limit_headers(response.headers, KLINES_ENDPOINT)
+                    if response.status == 200:
+                        return await response.json()
+                    if response.status in (418, 429):
+                        # 418: IP banned after ignoring 429s; Retry-After says for how long
+                        retry_after = response.headers.get('Retry-After')
+                        self.limiter.record_429(KLINES_ENDPOINT, int(retry_after) if retry_after else None)
+                        kline_backfill_retries.labels('rate_limited').inc()
+                        error = f"rate limited ({response.status})"
+                        continue
+                    error = f"{response.status}: {await response.text()}"
+                    if response.status < 500:
+                        raise Exception(f"API request failed: {error}")
+            except aiohttp.ClientError as e:
+                error = f"network error: {e}"
+            except asyncio.TimeoutError:
+                # The session's ClientTimeout expired (not a ClientError)
+                error = "request timed out"
+
+            kline_backfill_retries.labels('error').inc()
+            logger.warning("Kline page request failed, retrying",
+                           symbol=symbol,
+                           interval=interval,
+                           attempt=attempt + 1,
+                           error=error)
+            await asyncio.sleep(min(2 ** attempt, 30))
+
+        raise Exception(f"API request failed after {self.max_retries + 1} attempts: {error}")
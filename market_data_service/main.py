@@ -16,7 +16,8 @@ import signal
 import sys
 import websockets
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional
+from functools import partial
+from typing import Dict, List, Optional, Tuple
 
 import aio_pika
 from binance import AsyncClient, BinanceSocketManager
@@ -34,14 +35,19 @@ if USE_MOCK:
 else:
     from database import Database
 
-from models import MarketData, OrderBookData, TradeData
+from models import MarketData, TradeBar, TradeData
+from binance_stream_pool import BinanceStreamPool
+from ingest_pipeline import DropPolicy, IngestPipeline, StageConfig
 from signal_aggregator import SignalAggregator
+from trade_aggregator import TradeAggregator, TradeSpool
+from order_book_engine import OrderBookEngine
 
 # Import Redis cache manager
 import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from shared.redis_client import RedisCacheManager
+from shared.rabbitmq_publisher import BatchedPublisher, OutgoingMessage
 
 # Import components with fallback to mock versions
 try:
@@ -130,10 +136,26 @@ class MarketDataService:
         self.websocket_connections: Dict[str, websockets.WebSocketServerProtocol] = {}
         self.websocket_streams = {}
         
+        # Real-time streams multiplexed over combined-stream connections
+        self.stream_pool: Optional[BinanceStreamPool] = None
+        self.realtime_streams: Dict[str, Tuple[str, str]] = {}  # stream name -> (symbol, stream type)
+        
+        # Trades are rolled into bars; only bars are persisted (raw trades optionally spooled)
+        self.trade_aggregator = TradeAggregator(settings.TRADE_BAR_INTERVALS, settings.TRADE_BAR_GRACE_MS)
+        self.trade_spool = TradeSpool(settings.TRADE_SPOOL_DIR) if settings.TRADE_SPOOL_ENABLED else None
+        self.trade_bar_task: Optional[asyncio.Task] = None
+        
+        # Local L2 books kept in sync with diff-depth streams
+        self.order_books: Dict[str, OrderBookEngine] = {}
+        
+        # Receive loops only parse and enqueue; writer tasks batch database writes and publishes
+        self.ingest_pipeline = self._create_ingest_pipeline()
+        
         # RabbitMQ
         self.rabbitmq_connection: Optional[aio_pika.Connection] = None
         self.rabbitmq_channel: Optional[aio_pika.Channel] = None
         self.exchanges: Dict[str, aio_pika.Exchange] = {}
+        self.market_publisher: Optional[BatchedPublisher] = None
         
         # Configuration
         self.symbols: List[str] = []  # Will be loaded from database
@@ -311,7 +333,9 @@ class MarketDataService:
                     self.signal_aggregator = SignalAggregator(
                         database=self.database,
                         rabbitmq_channel=self.rabbitmq_channel,
-                        redis_cache=self.redis_cache
+                        redis_cache=self.redis_cache,
+                        max_concurrency=settings.SIGNAL_AGGREGATION_MAX_CONCURRENCY,
+                        set_based_queries=settings.SIGNAL_AGGREGATION_SET_BASED_QUERIES
                     )
                     logger.info("Signal aggregator initialized")
                 except Exception as e:
@@ -332,12 +356,87 @@ class MarketDataService:
             await self.strategy_request_handler.initialize()
             logger.info("Strategy request handler initialized")
             
+            self.ingest_pipeline.start()
+            self.trade_bar_task = asyncio.create_task(self._close_expired_trade_bars())
+            
             logger.info("Market data service initialized successfully")
             
         except Exception as e:
             logger.error("Failed to initialize service", error=str(e))
             raise
             
+    def _create_ingest_pipeline(self) -> IngestPipeline:
+        """Database writer and publisher stages per stream type"""
+        pipeline = IngestPipeline()
+        database_writers = {
+            'kline': 'upsert_market_data_batch',
+            'trade': None,  # Published only; aggregated into trade bars for storage
+            'trade_bar': 'insert_trade_bars_batch',
+            'orderbook': 'insert_orderbook_data_batch',
+            'ticker': None  # Published only
+        }
+        
+        for stream_type, writer in database_writers.items():
+            config = StageConfig(
+                max_queue_size=settings.INGEST_QUEUE_SIZE,
+                batch_size=settings.INGEST_BATCH_SIZE,
+                flush_interval_ms=settings.INGEST_FLUSH_INTERVAL_MS,
+                drop_policy=DropPolicy(settings.INGEST_DROP_POLICIES.get(stream_type, DropPolicy.BLOCK.value))
+            )
+            if writer:
+                pipeline.add_stage(f"{stream_type}_db", partial(self._write_batch, writer), config)
+            pipeline.add_stage(f"{stream_type}_publish", self._publish_batch, config)
+        
+        if self.trade_spool:
+            pipeline.add_stage('trade_spool', self._spool_trades, StageConfig(
+                max_queue_size=settings.INGEST_QUEUE_SIZE,
+                batch_size=settings.INGEST_BATCH_SIZE,
+                flush_interval_ms=settings.INGEST_FLUSH_INTERVAL_MS,
+                drop_policy=DropPolicy(settings.INGEST_DROP_POLICIES.get('trade', DropPolicy.BLOCK.value))
+            ))
+        
+        return pipeline
+    
+    async def _write_batch(self, writer: str, batch: List):
+        """Database sink for an ingest stage"""
+        try:
+            await getattr(self.database, writer)(batch)
+            database_operations.labels(operation=writer, status='success').inc()
+        except Exception:
+            database_operations.labels(operation=writer, status='error').inc()
+            raise
+    
+    async def _publish_batch(self, batch: List[Tuple[str, Dict, Optional[str]]]):
+        """Publisher sink for an ingest stage: (routing key, data, data type) items"""
+        if not self.market_publisher:
+            return
+        await self.market_publisher.publish_batch([
+            self._market_message(routing_key, data, data_type) for routing_key, data, data_type in batch
+        ])
+    
+    async def _spool_trades(self, batch: List[TradeData]):
+        """Spool sink: append raw trades to the compressed trade spool off the event loop"""
+        await asyncio.to_thread(self.trade_spool.write, batch)
+    
+    async def _submit_trade_bars(self, bars: List[TradeBar]):
+        """Queue closed trade bars for storage and publishing"""
+        for bar in bars:
+            await self.ingest_pipeline.submit('trade_bar_db', bar)
+            await self.ingest_pipeline.submit(
+                'trade_bar_publish', ('market.data.trade_bar', bar.model_dump(), None)
+            )
+    
+    async def _close_expired_trade_bars(self):
+        """Close trade bars of symbols that stopped trading once their interval has passed"""
+        while True:
+            try:
+                await asyncio.sleep(1)
+                await self._submit_trade_bars(self.trade_aggregator.flush_expired())
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error("Error closing expired trade bars", error=str(e))
+    
     async def _load_symbols_from_database(self):
         """Load symbols with tracking=true from database"""
         try:
@@ -385,11 +484,14 @@ class MarketDataService:
         
         if added_symbols:
             logger.info(f"New symbols added: {', '.join(added_symbols)}")
-            # TODO: Start data collection for new symbols
+            # TODO: Start historical data collection for new symbols
+            if self.stream_pool and self.stream_pool.running:
+                await self._subscribe_realtime_streams(sorted(added_symbols))
             
         if removed_symbols:
             logger.info(f"Symbols removed: {', '.join(removed_symbols)}")
-            # TODO: Stop data collection for removed symbols
+            if self.stream_pool and self.stream_pool.running:
+                await self._unsubscribe_realtime_streams(sorted(removed_symbols))
             
         return {
             "added": list(added_symbols),
@@ -413,6 +515,17 @@ class MarketDataService:
                 'mastertrade.market', aio_pika.ExchangeType.TOPIC, durable=True
             )
             
+            # Publisher confirms are awaited per batch on the shared channel
+            self.market_publisher = BatchedPublisher(
+                self.exchanges['market'],
+                content_type=settings.RABBITMQ_CONTENT_TYPE,
+                max_batch_size=settings.RABBITMQ_PUBLISH_BATCH_SIZE,
+                flush_interval_ms=settings.RABBITMQ_PUBLISH_FLUSH_INTERVAL_MS,
+                messages_counter=rabbitmq_messages,
+                name='market'
+            )
+            self.market_publisher.start()
+            
             logger.info("RabbitMQ initialized successfully")
             
         except Exception as e:
@@ -555,7 +668,8 @@ class MarketDataService:
         """Handle order book WebSocket stream"""
         socket = None
         try:
-            socket = self.socket_manager.depth_socket(symbol, depth=20)
+            # Diff-depth stream; the local book publishes top-level deltas
+            socket = self.socket_manager.depth_socket(symbol, interval=settings.ORDERBOOK_UPDATE_SPEED_MS)
             
             async with socket as stream:
                 logger.info(f"Started order book stream for {symbol}")
@@ -596,15 +710,14 @@ class MarketDataService:
             
             # Store in database (only closed candles)
             if kline_data['x']:  # Is kline closed
-                await self.database.insert_market_data(market_data)
-                database_operations.labels(operation='insert_market_data', status='success').inc()
+                self._update_streaming_indicators(market_data.symbol, market_data.interval, kline_data)
+                await self.ingest_pipeline.submit('kline_db', market_data)
             
             # Publish to RabbitMQ
-            await self._publish_market_data('market.data.kline', market_data.model_dump())
+            await self.ingest_pipeline.submit('kline_publish', ('market.data.kline', market_data.model_dump(), None))
             
         except Exception as e:
             logger.error("Error processing kline data", error=str(e), data=msg)
-            database_operations.labels(operation='insert_market_data', status='error').inc()
     
     @message_processing_time.time()
     async def _process_trade_data(self, msg: dict):
@@ -618,104 +731,86 @@ class MarketDataService:
                 is_buyer_maker=msg['m']
             )
             
-            # Store in database
-            await self.database.insert_trade_data(trade_data)
-
-            # Initialize Binance socket manager
-            try:
-                await self._init_socket_manager()
-                logger.info("Binance socket manager initialized")
-            except Exception as e:
-                logger.warning("Failed to initialize Binance socket manager", error=str(e))
-            database_operations.labels(operation='insert_trade_data', status='success').inc()
+            # Store the bars this trade closed; raw trades are only spooled
+            await self._submit_trade_bars(self.trade_aggregator.add_trade(trade_data))
+            if self.trade_spool:
+                await self.ingest_pipeline.submit('trade_spool', trade_data)
             
             # Publish to RabbitMQ
-            await self._publish_market_data('market.data.trade', trade_data.model_dump())
+            await self.ingest_pipeline.submit('trade_publish', ('market.data.trade', trade_data.model_dump(), None))
             
         except Exception as e:
             logger.error("Error processing trade data", error=str(e), data=msg)
-            database_operations.labels(operation='insert_trade_data', status='error').inc()
     
     @message_processing_time.time()
     async def _process_orderbook_data(self, msg: dict):
-        """Process order book data"""
+        """Apply a diff-depth event to the symbol's local order book"""
         try:
-            orderbook_data = OrderBookData(
-                symbol=msg['s'],
-                timestamp=datetime.fromtimestamp(msg['E'] / 1000, tz=timezone.utc),
-                bids=msg['b'],
-                asks=msg['a']
-            )
+            book = self._order_book(msg['s'])
+            delta = await book.apply_event(msg)
             
-            # Store in database (sample every 10 updates)
-            import random
-            if random.randint(1, 10) == 1:
-                await self.database.insert_orderbook_data(orderbook_data)
-                database_operations.labels(operation='insert_orderbook_data', status='success').inc()
+            # Publish changes to the top levels for real-time processing
+            if delta:
+                await self.ingest_pipeline.submit(
+                    'orderbook_publish', ('market.data.orderbook', delta.to_message(), None)
+                )
             
-            # Always publish to RabbitMQ for real-time processing
-            await self._publish_market_data('market.data.orderbook', orderbook_data.model_dump())
+            # Store snapshots on a fixed interval and after every resync
+            if book.snapshot_due():
+                await self.ingest_pipeline.submit(
+                    'orderbook_db', book.take_snapshot(settings.ORDERBOOK_PERSIST_LEVELS)
+                )
             
         except Exception as e:
             logger.error("Error processing order book data", error=str(e), data=msg)
-            database_operations.labels(operation='insert_orderbook_data', status='error').inc()
+    
+    def _order_book(self, symbol: str) -> OrderBookEngine:
+        book = self.order_books.get(symbol)
+        if book is None:
+            book = self.order_books[symbol] = OrderBookEngine(
+                symbol,
+                self._fetch_depth_snapshot,
+                depth=settings.ORDERBOOK_SNAPSHOT_DEPTH,
+                top_n=settings.ORDERBOOK_TOP_LEVELS,
+                snapshot_interval=settings.ORDERBOOK_SNAPSHOT_INTERVAL
+            )
+        return book
+    
+    async def _fetch_depth_snapshot(self, symbol: str, depth: int) -> Dict:
+        """REST depth snapshot used to (re)synchronise a local order book"""
+        return await self.binance_client.get_order_book(symbol=symbol, limit=depth)
+    
+    def _market_message(self, routing_key: str, data: dict, data_type: Optional[str] = None) -> OutgoingMessage:
+        """Market exchange message; with a data type the data is wrapped in the service envelope"""
+        if data_type is None:
+            return OutgoingMessage(routing_key, data)
+        
+        # Add metadata to all messages
+        enriched_data = {
+            "data_type": data_type,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+            "source": "market_data_service",
+            "data": data
+        }
+        headers = {
+            "data_type": data_type,
+            "source": "market_data_service"
+        }
+        return OutgoingMessage(routing_key, enriched_data, headers)
     
     async def _publish_market_data(self, routing_key: str, data: dict):
         """Publish market data to RabbitMQ"""
-        try:
-            if not self.exchanges.get('market'):
-                return
-                
-            message = aio_pika.Message(
-                json.dumps(data, default=str).encode(),
-                content_type='application/json',
-                timestamp=datetime.now(timezone.utc)
-            )
-            
-            await self.exchanges['market'].publish(
-                message, routing_key=routing_key
-            )
-            
-            rabbitmq_messages.labels(exchange='market', status='success').inc()
-            
-        except Exception as e:
-            logger.error("Error publishing to RabbitMQ", error=str(e), routing_key=routing_key)
-            rabbitmq_messages.labels(exchange='market', status='error').inc()
+        if not self.market_publisher:
+            return
+        await self.market_publisher.publish(routing_key, data)
     
     async def _publish_to_rabbitmq(self, data_type: str, data: dict, routing_key: str):
         """Enhanced RabbitMQ publisher for all data types"""
-        try:
-            if not self.exchanges.get('market'):
-                return
-                
-            # Add metadata to all messages
-            enriched_data = {
-                "data_type": data_type,
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-                "source": "market_data_service",
-                "data": data
-            }
-                
-            message = aio_pika.Message(
-                json.dumps(enriched_data, default=str).encode(),
-                content_type='application/json',
-                timestamp=datetime.now(timezone.utc),
-                headers={
-                    "data_type": data_type,
-                    "source": "market_data_service"
-                }
-            )
-            
-            await self.exchanges['market'].publish(
-                message, routing_key=routing_key
-            )
-            
-            rabbitmq_messages.labels(exchange='market', status='success').inc()
-            logger.debug(f"Published {data_type} data to RabbitMQ", routing_key=routing_key)
-            
-        except Exception as e:
-            logger.error(f"Error publishing {data_type} to RabbitMQ", error=str(e), routing_key=routing_key)
-            rabbitmq_messages.labels(exchange='market', status='error').inc()
+        if not self.market_publisher:
+            return
+        message = self._market_message(routing_key, data, data_type)
+        await self.market_publisher.publish(message.routing_key, message.body, message.headers)
+        logger.debug(f"Published {data_type} data to RabbitMQ", routing_key=routing_key)
     
     async def start_enhanced_features(self):
         """Start enhanced features: historical data collection, real-time streams, and sentiment analysis"""
@@ -824,90 +919,70 @@ class MarketDataService:
                 logger.warning("Binance socket manager not initialized; skipping real-time stream startup")
                 return
             
-            for symbol in self.symbols:
-                # Create WebSocket streams for each symbol
-                kline_task = asyncio.create_task(self._handle_binance_websocket(symbol, "kline"))
-                ticker_task = asyncio.create_task(self._handle_binance_websocket(symbol, "ticker"))
-                
-                self.websocket_tasks.extend([kline_task, ticker_task])
-                
-                # Small delay between symbols
-                await asyncio.sleep(0.1)
-                
-            websocket_connections.set(len(self.websocket_tasks))
-            logger.info(f"Started {len(self.websocket_tasks)} real-time streams")
+            self.stream_pool = BinanceStreamPool(
+                settings.BINANCE_COMBINED_STREAM_URL,
+                self._handle_combined_stream_message,
+                max_streams_per_connection=settings.WS_MAX_STREAMS_PER_CONNECTION,
+                ping_interval=settings.WS_PING_INTERVAL,
+                reconnect_interval=settings.WS_RECONNECT_INTERVAL,
+                max_reconnect_attempts=settings.WS_MAX_RECONNECT_ATTEMPTS
+            )
+            await self._subscribe_realtime_streams(self.symbols)
+            logger.info(f"Started {len(self.realtime_streams)} real-time streams",
+                        connections=self.stream_pool.connection_count)
             
-            # Wait for all WebSocket tasks
-            await asyncio.gather(*self.websocket_tasks, return_exceptions=True)
+            # Streams run on the pool's connections until the service stops
+            await self.stream_pool.wait_closed()
             
+        except asyncio.CancelledError:
+            raise
         except Exception as e:
             logger.error("Error starting real-time streams", error=str(e))
+        finally:
+            if self.stream_pool:
+                await self.stream_pool.close()
+                websocket_connections.set(0)
             
-    async def _handle_binance_websocket(self, symbol: str, stream_type: str):
-        """Handle individual Binance WebSocket connection"""
-        reconnect_attempts = 0
-        max_attempts = settings.WS_MAX_RECONNECT_ATTEMPTS
-        
-        while self.running and reconnect_attempts < max_attempts:
-            try:
-                # Construct WebSocket URL
-                stream_name = f"{symbol.lower()}@{stream_type}_1m" if stream_type == "kline" else f"{symbol.lower()}@ticker"
-                ws_url = f"{settings.BINANCE_WSS_URL}{stream_name}"
-                
-                logger.info(f"Connecting to {stream_type} stream for {symbol}")
-                
-                async with websockets.connect(ws_url) as websocket:
-                    reconnect_attempts = 0  # Reset on successful connection
-                    
-                    # Send ping periodically
-                    ping_task = asyncio.create_task(self._send_websocket_ping(websocket))
-                    
-                    try:
-                        while self.running:
-                            try:
-                                # Set a timeout for receiving messages
-                                message = await asyncio.wait_for(
-                                    websocket.recv(), 
-                                    timeout=settings.WS_PING_INTERVAL
-                                )
-                                
-                                data = json.loads(message)
-                                await self._process_websocket_message(symbol, stream_type, data)
-                                market_data_messages.labels(symbol=symbol, type=stream_type).inc()
-                                
-                            except asyncio.TimeoutError:
-                                logger.debug(f"WebSocket timeout for {symbol} {stream_type}")
-                                continue
-                            except websockets.exceptions.ConnectionClosed:
-                                logger.warning(f"WebSocket connection closed for {symbol} {stream_type}")
-                                break
-                            except Exception as e:
-                                logger.error(f"Error processing WebSocket message for {symbol}", error=str(e))
-                                
-                    finally:
-                        ping_task.cancel()
-                        
-            except Exception as e:
-                reconnect_attempts += 1
-                logger.error(
-                    f"WebSocket connection failed for {symbol} {stream_type}",
-                    error=str(e),
-                    attempt=reconnect_attempts
-                )
-                
-                if reconnect_attempts < max_attempts:
-                    await asyncio.sleep(settings.WS_RECONNECT_INTERVAL * reconnect_attempts)
-                    
-        logger.warning(f"Max reconnection attempts reached for {symbol} {stream_type}")
-        
-    async def _send_websocket_ping(self, websocket):
-        """Send periodic ping to keep WebSocket alive"""
-        try:
-            while self.running:
-                await asyncio.sleep(settings.WS_PING_INTERVAL)
-                await websocket.ping()
-        except Exception as e:
-            logger.debug("WebSocket ping error", error=str(e))
+    def _realtime_stream_names(self, symbol: str) -> Dict[str, str]:
+        """Binance stream names for a symbol's real-time streams, mapped to their stream type"""
+        symbol_lower = symbol.lower()
+        return {
+            f"{symbol_lower}@kline_1m": "kline",
+            f"{symbol_lower}@ticker": "ticker",
+            f"{symbol_lower}@trade": "trade",
+            f"{symbol_lower}@depth@{settings.ORDERBOOK_UPDATE_SPEED_MS}ms": "orderbook"
+        }
+    
+    async def _subscribe_realtime_streams(self, symbols: List[str]):
+        """Add symbols' real-time streams to the combined-stream pool"""
+        streams = {}
+        for symbol in symbols:
+            for stream_name, stream_type in self._realtime_stream_names(symbol).items():
+                streams[stream_name] = (symbol, stream_type)
+        self.realtime_streams.update(streams)
+        await self.stream_pool.subscribe(streams)
+        websocket_connections.set(self.stream_pool.connection_count)
+    
+    async def _unsubscribe_realtime_streams(self, symbols: List[str]):
+        """Remove symbols' real-time streams from the combined-stream pool"""
+        stream_names = [name for symbol in symbols for name in self._realtime_stream_names(symbol)]
+        await self.stream_pool.unsubscribe(stream_names)
+        for stream_name in stream_names:
+            self.realtime_streams.pop(stream_name, None)
+        for symbol in symbols:
+            book = self.order_books.pop(symbol, None)
+            if book:
+                await book.close()
+        websocket_connections.set(self.stream_pool.connection_count)
+    
+    async def _handle_combined_stream_message(self, stream_name: str, data: Dict):
+        """Demultiplex a combined-stream message to its symbol and stream type"""
+        stream = self.realtime_streams.get(stream_name)
+        if stream is None:
+            return  # Late message for an unsubscribed stream
+        symbol, stream_type = stream
+        await self._process_websocket_message(symbol, stream_type, data)
+        market_data_messages.labels(symbol=symbol, type=stream_type).inc()
             
     async def _process_websocket_message(self, symbol: str, stream_type: str, data: Dict):
         """Process incoming WebSocket message"""
@@ -917,6 +992,10 @@ class MarketDataService:
                     await self._process_kline_websocket_data(symbol, data["k"])
                 elif stream_type == "ticker":
                     await self._process_ticker_websocket_data(symbol, data)
+                elif stream_type == "trade":
+                    await self._process_trade_data(data)
+                elif stream_type == "orderbook":
+                    await self._process_orderbook_data(data)
                     
         except Exception as e:
             logger.error(f"Error processing {stream_type} data for {symbol}", error=str(e))
@@ -946,17 +1025,35 @@ class MarketDataService:
                     "created_at": datetime.utcnow().isoformat() + "Z"
                 }
                 
+                self._update_streaming_indicators(symbol, "1m", kline_data)
+                
                 # Store in database
-                await self.database.upsert_market_data(market_data_item)
-                database_operations.labels(operation='upsert', status='success').inc()
+                await self.ingest_pipeline.submit('kline_db', market_data_item)
                 
                 # Publish to RabbitMQ
-                await self._publish_to_rabbitmq("market_data", market_data_item, f"market.{symbol}.kline")
+                await self.ingest_pipeline.submit(
+                    'kline_publish', (f"market.{symbol}.kline", market_data_item, "market_data")
+                )
                 
         except Exception as e:
-            database_operations.labels(operation='upsert', status='error').inc()
             logger.error(f"Error processing kline data for {symbol}", error=str(e))
             
+    def _update_streaming_indicators(self, symbol: str, interval: str, kline_data: Dict):
+        """Advance subscribed streaming indicators with a closed kline"""
+        if not hasattr(self.indicator_calculator, 'on_closed_kline'):
+            return
+        try:
+            self.indicator_calculator.on_closed_kline(
+                symbol,
+                interval,
+                datetime.fromtimestamp(kline_data['t'] / 1000, tz=timezone.utc),
+                float(kline_data['h']),
+                float(kline_data['l']),
+                float(kline_data['c'])
+            )
+        except Exception as e:
+            logger.error("Error updating streaming indicators", symbol=symbol, error=str(e))
+            
     async def _process_ticker_websocket_data(self, symbol: str, ticker_data: Dict):
         """Process ticker data from WebSocket"""
         try:
@@ -972,7 +1069,7 @@ class MarketDataService:
             }
             
             # Publish ticker updates to RabbitMQ for real-time consumption
-            await self._publish_to_rabbitmq("ticker_updates", ticker_item, f"ticker.{symbol}")
+            await self.ingest_pipeline.submit('ticker_publish', (f"ticker.{symbol}", ticker_item, "ticker_updates"))
             
         except Exception as e:
             logger.error(f"Error processing ticker data for {symbol}", error=str(e))
@@ -1454,6 +1551,15 @@ class MarketDataService:
         if all_tasks:
             await asyncio.gather(*all_tasks, return_exceptions=True)
         
+        # Store partially filled trade bars, then flush queued market data
+        # while the database and RabbitMQ are still open
+        if self.trade_bar_task:
+            self.trade_bar_task.cancel()
+            await asyncio.gather(self.trade_bar_task, return_exceptions=True)
+        await self._submit_trade_bars(self.trade_aggregator.flush_all())
+        await asyncio.gather(*(book.close() for book in self.order_books.values()), return_exceptions=True)
+        await self.ingest_pipeline.stop(settings.INGEST_DRAIN_TIMEOUT)
+        
         # Stop indicator system
         if hasattr(self, 'indicator_config_manager') and self.indicator_config_manager:
             await self.indicator_config_manager.stop_processing()
@@ -1510,6 +1616,9 @@ class MarketDataService:
             self.binance_client = None
         
         # Close connections
+        if self.market_publisher:
+            await self.market_publisher.stop()
+        
         if self.rabbitmq_connection and not self.rabbitmq_connection.is_closed:
             await self.rabbitmq_connection.close()
         
@@ -1544,7 +1653,11 @@ async def get_cache_stats(request):
                 'cache_misses': service.cache_misses,
                 'hit_rate': service.cache_hits / (service.cache_hits + service.cache_misses) if (service.cache_hits + service.cache_misses) > 0 else 0.0
             },
-            'redis_connected': service.redis_cache is not None and service.redis_cache._connected if service.redis_cache else False
+            'redis_connected': service.redis_cache is not None and service.redis_cache._connected if service.redis_cache else False,
+            'ingest_pipeline': service.ingest_pipeline.statistics(),
+            'trade_aggregator': service.trade_aggregator.statistics(),
+            'order_books': {symbol: book.statistics() for symbol, book in service.order_books.items()},
+            'rabbitmq_publisher': service.market_publisher.statistics() if service.market_publisher else None
         }
         
         # Add collector stats if available
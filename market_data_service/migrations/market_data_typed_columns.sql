@@ -0,0 +1,164 @@
+-- Market Data Typed Columns Migration (online, phase 1 of 2)
+--
+-- Moves kline documents from the JSONB market_data table into the typed
+-- market_data_ohlcv table without blocking readers or writers:
+-- 1. Creates market_data_ohlcv with its (symbol, interval, ts) index
+-- 2. Mirrors every write to the JSONB table into market_data_ohlcv (trigger)
+-- 3. Backfills existing documents in committed batches (keyset on id)
+--
+-- Run in autocommit mode (the backfill procedure commits per batch):
+--   psql -f market_data_service/migrations/market_data_typed_columns.sql
+-- Safe to re-run. Once the backfill has finished and every market data
+-- writer runs the typed-column Database code, run
+-- market_data_typed_columns_cutover.sql to replace the JSONB table with
+-- the compatibility view.
+
+\set ON_ERROR_STOP on
+
+DO $$
+BEGIN
+    IF (SELECT relkind FROM pg_class WHERE oid = to_regclass('market_data')) IS DISTINCT FROM 'r' THEN
+        RAISE EXCEPTION 'market_data is not a JSONB document table; nothing to migrate';
+    END IF;
+END
+$$;
+
+-- =====================================================
+-- Table: market_data_ohlcv
+-- Typed klines; same definition as Database._create_tables
+-- =====================================================
+
+CREATE TABLE IF NOT EXISTS market_data_ohlcv (
+    id TEXT PRIMARY KEY,                          -- {symbol}_{interval}_{epoch seconds}
+    partition_key TEXT NOT NULL,
+    symbol TEXT NOT NULL,
+    interval TEXT NOT NULL,
+    ts TIMESTAMPTZ NOT NULL,                      -- Candle open time
+    open_price DOUBLE PRECISION,
+    high_price DOUBLE PRECISION,
+    low_price DOUBLE PRECISION,
+    close_price DOUBLE PRECISION,
+    volume DOUBLE PRECISION,
+    quote_volume DOUBLE PRECISION,
+    trades_count BIGINT,
+    asset_type TEXT NOT NULL DEFAULT 'crypto',
+    extra JSONB NOT NULL DEFAULT '{}'::jsonb,     -- Document fields without a typed column
+    created_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    ttl_seconds INTEGER
+);
+
+CREATE INDEX IF NOT EXISTS idx_market_data_ohlcv_symbol_interval_ts
+    ON market_data_ohlcv (symbol, interval, ts);
+CREATE INDEX IF NOT EXISTS idx_market_data_ohlcv_asset_type_ts
+    ON market_data_ohlcv (asset_type, ts);
+
+COMMENT ON TABLE market_data_ohlcv IS 'Typed OHLCV klines; market_data is a JSON view over this table after cutover';
+COMMENT ON COLUMN market_data_ohlcv.extra IS 'Original document fields that have no typed column';
+
+-- =====================================================
+-- Document -> typed row conversion
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION market_data_document_row(doc market_data)
+RETURNS market_data_ohlcv AS $$
+    SELECT
+        doc.id,
+        doc.partition_key,
+        COALESCE(doc.data->>'symbol', doc.partition_key),
+        COALESCE(doc.data->>'interval', '1m'),
+        COALESCE((doc.data->>'timestamp')::timestamptz, doc.created_at),
+        (doc.data->>'open_price')::double precision,
+        (doc.data->>'high_price')::double precision,
+        (doc.data->>'low_price')::double precision,
+        (doc.data->>'close_price')::double precision,
+        (doc.data->>'volume')::double precision,
+        (doc.data->>'quote_volume')::double precision,
+        (doc.data->>'trades_count')::numeric::bigint,
+        COALESCE(doc.data->>'asset_type', 'crypto'),
+        doc.data - ARRAY[
+            'id', 'symbol', 'interval', 'timestamp', 'open_price', 'high_price', 'low_price',
+            'close_price', 'volume', 'quote_volume', 'trades_count', 'asset_type'
+        ],
+        doc.created_at,
+        doc.updated_at,
+        doc.ttl_seconds
+$$ LANGUAGE sql STABLE;
+
+-- =====================================================
+-- Dual write: mirror JSONB writes while the backfill runs
+-- =====================================================
+
+CREATE OR REPLACE FUNCTION mirror_market_data_to_ohlcv()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'DELETE' THEN
+        DELETE FROM market_data_ohlcv WHERE id = OLD.id;
+        RETURN OLD;
+    END IF;
+
+    INSERT INTO market_data_ohlcv
+    SELECT row.* FROM market_data_document_row(NEW) AS row
+    ON CONFLICT (id) DO UPDATE SET
+        partition_key = EXCLUDED.partition_key,
+        symbol = EXCLUDED.symbol,
+        interval = EXCLUDED.interval,
+        ts = EXCLUDED.ts,
+        open_price = EXCLUDED.open_price,
+        high_price = EXCLUDED.high_price,
+        low_price = EXCLUDED.low_price,
+        close_price = EXCLUDED.close_price,
+        volume = EXCLUDED.volume,
+        quote_volume = EXCLUDED.quote_volume,
+        trades_count = EXCLUDED.trades_count,
+        asset_type = EXCLUDED.asset_type,
+        extra = EXCLUDED.extra,
+        updated_at = EXCLUDED.updated_at,
+        ttl_seconds = EXCLUDED.ttl_seconds;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS trigger_mirror_market_data_to_ohlcv ON market_data;
+CREATE TRIGGER trigger_mirror_market_data_to_ohlcv
+    AFTER INSERT OR UPDATE OR DELETE ON market_data
+    FOR EACH ROW
+    EXECUTE FUNCTION mirror_market_data_to_ohlcv();
+
+-- =====================================================
+-- Backfill in committed batches
+-- Rows already mirrored by the trigger are at least as new as the
+-- backfill's snapshot, so conflicts are left untouched.
+-- =====================================================
+
+CREATE OR REPLACE PROCEDURE backfill_market_data_ohlcv(batch_size INTEGER DEFAULT 5000)
+LANGUAGE plpgsql AS $$
+DECLARE
+    last_id TEXT := '';
+    page_end TEXT;
+    page_rows BIGINT;
+    total_rows BIGINT := 0;
+BEGIN
+    LOOP
+        SELECT max(page.id) INTO page_end
+        FROM (
+            SELECT id FROM market_data WHERE id > last_id ORDER BY id LIMIT batch_size
+        ) AS page;
+        EXIT WHEN page_end IS NULL;
+
+        INSERT INTO market_data_ohlcv
+        SELECT row.*
+        FROM market_data AS doc, market_data_document_row(doc) AS row
+        WHERE doc.id > last_id AND doc.id <= page_end
+        ON CONFLICT (id) DO NOTHING;
+        GET DIAGNOSTICS page_rows = ROW_COUNT;
+
+        total_rows := total_rows + page_rows;
+        last_id := page_end;
+        COMMIT;
+        RAISE NOTICE 'market_data_ohlcv backfill: % rows copied (through id %)', total_rows, last_id;
+    END LOOP;
+END;
+$$;
+
+CALL backfill_market_data_ohlcv(5000);
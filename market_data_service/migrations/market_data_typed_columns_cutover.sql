@@ -0,0 +1,63 @@
+-- Market Data Typed Columns Migration (cutover, phase 2 of 2)
+--
+-- Run after market_data_typed_columns.sql has finished and every market
+-- data writer uses market_data_ohlcv:
+--   psql -f market_data_service/migrations/market_data_typed_columns_cutover.sql
+--
+-- In one short transaction:
+-- 1. Copies any document the backfill has not seen yet
+-- 2. Renames the JSONB table to market_data_legacy and drops the mirror trigger
+-- 3. Creates the market_data compatibility view, so readers that select
+--    data->>'...' from market_data keep working
+--
+-- Writers to market_data_ohlcv are not blocked; only stray writes to the
+-- JSONB table wait for the swap.
+
+\set ON_ERROR_STOP on
+
+BEGIN;
+
+LOCK TABLE market_data IN SHARE ROW EXCLUSIVE MODE;
+
+INSERT INTO market_data_ohlcv
+SELECT row.*
+FROM market_data AS doc, market_data_document_row(doc) AS row
+ON CONFLICT (id) DO NOTHING;
+
+DROP TRIGGER IF EXISTS trigger_mirror_market_data_to_ohlcv ON market_data;
+ALTER TABLE market_data RENAME TO market_data_legacy;
+
+-- Same definition as Database._create_tables (MARKET_DATA_VIEW_SELECT)
+CREATE VIEW market_data AS
+SELECT
+    id,
+    partition_key,
+    extra || jsonb_build_object(
+        'id', id,
+        'symbol', symbol,
+        'interval', interval,
+        'timestamp', to_char(ts AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"'),
+        'open_price', open_price,
+        'high_price', high_price,
+        'low_price', low_price,
+        'close_price', close_price,
+        'volume', volume,
+        'quote_volume', quote_volume,
+        'trades_count', trades_count,
+        'asset_type', asset_type
+    ) AS data,
+    created_at,
+    updated_at,
+    ttl_seconds
+FROM market_data_ohlcv;
+
+COMMENT ON VIEW market_data IS 'JSON document view over market_data_ohlcv for legacy readers';
+
+DROP PROCEDURE IF EXISTS backfill_market_data_ohlcv(INTEGER);
+DROP FUNCTION IF EXISTS mirror_market_data_to_ohlcv();
+DROP FUNCTION IF EXISTS market_data_document_row(market_data_legacy);
+
+COMMIT;
+
+-- market_data_legacy is kept for verification; drop it afterwards:
+--   DROP TABLE market_data_legacy;
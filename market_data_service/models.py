@@ -31,6 +31,39 @@ class TradeData(BaseModel):
     is_buyer_maker: bool
 
 
+class TradeBar(BaseModel):
+    """Trades of one symbol aggregated over a fixed interval (e.g. 1s, 1m)"""
+    symbol: str
+    interval: str
+    open_time: datetime
+    close_time: datetime
+    open_price: float = Field(ge=0)
+    high_price: float = Field(ge=0)
+    low_price: float = Field(ge=0)
+    close_price: float = Field(ge=0)
+    volume: float = Field(ge=0)
+    quote_volume: float = Field(ge=0)
+    buy_volume: float = Field(ge=0)  # Taker buys (buyer was not the maker)
+    sell_volume: float = Field(ge=0)  # Taker sells
+    buy_quote_volume: float = Field(ge=0)
+    sell_quote_volume: float = Field(ge=0)
+    trades_count: int = Field(ge=0)
+    buy_trades_count: int = Field(default=0, ge=0)
+    sell_trades_count: int = Field(default=0, ge=0)
+
+    @property
+    def vwap(self) -> float:
+        return self.quote_volume / self.volume if self.volume > 0 else self.close_price
+
+    @property
+    def buy_vwap(self) -> float:
+        return self.buy_quote_volume / self.buy_volume if self.buy_volume > 0 else 0.0
+
+    @property
+    def sell_vwap(self) -> float:
+        return self.sell_quote_volume / self.sell_volume if self.sell_volume > 0 else 0.0
+
+
 class OrderBookData(BaseModel):
     """Order book data model"""
     symbol: str
@@ -3,6 +3,7 @@ Enhanced Multi-Symbol WebSocket Manager
 
 Comprehensive real-time data collection system with:
 - Dynamic symbol addition/removal
+- Streams multiplexed over Binance combined-stream connections
 - Automatic reconnection
 - Multiple stream types per symbol
 - Stream health monitoring
@@ -11,14 +12,13 @@ Comprehensive real-time data collection system with:
 """
 
 import asyncio
-import websockets
-import json
 from datetime import datetime, timezone
 from typing import Dict, List, Set, Optional, Callable
 from enum import Enum
 import structlog
 from dataclasses import dataclass, field
 
+from binance_stream_pool import BinanceStreamPool
 from config import settings
 from database import Database
 from models import MarketData, TradeData, OrderBookData
@@ -65,7 +65,8 @@ class EnhancedWebSocketManager:
     
     def __init__(self, database: Database):
         self.database = database
-        self.active_streams: Dict[str, asyncio.Task] = {}
+        self.active_streams: Dict[str, str] = {}  # stream ID -> Binance stream name
+        self.stream_ids: Dict[str, str] = {}  # Binance stream name -> stream ID
         self.stream_configs: Dict[str, StreamConfig] = {}
         self.stream_health: Dict[str, StreamHealth] = {}
         self.running = False
@@ -75,19 +76,31 @@ class EnhancedWebSocketManager:
             stream_type: [] for stream_type in StreamType
         }
         
-        # Connection pool
-        self.websocket_url = settings.BINANCE_WSS_URL
+        # Connection pool: streams share combined-stream connections
+        self.websocket_url = settings.BINANCE_COMBINED_STREAM_URL
+        self.stream_pool: Optional[BinanceStreamPool] = None
         
     async def start(self, initial_symbols: List[str] = None):
         """Start the WebSocket manager"""
         self.running = True
+        self.stream_pool = BinanceStreamPool(
+            self.websocket_url,
+            self._on_stream_message,
+            max_streams_per_connection=settings.WS_MAX_STREAMS_PER_CONNECTION,
+            ping_interval=20
+        )
+        
+        # Streams added before start
+        if self.stream_ids:
+            await self.stream_pool.subscribe(list(self.stream_ids))
         
         if initial_symbols:
             await self.add_symbols(initial_symbols)
             
         logger.info(
             "WebSocket manager started",
-            total_streams=len(self.active_streams)
+            total_streams=len(self.active_streams),
+            connections=self.stream_pool.connection_count
         )
     
     async def stop(self):
@@ -96,14 +109,15 @@ class EnhancedWebSocketManager:
         
         logger.info("Stopping all WebSocket streams")
         
-        # Cancel all active stream tasks
-        for stream_id, task in self.active_streams.items():
-            task.cancel()
-            
-        # Wait for cancellation
-        await asyncio.gather(*self.active_streams.values(), return_exceptions=True)
+        # Close the shared connections
+        if self.stream_pool:
+            await self.stream_pool.close()
+            self.stream_pool = None
         
         self.active_streams.clear()
+        self.stream_ids.clear()
+        for health in self.stream_health.values():
+            health.is_connected = False
         
         logger.info("All WebSocket streams stopped")
     
@@ -121,23 +135,23 @@ class EnhancedWebSocketManager:
         if intervals is None:
             intervals = ["1m"]  # Default to 1-minute klines
             
-        added_count = 0
+        stream_names = []
         
         for symbol in symbols:
             for stream_type in stream_types:
                 if stream_type == StreamType.KLINE:
                     for interval in intervals:
-                        added = await self._add_stream(symbol, stream_type, interval=interval)
-                        if added:
-                            added_count += 1
+                        stream_names.append(self._register_stream(symbol, stream_type, interval=interval))
                 elif stream_type == StreamType.DEPTH:
-                    added = await self._add_stream(symbol, stream_type, depth=20)
-                    if added:
-                        added_count += 1
+                    stream_names.append(self._register_stream(symbol, stream_type, depth=20))
                 else:
-                    added = await self._add_stream(symbol, stream_type)
-                    if added:
-                        added_count += 1
+                    stream_names.append(self._register_stream(symbol, stream_type))
+        
+        # One subscription for the whole batch
+        stream_names = [name for name in stream_names if name]
+        if stream_names and self.stream_pool:
+            await self.stream_pool.subscribe(stream_names)
+        added_count = len(stream_names)
                         
         logger.info(
             f"Added {added_count} streams for {len(symbols)} symbols",
@@ -149,7 +163,7 @@ class EnhancedWebSocketManager:
     
     async def remove_symbols(self, symbols: List[str]):
         """Remove symbols from tracking"""
-        removed_count = 0
+        stream_names = []
         
         for symbol in symbols:
             # Find all streams for this symbol
@@ -159,8 +173,12 @@ class EnhancedWebSocketManager:
             ]
             
             for stream_id in streams_to_remove:
-                if await self._remove_stream(stream_id):
-                    removed_count += 1
+                stream_names.append(self._unregister_stream(stream_id))
+        
+        # One unsubscription for the whole batch
+        if stream_names and self.stream_pool:
+            await self.stream_pool.unsubscribe(stream_names)
+        removed_count = len(stream_names)
                     
         logger.info(
             f"Removed {removed_count} streams for {len(symbols)} symbols",
@@ -177,6 +195,21 @@ class EnhancedWebSocketManager:
         depth: Optional[int] = None
     ) -> bool:
         """Add a single stream"""
+        stream_name = self._register_stream(symbol, stream_type, interval, depth)
+        if not stream_name:
+            return False
+        if self.stream_pool:
+            await self.stream_pool.subscribe([stream_name])
+        return True
+    
+    def _register_stream(
+        self,
+        symbol: str,
+        stream_type: StreamType,
+        interval: Optional[str] = None,
+        depth: Optional[int] = None
+    ) -> Optional[str]:
+        """Track a stream; returns its Binance stream name, or None if it already exists"""
         
         # Create stream ID
         stream_id = self._create_stream_id(symbol, stream_type, interval, depth)
@@ -184,7 +217,7 @@ class EnhancedWebSocketManager:
         # Check if already exists
         if stream_id in self.active_streams:
             logger.warning(f"Stream {stream_id} already exists")
-            return False
+            return None
             
         # Create stream config
         config = StreamConfig(
@@ -202,36 +235,32 @@ class EnhancedWebSocketManager:
             stream_type=stream_type.value
         )
         
-        # Start stream task
-        task = asyncio.create_task(
-            self._run_stream(stream_id, config)
-        )
-        self.active_streams[stream_id] = task
+        stream_name = self._build_stream_name(config)
+        self.active_streams[stream_id] = stream_name
+        self.stream_ids[stream_name] = stream_id
         
         logger.info(f"Started stream {stream_id}")
-        return True
+        return stream_name
     
     async def _remove_stream(self, stream_id: str) -> bool:
         """Remove a single stream"""
         if stream_id not in self.active_streams:
             return False
-            
-        # Cancel task
-        task = self.active_streams[stream_id]
-        task.cancel()
         
-        try:
-            await task
-        except asyncio.CancelledError:
-            pass
-            
-        # Cleanup
-        del self.active_streams[stream_id]
+        stream_name = self._unregister_stream(stream_id)
+        if self.stream_pool:
+            await self.stream_pool.unsubscribe([stream_name])
+        return True
+    
+    def _unregister_stream(self, stream_id: str) -> str:
+        """Stop tracking a stream; returns its Binance stream name"""
+        stream_name = self.active_streams.pop(stream_id)
+        self.stream_ids.pop(stream_name, None)
         del self.stream_configs[stream_id]
         del self.stream_health[stream_id]
         
         logger.info(f"Removed stream {stream_id}")
-        return True
+        return stream_name
     
     def _create_stream_id(
         self,
@@ -250,8 +279,8 @@ class EnhancedWebSocketManager:
             
         return "_".join(parts)
     
-    def _build_stream_url(self, config: StreamConfig) -> str:
-        """Build WebSocket URL for stream"""
+    def _build_stream_name(self, config: StreamConfig) -> str:
+        """Build the Binance stream name for a stream"""
         symbol_lower = config.symbol.lower()
         
         if config.stream_type == StreamType.KLINE:
@@ -269,72 +298,26 @@ class EnhancedWebSocketManager:
         else:
             raise ValueError(f"Unknown stream type: {config.stream_type}")
             
-        return f"{self.websocket_url}{stream_name}"
+        return stream_name
     
-    async def _run_stream(self, stream_id: str, config: StreamConfig):
-        """Run a single WebSocket stream with reconnection"""
-        url = self._build_stream_url(config)
+    async def _on_stream_message(self, stream_name: str, data: dict):
+        """Route a combined-stream message to its stream"""
+        stream_id = self.stream_ids.get(stream_name)
+        if stream_id is None:
+            return  # Late message for a removed stream
+        
+        # Update health
         health = self.stream_health[stream_id]
+        health.is_connected = True
+        health.last_message_time = datetime.utcnow()
+        health.messages_received += 1
         
-        while self.running and config.enabled:
-            try:
-                async with websockets.connect(url, ping_interval=20) as websocket:
-                    health.is_connected = True
-                    health.reconnect_attempts = 0
-                    logger.info(f"Connected to stream {stream_id}")
-                    
-                    while self.running and config.enabled:
-                        try:
-                            message = await asyncio.wait_for(
-                                websocket.recv(),
-                                timeout=30.0
-                            )
-                            
-                            # Update health
-                            health.last_message_time = datetime.utcnow()
-                            health.messages_received += 1
-                            
-                            # Process message
-                            await self._process_message(config, message)
-                            
-                        except asyncio.TimeoutError:
-                            logger.warning(f"Timeout on stream {stream_id}")
-                            break
-                        except websockets.ConnectionClosed:
-                            logger.warning(f"Connection closed for stream {stream_id}")
-                            break
-                            
-            except Exception as e:
-                health.errors += 1
-                health.last_error = str(e)
-                health.is_connected = False
-                
-                logger.error(
-                    f"Error in stream {stream_id}",
-                    error=str(e),
-                    reconnect_attempt=health.reconnect_attempts
-                )
-                
-                # Check reconnection limits
-                if not config.auto_reconnect:
-                    break
-                    
-                health.reconnect_attempts += 1
-                if health.reconnect_attempts >= config.max_reconnect_attempts:
-                    logger.error(f"Max reconnection attempts reached for {stream_id}")
-                    break
-                    
-                # Wait before reconnecting
-                await asyncio.sleep(config.reconnect_delay)
-                
-        health.is_connected = False
-        logger.info(f"Stream {stream_id} ended")
+        # Process message
+        await self._process_message(self.stream_configs[stream_id], data)
     
-    async def _process_message(self, config: StreamConfig, message: str):
+    async def _process_message(self, config: StreamConfig, data: dict):
         """Process incoming WebSocket message"""
         try:
-            data = json.loads(message)
-            
             # Route to appropriate handler
             if config.stream_type == StreamType.KLINE:
                 await self._process_kline(config.symbol, data)
@@ -356,8 +339,6 @@ class EnhancedWebSocketManager:
                 except Exception as e:
                     logger.error(f"Error in callback: {e}")
                     
-        except json.JSONDecodeError as e:
-            logger.error(f"Invalid JSON in message: {e}")
         except Exception as e:
             logger.error(f"Error processing message: {e}")
     
@@ -482,8 +463,14 @@ class EnhancedWebSocketManager:
     
     def get_health_status(self) -> Dict:
         """Get health status of all streams"""
+        for stream_id, stream_name in self.active_streams.items():
+            self.stream_health[stream_id].is_connected = bool(
+                self.stream_pool and self.stream_pool.is_connected(stream_name)
+            )
+        
         return {
             "total_streams": len(self.active_streams),
+            "connections": self.stream_pool.statistics() if self.stream_pool else None,
             "active_streams": sum(1 for h in self.stream_health.values() if h.is_connected),
             "total_messages": sum(h.messages_received for h in self.stream_health.values()),
             "total_errors": sum(h.errors for h in self.stream_health.values()),
@@ -0,0 +1,331 @@
+"""
+Local L2 Order Book Engine for Market Data Service
+
+Maintains each symbol's order book from Binance diff-depth events
+(``<symbol>@depth@100ms``) instead of handling full snapshots:
+
+1. Events are buffered while a REST depth snapshot loads in a background
+   task, so the stream's receive loop never waits on the REST request
+2. Events with ``u`` <= the snapshot's ``lastUpdateId`` are dropped; the
+   first applied event must satisfy ``U <= lastUpdateId + 1 <= u``
+3. Every later event must start at the previous event's ``u + 1``;
+   anything else is a sequence gap and the book is resynchronised
+
+Price levels are kept in sorted arrays (bisect), so an update only touches
+the levels that changed. After each event the engine reports a compact delta
+of the top N levels (only levels that changed there) for publishing, and
+signals when a snapshot should be persisted: every ``snapshot_interval``
+seconds and after every (re)synchronisation.
+"""
+
+import asyncio
+import time
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from models import OrderBookData
+
+logger = structlog.get_logger()
+
+orderbook_resyncs = Counter('orderbook_resyncs_total', 'Order book snapshot (re)synchronisations', ['symbol', 'reason'])
+orderbook_events = Counter('orderbook_events_total', 'Diff-depth events by outcome', ['status'])
+
+# (symbol, depth) -> Binance REST depth snapshot: {'lastUpdateId', 'bids', 'asks'}
+SnapshotFetcher = Callable[[str, int], Awaitable[Dict[str, Any]]]
+
+Level = Tuple[str, str]  # (price, quantity) as sent by Binance
+
+
+class BookSide:
+    """One side of a book: price levels in a sorted array plus a price -> level map"""
+
+    def __init__(self, descending: bool):
+        self.descending = descending
+        self._keys: List[float] = []  # Ascending sort keys (negated prices for bids)
+        self._levels: Dict[float, Level] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def clear(self):
+        self._keys.clear()
+        self._levels.clear()
+
+    def load(self, levels: Sequence[Sequence[str]]):
+        """Replace the side with snapshot levels"""
+        self.clear()
+        for price, quantity in levels:
+            if float(quantity) > 0:
+                self._levels[float(price)] = (price, quantity)
+        self._keys = sorted(-p if self.descending else p for p in self._levels)
+
+    def update(self, price: str, quantity: str) -> bool:
+        """Set one level (zero quantity removes it); returns True if the book changed"""
+        value = float(price)
+        key = -value if self.descending else value
+        if float(quantity) == 0:
+            if self._levels.pop(value, None) is None:
+                return False
+            del self._keys[bisect_left(self._keys, key)]
+            return True
+        if value not in self._levels:
+            index = bisect_left(self._keys, key)
+            self._keys.insert(index, key)
+        elif self._levels[value][1] == quantity:
+            return False
+        self._levels[value] = (price, quantity)
+        return True
+
+    def top(self, n: Optional[int] = None) -> List[Level]:
+        """Best n levels, best first"""
+        keys = self._keys if n is None else self._keys[:n]
+        sign = -1 if self.descending else 1
+        return [self._levels[sign * key] for key in keys]
+
+    def best(self) -> Optional[Level]:
+        return self.top(1)[0] if self._keys else None
+
+
+@dataclass
+class BookDelta:
+    """Changes to the top N levels caused by one event (quantity "0" = level left the top N)"""
+    symbol: str
+    first_update_id: int
+    final_update_id: int
+    bids: List[Level] = field(default_factory=list)
+    asks: List[Level] = field(default_factory=list)
+    snapshot: bool = False  # Full top N after a (re)sync: consumers replace their book
+
+    def to_message(self) -> Dict[str, Any]:
+        """Compact message body (Binance diff-depth field names)"""
+        message = {
+            's': self.symbol,
+            'U': self.first_update_id,
+            'u': self.final_update_id,
+            'b': self.bids,
+            'a': self.asks
+        }
+        if self.snapshot:
+            message['snapshot'] = True
+        return message
+
+
+def _top_changes(previous: Dict[str, str], current: List[Level]) -> List[Level]:
+    changes = [(price, quantity) for price, quantity in current if previous.get(price) != quantity]
+    current_prices = {price for price, _ in current}
+    changes.extend((price, "0") for price in previous if price not in current_prices)
+    return changes
+
+
+class OrderBookEngine:
+    """
+    Order book for one symbol kept in sync with a diff-depth stream
+
+    Args:
+        symbol: Trading symbol
+        snapshot_fetcher: Loads a REST depth snapshot (e.g. AsyncClient.get_order_book)
+        depth: Levels requested in snapshots
+        top_n: Levels covered by published deltas
+        snapshot_interval: Seconds between persisted snapshots
+        max_buffered_events: Events kept while waiting for a usable snapshot
+        resync_backoff: Minimum seconds between snapshot requests
+    """
+
+    def __init__(
+        self,
+        symbol: str,
+        snapshot_fetcher: SnapshotFetcher,
+        depth: int = 1000,
+        top_n: int = 20,
+        snapshot_interval: float = 60.0,
+        max_buffered_events: int = 1000,
+        resync_backoff: float = 1.0,
+    ):
+        self.symbol = symbol
+        self.snapshot_fetcher = snapshot_fetcher
+        self.depth = depth
+        self.top_n = top_n
+        self.snapshot_interval = snapshot_interval
+        self.max_buffered_events = max_buffered_events
+        self.resync_backoff = resync_backoff
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.last_update_id = 0
+        self.synced = False
+        self.event_time: Optional[datetime] = None
+        self._buffer: List[Dict[str, Any]] = []
+        self._awaiting_first_event = False  # Next event may straddle the snapshot's lastUpdateId
+        self._next_snapshot_request = 0.0
+        self._resync_task: Optional[asyncio.Task] = None
+        self._resync_delta_due = False  # Next event returns the full top N
+        self._resync_reason = 'initial'
+        self._top: Tuple[Dict[str, str], Dict[str, str]] = ({}, {})
+        self._snapshot_due = False
+        self._last_snapshot = 0.0
+        self.events_applied = 0
+        self.gaps = 0
+        self.resyncs = 0
+
+    async def apply_event(self, event: Dict[str, Any]) -> Optional[BookDelta]:
+        """
+        Apply one diff-depth event
+
+        Returns the top-N delta it caused (a full top-N ``snapshot`` delta for
+        the first event after a resync), or None if the event changed nothing
+        there or the book is still waiting for a usable snapshot. Never waits
+        for a snapshot: unsynced events are buffered and the resync runs in a
+        background task.
+        """
+        if 'E' in event:
+            self.event_time = datetime.fromtimestamp(event['E'] / 1000, tz=timezone.utc)
+
+        if self.synced:
+            if event['u'] <= self.last_update_id:
+                orderbook_events.labels('stale').inc()
+                return self._resync_delta()
+            expected = self.last_update_id + 1
+            if event['U'] == expected or (self._awaiting_first_event and event['U'] <= expected):
+                self._apply(event)
+                return self._resync_delta() or self._delta(expected)
+
+            self.gaps += 1
+            orderbook_events.labels('gap').inc()
+            logger.warning("Order book sequence gap, resynchronising",
+                           symbol=self.symbol,
+                           expected=expected,
+                           first_update_id=event['U'])
+            self.synced = False
+            self._resync_reason = 'gap'
+            self._buffer.clear()
+
+        self._buffer.append(event)
+        del self._buffer[:-self.max_buffered_events]
+        self._start_resync()
+        return None
+
+    async def wait_resync(self):
+        """Wait for a running snapshot resync to finish"""
+        if self._resync_task is not None:
+            await self._resync_task
+
+    async def close(self):
+        """Cancel a running snapshot resync"""
+        if self._resync_task is not None:
+            self._resync_task.cancel()
+            await asyncio.gather(self._resync_task, return_exceptions=True)
+            self._resync_task = None
+
+    def snapshot_due(self, now: Optional[float] = None) -> bool:
+        """True after a (re)sync or once snapshot_interval has passed since the last persisted snapshot"""
+        if not self.synced:
+            return False
+        now = time.monotonic() if now is None else now
+        return self._snapshot_due or now - self._last_snapshot >= self.snapshot_interval
+
+    def take_snapshot(self, levels: Optional[int] = None, now: Optional[float] = None) -> OrderBookData:
+        """Current book (best ``levels`` per side) for persistence; resets the snapshot timer"""
+        self._snapshot_due = False
+        self._last_snapshot = time.monotonic() if now is None else now
+        return OrderBookData(
+            symbol=self.symbol,
+            timestamp=self.event_time or datetime.now(timezone.utc),
+            bids=self.bids.top(levels),
+            asks=self.asks.top(levels)
+        )
+
+    def statistics(self) -> Dict[str, Any]:
+        best_bid, best_ask = self.bids.best(), self.asks.best()
+        return {
+            'synced': self.synced,
+            'last_update_id': self.last_update_id,
+            'bid_levels': len(self.bids),
+            'ask_levels': len(self.asks),
+            'best_bid': best_bid[0] if best_bid else None,
+            'best_ask': best_ask[0] if best_ask else None,
+            'events_applied': self.events_applied,
+            'gaps': self.gaps,
+            'resyncs': self.resyncs
+        }
+
+    def _start_resync(self):
+        """Start a background snapshot load unless one is running or backing off"""
+        if self._resync_task is not None and not self._resync_task.done():
+            return
+        now = time.monotonic()
+        if now < self._next_snapshot_request:
+            return
+        self._next_snapshot_request = now + self.resync_backoff
+        self._resync_task = asyncio.create_task(self._synchronise())
+
+    async def _synchronise(self):
+        """Load a snapshot and replay the events buffered meanwhile onto it"""
+        try:
+            snapshot = await self.snapshot_fetcher(self.symbol, self.depth)
+        except Exception as e:
+            logger.error("Error loading order book snapshot", symbol=self.symbol, error=str(e))
+            return
+
+        last_update_id = snapshot['lastUpdateId']
+        pending = [event for event in self._buffer if event['u'] > last_update_id]
+        if pending and pending[0]['U'] > last_update_id + 1:
+            # Snapshot is older than the buffered events; retry with the next event
+            orderbook_events.labels('snapshot_behind').inc()
+            return
+
+        self.bids.load(snapshot['bids'])
+        self.asks.load(snapshot['asks'])
+        self.last_update_id = last_update_id
+        for event in pending:
+            if event['U'] > self.last_update_id + 1:
+                # Gap inside the buffer: keep the rest and start over
+                self._buffer = pending[pending.index(event):]
+                orderbook_events.labels('gap').inc()
+                return
+            self._apply(event)
+
+        self._buffer.clear()
+        self._awaiting_first_event = not pending
+        self.synced = True
+        self._snapshot_due = True
+        self._resync_delta_due = True
+        self.resyncs += 1
+        orderbook_resyncs.labels(self.symbol, self._resync_reason).inc()
+        logger.info("Order book synchronised",
+                    symbol=self.symbol,
+                    reason=self._resync_reason,
+                    last_update_id=self.last_update_id,
+                    bid_levels=len(self.bids),
+                    ask_levels=len(self.asks))
+
+    def _apply(self, event: Dict[str, Any]):
+        for price, quantity in event['b']:
+            self.bids.update(price, quantity)
+        for price, quantity in event['a']:
+            self.asks.update(price, quantity)
+        self.last_update_id = event['u']
+        self._awaiting_first_event = False
+        self.events_applied += 1
+        orderbook_events.labels('applied').inc()
+
+    def _resync_delta(self) -> Optional[BookDelta]:
+        """Full top-N delta owed since the last resync, or None"""
+        if not self._resync_delta_due:
+            return None
+        self._resync_delta_due = False
+        return self._delta(self.last_update_id, snapshot=True)
+
+    def _delta(self, first_update_id: int, snapshot: bool = False) -> Optional[BookDelta]:
+        bids, asks = self.bids.top(self.top_n), self.asks.top(self.top_n)
+        previous_bids, previous_asks = self._top
+        self._top = (dict(bids), dict(asks))
+        if not snapshot:
+            bids = _top_changes(previous_bids, bids)
+            asks = _top_changes(previous_asks, asks)
+            if not bids and not asks:
+                return None
+        return BookDelta(self.symbol, first_update_id, self.last_update_id, bids, asks, snapshot)
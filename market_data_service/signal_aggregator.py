@@ -13,10 +13,12 @@ Publishes aggregated signals every 1 minute to RabbitMQ.
 
 import asyncio
 import json
+import time
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any
 import structlog
 import aio_pika
+from prometheus_client import Counter, Gauge, Histogram
 
 # Import message schemas
 import sys
@@ -30,9 +32,23 @@ from shared.message_schemas import (
     RoutingKeys
 )
 from shared.cache_decorators import cached, simple_key
+from shared.rabbitmq_publisher import BatchedPublisher
 
 logger = structlog.get_logger()
 
+aggregation_cycle_duration = Histogram(
+    'signal_aggregation_cycle_seconds', 'Time to aggregate and publish signals for all symbols',
+    buckets=(0.5, 1, 2.5, 5, 10, 20, 30, 45, 60, 90, 120, 300)
+)
+aggregation_lag = Gauge(
+    'signal_aggregation_lag_seconds', 'How late the latest aggregation cycle started versus its schedule'
+)
+aggregation_symbols = Gauge('signal_aggregation_symbols', 'Symbols aggregated in the latest cycle')
+aggregation_signals = Counter('signal_aggregation_signals_total', 'Aggregated signals by outcome', ['status'])
+
+# Component signals combined by _aggregate_signal_for_symbol
+SIGNAL_COMPONENTS = ('price', 'sentiment', 'onchain', 'flow', 'volatility')
+
 
 class SignalAggregator:
     """
@@ -45,17 +61,33 @@ class SignalAggregator:
     4. Institutional: Whale alerts, block trades
     
     Output: MarketSignalAggregate published every 60 seconds
+    
+    Each cycle loads the latest rows for every active symbol with one
+    set-based query per component, then aggregates symbols concurrently
+    (at most max_concurrency at a time). With set_based_queries=False each
+    symbol queries its four sub-signals in parallel instead.
     """
     
-    def __init__(self, database, rabbitmq_channel: aio_pika.Channel, redis_cache=None):
+    def __init__(
+        self,
+        database,
+        rabbitmq_channel: aio_pika.Channel,
+        redis_cache=None,
+        max_concurrency: int = 10,
+        set_based_queries: bool = True
+    ):
         self.database = database
         self.rabbitmq_channel = rabbitmq_channel
         self.redis_cache = redis_cache
+        # Signals of one aggregation round are published as one confirmed batch
+        self.publisher = BatchedPublisher(rabbitmq_channel.default_exchange, name="default")
         self.logger = logger.bind(component="signal_aggregator")
         
         # Configuration
         self.update_interval = 60  # seconds
         self.lookback_minutes = 15  # How far back to look for signals
+        self.max_concurrency = max_concurrency  # Symbols aggregated at once
+        self.set_based_queries = set_based_queries  # One query per component for all symbols
         
         # Signal weights (must sum to 1.0)
         self.weights = {
@@ -76,8 +108,12 @@ class SignalAggregator:
         self.cache_hits = 0
         self.cache_misses = 0
         
+        # Latest cycle statistics
+        self.last_cycle: Dict[str, Any] = {}
+        
         self.logger.info("Signal aggregator initialized", 
                         update_interval=self.update_interval,
+                        max_concurrency=self.max_concurrency,
                         weights=self.weights)
     
     async def start(self):
@@ -87,6 +123,7 @@ class SignalAggregator:
             return
         
         self.running = True
+        self.publisher.start()
         self.task = asyncio.create_task(self._aggregation_loop())
         self.logger.info("Signal aggregator started")
     
@@ -99,33 +136,74 @@ class SignalAggregator:
                 await self.task
             except asyncio.CancelledError:
                 pass
+        await self.publisher.stop()
         self.logger.info("Signal aggregator stopped")
     
     async def _aggregation_loop(self):
-        """Main aggregation loop - runs every minute"""
+        """Main aggregation loop - starts a cycle every update_interval seconds"""
+        loop = asyncio.get_running_loop()
+        scheduled = loop.time()
         while self.running:
             try:
-                # Get active symbols from database
-                symbols = await self._get_active_symbols()
-                
-                # Aggregate signals for each symbol
-                for symbol in symbols:
-                    try:
-                        signal = await self._aggregate_signal_for_symbol(symbol)
-                        if signal:
-                            await self._publish_signal(signal)
-                    except Exception as e:
-                        self.logger.error("Error aggregating signal", 
-                                        symbol=symbol, error=str(e))
-                
-                # Wait before next update
-                await asyncio.sleep(self.update_interval)
-                
+                aggregation_lag.set(max(loop.time() - scheduled, 0.0))
+                await self._run_aggregation_cycle()
             except asyncio.CancelledError:
                 break
             except Exception as e:
                 self.logger.error("Error in aggregation loop", error=str(e))
                 await asyncio.sleep(5)  # Brief pause before retry
+            
+            # Wait before next update; an overrunning cycle starts the next one immediately
+            scheduled += self.update_interval
+            now = loop.time()
+            if scheduled < now:
+                self.logger.warning("Signal aggregation cycle overran update interval",
+                                    lag_seconds=round(now - scheduled, 2),
+                                    update_interval=self.update_interval)
+            try:
+                await asyncio.sleep(max(scheduled - now, 0.0))
+            except asyncio.CancelledError:
+                break
+    
+    async def _run_aggregation_cycle(self) -> int:
+        """Aggregate and publish signals for all active symbols; returns the number published"""
+        started = time.monotonic()
+        
+        # Get active symbols from database
+        symbols = await self._get_active_symbols()
+        components = await self._fetch_signal_components(symbols) if self.set_based_queries else {}
+        
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        
+        async def aggregate(symbol: str) -> bool:
+            async with semaphore:
+                try:
+                    signal = await self._aggregate_signal_for_symbol(symbol, components.get(symbol))
+                    if signal:
+                        await self._publish_signal(signal)
+                        aggregation_signals.labels('published').inc()
+                        return True
+                    aggregation_signals.labels('skipped').inc()
+                except Exception as e:
+                    aggregation_signals.labels('error').inc()
+                    self.logger.error("Error aggregating signal", 
+                                    symbol=symbol, error=str(e))
+                return False
+        
+        published = sum(await asyncio.gather(*(aggregate(symbol) for symbol in symbols)))
+        await self.publisher.flush()
+        
+        duration = time.monotonic() - started
+        aggregation_cycle_duration.observe(duration)
+        aggregation_symbols.set(len(symbols))
+        self.last_cycle = {
+            'symbols': len(symbols),
+            'signals_published': published,
+            'duration_seconds': round(duration, 3),
+            'completed_at': datetime.utcnow().isoformat()
+        }
+        self.logger.info("Signal aggregation cycle complete", **self.last_cycle)
+        return published
     
     async def _get_active_symbols(self) -> List[str]:
         """Get list of active trading symbols"""
@@ -145,19 +223,160 @@ class SignalAggregator:
         except Exception as e:
             self.logger.error("Error getting active symbols", error=str(e))
             return ["BTCUSDT", "ETHUSDT"]  # Minimal fallback
-    
-    async def _aggregate_signal_for_symbol(self, symbol: str) -> Optional[MarketSignalAggregate]:
+
+    async def _fetch_signal_components(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """
+        Load component signals for all symbols with one query per component
+
+        Each query filters on the whole symbol list (= ANY($1)) and keeps the
+        same rows the per-symbol queries would, newest first. A failed query
+        leaves its component as None for every symbol.
+
+        Returns: {symbol: {component: signal}} keyed by SIGNAL_COMPONENTS
+        """
+        if not symbols:
+            return {}
+
+        now = datetime.utcnow()
+        # On-chain metrics are stored by base asset and only exist for USDT pairs
+        onchain_symbols = {
+            symbol: symbol.replace('USDT', '').replace('USDC', '')
+            for symbol in symbols if symbol.endswith('USDT')
+        }
+
+        queries = {
+            'price': ("""
+                SELECT DISTINCT ON (data->>'symbol', data->>'indicator_name')
+                    data->>'symbol' as symbol,
+                    data->>'indicator_name' as indicator_name,
+                    (data->>'value')::float as value,
+                    (data->>'timestamp')::timestamp as timestamp
+                FROM indicator_results
+                WHERE data->>'symbol' = ANY($1::text[]) AND (data->>'timestamp')::timestamp > $2
+                ORDER BY data->>'symbol', data->>'indicator_name', (data->>'timestamp')::timestamp DESC
+            """, symbols, now - timedelta(minutes=self.lookback_minutes)),
+            'sentiment': ("""
+                SELECT symbol, source, sentiment_score, social_volume, timestamp
+                FROM (
+                    SELECT
+                        data->>'symbol' as symbol,
+                        data->>'source' as source,
+                        (data->>'sentiment_score')::float as sentiment_score,
+                        (data->>'social_volume')::float as social_volume,
+                        (data->>'timestamp')::timestamp as timestamp,
+                        row_number() OVER (
+                            PARTITION BY data->>'symbol'
+                            ORDER BY (data->>'timestamp')::timestamp DESC
+                        ) as rank
+                    FROM sentiment_data
+                    WHERE data->>'symbol' = ANY($1::text[]) AND (data->>'timestamp')::timestamp > $2
+                ) latest
+                WHERE rank <= 10
+                ORDER BY symbol, timestamp DESC
+            """, symbols, now - timedelta(hours=1)),
+            'onchain': ("""
+                SELECT DISTINCT ON (data->>'symbol', data->>'metric_name')
+                    data->>'symbol' as symbol,
+                    data->>'metric_name' as metric_name,
+                    (data->>'value')::float as value,
+                    data->>'signal' as signal,
+                    (data->>'timestamp')::timestamp as timestamp
+                FROM onchain_metrics
+                WHERE data->>'symbol' = ANY($1::text[]) AND (data->>'timestamp')::timestamp > $2
+                ORDER BY data->>'symbol', data->>'metric_name', (data->>'timestamp')::timestamp DESC
+            """, sorted(set(onchain_symbols.values())), now - timedelta(hours=4)),
+            'flow': ("""
+                SELECT symbol, alert_type, amount_usd, significance_score, timestamp
+                FROM (
+                    SELECT symbol, alert_type, amount_usd, significance_score, timestamp,
+                           row_number() OVER (PARTITION BY symbol ORDER BY timestamp DESC) as rank
+                    FROM whale_alerts
+                    WHERE symbol = ANY($1::text[]) AND timestamp > $2
+                ) latest
+                WHERE rank <= 20
+                ORDER BY symbol, timestamp DESC
+            """, symbols, now - timedelta(hours=2)),
+            'volatility': ("""
+                SELECT DISTINCT ON (data->>'symbol')
+                    data->>'symbol' as symbol,
+                    (data->>'value')::float as value
+                FROM indicator_results
+                WHERE data->>'symbol' = ANY($1::text[]) AND data->>'indicator_name' = 'atr'
+                ORDER BY data->>'symbol', (data->>'timestamp')::timestamp DESC
+            """, symbols)
+        }
+
+        async def fetch(component: str) -> Dict[str, list]:
+            query, *args = queries[component]
+            if not args[0]:
+                return {}
+            try:
+                rows = await self.database._postgres.fetch(query, *args)
+            except Exception as e:
+                self.logger.error("Error loading component signals", component=component, error=str(e))
+                return {}
+            by_symbol: Dict[str, list] = {}
+            for row in rows:
+                by_symbol.setdefault(row['symbol'], []).append(row)
+            return by_symbol
+
+        price_rows, sentiment_rows, onchain_rows, flow_rows, volatility_rows = await asyncio.gather(
+            *(fetch(component) for component in SIGNAL_COMPONENTS)
+        )
+
+        def analyse(build, rows) -> Optional[dict]:
+            try:
+                return build(rows)
+            except Exception as e:
+                self.logger.error("Error building component signal", error=str(e))
+                return None
+
+        components = {}
+        for symbol in symbols:
+            base_symbol = onchain_symbols.get(symbol)
+            atr = volatility_rows.get(symbol)
+            components[symbol] = {
+                'price': analyse(self._price_signal_from_rows, price_rows.get(symbol)),
+                'sentiment': analyse(self._sentiment_signal_from_rows, sentiment_rows.get(symbol)),
+                'onchain': analyse(self._onchain_signal_from_rows, onchain_rows.get(base_symbol)),
+                'flow': analyse(self._flow_signal_from_rows, flow_rows.get(symbol)),
+                'volatility': float(atr[0]['value']) if atr and atr[0]['value'] is not None else None
+            }
+        return components
+
+    async def _aggregate_signal_for_symbol(
+        self,
+        symbol: str,
+        components: Optional[Dict[str, Any]] = None
+    ) -> Optional[MarketSignalAggregate]:
         """
         Aggregate all signals for a specific symbol
         
+        Component signals already loaded by _fetch_signal_components (keyed by
+        SIGNAL_COMPONENTS) are used as-is; the rest are queried concurrently.
+        
         Returns MarketSignalAggregate or None if insufficient data
         """
         try:
             # Gather component signals
-            price_signal = await self._get_price_signal(symbol)
-            sentiment_signal = await self._get_sentiment_signal(symbol)
-            onchain_signal = await self._get_onchain_signal(symbol)
-            flow_signal = await self._get_flow_signal(symbol)
+            components = dict(components or {})
+            fetchers = {
+                'price': self._get_price_signal,
+                'sentiment': self._get_sentiment_signal,
+                'onchain': self._get_onchain_signal,
+                'flow': self._get_flow_signal,
+                'volatility': self._get_current_volatility
+            }
+            missing = [name for name in SIGNAL_COMPONENTS if name not in components]
+            if missing:
+                results = await asyncio.gather(*(fetchers[name](symbol) for name in missing))
+                components.update(zip(missing, results))
+            
+            price_signal = components['price']
+            sentiment_signal = components['sentiment']
+            onchain_signal = components['onchain']
+            flow_signal = components['flow']
+            volatility = components['volatility']
             
             # Calculate overall signal
             overall_signal, overall_strength, confidence = self._calculate_overall_signal(
@@ -168,8 +387,7 @@ class SignalAggregator:
             recommended_action = self._determine_action(overall_signal, overall_strength, confidence)
             position_size_modifier = self._calculate_position_modifier(overall_strength, confidence)
             
-            # Calculate volatility and risk
-            volatility = await self._get_current_volatility(symbol)
+            # Calculate risk
             risk_level = self._assess_risk_level(volatility, overall_strength)
             
             # Build aggregate signal
@@ -231,95 +449,98 @@ class SignalAggregator:
             """
             cutoff = datetime.utcnow() - timedelta(minutes=self.lookback_minutes)
             rows = await self.database._postgres.fetch(query, symbol, cutoff)
-            
-            if not rows:
-                return None
-            
-            # Extract key indicators
-            indicators = {}
-            for row in rows:
-                name = row['indicator_name']
-                if name not in indicators:  # Take most recent
-                    indicators[name] = row['value']
-            
-            # Analyze indicators
-            bullish_signals = 0
-            bearish_signals = 0
-            total_signals = 0
-            
-            # RSI analysis
-            if 'rsi' in indicators:
-                rsi = indicators['rsi']
-                total_signals += 1
-                if rsi < 30:
-                    bullish_signals += 1  # Oversold
-                elif rsi > 70:
-                    bearish_signals += 1  # Overbought
-                elif 40 <= rsi <= 60:
-                    bullish_signals += 0.5
-                    bearish_signals += 0.5  # Neutral
-            
-            # MACD analysis
-            if 'macd' in indicators and 'macd_signal' in indicators:
-                total_signals += 1
-                if indicators['macd'] > indicators['macd_signal']:
-                    bullish_signals += 1
-                else:
-                    bearish_signals += 1
-            
-            # Moving average analysis
-            if 'sma_20' in indicators and 'sma_50' in indicators:
-                total_signals += 1
-                if indicators['sma_20'] > indicators['sma_50']:
-                    bullish_signals += 1  # Golden cross tendency
-                else:
-                    bearish_signals += 1  # Death cross tendency
-            
-            # Bollinger Bands analysis
-            if all(k in indicators for k in ['bb_upper', 'bb_lower', 'close']):
-                total_signals += 1
-                close = indicators['close']
-                bb_upper = indicators['bb_upper']
-                bb_lower = indicators['bb_lower']
-                bb_range = bb_upper - bb_lower
-                
-                if close < bb_lower + (bb_range * 0.2):
-                    bullish_signals += 1  # Near lower band
-                elif close > bb_upper - (bb_range * 0.2):
-                    bearish_signals += 1  # Near upper band
-            
-            if total_signals == 0:
-                return None
-            
-            # Calculate direction and strength
-            bullish_ratio = bullish_signals / total_signals
-            bearish_ratio = bearish_signals / total_signals
-            
-            if bullish_ratio > bearish_ratio + 0.2:
-                direction = TrendDirection.BULLISH
-                strength = min(bullish_ratio, 1.0)
-            elif bearish_ratio > bullish_ratio + 0.2:
-                direction = TrendDirection.BEARISH
-                strength = min(bearish_ratio, 1.0)
-            else:
-                direction = TrendDirection.NEUTRAL
-                strength = 0.5
-            
-            return {
-                'direction': direction,
-                'strength': strength,
-                'indicators': indicators,
-                'analysis': {
-                    'bullish_signals': bullish_signals,
-                    'bearish_signals': bearish_signals,
-                    'total_signals': total_signals
-                }
-            }
+            return self._price_signal_from_rows(rows)
             
         except Exception as e:
             self.logger.error("Error getting price signal", symbol=symbol, error=str(e))
             return None
     
+    def _price_signal_from_rows(self, rows) -> Optional[dict]:
+        """Price action signal from indicator rows, newest first"""
+        if not rows:
+            return None
+
+        # Extract key indicators
+        indicators = {}
+        for row in rows:
+            name = row['indicator_name']
+            if name not in indicators:  # Take most recent
+                indicators[name] = row['value']
+
+        # Analyze indicators
+        bullish_signals = 0
+        bearish_signals = 0
+        total_signals = 0
+
+        # RSI analysis
+        if 'rsi' in indicators:
+            rsi = indicators['rsi']
+            total_signals += 1
+            if rsi < 30:
+                bullish_signals += 1  # Oversold
+            elif rsi > 70:
+                bearish_signals += 1  # Overbought
+            elif 40 <= rsi <= 60:
+                bullish_signals += 0.5
+                bearish_signals += 0.5  # Neutral
+
+        # MACD analysis
+        if 'macd' in indicators and 'macd_signal' in indicators:
+            total_signals += 1
+            if indicators['macd'] > indicators['macd_signal']:
+                bullish_signals += 1
+            else:
+                bearish_signals += 1
+
+        # Moving average analysis
+        if 'sma_20' in indicators and 'sma_50' in indicators:
+            total_signals += 1
+            if indicators['sma_20'] > indicators['sma_50']:
+                bullish_signals += 1  # Golden cross tendency
+            else:
+                bearish_signals += 1  # Death cross tendency
+
+        # Bollinger Bands analysis
+        if all(k in indicators for k in ['bb_upper', 'bb_lower', 'close']):
+            total_signals += 1
+            close = indicators['close']
+            bb_upper = indicators['bb_upper']
+            bb_lower = indicators['bb_lower']
+            bb_range = bb_upper - bb_lower
+
+            if close < bb_lower + (bb_range * 0.2):
+                bullish_signals += 1  # Near lower band
+            elif close > bb_upper - (bb_range * 0.2):
+                bearish_signals += 1  # Near upper band
+
+        if total_signals == 0:
+            return None
+
+        # Calculate direction and strength
+        bullish_ratio = bullish_signals / total_signals
+        bearish_ratio = bearish_signals / total_signals
+
+        if bullish_ratio > bearish_ratio + 0.2:
+            direction = TrendDirection.BULLISH
+            strength = min(bullish_ratio, 1.0)
+        elif bearish_ratio > bullish_ratio + 0.2:
+            direction = TrendDirection.BEARISH
+            strength = min(bearish_ratio, 1.0)
+        else:
+            direction = TrendDirection.NEUTRAL
+            strength = 0.5
+
+        return {
+            'direction': direction,
+            'strength': strength,
+            'indicators': indicators,
+            'analysis': {
+                'bullish_signals': bullish_signals,
+                'bearish_signals': bearish_signals,
+                'total_signals': total_signals
+            }
+        }
+    
     @cached(prefix='sentiment_signal', ttl=60, key_func=simple_key(0))
     async def _get_sentiment_signal(self, symbol: str) -> Optional[dict]:
         """
@@ -342,56 +563,59 @@ class SignalAggregator:
             """
             cutoff = datetime.utcnow() - timedelta(hours=1)
             rows = await self.database._postgres.fetch(query, symbol, cutoff)
-            
-            if not rows:
-                return None
-            
-            # Aggregate sentiment by source
-            sentiment_by_source = {}
-            for row in rows:
-                source = row['source']
-                if source not in sentiment_by_source:
-                    sentiment_by_source[source] = {
-                        'score': row['sentiment_score'],
-                        'volume': row['social_volume']
-                    }
-            
-            if not sentiment_by_source:
-                return None
-            
-            # Calculate weighted average sentiment
-            total_volume = sum(s['volume'] for s in sentiment_by_source.values())
-            if total_volume == 0:
-                # Equal weight if no volume data
-                avg_sentiment = sum(s['score'] for s in sentiment_by_source.values()) / len(sentiment_by_source)
-            else:
-                # Volume-weighted average
-                avg_sentiment = sum(
-                    s['score'] * s['volume'] for s in sentiment_by_source.values()
-                ) / total_volume
-            
-            # Determine direction and strength
-            if avg_sentiment > 0.2:
-                direction = TrendDirection.BULLISH
-                strength = min(abs(avg_sentiment), 1.0)
-            elif avg_sentiment < -0.2:
-                direction = TrendDirection.BEARISH
-                strength = min(abs(avg_sentiment), 1.0)
-            else:
-                direction = TrendDirection.NEUTRAL
-                strength = 0.5
-            
-            return {
-                'direction': direction,
-                'strength': strength,
-                'avg_sentiment': avg_sentiment,
-                'sources': sentiment_by_source
-            }
+            return self._sentiment_signal_from_rows(rows)
             
         except Exception as e:
             self.logger.error("Error getting sentiment signal", symbol=symbol, error=str(e))
             return None
     
+    def _sentiment_signal_from_rows(self, rows) -> Optional[dict]:
+        """Sentiment signal from the latest sentiment rows, newest first"""
+        if not rows:
+            return None
+
+        # Aggregate sentiment by source
+        sentiment_by_source = {}
+        for row in rows:
+            source = row['source']
+            if source not in sentiment_by_source:
+                sentiment_by_source[source] = {
+                    'score': row['sentiment_score'],
+                    'volume': row['social_volume']
+                }
+
+        if not sentiment_by_source:
+            return None
+
+        # Calculate weighted average sentiment
+        total_volume = sum(s['volume'] for s in sentiment_by_source.values())
+        if total_volume == 0:
+            # Equal weight if no volume data
+            avg_sentiment = sum(s['score'] for s in sentiment_by_source.values()) / len(sentiment_by_source)
+        else:
+            # Volume-weighted average
+            avg_sentiment = sum(
+                s['score'] * s['volume'] for s in sentiment_by_source.values()
+            ) / total_volume
+
+        # Determine direction and strength
+        if avg_sentiment > 0.2:
+            direction = TrendDirection.BULLISH
+            strength = min(abs(avg_sentiment), 1.0)
+        elif avg_sentiment < -0.2:
+            direction = TrendDirection.BEARISH
+            strength = min(abs(avg_sentiment), 1.0)
+        else:
+            direction = TrendDirection.NEUTRAL
+            strength = 0.5
+
+        return {
+            'direction': direction,
+            'strength': strength,
+            'avg_sentiment': avg_sentiment,
+            'sources': sentiment_by_source
+        }
+    
     async def _get_onchain_signal(self, symbol: str) -> Optional[dict]:
         """
         Get on-chain metrics signal
@@ -418,55 +642,58 @@ class SignalAggregator:
             """
             cutoff = datetime.utcnow() - timedelta(hours=4)
             rows = await self.database._postgres.fetch(query, base_symbol, cutoff)
-            
-            if not rows:
-                return None
-            
-            # Extract metrics
-            metrics = {}
-            signals = []
-            for row in rows:
-                name = row['metric_name']
-                if name not in metrics:
-                    metrics[name] = row['value']
-                    if row['signal']:
-                        signals.append(row['signal'])
-            
-            if not signals:
-                return None
-            
-            # Count signal directions
-            bullish = sum(1 for s in signals if s.lower() == 'bullish')
-            bearish = sum(1 for s in signals if s.lower() == 'bearish')
-            neutral = sum(1 for s in signals if s.lower() == 'neutral')
-            total = len(signals)
-            
-            # Determine overall direction
-            if bullish > bearish + 1:
-                direction = TrendDirection.BULLISH
-                strength = bullish / total
-            elif bearish > bullish + 1:
-                direction = TrendDirection.BEARISH
-                strength = bearish / total
-            else:
-                direction = TrendDirection.NEUTRAL
-                strength = 0.5
-            
-            return {
-                'direction': direction,
-                'strength': strength,
-                'metrics': metrics,
-                'signal_counts': {
-                    'bullish': bullish,
-                    'bearish': bearish,
-                    'neutral': neutral
-                }
-            }
+            return self._onchain_signal_from_rows(rows)
             
         except Exception as e:
             self.logger.error("Error getting on-chain signal", symbol=symbol, error=str(e))
             return None
     
+    def _onchain_signal_from_rows(self, rows) -> Optional[dict]:
+        """On-chain signal from metric rows, newest first"""
+        if not rows:
+            return None
+
+        # Extract metrics
+        metrics = {}
+        signals = []
+        for row in rows:
+            name = row['metric_name']
+            if name not in metrics:
+                metrics[name] = row['value']
+                if row['signal']:
+                    signals.append(row['signal'])
+
+        if not signals:
+            return None
+
+        # Count signal directions
+        bullish = sum(1 for s in signals if s.lower() == 'bullish')
+        bearish = sum(1 for s in signals if s.lower() == 'bearish')
+        neutral = sum(1 for s in signals if s.lower() == 'neutral')
+        total = len(signals)
+
+        # Determine overall direction
+        if bullish > bearish + 1:
+            direction = TrendDirection.BULLISH
+            strength = bullish / total
+        elif bearish > bullish + 1:
+            direction = TrendDirection.BEARISH
+            strength = bearish / total
+        else:
+            direction = TrendDirection.NEUTRAL
+            strength = 0.5
+
+        return {
+            'direction': direction,
+            'strength': strength,
+            'metrics': metrics,
+            'signal_counts': {
+                'bullish': bullish,
+                'bearish': bearish,
+                'neutral': neutral
+            }
+        }
+    
     async def _get_flow_signal(self, symbol: str) -> Optional[dict]:
         """
         Get institutional flow signal from whale alerts
@@ -484,59 +711,62 @@ class SignalAggregator:
             """
             cutoff = datetime.utcnow() - timedelta(hours=2)
             rows = await self.database._postgres.fetch(query, symbol, cutoff)
-            
-            if not rows:
-                return None
-            
-            # Analyze whale activity
-            bullish_flow = 0.0
-            bearish_flow = 0.0
-            
-            for row in rows:
-                alert_type = row['alert_type']
-                significance = row['significance_score']
-                
-                if alert_type == 'exchange_outflow':
-                    # Outflow = accumulation (bullish)
-                    bullish_flow += significance
-                elif alert_type == 'exchange_inflow':
-                    # Inflow = potential selling (bearish)
-                    bearish_flow += significance
-                elif alert_type == 'whale_accumulation':
-                    bullish_flow += significance * 1.2
-                elif alert_type == 'whale_distribution':
-                    bearish_flow += significance * 1.2
-            
-            if bullish_flow == 0 and bearish_flow == 0:
-                return None
-            
-            # Determine direction
-            total_flow = bullish_flow + bearish_flow
-            bullish_ratio = bullish_flow / total_flow
-            bearish_ratio = bearish_flow / total_flow
-            
-            if bullish_ratio > 0.6:
-                direction = TrendDirection.BULLISH
-                strength = min(bullish_ratio, 1.0)
-            elif bearish_ratio > 0.6:
-                direction = TrendDirection.BEARISH
-                strength = min(bearish_ratio, 1.0)
-            else:
-                direction = TrendDirection.NEUTRAL
-                strength = 0.5
-            
-            return {
-                'direction': direction,
-                'strength': strength,
-                'bullish_flow': bullish_flow,
-                'bearish_flow': bearish_flow,
-                'alert_count': len(rows)
-            }
+            return self._flow_signal_from_rows(rows)
             
         except Exception as e:
             self.logger.error("Error getting flow signal", symbol=symbol, error=str(e))
             return None
     
+    def _flow_signal_from_rows(self, rows) -> Optional[dict]:
+        """Institutional flow signal from the latest whale alerts, newest first"""
+        if not rows:
+            return None
+
+        # Analyze whale activity
+        bullish_flow = 0.0
+        bearish_flow = 0.0
+
+        for row in rows:
+            alert_type = row['alert_type']
+            significance = row['significance_score']
+
+            if alert_type == 'exchange_outflow':
+                # Outflow = accumulation (bullish)
+                bullish_flow += significance
+            elif alert_type == 'exchange_inflow':
+                # Inflow = potential selling (bearish)
+                bearish_flow += significance
+            elif alert_type == 'whale_accumulation':
+                bullish_flow += significance * 1.2
+            elif alert_type == 'whale_distribution':
+                bearish_flow += significance * 1.2
+
+        if bullish_flow == 0 and bearish_flow == 0:
+            return None
+
+        # Determine direction
+        total_flow = bullish_flow + bearish_flow
+        bullish_ratio = bullish_flow / total_flow
+        bearish_ratio = bearish_flow / total_flow
+
+        if bullish_ratio > 0.6:
+            direction = TrendDirection.BULLISH
+            strength = min(bullish_ratio, 1.0)
+        elif bearish_ratio > 0.6:
+            direction = TrendDirection.BEARISH
+            strength = min(bearish_ratio, 1.0)
+        else:
+            direction = TrendDirection.NEUTRAL
+            strength = 0.5
+
+        return {
+            'direction': direction,
+            'strength': strength,
+            'bullish_flow': bullish_flow,
+            'bearish_flow': bearish_flow,
+            'alert_count': len(rows)
+        }
+    
     def _calculate_overall_signal(
         self, 
         price_signal: Optional[dict],
@@ -716,16 +946,11 @@ class SignalAggregator:
             else:
                 routing_key = RoutingKeys.MARKET_SIGNAL
             
-            # Serialize and publish
-            message = aio_pika.Message(
-                body=serialize_message(signal).encode(),
-                content_type="application/json",
-                delivery_mode=aio_pika.DeliveryMode.PERSISTENT
-            )
-            
-            await self.rabbitmq_channel.default_exchange.publish(
-                message,
-                routing_key=routing_key
+            # Queue for the round's batch
+            await self.publisher.publish(
+                routing_key,
+                signal.model_dump(mode="json"),
+                persistent=True
             )
             
             # Store signal in Redis buffer for fast retrieval
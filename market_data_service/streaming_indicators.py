@@ -0,0 +1,312 @@
+"""
+Streaming Technical Indicators
+
+Stateful indicators for IndicatorCalculator subscriptions. Each indicator is
+warmed from history once and then advanced in O(1) per closed kline, so a
+subscription tick reads the current value instead of reloading candles.
+Values match the ``ta`` based calculations in technical_indicator_calculator
+over the same candles.
+"""
+
+import math
+from collections import deque
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+from indicator_models import IndicatorConfiguration, IndicatorType
+
+
+class _Ema:
+    """Exponential moving average with pandas ``ewm(adjust=False)`` semantics"""
+
+    def __init__(self, alpha: float, min_periods: int):
+        self.alpha = alpha
+        self.min_periods = min_periods
+        self.value: Optional[float] = None
+        self.count = 0
+
+    def update(self, x: float) -> None:
+        if self.value is None:
+            self.value = x
+        else:
+            self.value = (1 - self.alpha) * self.value + self.alpha * x
+        self.count += 1
+
+    @property
+    def ready(self) -> bool:
+        return self.count >= self.min_periods
+
+    @property
+    def current(self) -> Optional[float]:
+        return self.value if self.ready else None
+
+
+class _RollingMoments:
+    """Rolling mean and population variance over a fixed window"""
+
+    def __init__(self, window: int):
+        self.window = window
+        self.values: deque = deque()
+        self.mean = 0.0
+        self.m2 = 0.0  # Sum of squared deviations from the mean
+
+    def update(self, x: float) -> None:
+        if len(self.values) < self.window:
+            self.values.append(x)
+            delta = x - self.mean
+            self.mean += delta / len(self.values)
+            self.m2 += delta * (x - self.mean)
+        else:
+            old = self.values.popleft()
+            self.values.append(x)
+            old_mean = self.mean
+            self.mean += (x - old) / self.window
+            self.m2 = max(self.m2 + (x - old) * (x - self.mean + old - old_mean), 0.0)
+
+    @property
+    def ready(self) -> bool:
+        return len(self.values) == self.window
+
+    @property
+    def std(self) -> float:
+        return math.sqrt(self.m2 / self.window)
+
+
+class _RollingExtreme:
+    """Rolling max (or min) over a fixed window using a monotonic deque"""
+
+    def __init__(self, window: int, maximum: bool):
+        self.window = window
+        self.maximum = maximum
+        self.candidates: deque = deque()  # (index, value), best first
+        self.index = -1
+
+    def update(self, x: float) -> None:
+        self.index += 1
+        while self.candidates and (
+            self.candidates[-1][1] <= x if self.maximum else self.candidates[-1][1] >= x
+        ):
+            self.candidates.pop()
+        self.candidates.append((self.index, x))
+        if self.candidates[0][0] <= self.index - self.window:
+            self.candidates.popleft()
+
+    @property
+    def ready(self) -> bool:
+        return self.index + 1 >= self.window
+
+    @property
+    def value(self) -> float:
+        return self.candidates[0][1]
+
+
+class StreamingIndicator:
+    """Base class: feed closed candles in time order, read the latest values"""
+
+    def __init__(self):
+        self.count = 0
+        self.first_timestamp: Optional[datetime] = None
+        self.last_timestamp: Optional[datetime] = None
+
+    def update(self, timestamp: datetime, high: float, low: float, close: float) -> None:
+        """Advance the indicator by one closed candle"""
+        self._update(float(high), float(low), float(close))
+        if self.first_timestamp is None:
+            self.first_timestamp = timestamp
+        self.last_timestamp = timestamp
+        self.count += 1
+
+    def warm_start(self, df: pd.DataFrame) -> None:
+        """Replay historical candles (timestamp/high/low/close columns, oldest first)"""
+        timestamps = pd.to_datetime(df['timestamp'], utc=True)
+        for timestamp, high, low, close in zip(
+            timestamps, df['high'].to_numpy(), df['low'].to_numpy(), df['close'].to_numpy()
+        ):
+            self.update(timestamp.to_pydatetime(), high, low, close)
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        raise NotImplementedError
+
+    def values(self) -> Dict[str, Optional[float]]:
+        """Latest indicator values, keyed like IndicatorCalculator results"""
+        raise NotImplementedError
+
+
+class StreamingSMA(StreamingIndicator):
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        self.key = f"sma_{params['period']}"
+        self.window = _RollingMoments(int(params['period']))
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        self.window.update(close)
+
+    def values(self) -> Dict[str, Optional[float]]:
+        return {self.key: self.window.mean if self.window.ready else None}
+
+
+class StreamingEMA(StreamingIndicator):
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        period = int(params['period'])
+        self.key = f"ema_{params['period']}"
+        self.ema = _Ema(2 / (period + 1), period)
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        self.ema.update(close)
+
+    def values(self) -> Dict[str, Optional[float]]:
+        return {self.key: self.ema.current}
+
+
+class StreamingRSI(StreamingIndicator):
+    """Wilder RSI; like ``ta`` the first candle counts as a zero change"""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        period = int(params['period'])
+        self.key = f"rsi_{params['period']}"
+        self.gains = _Ema(1 / period, period)
+        self.losses = _Ema(1 / period, period)
+        self.prev_close: Optional[float] = None
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        change = 0.0 if self.prev_close is None else close - self.prev_close
+        self.gains.update(max(change, 0.0))
+        self.losses.update(max(-change, 0.0))
+        self.prev_close = close
+
+    def values(self) -> Dict[str, Optional[float]]:
+        if not self.losses.ready:
+            return {self.key: None}
+        if self.losses.value == 0:
+            return {self.key: 100.0}
+        return {self.key: 100 - 100 / (1 + self.gains.value / self.losses.value)}
+
+
+class StreamingMACD(StreamingIndicator):
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        fast_period = int(params.get('fast_period', 12))
+        slow_period = int(params.get('slow_period', 26))
+        signal_period = int(params.get('signal_period', 9))
+        self.fast = _Ema(2 / (fast_period + 1), fast_period)
+        self.slow = _Ema(2 / (slow_period + 1), slow_period)
+        # The signal line starts at the first defined MACD value
+        self.signal = _Ema(2 / (signal_period + 1), signal_period)
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        self.fast.update(close)
+        self.slow.update(close)
+        if self.fast.ready and self.slow.ready:
+            self.signal.update(self.fast.value - self.slow.value)
+
+    def values(self) -> Dict[str, Optional[float]]:
+        if not (self.fast.ready and self.slow.ready):
+            return {'macd_line': None, 'macd_signal': None, 'macd_histogram': None}
+        macd_line = self.fast.value - self.slow.value
+        signal = self.signal.current
+        return {
+            'macd_line': macd_line,
+            'macd_signal': signal,
+            'macd_histogram': macd_line - signal if signal is not None else None
+        }
+
+
+class StreamingBollingerBands(StreamingIndicator):
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        self.window = _RollingMoments(int(params.get('period', 20)))
+        self.std_dev = float(params.get('std_dev', 2))
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        self.window.update(close)
+
+    def values(self) -> Dict[str, Optional[float]]:
+        if not self.window.ready:
+            return {'bb_upper': None, 'bb_middle': None, 'bb_lower': None}
+        middle = self.window.mean
+        width = self.std_dev * self.window.std
+        return {'bb_upper': middle + width, 'bb_middle': middle, 'bb_lower': middle - width}
+
+
+class StreamingStochastic(StreamingIndicator):
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        k_period = int(params.get('k_period', 14))
+        d_period = int(params.get('d_period', 3))
+        self.k_key = f'stoch_k_{k_period}'
+        self.d_key = f'stoch_d_{d_period}'
+        self.highest = _RollingExtreme(k_period, maximum=True)
+        self.lowest = _RollingExtreme(k_period, maximum=False)
+        self.k_values: deque = deque(maxlen=d_period)
+        self.d_period = d_period
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        self.highest.update(high)
+        self.lowest.update(low)
+        k = math.nan
+        if self.highest.ready:
+            price_range = self.highest.value - self.lowest.value
+            if price_range != 0:
+                k = 100 * (close - self.lowest.value) / price_range
+        self.k_values.append(k)
+
+    def values(self) -> Dict[str, Optional[float]]:
+        k = self.k_values[-1] if self.k_values else math.nan
+        d = math.nan
+        if len(self.k_values) == self.d_period:
+            d = sum(self.k_values) / self.d_period
+        return {
+            self.k_key: None if math.isnan(k) else k,
+            self.d_key: None if math.isnan(d) else d
+        }
+
+
+class StreamingATR(StreamingIndicator):
+    """Wilder ATR seeded with the mean true range of the first window"""
+
+    def __init__(self, params: Dict[str, Any]):
+        super().__init__()
+        self.period = int(params.get('period', 14))
+        self.key = f"atr_{self.period}"
+        self.prev_close: Optional[float] = None
+        self.seed_sum = 0.0
+        self.atr: Optional[float] = None
+
+    def _update(self, high: float, low: float, close: float) -> None:
+        true_range = high - low
+        if self.prev_close is not None:
+            true_range = max(true_range, abs(high - self.prev_close), abs(low - self.prev_close))
+        self.prev_close = close
+
+        if self.atr is not None:
+            self.atr = (self.atr * (self.period - 1) + true_range) / self.period
+        else:
+            self.seed_sum += true_range
+            if self.count + 1 == self.period:
+                self.atr = self.seed_sum / self.period
+
+    def values(self) -> Dict[str, Optional[float]]:
+        return {self.key: self.atr}
+
+
+STREAMING_INDICATORS = {
+    IndicatorType.SMA: StreamingSMA,
+    IndicatorType.EMA: StreamingEMA,
+    IndicatorType.RSI: StreamingRSI,
+    IndicatorType.MACD: StreamingMACD,
+    IndicatorType.BOLLINGER_BANDS: StreamingBollingerBands,
+    IndicatorType.STOCHASTIC: StreamingStochastic,
+    IndicatorType.ATR: StreamingATR,
+}
+
+
+def create_streaming_indicator(config: IndicatorConfiguration) -> Optional[StreamingIndicator]:
+    """Streaming state for a configuration, or None if the type has no streaming form"""
+    indicator_class = STREAMING_INDICATORS.get(config.indicator_type)
+    if indicator_class is None:
+        return None
+    return indicator_class({p.name: p.value for p in config.parameters})
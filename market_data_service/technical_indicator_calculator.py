@@ -9,7 +9,7 @@ import asyncio
 import json
 import time
 from datetime import datetime, timezone, timedelta
-from typing import Dict, List, Optional, Any, Tuple
+from typing import Dict, Iterable, List, Optional, Any, Tuple
 from decimal import Decimal
 import hashlib
 
@@ -24,6 +24,10 @@ from indicator_models import (
     IndicatorRequest, BulkIndicatorRequest
 )
 from database import Database
+from shared.lru_cache import LRUCache
+from streaming_indicators import (
+    STREAMING_INDICATORS, StreamingIndicator, create_streaming_indicator
+)
 
 logger = structlog.get_logger()
 
@@ -32,23 +36,42 @@ indicator_calculations = Counter('indicator_calculations_total', 'Total indicato
                                ['indicator_type', 'symbol', 'status'])
 calculation_time = Histogram('indicator_calculation_time_seconds', 'Indicator calculation time',
                             ['indicator_type', 'symbol'])
-cache_operations = Counter('indicator_cache_operations_total', 'Cache operations', ['operation'])
+cache_operations = Counter('indicator_cache_operations_total', 'Cache operations',
+                           ['operation', 'indicator_type'])
+cache_bytes = Gauge('indicator_cache_bytes', 'Estimated bytes held by cached indicator results',
+                    ['indicator_type'])
 active_subscriptions = Gauge('active_indicator_subscriptions', 'Number of active indicator subscriptions')
 
 
+def _result_size(result: IndicatorResult) -> int:
+    """Approximate in-memory size of a cached result (its JSON length)"""
+    return len(result.model_dump_json())
+
+
 class IndicatorCalculator:
     """High-performance technical indicator calculator with caching"""
     
-    def __init__(self, database: Database):
+    def __init__(self, database: Database, streamed_intervals: Iterable[str] = ('1m',)):
         self.database = database
-        self.cache: Dict[str, Dict] = {}  # In-memory cache for results
-        self.cache_ttl: Dict[str, datetime] = {}  # Cache expiration times
         self.subscriptions: Dict[str, Dict] = {}  # Active subscriptions
+        # Streaming state for subscribed configurations: (symbol, interval) -> state key -> indicator.
+        # Identical configurations share one state, keyed like the cache without a timestamp.
+        self.streaming_indicators: Dict[Tuple[str, str], Dict[str, StreamingIndicator]] = {}
+        # Only intervals fed through on_closed_kline get streaming state; others stay batch
+        self.streamed_intervals = set(streamed_intervals)
         
         # Performance settings
         self.max_cache_size = 10000  # Maximum cached results
         self.batch_size = 50  # Default batch size for calculations
         
+        # In-memory LRU cache of IndicatorResult objects, per-entry TTL
+        self.cache: LRUCache[IndicatorResult] = LRUCache(
+            self.max_cache_size,
+            size_of=_result_size,
+            operations_counter=cache_operations,
+            bytes_gauge=cache_bytes
+        )
+        
     def _generate_cache_key(self, config: IndicatorConfiguration, timestamp: datetime = None) -> str:
         """Generate cache key for indicator configuration"""
         key_data = {
@@ -66,39 +89,23 @@ class IndicatorCalculator:
         key_string = json.dumps(key_data, sort_keys=True)
         return hashlib.md5(key_string.encode()).hexdigest()
     
-    async def _get_cached_result(self, cache_key: str) -> Optional[IndicatorResult]:
+    async def _get_cached_result(self, cache_key: str, indicator_type: str) -> Optional[IndicatorResult]:
         """Get cached result if still valid"""
-        if cache_key in self.cache and cache_key in self.cache_ttl:
-            if datetime.utcnow() < self.cache_ttl[cache_key]:
-                cache_operations.labels(operation='hit').inc()
-                result = IndicatorResult(**self.cache[cache_key])
-                result.cache_hit = True
-                return result
-            else:
-                # Expired cache entry
-                del self.cache[cache_key]
-                del self.cache_ttl[cache_key]
-                
-        cache_operations.labels(operation='miss').inc()
-        return None
+        result = self.cache.get(cache_key, category=indicator_type)
+        if result is None:
+            return None
+        # Shallow copy so the stored result keeps cache_hit=False
+        return result.model_copy(update={'cache_hit': True})
     
-    def _cache_result(self, cache_key: str, result: IndicatorResult, ttl_minutes: int):
+    def _cache_result(self, cache_key: str, result: IndicatorResult, ttl_minutes: int, indicator_type: str):
         """Cache calculation result"""
-        # Cleanup old cache entries if at capacity
-        if len(self.cache) >= self.max_cache_size:
-            # Remove oldest entries (simple FIFO cleanup)
-            oldest_keys = list(self.cache.keys())[:100]  # Remove 100 oldest
-            for key in oldest_keys:
-                self.cache.pop(key, None)
-                self.cache_ttl.pop(key, None)
-        
-        # Cache new result
-        self.cache[cache_key] = result.dict()
-        self.cache_ttl[cache_key] = datetime.utcnow() + timedelta(minutes=ttl_minutes)
-        cache_operations.labels(operation='set').inc()
+        if ttl_minutes <= 0:
+            return
+        self.cache.set(cache_key, result, ttl_seconds=ttl_minutes * 60, category=indicator_type)
     
-    async def _get_market_data(self, symbol: str, interval: str, periods: int) -> pd.DataFrame:
-        """Get market data for calculation"""
+    async def _get_market_data(self, symbol: str, interval: str, periods: int,
+                               min_periods: Optional[int] = None) -> pd.DataFrame:
+        """Get market data for calculation; fails with fewer than ``min_periods`` (default ``periods``) candles"""
         try:
             # Calculate how much historical data we need
             hours_back = periods * self._interval_to_minutes(interval) // 60
@@ -112,8 +119,9 @@ class IndicatorCalculator:
                 limit=periods + 50  # Get extra data for calculation accuracy
             )
             
-            if len(data) < periods:
-                raise ValueError(f"Insufficient data: need {periods}, got {len(data)}")
+            required = periods if min_periods is None else min_periods
+            if len(data) < required:
+                raise ValueError(f"Insufficient data: need {required}, got {len(data)}")
             
             # Convert to DataFrame
             df = pd.DataFrame([{
@@ -126,6 +134,7 @@ class IndicatorCalculator:
             } for item in data])
             
             # Sort by timestamp
+            df['timestamp'] = pd.to_datetime(df['timestamp'], utc=True)
             df = df.sort_values('timestamp').reset_index(drop=True)
             
             return df
@@ -140,10 +149,18 @@ class IndicatorCalculator:
         interval_map = {
             '1m': 1, '3m': 3, '5m': 5, '15m': 15, '30m': 30,
             '1h': 60, '2h': 120, '4h': 240, '6h': 360, '8h': 480, '12h': 720,
-            '1d': 1440, '3d': 4320, '1w': 10080, '1M': 43200
+            '1d': 1440, '3d': 4320, '1w': 10080, '1M': 43200  # 1M approximate; see _next_open
         }
         return interval_map.get(interval, 60)  # Default to 1 hour
     
+    def _next_open(self, interval: str, timestamp: datetime) -> datetime:
+        """Open time of the kline following the one opened at ``timestamp``"""
+        if interval == '1M':
+            # Calendar months: Binance monthly klines open on the 1st
+            year, month = divmod(timestamp.month, 12)
+            return timestamp.replace(year=timestamp.year + year, month=month + 1)
+        return timestamp + timedelta(minutes=self._interval_to_minutes(interval))
+    
     async def calculate_sma(self, df: pd.DataFrame, config: IndicatorConfiguration) -> Dict[str, float]:
         """Calculate Simple Moving Average"""
         period = next(p.value for p in config.parameters if p.name == 'period')
@@ -222,6 +239,19 @@ class IndicatorCalculator:
             f'stoch_d_{d_period}': float(stoch_d.iloc[-1]) if not pd.isna(stoch_d.iloc[-1]) else None
         }
     
+    async def calculate_atr(self, df: pd.DataFrame, config: IndicatorConfiguration) -> Dict[str, float]:
+        """Calculate Average True Range"""
+        params = {p.name: p.value for p in config.parameters}
+        period = int(params.get('period', 14))
+        if len(df) < period:
+            return {f'atr_{period}': None}
+        
+        atr = ta.volatility.average_true_range(df['high'], df['low'], df['close'], window=period)
+        
+        return {
+            f'atr_{period}': float(atr.iloc[-1]) if not pd.isna(atr.iloc[-1]) else None
+        }
+    
     async def calculate_indicator(self, config: IndicatorConfiguration) -> IndicatorResult:
         """Calculate a single technical indicator"""
         start_time = time.time()
@@ -229,86 +259,181 @@ class IndicatorCalculator:
         try:
             # Check cache first
             cache_key = self._generate_cache_key(config, datetime.utcnow())
-            cached_result = await self._get_cached_result(cache_key)
+            cached_result = await self._get_cached_result(cache_key, config.indicator_type.value)
             if cached_result:
                 return cached_result
             
-            # Get market data
-            df = await self._get_market_data(
-                config.symbol, 
-                config.interval, 
-                config.periods_required
-            )
-            
-            # Calculate indicator based on type
-            calculation_methods = {
-                IndicatorType.SMA: self.calculate_sma,
-                IndicatorType.EMA: self.calculate_ema,
-                IndicatorType.RSI: self.calculate_rsi,
-                IndicatorType.MACD: self.calculate_macd,
-                IndicatorType.BOLLINGER_BANDS: self.calculate_bollinger_bands,
-                IndicatorType.STOCHASTIC: self.calculate_stochastic,
-            }
-            
-            if config.indicator_type not in calculation_methods:
-                raise ValueError(f"Unsupported indicator type: {config.indicator_type}")
-            
-            values = await calculation_methods[config.indicator_type](df, config)
-            
-            # Create result
-            calculation_time_ms = (time.time() - start_time) * 1000
-            result = IndicatorResult(
-                configuration_id=config.id,
-                symbol=config.symbol,
-                interval=config.interval,
-                timestamp=datetime.utcnow(),
-                values=values,
-                metadata={
-                    'parameters': {p.name: p.value for p in config.parameters},
-                    'data_range': {
-                        'start': df['timestamp'].iloc[0].isoformat() if len(df) > 0 else None,
-                        'end': df['timestamp'].iloc[-1].isoformat() if len(df) > 0 else None
-                    }
-                },
-                data_points_used=len(df),
-                calculation_time_ms=calculation_time_ms
-            )
-            
-            # Cache result
-            self._cache_result(cache_key, result, config.cache_duration_minutes)
-            
-            # Update metrics
-            indicator_calculations.labels(
-                indicator_type=config.indicator_type,
-                symbol=config.symbol,
-                status='success'
-            ).inc()
-            
-            calculation_time.labels(
-                indicator_type=config.indicator_type,
-                symbol=config.symbol
-            ).observe(calculation_time_ms / 1000)
+            result = self._streaming_result(config, start_time)
+            if result is None:
+                # Get market data
+                df = await self._get_market_data(
+                    config.symbol,
+                    config.interval,
+                    config.periods_required
+                )
+                result = await self._calculate_from_data(config, df, start_time)
             
+            self._record_result(config, cache_key, result)
             return result
             
         except Exception as e:
-            logger.error("Error calculating indicator", 
-                        indicator_type=config.indicator_type,
-                        symbol=config.symbol, 
-                        error=str(e))
-            
-            indicator_calculations.labels(
-                indicator_type=config.indicator_type,
-                symbol=config.symbol,
-                status='error'
-            ).inc()
+            self._record_error(config, e)
             raise
     
+    def _streaming_result(self, config: IndicatorConfiguration, start_time: float) -> Optional[IndicatorResult]:
+        """Result from warmed streaming state (current as of the last closed kline), if any"""
+        streaming_indicator = self._get_streaming_indicator(config)
+        if streaming_indicator is None or streaming_indicator.count < config.periods_required:
+            return None
+        if not self._is_streaming_fresh(config.interval, streaming_indicator):
+            # Klines stopped arriving; the batch path reads newer bars from the database
+            return None
+        return self._build_result(
+            config,
+            streaming_indicator.values(),
+            streaming_indicator.first_timestamp,
+            streaming_indicator.last_timestamp,
+            streaming_indicator.count,
+            'streaming',
+            start_time
+        )
+    
+    async def _calculate_from_data(self, config: IndicatorConfiguration, df: pd.DataFrame,
+                                   start_time: float) -> IndicatorResult:
+        """Calculate an indicator over candles already loaded for its symbol/interval"""
+        if len(df) < config.periods_required:
+            raise ValueError(f"Insufficient data: need {config.periods_required}, got {len(df)}")
+        
+        # Same window a single calculation loads, so results do not depend on batching
+        df = df.iloc[-(config.periods_required + 50):]
+        
+        # Calculate indicator based on type
+        calculation_methods = {
+            IndicatorType.SMA: self.calculate_sma,
+            IndicatorType.EMA: self.calculate_ema,
+            IndicatorType.RSI: self.calculate_rsi,
+            IndicatorType.MACD: self.calculate_macd,
+            IndicatorType.BOLLINGER_BANDS: self.calculate_bollinger_bands,
+            IndicatorType.STOCHASTIC: self.calculate_stochastic,
+            IndicatorType.ATR: self.calculate_atr,
+        }
+        
+        if config.indicator_type not in calculation_methods:
+            raise ValueError(f"Unsupported indicator type: {config.indicator_type}")
+        
+        values = await calculation_methods[config.indicator_type](df, config)
+        return self._build_result(
+            config,
+            values,
+            df['timestamp'].iloc[0] if len(df) > 0 else None,
+            df['timestamp'].iloc[-1] if len(df) > 0 else None,
+            len(df),
+            'batch',
+            start_time
+        )
+    
+    def _build_result(self, config: IndicatorConfiguration, values: Dict[str, Optional[float]],
+                      data_start: Optional[datetime], data_end: Optional[datetime],
+                      data_points: int, source: str, start_time: float) -> IndicatorResult:
+        """Create the result for a calculation"""
+        return IndicatorResult(
+            configuration_id=config.id,
+            symbol=config.symbol,
+            interval=config.interval,
+            timestamp=datetime.utcnow(),
+            values=values,
+            metadata={
+                'parameters': {p.name: p.value for p in config.parameters},
+                'data_range': {
+                    'start': data_start.isoformat() if data_start is not None else None,
+                    'end': data_end.isoformat() if data_end is not None else None
+                },
+                'source': source
+            },
+            data_points_used=data_points,
+            calculation_time_ms=(time.time() - start_time) * 1000
+        )
+    
+    def _record_result(self, config: IndicatorConfiguration, cache_key: str, result: IndicatorResult):
+        """Cache a fresh result and update metrics"""
+        self._cache_result(cache_key, result, config.cache_duration_minutes, config.indicator_type.value)
+        
+        indicator_calculations.labels(
+            indicator_type=config.indicator_type,
+            symbol=config.symbol,
+            status='success'
+        ).inc()
+        
+        calculation_time.labels(
+            indicator_type=config.indicator_type,
+            symbol=config.symbol
+        ).observe(result.calculation_time_ms / 1000)
+    
+    def _record_error(self, config: IndicatorConfiguration, error: Exception):
+        """Log a failed calculation and update metrics"""
+        logger.error("Error calculating indicator", 
+                    indicator_type=config.indicator_type,
+                    symbol=config.symbol, 
+                    error=str(error))
+        
+        indicator_calculations.labels(
+            indicator_type=config.indicator_type,
+            symbol=config.symbol,
+            status='error'
+        ).inc()
+    
+    async def _calculate_group(self, symbol: str, interval: str,
+                               configs: List[IndicatorConfiguration]) -> List[IndicatorResult]:
+        """Calculate configurations of one symbol/interval over a single candle load"""
+        results = []
+        pending = []
+        
+        # Cached and streaming results need no candles
+        for config in configs:
+            start_time = time.time()
+            cache_key = self._generate_cache_key(config, datetime.utcnow())
+            result = await self._get_cached_result(cache_key, config.indicator_type.value)
+            if result is None:
+                result = self._streaming_result(config, start_time)
+                if result is None:
+                    pending.append((config, cache_key))
+                    continue
+                self._record_result(config, cache_key, result)
+            results.append(result)
+        
+        if not pending:
+            return results
+        
+        # One load sized to the longest lookback; shorter ones use its tail
+        try:
+            df = await self._get_market_data(
+                symbol,
+                interval,
+                max(config.periods_required for config, _ in pending),
+                min_periods=min(config.periods_required for config, _ in pending)
+            )
+        except Exception as e:
+            for config, _ in pending:
+                self._record_error(config, e)
+            return results
+        
+        for config, cache_key in pending:
+            start_time = time.time()
+            try:
+                result = await self._calculate_from_data(config, df, start_time)
+            except Exception as e:
+                self._record_error(config, e)
+                continue
+            self._record_result(config, cache_key, result)
+            results.append(result)
+        
+        return results
+    
     async def calculate_bulk_indicators(self, request: BulkIndicatorRequest) -> List[IndicatorResult]:
         """Calculate multiple indicators efficiently"""
         results = []
         
-        # Group by symbol and interval for efficiency
+        # Group by symbol and interval so each group loads its candles once
         grouped_configs = {}
         for indicator_request in request.requests:
             for config in indicator_request.indicators:
@@ -317,38 +442,117 @@ class IndicatorCalculator:
                     grouped_configs[key] = []
                 grouped_configs[key].append(config)
         
-        # Calculate in batches
+        groups = list(grouped_configs.items())
         if request.parallel_execution:
-            # Parallel execution
-            tasks = []
-            for configs in grouped_configs.values():
-                for config in configs:
-                    task = asyncio.create_task(self.calculate_indicator(config))
-                    tasks.append(task)
-            
-            # Process in batches to avoid overwhelming the system
-            batch_size = request.batch_size
-            for i in range(0, len(tasks), batch_size):
-                batch = tasks[i:i + batch_size]
-                batch_results = await asyncio.gather(*batch, return_exceptions=True)
+            # Parallel execution, batch_size groups at a time to avoid overwhelming the system
+            batch_size = max(request.batch_size, 1)
+            for i in range(0, len(groups), batch_size):
+                batch = groups[i:i + batch_size]
+                batch_results = await asyncio.gather(
+                    *[self._calculate_group(symbol, interval, configs)
+                      for (symbol, interval), configs in batch],
+                    return_exceptions=True
+                )
                 
-                for result in batch_results:
-                    if isinstance(result, Exception):
-                        logger.error("Batch calculation error", error=str(result))
+                for group_results in batch_results:
+                    if isinstance(group_results, Exception):
+                        logger.error("Batch calculation error", error=str(group_results))
                     else:
-                        results.append(result)
+                        results.extend(group_results)
         else:
             # Sequential execution
-            for configs in grouped_configs.values():
-                for config in configs:
-                    try:
-                        result = await self.calculate_indicator(config)
-                        results.append(result)
-                    except Exception as e:
-                        logger.error("Sequential calculation error", error=str(e))
+            for (symbol, interval), configs in groups:
+                try:
+                    results.extend(await self._calculate_group(symbol, interval, configs))
+                except Exception as e:
+                    logger.error("Sequential calculation error", error=str(e))
         
         return results
     
+    def _is_streaming_fresh(self, interval: str, indicator: StreamingIndicator) -> bool:
+        """Whether the state's last kline closed within one interval of now"""
+        if indicator.last_timestamp is None:
+            return False
+        last_close = self._next_open(interval, indicator.last_timestamp)
+        return datetime.now(timezone.utc) < self._next_open(interval, last_close)
+    
+    def _get_streaming_indicator(self, config: IndicatorConfiguration) -> Optional[StreamingIndicator]:
+        """Streaming state for a subscribed configuration, if warmed"""
+        states = self.streaming_indicators.get((config.symbol, config.interval))
+        if not states:
+            return None
+        return states.get(self._generate_cache_key(config))
+    
+    async def _warm_start_streaming(self, configurations: List[IndicatorConfiguration]):
+        """Create streaming state from history for configurations that have none"""
+        pending: Dict[Tuple[str, str], List[IndicatorConfiguration]] = {}
+        for config in configurations:
+            if (config.interval in self.streamed_intervals
+                    and config.indicator_type in STREAMING_INDICATORS
+                    and self._get_streaming_indicator(config) is None):
+                pending.setdefault((config.symbol, config.interval), []).append(config)
+        
+        # One history load per symbol/interval, sized for the longest lookback
+        for (symbol, interval), configs in pending.items():
+            try:
+                df = await self._get_market_data(symbol, interval, max(c.periods_required for c in configs))
+            except Exception as e:
+                logger.warning("Streaming indicator warm start failed, using batch calculation",
+                               symbol=symbol, interval=interval, error=str(e))
+                continue
+            
+            states = self.streaming_indicators.setdefault((symbol, interval), {})
+            for config in configs:
+                state_key = self._generate_cache_key(config)
+                if state_key in states:
+                    continue
+                try:
+                    indicator = create_streaming_indicator(config)
+                except (KeyError, TypeError, ValueError) as e:
+                    logger.warning("Invalid streaming indicator parameters, using batch calculation",
+                                   configuration_id=config.id, error=str(e))
+                    continue
+                indicator.warm_start(df)
+                states[state_key] = indicator
+    
+    def _prune_streaming_indicators(self):
+        """Drop streaming state no longer used by any subscription"""
+        in_use = {
+            self._generate_cache_key(config)
+            for subscription in self.subscriptions.values()
+            for config in subscription['configurations']
+        }
+        for market, states in list(self.streaming_indicators.items()):
+            for state_key in [key for key in states if key not in in_use]:
+                del states[state_key]
+            if not states:
+                del self.streaming_indicators[market]
+    
+    def on_closed_kline(self, symbol: str, interval: str, timestamp: datetime,
+                        high: float, low: float, close: float) -> int:
+        """Advance streaming indicators with a closed kline; returns the number updated"""
+        states = self.streaming_indicators.get((symbol, interval))
+        if not states:
+            return 0
+        
+        updated = 0
+        for state_key, indicator in list(states.items()):
+            last_timestamp = indicator.last_timestamp
+            if last_timestamp is not None:
+                if timestamp <= last_timestamp:
+                    continue  # Replayed kline
+                if timestamp > self._next_open(interval, last_timestamp):
+                    # Missed klines: the next subscription pass warms this state again
+                    logger.warning("Kline gap in streaming indicator, re-warming",
+                                   symbol=symbol, interval=interval,
+                                   last_timestamp=last_timestamp.isoformat(),
+                                   timestamp=timestamp.isoformat())
+                    del states[state_key]
+                    continue
+            indicator.update(timestamp, high, low, close)
+            updated += 1
+        return updated
+    
     async def create_subscription(self, subscription_id: str, 
                                 configurations: List[IndicatorConfiguration]) -> bool:
         """Create a subscription for continuous indicator updates"""
@@ -359,6 +563,7 @@ class IndicatorCalculator:
                 'last_calculation': None
             }
             active_subscriptions.set(len(self.subscriptions))
+            await self._warm_start_streaming(configurations)
             return True
         except Exception as e:
             logger.error("Error creating indicator subscription", error=str(e))
@@ -370,6 +575,7 @@ class IndicatorCalculator:
             if subscription_id in self.subscriptions:
                 del self.subscriptions[subscription_id]
                 active_subscriptions.set(len(self.subscriptions))
+                self._prune_streaming_indicators()
                 return True
             return False
         except Exception as e:
@@ -383,6 +589,9 @@ class IndicatorCalculator:
                 configurations = subscription_data['configurations']
                 results = []
                 
+                # Re-warm state dropped after a kline gap; otherwise a no-op
+                await self._warm_start_streaming(configurations)
+                
                 for config in configurations:
                     result = await self.calculate_indicator(config)
                     results.append(result)
@@ -399,10 +608,14 @@ class IndicatorCalculator:
     
     def get_cache_statistics(self) -> Dict[str, Any]:
         """Get cache performance statistics"""
+        cache_stats = self.cache.statistics()
         return {
-            'cache_size': len(self.cache),
+            'cache_size': cache_stats['entries'],
             'max_cache_size': self.max_cache_size,
-            'cache_hit_ratio': cache_operations._value._samples.get(('hit',), 0) / 
-                             max(cache_operations._value._samples.get(('miss',), 1), 1),
-            'active_subscriptions': len(self.subscriptions)
+            'cache_hit_ratio': cache_stats['hit_ratio'],
+            'cache_size_bytes': cache_stats['size_bytes'],
+            'cache_evictions': cache_stats['evictions'],
+            'cache_by_indicator': cache_stats['categories'],
+            'active_subscriptions': len(self.subscriptions),
+            'streaming_indicators': sum(len(states) for states in self.streaming_indicators.values())
         }
\ No newline at end of file
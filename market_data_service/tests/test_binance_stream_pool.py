@@ -0,0 +1,248 @@
+"""
+Unit Tests for the Binance combined-stream connection pool
+
+Tests:
+- Packing streams onto combined-stream connections
+- Demultiplexing messages by stream name
+- Live SUBSCRIBE/UNSUBSCRIBE without reconnecting
+- Resubscription after a server disconnect
+- Backoff when the server closes connections before sending data
+- EnhancedWebSocketManager sharing the pool across symbols
+"""
+
+import asyncio
+import json
+from unittest.mock import AsyncMock, Mock
+from urllib.parse import parse_qs, urlparse
+
+import pytest
+import websockets
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from binance_stream_pool import BinanceStreamPool
+from database import Database
+from multi_symbol_websocket_manager import EnhancedWebSocketManager, StreamType
+
+
+class FakeBinanceServer:
+    """Combined-stream endpoint: streams from the URL plus SUBSCRIBE/UNSUBSCRIBE frames"""
+
+    def __init__(self, close_on_connect=False):
+        self.close_on_connect = close_on_connect  # Accept, then close at once (e.g. rate limited)
+        self.connections = []  # Per connection: set of subscribed streams
+        self.control_messages = []
+        self._sockets = []
+        self._server = None
+
+    @property
+    def url(self):
+        port = self._server.sockets[0].getsockname()[1]
+        return f"ws://127.0.0.1:{port}/stream"
+
+    async def __aenter__(self):
+        self._server = await websockets.serve(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc_info):
+        self._server.close()
+        await self._server.wait_closed()
+
+    async def _handle(self, websocket):
+        query = parse_qs(urlparse(websocket.path).query)
+        streams = set(query["streams"][0].split("/"))
+        self.connections.append(streams)
+        self._sockets.append(websocket)
+        if self.close_on_connect:
+            await websocket.close()
+            return
+        async for raw_message in websocket:
+            message = json.loads(raw_message)
+            self.control_messages.append(message)
+            if message["method"] == "SUBSCRIBE":
+                streams.update(message["params"])
+            else:
+                streams.difference_update(message["params"])
+            await websocket.send(json.dumps({"result": None, "id": message["id"]}))
+
+    async def push(self, stream, data):
+        """Send a message to every connection subscribed to the stream"""
+        for streams, websocket in zip(self.connections, self._sockets):
+            if stream in streams and websocket.open:
+                await websocket.send(json.dumps({"stream": stream, "data": data}))
+
+    async def drop_connections(self):
+        for websocket in self._sockets:
+            await websocket.close()
+
+
+async def _until(predicate, timeout=5.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while not predicate():
+        assert asyncio.get_running_loop().time() < deadline, "condition not reached"
+        await asyncio.sleep(0.01)
+
+
+def _collector():
+    received = []
+
+    async def handler(stream, data):
+        received.append((stream, data))
+
+    return received, handler
+
+
+class TestBinanceStreamPool:
+    def test_combined_url(self):
+        pool = BinanceStreamPool("wss://stream.binance.com:9443/stream/", Mock())
+
+        assert pool.combined_url(["btcusdc@ticker", "ethusdc@kline_1m"]) == \
+            "wss://stream.binance.com:9443/stream?streams=btcusdc@ticker/ethusdc@kline_1m"
+
+    @pytest.mark.asyncio
+    async def test_streams_are_packed_and_demultiplexed(self):
+        received, handler = _collector()
+        streams = [f"sym{i}usdc@ticker" for i in range(5)]
+
+        async with FakeBinanceServer() as server:
+            pool = BinanceStreamPool(server.url, handler, max_streams_per_connection=2)
+            assert await pool.subscribe(streams) == 5
+            await _until(lambda: all(pool.is_connected(s) for s in streams))
+
+            assert pool.connection_count == 3
+            assert sorted(len(c) for c in server.connections) == [1, 2, 2]
+            assert server.control_messages == []  # Initial streams go in the URL
+
+            for i, stream in enumerate(streams):
+                await server.push(stream, {"i": i})
+            await _until(lambda: len(received) == 5)
+
+            assert sorted(received, key=lambda r: r[1]["i"]) == [(s, {"i": i}) for i, s in enumerate(streams)]
+            assert pool.statistics()["messages_received"] == 5
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_live_subscribe_and_unsubscribe_reuse_the_connection(self):
+        received, handler = _collector()
+
+        async with FakeBinanceServer() as server:
+            pool = BinanceStreamPool(server.url, handler)
+            await pool.subscribe(["btcusdc@ticker"])
+            await _until(lambda: pool.is_connected("btcusdc@ticker"))
+
+            await pool.subscribe(["ethusdc@ticker", "solusdc@ticker"])
+            await pool.unsubscribe(["btcusdc@ticker"])
+            await _until(lambda: len(server.control_messages) == 2)
+
+            assert len(server.connections) == 1
+            assert [(m["method"], sorted(m["params"])) for m in server.control_messages] == [
+                ("SUBSCRIBE", ["ethusdc@ticker", "solusdc@ticker"]),
+                ("UNSUBSCRIBE", ["btcusdc@ticker"]),
+            ]
+            assert server.connections[0] == {"ethusdc@ticker", "solusdc@ticker"}
+            assert not pool.is_connected("btcusdc@ticker")
+            assert pool.is_connected("ethusdc@ticker")
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_empty_connections_are_closed(self):
+        _, handler = _collector()
+
+        async with FakeBinanceServer() as server:
+            pool = BinanceStreamPool(server.url, handler, max_streams_per_connection=1)
+            await pool.subscribe(["btcusdc@ticker", "ethusdc@ticker"])
+            await _until(lambda: pool.statistics()["connected"] == 2)
+
+            assert await pool.unsubscribe(["btcusdc@ticker", "unknown@ticker"]) == 1
+
+            assert pool.connection_count == 1
+            assert pool.streams == {"ethusdc@ticker"}
+            await pool.close()
+            assert pool.connection_count == 0
+
+    @pytest.mark.asyncio
+    async def test_reconnect_resubscribes_current_streams(self):
+        received, handler = _collector()
+
+        async with FakeBinanceServer() as server:
+            pool = BinanceStreamPool(server.url, handler, reconnect_interval=0.05)
+            await pool.subscribe(["btcusdc@ticker", "ethusdc@ticker"])
+            await _until(lambda: pool.is_connected("btcusdc@ticker"))
+
+            await server.drop_connections()
+            await pool.unsubscribe(["btcusdc@ticker"])  # Changed while disconnected
+            await _until(lambda: len(server.connections) == 2 and pool.is_connected("ethusdc@ticker"))
+
+            assert server.connections[1] == {"ethusdc@ticker"}
+            await server.push("ethusdc@ticker", {"p": "1"})
+            await _until(lambda: received == [("ethusdc@ticker", {"p": "1"})])
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_closes_without_data_back_off_and_give_up(self):
+        _, handler = _collector()
+
+        async with FakeBinanceServer(close_on_connect=True) as server:
+            pool = BinanceStreamPool(server.url, handler, reconnect_interval=0.05, max_reconnect_attempts=3)
+            loop = asyncio.get_running_loop()
+            started = loop.time()
+            await pool.subscribe(["btcusdc@ticker"])
+            connection = pool._assignments["btcusdc@ticker"]
+            await _until(lambda: connection.task.done())
+
+            assert len(server.connections) == 3
+            assert loop.time() - started >= 0.05 * (1 + 2)  # Backed off before each reconnect
+            assert pool.statistics()["per_connection"][0]["reconnect_attempts"] == 3
+            await pool.close()
+
+    @pytest.mark.asyncio
+    async def test_closed_pool_rejects_subscriptions(self):
+        pool = BinanceStreamPool("ws://127.0.0.1:1/stream", Mock())
+        await pool.close()
+        await pool.wait_closed()
+
+        with pytest.raises(RuntimeError):
+            await pool.subscribe(["btcusdc@ticker"])
+
+
+class TestEnhancedWebSocketManager:
+    @pytest.mark.asyncio
+    async def test_symbols_share_combined_connections(self, monkeypatch):
+        async with FakeBinanceServer() as server:
+            database = Mock(spec=Database)
+            database.upsert_item = AsyncMock()
+            manager = EnhancedWebSocketManager(database)
+            monkeypatch.setattr(manager, "websocket_url", server.url)
+            tickers = []
+
+            async def on_ticker(symbol, data):
+                tickers.append((symbol, data["c"]))
+
+            manager.register_callback(StreamType.TICKER, on_ticker)
+            await manager.start()
+            await manager.add_symbols(["BTCUSDC", "ETHUSDC"], stream_types=[StreamType.TICKER, StreamType.TRADE])
+            await _until(lambda: manager.stream_pool.statistics()["connected"] == 1)
+
+            assert len(server.connections) == 1
+            assert server.connections[0] == {
+                "btcusdc@ticker", "btcusdc@trade", "ethusdc@ticker", "ethusdc@trade"
+            }
+
+            await server.push("ethusdc@ticker", {"c": "2500.5", "o": "2400", "h": "2600", "l": "2300",
+                                                 "v": "10", "q": "25000", "P": "4.2", "p": "100.5"})
+            await _until(lambda: tickers)
+            assert tickers == [("ETHUSDC", "2500.5")]
+            assert database.upsert_item.await_args.args[0]["last_price"] == "2500.5"
+
+            await manager.remove_symbols(["BTCUSDC"])
+            await _until(lambda: server.control_messages)
+            assert server.control_messages[-1]["method"] == "UNSUBSCRIBE"
+            assert sorted(server.control_messages[-1]["params"]) == ["btcusdc@ticker", "btcusdc@trade"]
+
+            health = manager.get_health_status()
+            assert health["total_streams"] == 2
+            assert health["connections"]["connections"] == 1
+            await manager.stop()
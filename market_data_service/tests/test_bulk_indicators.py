@@ -0,0 +1,109 @@
+"""
+Unit Tests for bulk indicator calculation
+
+Tests:
+- One candle load per symbol/interval, sized to the longest lookback
+- Per-config results identical to single calculations
+- Groups with too little history for some configurations
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from database import Database
+from indicator_models import BulkIndicatorRequest, IndicatorRequest
+from technical_indicator_calculator import IndicatorCalculator
+from tests.test_streaming_indicators import CONFIGS, _candles, _config, _documents
+
+SYMBOLS = ["BTCUSDC", "ETHUSDC"]
+
+
+def _symbol_config(symbol, indicator_type, params, periods_required):
+    config = _config(indicator_type, params, config_id=f"{symbol}_{indicator_type.value}",
+                     periods_required=periods_required)
+    return config.model_copy(update={"symbol": symbol})
+
+
+def _database(n_bars=300):
+    documents = {symbol: _documents(_candles(n_bars, seed=i)) for i, symbol in enumerate(SYMBOLS)}
+
+    async def get_market_data(symbol, interval, hours_back, limit):
+        return documents[symbol][-limit:]
+
+    database = Mock(spec=Database)
+    database.get_market_data = AsyncMock(side_effect=get_market_data)
+    return database
+
+
+def _request(configs, parallel_execution=True):
+    return BulkIndicatorRequest(
+        strategy_id="strategy-1",
+        requests=[IndicatorRequest(strategy_id="strategy-1", indicators=configs,
+                                   symbols=SYMBOLS, intervals=["1m"])],
+        parallel_execution=parallel_execution,
+    )
+
+
+def _configs():
+    return [
+        _symbol_config(symbol, indicator_type, params, periods_required=40 + 20 * i)
+        for symbol in SYMBOLS
+        for i, (indicator_type, params) in enumerate(CONFIGS)
+    ]
+
+
+class TestBulkIndicators:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("parallel_execution", [True, False])
+    async def test_one_load_per_symbol_interval(self, parallel_execution):
+        database = _database()
+        configs = _configs()
+
+        results = await IndicatorCalculator(database).calculate_bulk_indicators(
+            _request(configs, parallel_execution)
+        )
+
+        assert [r.configuration_id for r in results] == [c.id for c in configs]
+        assert database.get_market_data.await_count == len(SYMBOLS)
+        longest = max(c.periods_required for c in configs)
+        assert {call.kwargs["limit"] for call in database.get_market_data.await_args_list} == {longest + 50}
+
+    @pytest.mark.asyncio
+    async def test_results_match_single_calculations(self):
+        configs = _configs()
+        bulk = await IndicatorCalculator(_database()).calculate_bulk_indicators(_request(configs))
+
+        single = IndicatorCalculator(_database())
+        for config, result in zip(configs, bulk):
+            expected = await single.calculate_indicator(config)
+            assert result.values == expected.values
+            assert result.data_points_used == expected.data_points_used
+            assert result.metadata["data_range"] == expected.metadata["data_range"]
+
+    @pytest.mark.asyncio
+    async def test_short_history_only_fails_longer_lookbacks(self):
+        database = _database(n_bars=120)
+        configs = _configs()
+
+        results = await IndicatorCalculator(database).calculate_bulk_indicators(_request(configs))
+
+        assert {r.configuration_id for r in results} == {c.id for c in configs if c.periods_required <= 120}
+        assert database.get_market_data.await_count == len(SYMBOLS)
+
+    @pytest.mark.asyncio
+    async def test_cached_results_skip_the_load(self):
+        database = _database()
+        calculator = IndicatorCalculator(database)
+        configs = [c for c in _configs() if c.symbol == "BTCUSDC"]
+        await calculator.calculate_bulk_indicators(_request(configs))
+
+        results = await calculator.calculate_bulk_indicators(_request(configs))
+
+        assert all(r.cache_hit for r in results)
+        assert database.get_market_data.await_count == 1
@@ -0,0 +1,165 @@
+"""
+Unit Tests for the bulk market data upsert
+
+Tests:
+- Staging COPY + single merge per batch into market_data_ohlcv
+- Row parity with the single-record insert path
+- Conversion errors and duplicate ids
+- Rows built from kline arrays
+"""
+
+import json
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from database import MARKET_DATA_COLUMNS, MARKET_DATA_TTL_SECONDS, Database, market_data_rows
+from models import MarketData
+
+
+class FakeConnection:
+    """Records the statements issued inside a transaction"""
+
+    def __init__(self):
+        self.executed = []
+        self.copied = []
+
+    async def execute(self, query, *args):
+        self.executed.append((" ".join(query.split()), args))
+
+    async def copy_records_to_table(self, table, records, columns):
+        self.copied.append((table, list(records), columns))
+
+
+class FakePostgres:
+    def __init__(self):
+        self.connection = FakeConnection()
+        self.execute = AsyncMock()
+        self.transactions = 0
+
+    @asynccontextmanager
+    async def transaction(self):
+        self.transactions += 1
+        yield self.connection
+
+
+def _kline(symbol, minute, close="100.5"):
+    timestamp = datetime(2024, 1, 1, 0, minute)
+    return {
+        "id": f"{symbol}_1m_{minute}",
+        "symbol": symbol,
+        "interval": "1m",
+        "timestamp": timestamp.isoformat() + "Z",
+        "open_price": "100.0",
+        "high_price": "101.0",
+        "low_price": "99.0",
+        "close_price": close,
+        "volume": "12.5",
+        "quote_asset_volume": "1250.0",
+        "number_of_trades": 42,
+    }
+
+
+def _typed_fields(row):
+    """Row values without the per-write created_at stamp kept in ``extra``"""
+    return row[:-1]
+
+
+@pytest.fixture
+def database():
+    db = Database.__new__(Database)
+    db._postgres = FakePostgres()
+    db._schema_initialized = True
+    return db
+
+
+class TestBulkUpsert:
+    @pytest.mark.asyncio
+    async def test_batch_uses_one_copy_and_one_merge(self, database):
+        klines = [_kline("BTCUSDC", minute) for minute in range(50)]
+
+        stored = await database.upsert_market_data_batch(klines)
+
+        assert stored == 50
+        assert database._postgres.transactions == 1
+        table, records, columns = database._postgres.connection.copied[0]
+        assert table == "market_data_staging"
+        assert columns == MARKET_DATA_COLUMNS
+        assert len(records) == 50
+        merges = [q for q in database._postgres.connection.executed if q[0].startswith("INSERT INTO market_data_ohlcv")]
+        assert len(merges) == 1
+        assert "ON CONFLICT (id) DO UPDATE" in merges[0][0]
+        assert merges[0][1] == (MARKET_DATA_TTL_SECONDS,)
+        database._postgres.execute.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_rows_match_single_row_insert(self, database):
+        record = _kline("ETHUSDC", 5)
+        await database.upsert_market_data_batch([record])
+        _, records, _ = database._postgres.connection.copied[0]
+
+        market_data = MarketData(
+            symbol="ETHUSDC",
+            timestamp=datetime(2024, 1, 1, 0, 5),
+            open_price=100.0,
+            high_price=101.0,
+            low_price=99.0,
+            close_price=100.5,
+            volume=12.5,
+            quote_volume=1250.0,
+            trades_count=42,
+            interval="1m",
+        )
+        await database.insert_market_data(market_data)
+        _, *row, ttl_seconds = database._postgres.execute.call_args.args
+
+        assert _typed_fields(records[0]) == _typed_fields(tuple(row))
+        assert records[0][:5] == (
+            "ETHUSDC_1m_" + str(int(datetime(2024, 1, 1, 0, 5).timestamp())),
+            "ETHUSDC",
+            "ETHUSDC",
+            "1m",
+            datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc),
+        )
+        assert json.loads(records[0][-1]).keys() == {"created_at"}
+        assert ttl_seconds == MARKET_DATA_TTL_SECONDS
+
+    @pytest.mark.asyncio
+    async def test_invalid_rows_are_skipped_and_duplicates_keep_last(self, database):
+        bad = _kline("BTCUSDC", 1)
+        bad["timestamp"] = 1704067260
+        batch = [_kline("BTCUSDC", 0), bad, _kline("BTCUSDC", 0, close="105.0")]
+
+        stored = await database.upsert_market_data_batch(batch)
+
+        assert stored == 1
+        _, records, _ = database._postgres.connection.copied[0]
+        assert records[0][MARKET_DATA_COLUMNS.index("close_price")] == 105.0
+
+    @pytest.mark.asyncio
+    async def test_empty_batch_skips_database(self, database):
+        assert await database.upsert_market_data_batch([]) == 0
+        assert database._postgres.transactions == 0
+
+
+class TestArrayRows:
+    @pytest.mark.asyncio
+    async def test_array_rows_match_record_rows(self, database):
+        open_time = int(datetime(2024, 1, 1, 0, 5, tzinfo=timezone.utc).timestamp() * 1000)
+        rows = market_data_rows("ETHUSDC", "1m", [open_time], [100.0], [101.0], [99.0], [100.5],
+                                [12.5], [1250.0], [42])
+
+        stored = await database.upsert_market_data_rows(rows)
+
+        await database.upsert_market_data_batch([_kline("ETHUSDC", 5)])
+        (_, array_records, _), (_, batch_records, _) = database._postgres.connection.copied
+        assert stored == 1
+        assert _typed_fields(array_records[0]) == _typed_fields(batch_records[0])
+        assert json.loads(array_records[0][-1]).keys() == {"created_at"}
@@ -0,0 +1,155 @@
+"""
+Unit Tests for the indicator result cache
+
+Tests:
+- LRU ordering, O(1) eviction and TTL expiry of shared.lru_cache.LRUCache
+- Per-category hit/miss/eviction/byte counters and Prometheus mirroring
+- IndicatorCalculator caching result objects without re-validation
+"""
+
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter, Gauge
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from shared.lru_cache import LRUCache
+from database import Database
+from indicator_models import IndicatorConfiguration, IndicatorParameter, IndicatorResult, IndicatorType
+from technical_indicator_calculator import IndicatorCalculator
+from tests.test_streaming_indicators import _candles, _documents
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestLRUCache:
+    def test_least_recently_used_entry_is_evicted(self, clock):
+        cache = LRUCache(3, clock=clock)
+        for key in "abc":
+            cache.set(key, key.upper())
+
+        assert cache.get("a") == "A"  # "b" is now least recently used
+        cache.set("d", "D")
+
+        assert "b" not in cache
+        assert [key for key in "acd" if key in cache] == ["a", "c", "d"]
+        assert cache.statistics()["evictions"] == 1
+
+    def test_entries_expire_after_ttl(self, clock):
+        cache = LRUCache(10, default_ttl_seconds=60, clock=clock)
+        cache.set("default_ttl", 1)
+        cache.set("short_ttl", 2, ttl_seconds=5)
+        cache.set("long_ttl", 3, ttl_seconds=3600)
+
+        clock.now += 10
+        assert cache.get("short_ttl") is None
+        assert cache.get("default_ttl") == 1
+
+        clock.now += 60
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+
+        stats = cache.statistics()
+        assert stats["expirations"] == 2
+        assert stats["misses"] == 1
+
+    def test_overwrite_refreshes_value_without_eviction(self, clock):
+        cache = LRUCache(2, size_of=len, clock=clock)
+        cache.set("a", "xx")
+        cache.set("b", "yyyy")
+        cache.set("a", "zzzzzz")
+
+        assert len(cache) == 2
+        assert cache.get("a") == "zzzzzz"
+        assert cache.statistics()["size_bytes"] == 10
+        assert cache.statistics()["evictions"] == 0
+
+    def test_categories_are_counted_and_exported(self, clock):
+        registry = CollectorRegistry()
+        operations = Counter("test_cache_operations", "ops", ["operation", "indicator_type"], registry=registry)
+        held_bytes = Gauge("test_cache_bytes", "bytes", ["indicator_type"], registry=registry)
+        cache = LRUCache(2, size_of=len, operations_counter=operations, bytes_gauge=held_bytes, clock=clock)
+
+        cache.set("rsi-1", "abc", category="rsi")
+        cache.set("ema-1", "abcdef", category="ema")
+        cache.get("rsi-1", category="rsi")
+        cache.get("rsi-2", category="rsi")
+        cache.set("rsi-2", "ab", category="rsi")  # Evicts ema-1
+
+        def sample(name, **labels):
+            return registry.get_sample_value(name, labels)
+
+        assert sample("test_cache_operations_total", operation="hit", indicator_type="rsi") == 1
+        assert sample("test_cache_operations_total", operation="miss", indicator_type="rsi") == 1
+        assert sample("test_cache_operations_total", operation="eviction", indicator_type="ema") == 1
+        assert sample("test_cache_bytes", indicator_type="rsi") == 5
+        assert sample("test_cache_bytes", indicator_type="ema") == 0
+
+        categories = cache.statistics()["categories"]
+        assert categories["rsi"]["entries"] == 2
+        assert categories["ema"] == {
+            "hits": 0, "misses": 0, "sets": 1, "evictions": 1, "expirations": 0, "entries": 0, "size_bytes": 0
+        }
+
+        cache.clear()
+        assert cache.statistics()["size_bytes"] == 0
+        assert sample("test_cache_bytes", indicator_type="rsi") == 0
+
+
+class TestCalculatorCache:
+    @pytest.mark.asyncio
+    async def test_hits_return_cached_objects_without_database_reads(self):
+        database = Mock(spec=Database)
+        database.get_market_data = AsyncMock(return_value=_documents(_candles()))
+        calculator = IndicatorCalculator(database)
+        config = IndicatorConfiguration(
+            id="rsi_cfg",
+            indicator_type=IndicatorType.RSI,
+            parameters=[IndicatorParameter(name="period", value=14)],
+            symbol="BTCUSDC",
+            interval="1m",
+            periods_required=100,
+            output_fields=[],
+            strategy_id="strategy-1",
+        )
+
+        first = await calculator.calculate_indicator(config)
+        second = await calculator.calculate_indicator(config)
+
+        database.get_market_data.assert_awaited_once()
+        assert not first.cache_hit
+        assert second.cache_hit
+        assert second.values == first.values
+
+        stats = calculator.get_cache_statistics()
+        assert stats["cache_size"] == 1
+        assert stats["cache_hit_ratio"] == 0.5
+        assert stats["cache_by_indicator"]["rsi"]["size_bytes"] == len(first.model_dump_json())
+
+    @pytest.mark.asyncio
+    async def test_zero_cache_duration_is_not_cached(self):
+        calculator = IndicatorCalculator(Mock(spec=Database))
+        result = IndicatorResult(
+            configuration_id="cfg", symbol="BTCUSDC", interval="1m",
+            timestamp=_candles(1)["timestamp"].iloc[0], values={}, data_points_used=0,
+            calculation_time_ms=0.0,
+        )
+
+        calculator._cache_result("key", result, 0, "rsi")
+
+        assert len(calculator.cache) == 0
@@ -0,0 +1,181 @@
+"""
+Unit Tests for the staged ingest pipeline
+
+Tests:
+- Micro-batching by batch size and flush interval
+- Block, drop-newest and drop-oldest policies on full queues
+- Draining queued items on stop
+- Failed flushes counted without stopping the writer
+"""
+
+import asyncio
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from ingest_pipeline import DropPolicy, IngestPipeline, IngestStage, StageConfig, ingest_queue_depth
+
+
+class RecordingSink:
+    def __init__(self, delay=0.0, fail_first=0):
+        self.batches = []
+        self.delay = delay
+        self.fail_first = fail_first
+        self.release = asyncio.Event()
+        self.release.set()
+
+    async def __call__(self, batch):
+        await self.release.wait()
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_first:
+            self.fail_first -= 1
+            raise RuntimeError("database unavailable")
+        self.batches.append(list(batch))
+
+    @property
+    def items(self):
+        return [item for batch in self.batches for item in batch]
+
+
+async def _blocked_stage(policy, max_queue_size=3):
+    """Started stage whose writer holds one item while the sink is blocked"""
+    sink = RecordingSink()
+    sink.release.clear()
+    stage = IngestStage("test", sink, StageConfig(
+        max_queue_size=max_queue_size, batch_size=1, flush_interval_ms=0, drop_policy=policy
+    ))
+    stage.start()
+    await stage.put("held")
+    await asyncio.sleep(0)  # Writer takes "held" and waits on the sink
+    return stage, sink
+
+
+class TestIngestStage:
+    @pytest.mark.asyncio
+    async def test_full_batches_flush_without_waiting(self):
+        sink = RecordingSink()
+        stage = IngestStage("test", sink, StageConfig(batch_size=4, flush_interval_ms=60_000))
+        for i in range(8):
+            await stage.put(i)
+        stage.start()
+
+        await asyncio.wait_for(stage.queue.join(), 1)
+
+        assert sink.batches == [[0, 1, 2, 3], [4, 5, 6, 7]]
+        await stage.stop()
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_flushes_after_interval(self):
+        sink = RecordingSink()
+        stage = IngestStage("test", sink, StageConfig(batch_size=100, flush_interval_ms=20))
+        stage.start()
+
+        for i in range(3):
+            await stage.put(i)
+            await asyncio.sleep(0.001)
+        await asyncio.wait_for(stage.queue.join(), 1)
+
+        assert sink.batches == [[0, 1, 2]]
+        await stage.stop()
+
+    @pytest.mark.asyncio
+    async def test_drop_newest_rejects_items_when_full(self):
+        stage, sink = await _blocked_stage(DropPolicy.DROP_NEWEST)
+
+        results = [await stage.put(i) for i in range(5)]
+        sink.release.set()
+        await stage.stop()
+
+        assert results == [True, True, True, False, False]
+        assert sink.items == ["held", 0, 1, 2]
+        assert stage.statistics()["items_dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_drop_oldest_keeps_latest_items(self):
+        stage, sink = await _blocked_stage(DropPolicy.DROP_OLDEST)
+
+        results = [await stage.put(i) for i in range(5)]
+        sink.release.set()
+        await stage.stop()
+
+        assert results == [True] * 5
+        assert sink.items == ["held", 2, 3, 4]
+        assert stage.statistics()["items_dropped"] == 2
+
+    @pytest.mark.asyncio
+    async def test_block_applies_backpressure(self):
+        stage, sink = await _blocked_stage(DropPolicy.BLOCK, max_queue_size=2)
+        await stage.put(0)
+        await stage.put(1)
+
+        producer = asyncio.create_task(stage.put(2))
+        await asyncio.sleep(0.01)
+        assert not producer.done()
+        assert ingest_queue_depth.labels("test")._value.get() == 2
+
+        sink.release.set()
+        assert await asyncio.wait_for(producer, 1)
+        await stage.stop()
+
+        assert sink.items == ["held", 0, 1, 2]
+        assert stage.statistics()["items_dropped"] == 0
+
+    @pytest.mark.asyncio
+    async def test_stop_drains_queue(self):
+        sink = RecordingSink(delay=0.001)
+        stage = IngestStage("test", sink, StageConfig(batch_size=10, flush_interval_ms=60_000))
+        stage.start()
+        for i in range(25):
+            await stage.put(i)
+
+        await stage.stop(drain_timeout=1)
+
+        assert sink.items == list(range(25))
+        assert not stage.running
+        assert stage.depth == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_flush_is_counted_and_writer_continues(self):
+        sink = RecordingSink(fail_first=1)
+        stage = IngestStage("test", sink, StageConfig(batch_size=2, flush_interval_ms=0))
+        for i in range(4):
+            await stage.put(i)
+        stage.start()
+
+        await stage.stop(drain_timeout=1)
+
+        assert sink.items == [2, 3]
+        stats = stage.statistics()
+        assert stats["items_failed"] == 2
+        assert stats["items_flushed"] == 2
+
+
+class TestIngestPipeline:
+    @pytest.mark.asyncio
+    async def test_stages_are_routed_by_name(self):
+        klines, trades = RecordingSink(), RecordingSink()
+        pipeline = IngestPipeline()
+        pipeline.add_stage("kline_db", klines, StageConfig(flush_interval_ms=1))
+        pipeline.add_stage("trade_db", trades, StageConfig(flush_interval_ms=1))
+        pipeline.start()
+
+        await pipeline.submit("kline_db", "k1")
+        await pipeline.submit("trade_db", "t1")
+        await pipeline.submit("trade_db", "t2")
+        await pipeline.stop()
+
+        assert klines.items == ["k1"]
+        assert trades.items == ["t1", "t2"]
+        assert pipeline.statistics()["trade_db"]["items_flushed"] == 2
+
+    def test_duplicate_stage_names_are_rejected(self):
+        pipeline = IngestPipeline()
+        pipeline.add_stage("kline_db", RecordingSink())
+
+        with pytest.raises(ValueError):
+            pipeline.add_stage("kline_db", RecordingSink())
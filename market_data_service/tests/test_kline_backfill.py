@@ -0,0 +1,316 @@
+"""
+Unit Tests for the concurrent, resumable kline backfill
+
+Tests:
+- Klines parsed into numeric pages and bulk rows
+- Paging, checkpoints and resuming after an interrupted run
+- Unfinished klines are fetched again by the next run
+- Concurrency pool, rate limit and timeout retries
+- One session shared by concurrent pairs
+- Request weight budget in the adaptive rate limiter
+"""
+
+import asyncio
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from adaptive_limiter import RateLimiter
+from database import MARKET_DATA_COLUMNS
+from historical_data_collector import HistoricalDataCollector
+import kline_backfill
+from kline_backfill import KLINES_REQUEST_WEIGHT, KlineBackfill, KlinePage
+
+T0 = datetime(2024, 1, 1, tzinfo=timezone.utc)
+T0_MS = int(T0.timestamp() * 1000)
+MINUTE_MS = 60_000
+
+
+def _kline(open_ms, interval_ms=MINUTE_MS):
+    price = 100 + ((open_ms - T0_MS) // interval_ms) % 50
+    return [open_ms, f"{price:.8f}", f"{price + 1:.8f}", f"{price - 1:.8f}", f"{price + 0.5:.8f}",
+            "12.50000000", open_ms + interval_ms - 1, "1250.00000000", 42, "6.0", "600.0", "0"]
+
+
+class FakeResponse:
+    def __init__(self, session, status, payload, headers, error=None):
+        self.session = session
+        self.status = status
+        self.payload = payload
+        self.headers = headers
+        self.error = error
+
+    async def __aenter__(self):
+        if self.error is not None:
+            raise self.error
+        self.session.in_flight += 1
+        self.session.max_in_flight = max(self.session.max_in_flight, self.session.in_flight)
+        await asyncio.sleep(0.005)
+        return self
+
+    async def __aexit__(self, *exc):
+        self.session.in_flight -= 1
+
+    async def json(self):
+        return self.payload
+
+    async def text(self):
+        return str(self.payload)
+
+
+class FakeKlineSession:
+    """Binance klines endpoint serving klines from first_open_ms up to now"""
+
+    def __init__(self, first_open_ms=T0_MS, interval_ms=MINUTE_MS, statuses=()):
+        self.first_open_ms = first_open_ms
+        self.interval_ms = interval_ms
+        self.statuses = list(statuses)  # Forced (status, headers) replies or exceptions before serving data
+        self.requests = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.closed = False
+
+    def get(self, url, params):
+        self.requests.append(dict(params))
+        if self.statuses:
+            reply = self.statuses.pop(0)
+            if isinstance(reply, Exception):
+                return FakeResponse(self, None, None, {}, error=reply)
+            status, headers = reply
+            return FakeResponse(self, status, {"code": -1003}, headers)
+
+        start = max(params["startTime"], self.first_open_ms)
+        start += -(start - self.first_open_ms) % self.interval_ms
+        last = min(params["endTime"], int(time.time() * 1000))
+        klines = [_kline(open_ms, self.interval_ms)
+                  for open_ms in range(start, last + 1, self.interval_ms)][:params["limit"]]
+        return FakeResponse(self, 200, klines, {"X-MBX-USED-WEIGHT-1M": str(2 * len(self.requests))})
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeDatabase:
+    def __init__(self, fail_on_write=None):
+        self.rows = {}
+        self.writes = 0
+        self.checkpoints = {}
+        self.fail_on_write = fail_on_write
+
+    async def upsert_market_data_rows(self, rows):
+        self.writes += 1
+        if self.writes == self.fail_on_write:
+            raise ConnectionError("database went away")
+        for row in rows:
+            self.rows[row[0]] = row
+        return len(rows)
+
+    async def get_backfill_checkpoint(self, symbol, interval):
+        checkpoint = self.checkpoints.get((symbol, interval))
+        return dict(checkpoint) if checkpoint else None
+
+    async def save_backfill_checkpoint(self, checkpoint):
+        self.checkpoints[(checkpoint["symbol"], checkpoint["interval"])] = dict(checkpoint)
+
+
+def _engine(database, session, **kwargs):
+    limiter = RateLimiter(name="test", default_rate=1000.0, max_rate=1000.0, weight_limit=6000)
+    return KlineBackfill(database, session=session, limiter=limiter, **kwargs)
+
+
+class TestKlinePage:
+    def test_klines_become_numeric_columns(self):
+        page = KlinePage.from_klines("BTCUSDT", "1m", [_kline(T0_MS), _kline(T0_MS + MINUTE_MS)])
+
+        assert len(page) == 2
+        assert page.open_time.dtype == np.int64 and page.trades_count.dtype == np.int64
+        assert page.close.dtype == np.float64
+        assert page.open.tolist() == [100.0, 101.0]
+        assert page.close_time.tolist() == [T0_MS + MINUTE_MS - 1, T0_MS + 2 * MINUTE_MS - 1]
+
+    def test_rows_follow_market_data_columns(self):
+        rows = KlinePage.from_klines("BTCUSDT", "1m", [_kline(T0_MS)]).to_rows()
+
+        row = dict(zip(MARKET_DATA_COLUMNS, rows[0]))
+        assert row["id"] == f"BTCUSDT_1m_{T0_MS // 1000}"
+        assert row["ts"] == T0
+        assert (row["open_price"], row["high_price"], row["low_price"], row["close_price"]) == (100.0, 101.0, 99.0, 100.5)
+        assert (row["volume"], row["quote_volume"], row["trades_count"]) == (12.5, 1250.0, 42)
+        assert type(row["trades_count"]) is int  # Plain Python values for COPY
+
+
+class TestKlineBackfill:
+    @pytest.mark.asyncio
+    async def test_pages_through_range_and_checkpoints(self):
+        database, session = FakeDatabase(), FakeKlineSession()
+        engine = _engine(database, session)
+        end = T0 + timedelta(minutes=2500) - timedelta(milliseconds=1)
+
+        written = await engine.backfill("BTCUSDT", "1m", T0, end)
+
+        assert written == 2500
+        assert len(database.rows) == 2500
+        assert [request["startTime"] for request in session.requests] == \
+            [T0_MS, T0_MS + 1000 * MINUTE_MS, T0_MS + 2000 * MINUTE_MS]
+        checkpoint = database.checkpoints[("BTCUSDT", "1m")]
+        assert checkpoint["next_time"] == T0_MS + 2500 * MINUTE_MS
+        assert checkpoint["rows_written"] == 2500
+        assert checkpoint["completed"]
+        assert engine.limiter.stats["total_weight"] == 3 * KLINES_REQUEST_WEIGHT
+
+    @pytest.mark.asyncio
+    async def test_interrupted_run_resumes_from_checkpoint(self):
+        database, session = FakeDatabase(fail_on_write=2), FakeKlineSession()
+        end = T0 + timedelta(minutes=2500) - timedelta(milliseconds=1)
+
+        with pytest.raises(ConnectionError):
+            await _engine(database, session).backfill("BTCUSDT", "1m", T0, end)
+        checkpoint = database.checkpoints[("BTCUSDT", "1m")]
+        assert checkpoint["next_time"] == T0_MS + 1000 * MINUTE_MS
+        assert not checkpoint["completed"]
+
+        session.requests.clear()
+        written = await _engine(database, session).backfill("BTCUSDT", "1m", T0, end)
+
+        assert written == 1500
+        assert session.requests[0]["startTime"] == T0_MS + 1000 * MINUTE_MS
+        assert len(database.rows) == 2500
+        assert database.checkpoints[("BTCUSDT", "1m")]["rows_written"] == 2500
+
+    @pytest.mark.asyncio
+    async def test_later_run_fetches_only_new_klines(self):
+        database, session = FakeDatabase(), FakeKlineSession()
+        await _engine(database, session).backfill("BTCUSDT", "1m", T0, T0 + timedelta(minutes=99))
+
+        session.requests.clear()
+        written = await _engine(database, session).backfill("BTCUSDT", "1m", T0, T0 + timedelta(minutes=149))
+
+        assert written == 50
+        assert session.requests[0]["startTime"] == T0_MS + 100 * MINUTE_MS
+
+    @pytest.mark.asyncio
+    async def test_unfinished_kline_is_refetched(self):
+        hour_ms = 3_600_000
+        first_open = (int(time.time() * 1000) // hour_ms - 5) * hour_ms
+        database, session = FakeDatabase(), FakeKlineSession(first_open_ms=first_open, interval_ms=hour_ms)
+        start = datetime.fromtimestamp(first_open / 1000, tz=timezone.utc)
+
+        written = await _engine(database, session).backfill("BTCUSDT", "1h", start)
+
+        assert written == 6  # Five closed hours and the current one
+        assert database.checkpoints[("BTCUSDT", "1h")]["next_time"] == first_open + 5 * hour_ms
+
+    @pytest.mark.asyncio
+    async def test_pairs_run_concurrently_up_to_pool_size(self):
+        database, session = FakeDatabase(), FakeKlineSession()
+        engine = _engine(database, session, concurrency=2)
+        pairs = [(symbol, "1m") for symbol in ("BTCUSDT", "ETHUSDT", "SOLUSDT", "BNBUSDT")]
+
+        results = await engine.run(pairs, T0, T0 + timedelta(minutes=9))
+
+        assert results == {symbol: {"1m": 10} for symbol, _ in pairs}
+        assert session.max_in_flight == 2
+        assert engine.pairs_completed == 4
+
+    @pytest.mark.asyncio
+    async def test_rate_limited_page_is_retried(self):
+        database = FakeDatabase()
+        session = FakeKlineSession(statuses=[(429, {"Retry-After": "1"})])
+        engine = _engine(database, session)
+
+        written = await engine.backfill("BTCUSDT", "1m", T0, T0 + timedelta(minutes=4))
+
+        assert written == 5
+        assert len(session.requests) == 2
+        assert engine.limiter.stats["total_violations"] == 1
+
+    @pytest.mark.asyncio
+    async def test_timed_out_page_is_retried(self):
+        database = FakeDatabase()
+        session = FakeKlineSession(statuses=[asyncio.TimeoutError()])
+        engine = _engine(database, session)
+
+        written = await engine.backfill("BTCUSDT", "1m", T0, T0 + timedelta(minutes=4))
+
+        assert written == 5
+        assert len(session.requests) == 2
+        assert engine.pairs_failed == 0
+
+    @pytest.mark.asyncio
+    async def test_concurrent_pairs_share_one_session(self, monkeypatch):
+        sessions = []
+
+        def create_session(**kwargs):
+            sessions.append(FakeKlineSession())
+            return sessions[-1]
+
+        monkeypatch.setattr(kline_backfill.aiohttp, "ClientSession", create_session)
+        database = FakeDatabase()
+        engine = _engine(database, None, concurrency=4)
+        pairs = [(f"SYM{i}USDT", "1m") for i in range(4)]
+
+        results = await engine.run(pairs, T0, T0 + timedelta(minutes=9))
+        await engine.close()
+
+        assert results == {symbol: {"1m": 10} for symbol, _ in pairs}
+        assert len(sessions) == 1
+        assert sessions[0].closed
+        assert engine.session is None
+
+    @pytest.mark.asyncio
+    async def test_client_errors_fail_the_pair(self):
+        database = FakeDatabase()
+        session = FakeKlineSession(statuses=[(400, {})])
+        engine = _engine(database, session)
+
+        results = await engine.run([("NOPE", "1m")], T0, T0 + timedelta(minutes=4))
+
+        assert results == {"NOPE": {"1m": 0}}
+        assert len(session.requests) == 1
+        assert engine.pairs_failed == 1
+
+    @pytest.mark.asyncio
+    async def test_historical_collector_uses_backfill(self):
+        database, session = FakeDatabase(), FakeKlineSession(
+            first_open_ms=(int(time.time() * 1000) // 86_400_000 - 30) * 86_400_000, interval_ms=86_400_000
+        )
+        collector = HistoricalDataCollector(database)
+        collector.session = collector.backfill.session = session
+        collector.backfill.limiter = RateLimiter(name="test", default_rate=1000.0, max_rate=1000.0)
+
+        written = await collector.collect_historical_data_for_symbol("BTCUSDT", "1d", days_back=10)
+
+        assert written == 10
+        assert ("BTCUSDT", "1d") in database.checkpoints
+
+
+class TestRequestWeightBudget:
+    @pytest.mark.asyncio
+    async def test_requests_wait_for_weight_to_leave_window(self):
+        limiter = RateLimiter(name="test", default_rate=1000.0, max_rate=1000.0, weight_limit=4, weight_window=0.2)
+
+        started = time.monotonic()
+        await asyncio.gather(*(limiter.wait("/api/v3/klines", weight=2) for _ in range(3)))
+
+        assert time.monotonic() - started >= 0.19
+        assert limiter.stats["total_weight"] == 6
+
+    def test_used_weight_header_sets_server_count(self):
+        limiter = RateLimiter(name="test", weight_limit=6000, weight_window=60)
+
+        limiter.parse_rate_limit_headers({"x-mbx-used-weight-1m": "5990", "X-MBX-USED-WEIGHT-1S": "9"})
+
+        assert limiter.used_weight() == 5990
+        assert limiter.server_weight_reset <= datetime.now(timezone.utc) + timedelta(seconds=60)
+
+    def test_unweighted_limiter_ignores_weight(self):
+        limiter = RateLimiter(name="test")
+        limiter.parse_rate_limit_headers({"X-MBX-USED-WEIGHT-1M": "5990"})
+        assert limiter.server_used_weight is None
@@ -0,0 +1,230 @@
+"""
+Unit Tests for the local L2 order book engine
+
+Tests:
+- Snapshot synchronisation with buffered diff-depth events
+- Events keep buffering while a snapshot loads in the background
+- Sequence gaps trigger a resync
+- Sorted levels match a fully re-sorted reference book
+- Compact top-N deltas
+- Deterministic snapshot persistence
+"""
+
+import asyncio
+import random
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from order_book_engine import BookSide, OrderBookEngine
+
+
+def _event(first, final, bids=(), asks=(), symbol="BTCUSDT"):
+    return {"e": "depthUpdate", "E": 1704067200000 + final, "s": symbol,
+            "U": first, "u": final, "b": [list(l) for l in bids], "a": [list(l) for l in asks]}
+
+
+class FakeSnapshots:
+    """REST depth endpoint returning queued snapshots"""
+
+    def __init__(self, *snapshots):
+        self.snapshots = list(snapshots)
+        self.requests = 0
+
+    async def __call__(self, symbol, depth):
+        self.requests += 1
+        if len(self.snapshots) > 1:
+            return self.snapshots.pop(0)
+        return self.snapshots[0]
+
+
+SNAPSHOT = {
+    "lastUpdateId": 100,
+    "bids": [["100.0", "1.0"], ["99.0", "2.0"], ["98.0", "3.0"]],
+    "asks": [["101.0", "1.5"], ["102.0", "2.5"], ["103.0", "3.5"]],
+}
+
+
+def _engine(snapshots, **kwargs):
+    kwargs.setdefault("resync_backoff", 0)
+    return OrderBookEngine("BTCUSDT", snapshots, depth=1000, **kwargs)
+
+
+async def _sync(engine, event):
+    """Buffer an event, let the background snapshot load finish and take the resync's full top N"""
+    assert await engine.apply_event(event) is None
+    await engine.wait_resync()
+    assert engine.synced
+    return engine._resync_delta()
+
+
+class TestBookSide:
+    def test_levels_stay_sorted_under_random_updates(self):
+        rng = random.Random(7)
+        bids, asks = BookSide(descending=True), BookSide(descending=False)
+        reference = {"bids": {}, "asks": {}}
+
+        for _ in range(2000):
+            side, book = rng.choice([("bids", bids), ("asks", asks)])
+            price = f"{rng.randint(900, 1100) / 10:.2f}"
+            quantity = "0" if rng.random() < 0.3 else f"{rng.randint(1, 50) / 10:.1f}"
+            book.update(price, quantity)
+            if float(quantity) == 0:
+                reference[side].pop(price, None)
+            else:
+                reference[side][price] = quantity
+
+        expected_bids = sorted(reference["bids"].items(), key=lambda l: float(l[0]), reverse=True)
+        expected_asks = sorted(reference["asks"].items(), key=lambda l: float(l[0]))
+        assert bids.top() == expected_bids
+        assert asks.top(10) == expected_asks[:10]
+
+    def test_unchanged_levels_are_not_updates(self):
+        side = BookSide(descending=False)
+        assert side.update("1.0", "2.0")
+        assert not side.update("1.0", "2.0")
+        assert not side.update("5.0", "0")
+        assert side.update("1.0", "0.00000000")
+        assert len(side) == 0
+
+
+class TestOrderBookEngine:
+    @pytest.mark.asyncio
+    async def test_initial_sync_drops_old_events_and_applies_straddling_event(self):
+        snapshots = FakeSnapshots(SNAPSHOT)
+        engine = _engine(snapshots)
+
+        assert await engine.apply_event(_event(90, 95, bids=[("100.0", "9.0")])) is None  # Starts snapshot load
+        await engine.wait_resync()
+        assert engine.synced
+
+        # The first event after the resync carries the full top N, even when stale
+        delta = await engine.apply_event(_event(96, 100, bids=[("100.0", "9.0")]))
+        assert delta.snapshot
+        assert delta.bids[0] == ("100.0", "1.0")  # Events older than snapshot were dropped
+
+        assert await engine.apply_event(_event(96, 100, bids=[("100.0", "9.0")])) is None  # Stale
+        delta = await engine.apply_event(_event(99, 104, bids=[("100.5", "0.5")]))  # Straddles 101
+        assert delta.bids == [("100.5", "0.5")]
+
+        delta = await engine.apply_event(_event(105, 106, asks=[("101.0", "0")]))
+        assert delta.asks == [("101.0", "0")]
+        assert engine.last_update_id == 106
+        assert engine.asks.best() == ("102.0", "2.5")
+        assert snapshots.requests == 1
+
+    @pytest.mark.asyncio
+    async def test_buffered_events_are_replayed_onto_snapshot(self):
+        engine = _engine(FakeSnapshots({**SNAPSHOT, "lastUpdateId": 100}))
+
+        delta = await _sync(engine, _event(101, 103, asks=[("100.5", "4.0")]))
+
+        assert delta.snapshot
+        assert engine.asks.best() == ("100.5", "4.0")
+        assert engine.last_update_id == 103
+
+    @pytest.mark.asyncio
+    async def test_snapshot_behind_events_waits_for_next_snapshot(self):
+        behind = {**SNAPSHOT, "lastUpdateId": 50}
+        snapshots = FakeSnapshots(behind, SNAPSHOT)
+        engine = _engine(snapshots)
+
+        assert await engine.apply_event(_event(101, 102, bids=[("97.0", "1.0")])) is None
+        await engine.wait_resync()
+        assert not engine.synced
+
+        delta = await _sync(engine, _event(103, 104, bids=[("96.0", "1.0")]))
+        assert delta.snapshot
+        assert [price for price, _ in engine.bids.top()] == ["100.0", "99.0", "98.0", "97.0", "96.0"]
+
+    @pytest.mark.asyncio
+    async def test_sequence_gap_resynchronises(self):
+        resynced = {"lastUpdateId": 200, "bids": [["90.0", "1.0"]], "asks": [["91.0", "1.0"]]}
+        snapshots = FakeSnapshots(SNAPSHOT, resynced)
+        engine = _engine(snapshots)
+        await _sync(engine, _event(101, 101))
+        engine.take_snapshot()
+        assert not engine.snapshot_due()
+
+        delta = await _sync(engine, _event(150, 201, asks=[("91.0", "2.0")]))  # Missed 102-149
+
+        assert engine.gaps == 1
+        assert engine.resyncs == 2
+        assert delta.snapshot
+        assert engine.asks.top() == [("91.0", "2.0")]
+        assert engine.snapshot_due()  # Persisted after every resync
+
+    @pytest.mark.asyncio
+    async def test_changes_below_top_levels_publish_nothing(self):
+        engine = _engine(FakeSnapshots(SNAPSHOT), top_n=2)
+        await _sync(engine, _event(101, 101))
+
+        assert await engine.apply_event(_event(102, 102, bids=[("98.0", "7.0")])) is None
+
+        delta = await engine.apply_event(_event(103, 103, bids=[("100.5", "1.0")]))
+        assert sorted(delta.bids) == [("100.5", "1.0"), ("99.0", "0")]  # 99.0 left the top 2
+        assert delta.to_message() == {"s": "BTCUSDT", "U": 103, "u": 103, "b": delta.bids, "a": []}
+
+    @pytest.mark.asyncio
+    async def test_snapshots_are_persisted_on_interval(self):
+        engine = _engine(FakeSnapshots(SNAPSHOT), snapshot_interval=60)
+        await _sync(engine, _event(101, 101))
+        assert engine.snapshot_due()
+
+        snapshot = engine.take_snapshot(levels=2, now=1000.0)
+        assert snapshot.bids == [("100.0", "1.0"), ("99.0", "2.0")]
+        assert snapshot.asks == [("101.0", "1.5"), ("102.0", "2.5")]
+        assert snapshot.timestamp.year == 2024
+
+        assert not engine.snapshot_due(now=1059.0)
+        assert engine.snapshot_due(now=1060.0)
+
+    @pytest.mark.asyncio
+    async def test_failed_snapshot_requests_back_off(self):
+        calls = []
+
+        async def failing(symbol, depth):
+            calls.append(symbol)
+            raise RuntimeError("rate limited")
+
+        engine = OrderBookEngine("BTCUSDT", failing, resync_backoff=60)
+        await engine.apply_event(_event(101, 101))
+        await engine.wait_resync()
+        await engine.apply_event(_event(102, 102))
+        await engine.wait_resync()
+
+        assert len(calls) == 1
+        assert not engine.synced
+        assert not engine.snapshot_due()
+
+    @pytest.mark.asyncio
+    async def test_events_buffer_while_snapshot_loads(self):
+        released = asyncio.Event()
+        requests = []
+
+        async def slow_snapshot(symbol, depth):
+            requests.append(symbol)
+            await released.wait()
+            return SNAPSHOT
+
+        engine = OrderBookEngine("BTCUSDT", slow_snapshot, resync_backoff=0)
+
+        # Events return straight away while the snapshot request is in flight
+        for first in (101, 102, 103):
+            assert await engine.apply_event(_event(first, first, bids=[(f"{first - 3}.5", "1.0")])) is None
+        await asyncio.sleep(0)
+        assert not engine.synced
+        assert len(requests) == 1
+
+        released.set()
+        await engine.wait_resync()
+
+        assert engine.synced
+        assert engine.last_update_id == 103
+        assert engine.bids.best() == ("100.5", "1.0")
+
+        await engine.close()
@@ -0,0 +1,219 @@
+"""
+Unit Tests for the batched RabbitMQ publisher
+
+Tests:
+- Buffered messages published in concurrent, confirmed batches
+- Failed confirms counted per batch
+- JSON (orjson) and msgpack bodies decoded by content type
+- Consumer envelopes in both formats
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+
+import pytest
+from prometheus_client import CollectorRegistry, Counter
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from shared.enhanced_market_data_consumer import EnhancedMarketDataConsumer
+from shared.rabbitmq_publisher import (
+    CONTENT_TYPE_JSON,
+    CONTENT_TYPE_MSGPACK,
+    BatchedPublisher,
+    OutgoingMessage,
+    decode_body,
+    encode_body,
+)
+
+
+class FakeExchange:
+    """Records publishes; confirms arrive together once every publish of a batch is in flight"""
+
+    name = "mastertrade.market"
+
+    def __init__(self, fail_routing_keys=()):
+        self.messages = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.fail_routing_keys = set(fail_routing_keys)
+
+    async def publish(self, message, routing_key):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.001)  # Broker confirm
+        self.in_flight -= 1
+        if routing_key in self.fail_routing_keys:
+            raise RuntimeError("nack")
+        self.messages.append((routing_key, message))
+
+
+class TestBatchedPublisher:
+    @pytest.mark.asyncio
+    async def test_buffered_messages_are_published_in_concurrent_batches(self):
+        exchange = FakeExchange()
+        publisher = BatchedPublisher(exchange, max_batch_size=10, flush_interval_ms=5)
+        publisher.start()
+
+        for i in range(25):
+            await publisher.publish(f"ticker.SYM{i}", {"i": i})
+        await publisher.stop()
+
+        assert [decode_body(m.body)["i"] for _, m in exchange.messages] == list(range(25))
+        assert exchange.max_in_flight == 10
+        assert publisher.statistics()["batches"] == 3
+        assert publisher.statistics()["published"] == 25
+
+    @pytest.mark.asyncio
+    async def test_partial_batch_is_flushed_after_interval(self):
+        exchange = FakeExchange()
+        publisher = BatchedPublisher(exchange, max_batch_size=100, flush_interval_ms=5)
+        publisher.start()
+
+        await publisher.publish("ticker.BTCUSDC", {"p": 1})
+        await asyncio.sleep(0.05)
+
+        assert len(exchange.messages) == 1
+        assert publisher.pending == 0
+        await publisher.stop()
+
+    @pytest.mark.asyncio
+    async def test_unstarted_publisher_publishes_immediately(self):
+        exchange = FakeExchange()
+        publisher = BatchedPublisher(exchange)
+
+        await publisher.publish("market.signal", {"s": 1}, persistent=True)
+
+        routing_key, message = exchange.messages[0]
+        assert routing_key == "market.signal"
+        assert message.delivery_mode == 2
+        assert message.content_type == CONTENT_TYPE_JSON
+
+    @pytest.mark.asyncio
+    async def test_failed_confirms_are_counted(self):
+        registry = CollectorRegistry()
+        counter = Counter("test_rabbitmq_messages", "msgs", ["exchange", "status"], registry=registry)
+        exchange = FakeExchange(fail_routing_keys={"bad"})
+        publisher = BatchedPublisher(exchange, messages_counter=counter, name="market")
+
+        confirmed = await publisher.publish_batch([
+            OutgoingMessage("good", {"a": 1}),
+            OutgoingMessage("bad", {"a": 2}),
+            OutgoingMessage("good", {"a": 3}),
+        ])
+
+        assert confirmed == 2
+        assert registry.get_sample_value("test_rabbitmq_messages_total", {"exchange": "market", "status": "success"}) == 2
+        assert registry.get_sample_value("test_rabbitmq_messages_total", {"exchange": "market", "status": "error"}) == 1
+        assert publisher.statistics()["failed"] == 1
+
+    @pytest.mark.asyncio
+    async def test_full_buffer_waits_for_flush(self):
+        exchange = FakeExchange()
+        publisher = BatchedPublisher(exchange, max_batch_size=2, max_buffer_size=2, flush_interval_ms=1000)
+        publisher.start()
+        await publisher.publish("a", 1)
+        await publisher.publish("b", 2)
+
+        await asyncio.wait_for(publisher.publish("c", 3), 1)
+        await publisher.stop()
+
+        assert [routing_key for routing_key, _ in exchange.messages] == ["a", "b", "c"]
+
+
+class TestSerialization:
+    def test_json_matches_standard_library_output(self):
+        data = {"price": 1.5, "timestamp": datetime(2024, 1, 1, tzinfo=timezone.utc), "nested": [1, "x"]}
+
+        body = encode_body(data, CONTENT_TYPE_JSON)
+
+        assert decode_body(body, CONTENT_TYPE_JSON) == json.loads(json.dumps(data, default=str))
+
+    def test_msgpack_round_trip(self):
+        pytest.importorskip("msgpack")
+        data = {"symbol": "BTCUSDC", "bids": [["1.0", "2.0"]], "timestamp": datetime(2024, 1, 1)}
+
+        body = encode_body(data, CONTENT_TYPE_MSGPACK)
+
+        assert decode_body(body, CONTENT_TYPE_MSGPACK) == {
+            "symbol": "BTCUSDC", "bids": [["1.0", "2.0"]], "timestamp": "2024-01-01 00:00:00"
+        }
+        assert len(body) < len(encode_body(data, CONTENT_TYPE_JSON))
+
+    def test_publisher_negotiates_msgpack_when_available(self):
+        pytest.importorskip("msgpack")
+        publisher = BatchedPublisher(FakeExchange(), content_type="application/x-msgpack")
+
+        assert publisher.content_type == CONTENT_TYPE_MSGPACK
+
+
+class FakeIncomingMessage:
+    def __init__(self, body, content_type, routing_key="ticker.BTCUSDC"):
+        self.body = body
+        self.content_type = content_type
+        self.routing_key = routing_key
+        self.headers = {"data_type": "ticker_updates"}
+
+    def process(self):
+        return _NullContext()
+
+
+class _NullContext:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class FakeQueue:
+    def __init__(self, messages):
+        self.messages = messages
+
+    def iterator(self):
+        messages = self.messages
+
+        class _Iterator:
+            async def __aenter__(self):
+                return self
+
+            async def __aexit__(self, *exc_info):
+                return False
+
+            def __aiter__(self):
+                return self._gen()
+
+            async def _gen(self):
+                for message in messages:
+                    yield message
+
+        return _Iterator()
+
+
+class TestConsumerFormats:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("content_type", [CONTENT_TYPE_JSON, CONTENT_TYPE_MSGPACK, None])
+    async def test_consumer_decodes_both_formats(self, content_type):
+        if content_type == CONTENT_TYPE_MSGPACK:
+            pytest.importorskip("msgpack")
+        envelope = {
+            "data_type": "ticker_updates",
+            "timestamp": "2024-01-01T00:00:00Z",
+            "source": "market_data_service",
+            "data": {"symbol": "BTCUSDC", "price": 42000.5},
+        }
+        consumer = EnhancedMarketDataConsumer(service_name="test")
+        consumer.running = True
+        received = []
+        consumer.add_message_handler("ticker_updates", received.append)
+
+        body = encode_body(envelope, content_type or CONTENT_TYPE_JSON)
+        await consumer._consume_messages(FakeQueue([FakeIncomingMessage(body, content_type)]))
+
+        assert len(received) == 1
+        assert received[0].data == {"symbol": "BTCUSDC", "price": 42000.5}
+        assert received[0].source == "market_data_service"
@@ -0,0 +1,117 @@
+"""
+Unit Tests for the service's combined-stream routing
+
+Tests:
+- Symbols subscribe their kline, ticker, trade and diff-depth streams on the pool
+- Combined-stream trade messages are aggregated into stored trade bars
+- Combined-stream depth messages keep the local order book in sync without
+  blocking on the REST snapshot
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+import main
+from trade_aggregator import TradeAggregator
+
+T0_MS = int(datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc).timestamp() * 1000)
+
+
+def _trade_message(trade_id, ms, price, quantity, is_buyer_maker=False, symbol="BTCUSDC"):
+    """Payload of a <symbol>@trade combined-stream message"""
+    return {"e": "trade", "E": T0_MS + ms, "s": symbol, "t": trade_id, "p": price, "q": quantity,
+            "T": T0_MS + ms, "m": is_buyer_maker, "M": True}
+
+
+def _depth_message(first, final, bids=(), asks=(), symbol="BTCUSDC"):
+    """Payload of a <symbol>@depth@100ms combined-stream message"""
+    return {"e": "depthUpdate", "E": T0_MS + final, "s": symbol, "U": first, "u": final,
+            "b": [list(level) for level in bids], "a": [list(level) for level in asks]}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(main, "Database", Mock)
+    service = main.MarketDataService()
+    service.trade_aggregator = TradeAggregator(intervals=("1s",))
+    service.trade_spool = None
+    service.ingest_pipeline = Mock(submit=AsyncMock())
+    service.stream_pool = Mock(subscribe=AsyncMock(), unsubscribe=AsyncMock(), connection_count=1)
+    return service
+
+
+def _submitted(service, stage):
+    return [call.args[1] for call in service.ingest_pipeline.submit.await_args_list if call.args[0] == stage]
+
+
+class TestRealtimeStreams:
+    @pytest.mark.asyncio
+    async def test_symbols_subscribe_trade_and_depth_streams(self, service):
+        await service._subscribe_realtime_streams(["BTCUSDC"])
+
+        streams = service.stream_pool.subscribe.await_args.args[0]
+        assert streams["btcusdc@trade"] == ("BTCUSDC", "trade")
+        assert streams["btcusdc@depth@100ms"] == ("BTCUSDC", "orderbook")
+        assert {"btcusdc@kline_1m", "btcusdc@ticker"} <= set(streams)
+
+    @pytest.mark.asyncio
+    async def test_combined_stream_trades_become_bars(self, service):
+        await service._subscribe_realtime_streams(["BTCUSDC"])
+
+        for message in (
+            _trade_message(1, 100, "100.0", "1.0"),
+            _trade_message(2, 400, "102.0", "0.5", is_buyer_maker=True),
+            _trade_message(3, 900, "101.0", "1.5"),
+            _trade_message(4, 1_200, "103.0", "1.0"),  # Closes the first second
+        ):
+            await service._handle_combined_stream_message("btcusdc@trade", message)
+
+        bars = _submitted(service, "trade_bar_db")
+        assert len(bars) == 1
+        bar = bars[0]
+        assert (bar.symbol, bar.interval, bar.trades_count) == ("BTCUSDC", "1s", 3)
+        assert (bar.open_price, bar.high_price, bar.low_price, bar.close_price) == (100.0, 102.0, 100.0, 101.0)
+        assert bar.buy_volume == pytest.approx(2.5)
+        assert bar.sell_volume == pytest.approx(0.5)
+        assert len(_submitted(service, "trade_publish")) == 4
+        assert service.trade_aggregator.open_bar("BTCUSDC", "1s").open_price == 103.0
+
+    @pytest.mark.asyncio
+    async def test_combined_stream_depth_events_sync_the_order_book(self, service, monkeypatch):
+        released = asyncio.Event()
+
+        async def slow_snapshot(symbol, depth):
+            await released.wait()
+            return {"lastUpdateId": 100, "bids": [["100.0", "1.0"]], "asks": [["101.0", "1.0"]]}
+
+        monkeypatch.setattr(service, "_fetch_depth_snapshot", slow_snapshot)
+        await service._subscribe_realtime_streams(["BTCUSDC"])
+
+        # Depth events return while the snapshot is still loading
+        stream = "btcusdc@depth@100ms"
+        await service._handle_combined_stream_message(stream, _depth_message(101, 101, bids=[("100.5", "2.0")]))
+        await service._handle_combined_stream_message(stream, _depth_message(102, 102, asks=[("100.8", "1.0")]))
+        book = service.order_books["BTCUSDC"]
+        assert not book.synced
+
+        released.set()
+        await book.wait_resync()
+        await service._handle_combined_stream_message(stream, _depth_message(103, 103))
+
+        assert book.last_update_id == 103
+        assert book.bids.best() == ("100.5", "2.0")
+        assert book.asks.best() == ("100.8", "1.0")
+        published = _submitted(service, "orderbook_publish")
+        assert len(published) == 1 and published[0][1]["snapshot"]
+        assert len(_submitted(service, "orderbook_db")) == 1
+
+        await service._unsubscribe_realtime_streams(["BTCUSDC"])
+        assert "BTCUSDC" not in service.order_books
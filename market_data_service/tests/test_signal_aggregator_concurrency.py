@@ -0,0 +1,177 @@
+"""
+Unit Tests for concurrent signal aggregation
+
+Tests:
+- One set-based query per component regardless of symbol count
+- Set-based components match the per-symbol queries
+- Per-symbol aggregation bounded by max_concurrency
+- Cycle statistics and metrics
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from unittest.mock import MagicMock
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from signal_aggregator import SIGNAL_COMPONENTS, SignalAggregator, aggregation_signals
+
+
+def _table(query):
+    for table in ('symbols', 'indicator_results', 'sentiment_data', 'onchain_metrics', 'whale_alerts'):
+        if f"FROM {table}" in query:
+            return table
+    raise AssertionError(f"unexpected query: {query}")
+
+
+class FakePostgres:
+    """Serves canned rows (newest first) for per-symbol and = ANY($1) queries"""
+
+    def __init__(self, tables, delay=0.0):
+        self.tables = tables
+        self.delay = delay
+        self.queries = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def fetch(self, query, *args):
+        table = _table(query)
+        self.queries.append((table, 'ANY(' in query))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            await asyncio.sleep(self.delay)
+        finally:
+            self.in_flight -= 1
+
+        rows = self.tables.get(table, [])
+        if table == 'symbols':
+            return rows
+        if 'ANY(' in query:
+            rows = [row for row in rows if row['symbol'] in args[0]]
+        else:
+            rows = [row for row in rows if row['symbol'] == args[0]]
+        if table == 'indicator_results' and "'atr'" in query:
+            rows = [row for row in rows if row['indicator_name'] == 'atr']
+        return rows
+
+    async def fetchrow(self, query, *args):
+        rows = await self.fetch(query, *args)
+        return rows[0] if rows else None
+
+
+def _tables(symbols):
+    now = datetime.utcnow()
+    indicators, sentiment, onchain, whales = [], [], [], []
+    for i, symbol in enumerate(symbols):
+        base = symbol.replace('USDT', '').replace('USDC', '')
+        for name, value in (('rsi', 25.0 + i), ('macd', 1.0), ('macd_signal', 0.5),
+                            ('sma_20', 110.0), ('sma_50', 100.0), ('atr', 0.02 * (i + 1))):
+            indicators.append({'symbol': symbol, 'indicator_name': name, 'value': value, 'timestamp': now})
+        sentiment.append({'symbol': symbol, 'source': 'twitter', 'sentiment_score': 0.6,
+                          'social_volume': 10.0, 'timestamp': now})
+        for name, signal in (('nvt', 'bullish'), ('mvrv', 'bullish'), ('sopr', 'bullish')):
+            onchain.append({'symbol': base, 'metric_name': name, 'value': 1.0,
+                            'signal': signal, 'timestamp': now})
+        whales.append({'symbol': symbol, 'alert_type': 'exchange_outflow', 'amount_usd': 5e6,
+                       'significance_score': 0.9, 'timestamp': now - timedelta(minutes=5)})
+    return {
+        'symbols': [{'symbol': symbol} for symbol in symbols],
+        'indicator_results': indicators,
+        'sentiment_data': sentiment,
+        'onchain_metrics': onchain,
+        'whale_alerts': whales,
+    }
+
+
+def _aggregator(symbols, delay=0.0, **kwargs):
+    database = MagicMock()
+    database._postgres = FakePostgres(_tables(symbols), delay)
+    channel = MagicMock()
+    aggregator = SignalAggregator(database, channel, **kwargs)
+    published = []
+
+    async def publish(signal):
+        published.append(signal)
+
+    aggregator._publish_signal = publish
+    return aggregator, database._postgres, published
+
+
+class TestSignalAggregatorConcurrency:
+    @pytest.mark.asyncio
+    async def test_set_based_queries_do_not_grow_with_symbols(self):
+        symbols = [f"SYM{i}USDT" for i in range(25)]
+        aggregator, postgres, published = _aggregator(symbols)
+
+        assert await aggregator._run_aggregation_cycle() == 25
+
+        # One symbols query plus one query per component
+        assert len(postgres.queries) == 1 + len(SIGNAL_COMPONENTS)
+        assert all(set_based for table, set_based in postgres.queries if table != 'symbols')
+        assert sorted(signal.symbol for signal in published) == sorted(symbols)
+
+    @pytest.mark.asyncio
+    async def test_set_based_components_match_per_symbol_queries(self):
+        symbols = ["BTCUSDT", "ETHUSDT", "SOLUSDC"]
+        aggregator, _, _ = _aggregator(symbols)
+
+        components = await aggregator._fetch_signal_components(symbols)
+
+        for symbol in symbols:
+            expected = {
+                'price': await aggregator._get_price_signal(symbol),
+                'sentiment': await aggregator._get_sentiment_signal(symbol),
+                'onchain': await aggregator._get_onchain_signal(symbol),
+                'flow': await aggregator._get_flow_signal(symbol),
+                'volatility': await aggregator._get_current_volatility(symbol),
+            }
+            assert components[symbol] == expected
+        assert components["SOLUSDC"]['onchain'] is None  # USDT pairs only
+
+    @pytest.mark.asyncio
+    async def test_failed_component_query_leaves_component_empty(self):
+        symbols = ["BTCUSDT"]
+        aggregator, postgres, _ = _aggregator(symbols)
+        fetch = postgres.fetch
+
+        async def failing_fetch(query, *args):
+            if 'whale_alerts' in query:
+                raise RuntimeError("relation does not exist")
+            return await fetch(query, *args)
+
+        postgres.fetch = failing_fetch
+        components = await aggregator._fetch_signal_components(symbols)
+
+        assert components["BTCUSDT"]['flow'] is None
+        assert components["BTCUSDT"]['price'] is not None
+
+    @pytest.mark.asyncio
+    async def test_per_symbol_aggregation_is_bounded(self):
+        symbols = [f"SYM{i}USDT" for i in range(12)]
+        aggregator, postgres, published = _aggregator(
+            symbols, delay=0.005, max_concurrency=3, set_based_queries=False
+        )
+
+        assert await aggregator._run_aggregation_cycle() == 12
+
+        # Up to 3 symbols at once, each querying its components in parallel
+        assert postgres.max_in_flight == 3 * len(SIGNAL_COMPONENTS)
+        assert len(published) == 12
+
+    @pytest.mark.asyncio
+    async def test_cycle_statistics_are_recorded(self):
+        aggregator, _, _ = _aggregator(["BTCUSDT", "ETHUSDT"])
+        before = aggregation_signals.labels('published')._value.get()
+
+        await aggregator._run_aggregation_cycle()
+
+        assert aggregator.last_cycle['symbols'] == 2
+        assert aggregator.last_cycle['signals_published'] == 2
+        assert aggregator.last_cycle['duration_seconds'] >= 0
+        assert aggregation_signals.labels('published')._value.get() == before + 2
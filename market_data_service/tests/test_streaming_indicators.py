@@ -0,0 +1,258 @@
+"""
+Unit Tests for streaming indicators
+
+Tests:
+- Parity of every streaming indicator with the ta based batch calculation
+- Subscription warm start from one history load per symbol/interval
+- O(1) updates from closed klines, replays and gap re-warming
+- Batch fallback for stale state and intervals the service does not stream
+"""
+
+from datetime import datetime, timedelta, timezone
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from database import Database
+from indicator_models import IndicatorConfiguration, IndicatorParameter, IndicatorType
+from streaming_indicators import create_streaming_indicator
+from technical_indicator_calculator import IndicatorCalculator
+
+# Bar 202 is the last closed 1m kline, so subscription tests see fresh streaming state
+START = datetime.now(timezone.utc).replace(second=0, microsecond=0) - timedelta(minutes=203)
+
+CONFIGS = [
+    (IndicatorType.SMA, {"period": 20}),
+    (IndicatorType.EMA, {"period": 21}),
+    (IndicatorType.RSI, {"period": 14}),
+    (IndicatorType.MACD, {"fast_period": 12, "slow_period": 26, "signal_period": 9}),
+    (IndicatorType.BOLLINGER_BANDS, {"period": 20, "std_dev": 2.5}),
+    (IndicatorType.STOCHASTIC, {"k_period": 14, "d_period": 3}),
+    (IndicatorType.ATR, {"period": 14}),
+]
+
+
+def _candles(n_bars=300, seed=11, start=None, step=timedelta(minutes=1)):
+    rng = np.random.default_rng(seed)
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    spread = np.abs(rng.normal(0, 0.001, n_bars)) * close
+    start = START if start is None else start
+    return pd.DataFrame({
+        "timestamp": [start + i * step for i in range(n_bars)],
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1, 10, n_bars),
+    })
+
+
+def _config(indicator_type, params, config_id=None, periods_required=100, interval="1m", **kwargs):
+    return IndicatorConfiguration(
+        id=config_id or f"{indicator_type.value}_cfg",
+        indicator_type=indicator_type,
+        parameters=[IndicatorParameter(name=name, value=value) for name, value in params.items()],
+        symbol="BTCUSDC",
+        interval=interval,
+        periods_required=periods_required,
+        output_fields=[],
+        strategy_id="strategy-1",
+        **kwargs,
+    )
+
+
+def _documents(df):
+    return [{
+        "timestamp": row.timestamp.strftime("%Y-%m-%dT%H:%M:%SZ"),
+        "open_price": row.open,
+        "high_price": row.high,
+        "low_price": row.low,
+        "close_price": row.close,
+        "volume": row.volume,
+    } for row in df.itertuples(index=False)]
+
+
+def _assert_values_close(streaming, batch):
+    assert streaming.keys() == batch.keys()
+    for key, expected in batch.items():
+        if expected is None:
+            assert streaming[key] is None, key
+        else:
+            assert streaming[key] == pytest.approx(expected, rel=1e-9, abs=1e-9), key
+
+
+@pytest.fixture
+def calculator():
+    database = Mock(spec=Database)
+    return IndicatorCalculator(database)
+
+
+class TestStreamingParity:
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("indicator_type,params", CONFIGS)
+    async def test_every_bar_matches_batch_calculation(self, calculator, indicator_type, params):
+        df = _candles()
+        config = _config(indicator_type, params)
+        methods = {
+            IndicatorType.SMA: calculator.calculate_sma,
+            IndicatorType.EMA: calculator.calculate_ema,
+            IndicatorType.RSI: calculator.calculate_rsi,
+            IndicatorType.MACD: calculator.calculate_macd,
+            IndicatorType.BOLLINGER_BANDS: calculator.calculate_bollinger_bands,
+            IndicatorType.STOCHASTIC: calculator.calculate_stochastic,
+            IndicatorType.ATR: calculator.calculate_atr,
+        }
+
+        indicator = create_streaming_indicator(config)
+        indicator.warm_start(df.iloc[:5])
+        for n_bars in range(5, len(df)):
+            row = df.iloc[n_bars]
+            indicator.update(row.timestamp, row.high, row.low, row.close)
+            if n_bars % 7 == 0 or n_bars >= len(df) - 3:
+                expected = await methods[indicator_type](df.iloc[:n_bars + 1], config)
+                _assert_values_close(indicator.values(), expected)
+
+        assert indicator.count == len(df)
+        assert indicator.last_timestamp == df["timestamp"].iloc[-1]
+
+    def test_flat_prices_leave_stochastic_undefined(self):
+        indicator = create_streaming_indicator(_config(IndicatorType.STOCHASTIC, {"k_period": 5, "d_period": 3}))
+        for i in range(10):
+            indicator.update(START + timedelta(minutes=i), 100.0, 100.0, 100.0)
+
+        assert indicator.values() == {"stoch_k_5": None, "stoch_d_3": None}
+
+    def test_types_without_streaming_form(self):
+        assert create_streaming_indicator(_config(IndicatorType.CCI, {"period": 20})) is None
+
+
+class TestStreamingSubscriptions:
+    @pytest.mark.asyncio
+    async def test_warm_start_loads_history_once_per_market(self, calculator):
+        df = _candles()
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(df))
+        configs = [_config(t, p, periods_required=60 + i) for i, (t, p) in enumerate(CONFIGS)]
+        # Another strategy with the same indicator shares its state
+        configs.append(_config(IndicatorType.EMA, {"period": 21}, config_id="other_strategy_ema", periods_required=30))
+
+        assert await calculator.create_subscription("sub-1", configs)
+
+        calculator.database.get_market_data.assert_awaited_once()
+        assert calculator.database.get_market_data.await_args.kwargs["limit"] == 66 + 50
+        assert len(calculator.streaming_indicators[("BTCUSDC", "1m")]) == len(CONFIGS)
+
+    @pytest.mark.asyncio
+    async def test_closed_klines_update_without_database_reads(self, calculator):
+        df = _candles()
+        history, live = df.iloc[:250], df.iloc[250:]
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(history))
+        config = _config(IndicatorType.MACD, dict(CONFIGS[3][1]))
+        await calculator.create_subscription("sub-1", [config])
+
+        for row in live.itertuples(index=False):
+            assert calculator.on_closed_kline("BTCUSDC", "1m", row.timestamp, row.high, row.low, row.close) == 1
+        # Replayed kline is ignored
+        last = live.iloc[-1]
+        assert calculator.on_closed_kline("BTCUSDC", "1m", last.timestamp, last.high, last.low, last.close) == 0
+
+        result = await calculator.calculate_indicator(config)
+
+        calculator.database.get_market_data.assert_awaited_once()
+        assert result.metadata["source"] == "streaming"
+        assert result.data_points_used == len(df)
+        assert result.metadata["data_range"]["end"] == last.timestamp.isoformat()
+        _assert_values_close(result.values, await calculator.calculate_macd(df, config))
+
+    @pytest.mark.asyncio
+    async def test_kline_gap_drops_state_until_rewarmed(self, calculator):
+        df = _candles()
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(df.iloc[:200]))
+        config = _config(IndicatorType.RSI, {"period": 14})
+        await calculator.create_subscription("sub-1", [config])
+
+        skipped = df.iloc[202]
+        assert calculator.on_closed_kline("BTCUSDC", "1m", skipped.timestamp, skipped.high, skipped.low, skipped.close) == 0
+        assert calculator._get_streaming_indicator(config) is None
+
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(df.iloc[:203]))
+        await calculator.process_subscriptions()
+
+        calculator.database.get_market_data.assert_awaited_once()
+        assert calculator._get_streaming_indicator(config).last_timestamp == skipped.timestamp
+
+    @pytest.mark.asyncio
+    async def test_failed_warm_start_falls_back_to_batch(self, calculator):
+        calculator.database.get_market_data = AsyncMock(return_value=[])
+        config = _config(IndicatorType.EMA, {"period": 21})
+
+        assert await calculator.create_subscription("sub-1", [config])
+        assert calculator._get_streaming_indicator(config) is None
+
+    @pytest.mark.asyncio
+    async def test_removing_last_subscriber_drops_state(self, calculator):
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(_candles()))
+        shared = _config(IndicatorType.EMA, {"period": 21})
+        await calculator.create_subscription("sub-1", [shared])
+        await calculator.create_subscription("sub-2", [shared, _config(IndicatorType.RSI, {"period": 14})])
+
+        await calculator.remove_subscription("sub-2")
+        assert calculator._get_streaming_indicator(shared) is not None
+        assert len(calculator.streaming_indicators[("BTCUSDC", "1m")]) == 1
+
+        await calculator.remove_subscription("sub-1")
+        assert calculator.streaming_indicators == {}
+
+    @pytest.mark.asyncio
+    async def test_non_streamed_interval_reads_new_database_bars(self, calculator):
+        step = timedelta(minutes=5)
+        df = _candles(start=START - 200 * step, step=step)
+        config = _config(IndicatorType.EMA, {"period": 21}, interval="5m", cache_duration_minutes=0)
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(df.iloc[:200]))
+        await calculator.create_subscription("sub-1", [config])
+
+        assert calculator.streaming_indicators == {}
+
+        first = await calculator.calculate_indicator(config)
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(df.iloc[:201]))
+        second = await calculator.calculate_indicator(config)
+
+        calculator.database.get_market_data.assert_awaited_once()
+        assert first.metadata["source"] == second.metadata["source"] == "batch"
+        assert second.metadata["data_range"]["end"] == df["timestamp"].iloc[200].isoformat()
+        _assert_values_close(second.values, await calculator.calculate_ema(df.iloc[51:201], config))
+
+    @pytest.mark.asyncio
+    async def test_stale_streaming_state_falls_back_to_batch(self, calculator):
+        df = _candles(start=START - timedelta(days=1))
+        calculator.database.get_market_data = AsyncMock(return_value=_documents(df))
+        config = _config(IndicatorType.RSI, {"period": 14})
+        await calculator.create_subscription("sub-1", [config])
+
+        assert calculator._get_streaming_indicator(config) is not None
+        result = await calculator.calculate_indicator(config)
+
+        assert result.metadata["source"] == "batch"
+        assert calculator.database.get_market_data.await_count == 2
+
+    def test_monthly_klines_follow_calendar_months(self, calculator):
+        config = _config(IndicatorType.SMA, {"period": 3}, interval="1M")
+        indicator = create_streaming_indicator(config)
+        calculator.streaming_indicators[("BTCUSDC", "1M")] = {calculator._generate_cache_key(config): indicator}
+
+        opens = [datetime(2024, month, 1, tzinfo=timezone.utc) for month in (10, 11, 12)]
+        opens.append(datetime(2025, 1, 1, tzinfo=timezone.utc))
+        for timestamp in opens:
+            # October and December have 31 days; neither is mistaken for a gap
+            assert calculator.on_closed_kline("BTCUSDC", "1M", timestamp, 1.0, 1.0, 1.0) == 1
+
+        assert calculator.on_closed_kline(
+            "BTCUSDC", "1M", datetime(2025, 3, 1, tzinfo=timezone.utc), 1.0, 1.0, 1.0
+        ) == 0
+        assert calculator._get_streaming_indicator(config) is None
@@ -0,0 +1,179 @@
+"""
+Unit Tests for trade aggregation
+
+Tests:
+- 1s/1m bars (OHLC, VWAP, taker buy/sell volume, counts)
+- Bars closed by later trades, expiry and shutdown
+- Late trades dropped and counted
+- Compressed raw trade spool round trip
+- Order flow and VPIN calculated from bars match raw trades
+"""
+
+import gzip
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '../..'))
+
+from models import TradeData
+from trade_aggregator import TradeAggregator, TradeSpool, interval_to_ms, read_spool
+from market_microstructure import OrderFlowAnalyzer, VPINCalculator
+
+T0 = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+
+def _trade(ms, price, quantity, is_buyer_maker=False, symbol="BTCUSDT"):
+    return TradeData(
+        symbol=symbol,
+        timestamp=T0 + timedelta(milliseconds=ms),
+        price=price,
+        quantity=quantity,
+        is_buyer_maker=is_buyer_maker
+    )
+
+
+class TestTradeAggregator:
+    def test_interval_parsing(self):
+        assert interval_to_ms("1s") == 1000
+        assert interval_to_ms("15s") == 15_000
+        assert interval_to_ms("1m") == 60_000
+        with pytest.raises(ValueError):
+            interval_to_ms("1d")
+
+    def test_second_bar_closed_by_next_second(self):
+        aggregator = TradeAggregator(intervals=("1s",))
+        trades = [
+            _trade(10, 100.0, 1.0),
+            _trade(200, 102.0, 2.0, is_buyer_maker=True),
+            _trade(500, 99.0, 1.0),
+            _trade(900, 101.0, 1.0, is_buyer_maker=True),
+        ]
+
+        assert aggregator.add_trades(trades) == []
+        closed = aggregator.add_trade(_trade(1_100, 101.5, 1.0))
+
+        assert len(closed) == 1
+        bar = closed[0]
+        assert bar.open_time == T0
+        assert bar.close_time == T0 + timedelta(milliseconds=999)
+        assert (bar.open_price, bar.high_price, bar.low_price, bar.close_price) == (100.0, 102.0, 99.0, 101.0)
+        assert bar.volume == 5.0
+        assert bar.quote_volume == pytest.approx(100 + 204 + 99 + 101)
+        assert bar.vwap == pytest.approx(504 / 5)
+        assert (bar.buy_volume, bar.sell_volume) == (2.0, 3.0)
+        assert bar.buy_vwap == pytest.approx(199 / 2)
+        assert (bar.trades_count, bar.buy_trades_count, bar.sell_trades_count) == (4, 2, 2)
+
+    def test_minute_bar_spans_second_bars(self):
+        aggregator = TradeAggregator(intervals=("1s", "1m"))
+        closed = aggregator.add_trades(_trade(ms, 100.0 + i, 1.0) for i, ms in enumerate(range(0, 60_000, 250)))
+
+        assert [bar.interval for bar in closed] == ["1s"] * 59
+        assert aggregator.open_bar("BTCUSDT", "1m").trades_count == 240
+
+        closed = aggregator.add_trade(_trade(60_000, 50.0, 1.0))
+        minute = next(bar for bar in closed if bar.interval == "1m")
+        assert minute.trades_count == 240
+        assert minute.low_price == 100.0
+        assert minute.high_price == 339.0
+
+    def test_symbols_are_aggregated_separately(self):
+        aggregator = TradeAggregator(intervals=("1s",))
+        aggregator.add_trade(_trade(0, 100.0, 1.0, symbol="BTCUSDT"))
+        aggregator.add_trade(_trade(100, 10.0, 1.0, symbol="ETHUSDT"))
+
+        closed = aggregator.add_trade(_trade(1_000, 101.0, 1.0, symbol="BTCUSDT"))
+
+        assert [bar.symbol for bar in closed] == ["BTCUSDT"]
+        assert aggregator.open_bar("ETHUSDT", "1s").close_price == 10.0
+
+    def test_quiet_symbols_close_after_interval_and_grace(self):
+        aggregator = TradeAggregator(intervals=("1s", "1m"), grace_ms=250)
+        aggregator.add_trade(_trade(400, 100.0, 1.0))
+
+        assert aggregator.flush_expired(T0 + timedelta(milliseconds=1_200)) == []
+        closed = aggregator.flush_expired(T0 + timedelta(milliseconds=1_250))
+        assert [bar.interval for bar in closed] == ["1s"]
+
+        closed = aggregator.flush_all()
+        assert [bar.interval for bar in closed] == ["1m"]
+        assert aggregator.statistics()["open_bars"] == 0
+
+    def test_late_trades_are_dropped(self):
+        aggregator = TradeAggregator(intervals=("1s", "1m"))
+        aggregator.add_trade(_trade(0, 100.0, 1.0))
+        aggregator.add_trade(_trade(1_500, 101.0, 1.0))
+
+        aggregator.add_trade(_trade(900, 99.0, 1.0))  # Its second was already closed
+
+        assert aggregator.late_trades == 1
+        assert aggregator.open_bar("BTCUSDT", "1s").trades_count == 1
+        assert aggregator.open_bar("BTCUSDT", "1m").trades_count == 3
+
+
+class TestTradeSpool:
+    def test_spool_round_trip(self, tmp_path):
+        spool = TradeSpool(str(tmp_path))
+        first = [_trade(i, 100.0 + i, 0.5, is_buyer_maker=bool(i % 2)) for i in range(5)]
+        second = [_trade(3_600_000 + i, 200.0, 1.0) for i in range(3)]  # Next hour
+
+        spool.write(first)
+        spool.write(second[:1])
+        spool.write(second[1:])  # Appended as a further gzip member
+
+        assert sorted(os.listdir(tmp_path)) == ["trades-2024010112.ndjson.gz", "trades-2024010113.ndjson.gz"]
+        assert list(read_spool(str(tmp_path / "trades-2024010112.ndjson.gz"))) == first
+        assert list(read_spool(str(tmp_path / "trades-2024010113.ndjson.gz"))) == second
+        with gzip.open(tmp_path / "trades-2024010112.ndjson.gz", "rt") as spool_file:
+            assert spool_file.readline().startswith('{"s":"BTCUSDT","T":1704110400000')
+        assert spool.trades_written == 8
+
+
+class TestMicrostructureConsumers:
+    def _trades(self):
+        trades = []
+        for i in range(400):
+            price = 100.0 + (i % 7) - 3
+            trades.append(_trade(i * 37, price, 0.1 + (i % 5) * 0.3, is_buyer_maker=(i % 3 == 0)))
+        return trades
+
+    def test_order_flow_from_bars_matches_trades(self):
+        trades = self._trades()
+        aggregator = TradeAggregator(intervals=("1s",))
+        bars = aggregator.add_trades(trades) + aggregator.flush_all()
+
+        from_bars = OrderFlowAnalyzer(window_size=10_000)
+        for bar in bars:
+            from_bars.record_bar(bar)
+        from_trades = OrderFlowAnalyzer(window_size=10_000)
+        for trade in trades:
+            # Quote on the aggressor's side so Lee-Ready matches the taker flag
+            bid, ask = (trade.price, trade.price + 1) if trade.is_buyer_maker else (trade.price - 1, trade.price)
+            from_trades.record_trade(trade.symbol, trade.timestamp, trade.price, trade.quantity, bid, ask)
+
+        expected = from_trades.calculate_metrics("BTCUSDT")
+        metrics = from_bars.calculate_metrics("BTCUSDT")
+        for field in ("total_volume", "buy_volume", "sell_volume", "ofi", "vwap", "buy_vwap", "sell_vwap"):
+            assert getattr(metrics, field) == pytest.approx(getattr(expected, field))
+        assert (metrics.total_trades, metrics.buy_trades, metrics.sell_trades) == \
+            (expected.total_trades, expected.buy_trades, expected.sell_trades)
+
+    def test_vpin_from_bars_fills_volume_buckets(self):
+        trades = self._trades()
+        aggregator = TradeAggregator(intervals=("1s",))
+        bars = aggregator.add_trades(trades) + aggregator.flush_all()
+        calculator = VPINCalculator(bucket_size=5.0, num_buckets=10)
+
+        for bar in bars:
+            calculator.add_bar(bar)
+
+        volume_bars = calculator.volume_bars["BTCUSDT"]
+        total_volume = sum(trade.quantity for trade in trades)
+        assert len(volume_bars) == min(int(total_volume // 5.0), 20)
+        assert all(bar.total_volume == pytest.approx(5.0) for bar in volume_bars)
+        assert all(bar.buy_volume + bar.sell_volume == pytest.approx(5.0) for bar in volume_bars)
+        assert calculator.calculate_vpin("BTCUSDT") is not None
@@ -0,0 +1,257 @@
+"""
+Trade Aggregation for Market Data Service
+
+Rolls the raw trade stream into per-interval bars (1s and 1m by default)
+before anything is persisted: OHLC, VWAP, taker buy/sell volume and trade
+count per symbol. A busy symbol produces thousands of trades per second but
+only one bar per interval, so only bars are written to the database.
+
+Bars close when a trade for a later interval arrives, or once the interval
+plus ``grace_ms`` has passed (``flush_expired``) for symbols that went quiet.
+Trades older than a symbol's open bar are counted as late and dropped.
+
+Raw trades can optionally be spooled to hourly gzip-compressed NDJSON files
+(TradeSpool) for replay.
+"""
+
+import gzip
+import json
+import os
+import re
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import structlog
+from prometheus_client import Counter
+
+from models import TradeBar, TradeData
+
+logger = structlog.get_logger()
+
+trade_bars_closed = Counter('trade_bars_closed_total', 'Trade bars closed by the aggregator', ['interval'])
+trade_aggregator_late = Counter('trade_aggregator_late_trades_total', 'Trades older than the open bar', ['interval'])
+
+_INTERVAL_PATTERN = re.compile(r'^(\d+)([smh])$')
+_UNIT_MS = {'s': 1000, 'm': 60_000, 'h': 3_600_000}
+
+
+def interval_to_ms(interval: str) -> int:
+    """Length of a bar interval such as '1s', '15s', '1m' or '1h' in milliseconds"""
+    match = _INTERVAL_PATTERN.match(interval)
+    if not match or int(match.group(1)) == 0:
+        raise ValueError(f"Unsupported trade bar interval: {interval}")
+    return int(match.group(1)) * _UNIT_MS[match.group(2)]
+
+
+def _to_ms(timestamp: datetime) -> int:
+    if timestamp.tzinfo is None:
+        timestamp = timestamp.replace(tzinfo=timezone.utc)
+    return int(timestamp.timestamp() * 1000)
+
+
+def _from_ms(value: int) -> datetime:
+    return datetime.fromtimestamp(value / 1000, tz=timezone.utc)
+
+
+class _OpenBar:
+    """Running totals of a bar that is still receiving trades"""
+
+    __slots__ = (
+        'start_ms', 'open', 'high', 'low', 'close', 'volume', 'quote_volume',
+        'buy_volume', 'sell_volume', 'buy_quote_volume', 'sell_quote_volume', 'count', 'buy_count'
+    )
+
+    def __init__(self, start_ms: int, price: float):
+        self.start_ms = start_ms
+        self.open = self.high = self.low = self.close = price
+        self.volume = self.quote_volume = 0.0
+        self.buy_volume = self.sell_volume = 0.0
+        self.buy_quote_volume = self.sell_quote_volume = 0.0
+        self.count = self.buy_count = 0
+
+    def add(self, price: float, quantity: float, is_buyer_maker: bool):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        value = price * quantity
+        self.volume += quantity
+        self.quote_volume += value
+        # The maker was the buyer, so the aggressor (taker) sold
+        if is_buyer_maker:
+            self.sell_volume += quantity
+            self.sell_quote_volume += value
+        else:
+            self.buy_volume += quantity
+            self.buy_quote_volume += value
+            self.buy_count += 1
+        self.count += 1
+
+    def to_bar(self, symbol: str, interval: str, interval_ms: int) -> TradeBar:
+        return TradeBar(
+            symbol=symbol,
+            interval=interval,
+            open_time=_from_ms(self.start_ms),
+            close_time=_from_ms(self.start_ms + interval_ms - 1),
+            open_price=self.open,
+            high_price=self.high,
+            low_price=self.low,
+            close_price=self.close,
+            volume=self.volume,
+            quote_volume=self.quote_volume,
+            buy_volume=self.buy_volume,
+            sell_volume=self.sell_volume,
+            buy_quote_volume=self.buy_quote_volume,
+            sell_quote_volume=self.sell_quote_volume,
+            trades_count=self.count,
+            buy_trades_count=self.buy_count,
+            sell_trades_count=self.count - self.buy_count
+        )
+
+
+class TradeAggregator:
+    """
+    Aggregates trades into fixed-interval bars per symbol
+
+    Args:
+        intervals: Bar intervals to build, e.g. ('1s', '1m')
+        grace_ms: How long after an interval ends its bar stays open for
+            trades that are still in flight
+    """
+
+    def __init__(self, intervals: Sequence[str] = ('1s', '1m'), grace_ms: int = 250):
+        self.intervals: List[Tuple[str, int]] = [(interval, interval_to_ms(interval)) for interval in intervals]
+        self.grace_ms = grace_ms
+        self._open: Dict[Tuple[str, str], _OpenBar] = {}  # (symbol, interval) -> open bar
+        self.trades_aggregated = 0
+        self.bars_closed = 0
+        self.late_trades = 0
+
+    def add_trade(self, trade: TradeData) -> List[TradeBar]:
+        """Add one trade; returns the bars it closed"""
+        return self._add(trade.symbol, _to_ms(trade.timestamp), trade.price, trade.quantity, trade.is_buyer_maker)
+
+    def add_trades(self, trades: Iterable[TradeData]) -> List[TradeBar]:
+        """Add trades in arrival order; returns the bars they closed"""
+        closed = []
+        for trade in trades:
+            closed.extend(self.add_trade(trade))
+        return closed
+
+    def flush_expired(self, now: Optional[datetime] = None) -> List[TradeBar]:
+        """Close bars whose interval (plus grace) ended before now"""
+        now_ms = _to_ms(now or datetime.now(timezone.utc))
+        interval_ms = dict(self.intervals)
+        return [
+            self._close(key, interval_ms[key[1]])
+            for key, bar in list(self._open.items())
+            if bar.start_ms + interval_ms[key[1]] + self.grace_ms <= now_ms
+        ]
+
+    def flush_all(self) -> List[TradeBar]:
+        """Close every open bar (e.g. on shutdown)"""
+        interval_ms = dict(self.intervals)
+        return [self._close(key, interval_ms[key[1]]) for key in list(self._open)]
+
+    def open_bar(self, symbol: str, interval: str) -> Optional[TradeBar]:
+        """Snapshot of a symbol's bar that is still open"""
+        bar = self._open.get((symbol, interval))
+        if bar is None:
+            return None
+        return bar.to_bar(symbol, interval, interval_to_ms(interval))
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            'intervals': [interval for interval, _ in self.intervals],
+            'open_bars': len(self._open),
+            'trades_aggregated': self.trades_aggregated,
+            'bars_closed': self.bars_closed,
+            'late_trades': self.late_trades
+        }
+
+    def _add(self, symbol: str, ts_ms: int, price: float, quantity: float, is_buyer_maker: bool) -> List[TradeBar]:
+        closed = []
+        for interval, interval_ms in self.intervals:
+            key = (symbol, interval)
+            start_ms = ts_ms - ts_ms % interval_ms
+            bar = self._open.get(key)
+            if bar is not None and start_ms != bar.start_ms:
+                if start_ms < bar.start_ms:
+                    self.late_trades += 1
+                    trade_aggregator_late.labels(interval).inc()
+                    continue
+                closed.append(self._close(key, interval_ms))
+                bar = None
+            if bar is None:
+                bar = self._open[key] = _OpenBar(start_ms, price)
+            bar.add(price, quantity, is_buyer_maker)
+        self.trades_aggregated += 1
+        return closed
+
+    def _close(self, key: Tuple[str, str], interval_ms: int) -> TradeBar:
+        symbol, interval = key
+        bar = self._open.pop(key).to_bar(symbol, interval, interval_ms)
+        self.bars_closed += 1
+        trade_bars_closed.labels(interval).inc()
+        return bar
+
+
+class TradeSpool:
+    """
+    Append-only, gzip-compressed NDJSON spool of raw trades
+
+    One file per UTC hour (``trades-YYYYMMDDHH.ndjson.gz``). Every ``write``
+    appends a gzip member, which gzip readers decompress as one stream, so
+    a crash loses at most the batch being written. Records use the Binance
+    trade field names: s (symbol), T (time in ms), p, q, m (buyer is maker).
+    Writes block; call them from a worker thread.
+    """
+
+    def __init__(self, directory: str, compresslevel: int = 6):
+        self.directory = directory
+        self.compresslevel = compresslevel
+        self.trades_written = 0
+        os.makedirs(directory, exist_ok=True)
+
+    def path_for(self, timestamp: datetime) -> str:
+        if timestamp.tzinfo is not None:
+            timestamp = timestamp.astimezone(timezone.utc)
+        return os.path.join(self.directory, f"trades-{timestamp:%Y%m%d%H}.ndjson.gz")
+
+    def write(self, trades: Sequence[TradeData]) -> int:
+        """Append trades to their hourly files; returns the number written"""
+        lines_by_path: Dict[str, List[str]] = {}
+        for trade in trades:
+            record = {
+                's': trade.symbol,
+                'T': _to_ms(trade.timestamp),
+                'p': trade.price,
+                'q': trade.quantity,
+                'm': trade.is_buyer_maker
+            }
+            lines_by_path.setdefault(self.path_for(trade.timestamp), []).append(
+                json.dumps(record, separators=(',', ':'))
+            )
+
+        for path, lines in lines_by_path.items():
+            with gzip.open(path, 'at', compresslevel=self.compresslevel, encoding='utf-8') as spool_file:
+                spool_file.write('\n'.join(lines) + '\n')
+        self.trades_written += len(trades)
+        return len(trades)
+
+
+def read_spool(path: str) -> Iterator[TradeData]:
+    """Replay the trades in a spool file"""
+    with gzip.open(path, 'rt', encoding='utf-8') as spool_file:
+        for line in spool_file:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield TradeData(
+                symbol=record['s'],
+                timestamp=_from_ms(record['T']),
+                price=record['p'],
+                quantity=record['q'],
+                is_buyer_maker=record['m']
+            )
@@ -102,12 +102,19 @@ class MarketDepthAnalyzer:
         timestamp: datetime,
         bids: List[OrderBookLevel],
         asks: List[OrderBookLevel],
+        presorted: bool = False,
     ):
-        """Update order book snapshot"""
+        """
+        Update order book snapshot.
+        
+        Pass presorted=True for levels that are already best-first (e.g. from
+        a locally maintained L2 book) to skip re-sorting the whole book.
+        """
         
         # Sort bids descending, asks ascending
-        bids = sorted(bids, key=lambda x: x.price, reverse=True)
-        asks = sorted(asks, key=lambda x: x.price)
+        if not presorted:
+            bids = sorted(bids, key=lambda x: x.price, reverse=True)
+            asks = sorted(asks, key=lambda x: x.price)
         
         self.order_books[symbol] = {
             "timestamp": timestamp,
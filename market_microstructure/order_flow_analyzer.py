@@ -34,6 +34,7 @@ class Trade:
     price: float
     volume: float
     classification: TradeClassification = TradeClassification.UNKNOWN
+    count: int = 1  # Trades represented (more than one for aggregated bar flow)
 
 
 @dataclass
@@ -161,6 +162,32 @@ class OrderFlowAnalyzer:
         
         logger.debug(f"Recorded trade: {symbol} {classification.value} {volume}@{price}")
     
+    def record_bar(self, bar) -> None:
+        """
+        Record an aggregated trade bar (e.g. market_data_service TradeBar).
+        
+        Bars already carry the taker side of each trade, so no quote is needed:
+        the bar's buy and sell flow are recorded at their own VWAPs, which keeps
+        volumes, VWAPs and trade counts exact in calculate_metrics.
+        """
+        trades = self.trades.setdefault(bar.symbol, [])
+        for classification, volume, quote_volume, count in (
+            (TradeClassification.BUY, bar.buy_volume, bar.buy_quote_volume, bar.buy_trades_count),
+            (TradeClassification.SELL, bar.sell_volume, bar.sell_quote_volume, bar.sell_trades_count),
+        ):
+            if volume > 0:
+                trades.append(Trade(
+                    timestamp=bar.close_time,
+                    price=quote_volume / volume,
+                    volume=volume,
+                    classification=classification,
+                    count=max(count, 1),
+                ))
+        
+        # Keep only recent trades
+        if len(trades) > self.window_size:
+            self.trades[bar.symbol] = trades[-self.window_size:]
+    
     def calculate_metrics(
         self,
         symbol: str,
@@ -216,9 +243,9 @@ class OrderFlowAnalyzer:
             buy_volume=buy_volume,
             sell_volume=sell_volume,
             ofi=ofi,
-            total_trades=len(trades),
-            buy_trades=len(buy_trades),
-            sell_trades=len(sell_trades),
+            total_trades=sum(t.count for t in trades),
+            buy_trades=sum(t.count for t in buy_trades),
+            sell_trades=sum(t.count for t in sell_trades),
             vwap=vwap,
             buy_vwap=buy_vwap,
             sell_vwap=sell_vwap,
@@ -129,32 +129,71 @@ class VPINCalculator:
         
         # Check if bucket is full
         if bucket["total_volume"] >= self.bucket_size:
-            # Create volume bar
-            bar = VolumeBar(
-                timestamp=bucket["timestamp"],
-                buy_volume=bucket["buy_volume"],
-                sell_volume=bucket["sell_volume"],
-                total_volume=bucket["total_volume"],
-            )
-            
-            # Store bar
-            if symbol not in self.volume_bars:
-                self.volume_bars[symbol] = []
-            self.volume_bars[symbol].append(bar)
-            
-            # Keep only recent buckets
-            if len(self.volume_bars[symbol]) > self.num_buckets * 2:
-                self.volume_bars[symbol] = self.volume_bars[symbol][-self.num_buckets * 2:]
-            
-            # Reset bucket
+            self._complete_bucket(symbol, timestamp)
+    
+    def add_bar(self, bar) -> None:
+        """
+        Add an aggregated trade bar (e.g. market_data_service TradeBar).
+        
+        The bar's taker buy/sell volume is spread over volume buckets in
+        proportion, so a bar larger than bucket_size fills several buckets
+        instead of one oversized one.
+        """
+        symbol = bar.symbol
+        if bar.volume <= 0:
+            return
+        if symbol not in self.current_bucket:
             self.current_bucket[symbol] = {
-                "timestamp": timestamp,
+                "timestamp": bar.open_time,
                 "buy_volume": 0.0,
                 "sell_volume": 0.0,
                 "total_volume": 0.0,
             }
+        
+        buy_fraction = bar.buy_volume / bar.volume
+        remaining = bar.volume
+        while remaining > 0:
+            bucket = self.current_bucket[symbol]
+            capacity = self.bucket_size - bucket["total_volume"]
+            volume = min(remaining, capacity)
+            bucket["total_volume"] += volume
+            bucket["buy_volume"] += volume * buy_fraction
+            bucket["sell_volume"] += volume * (1 - buy_fraction)
+            remaining -= volume
             
-            logger.debug(f"Completed volume bucket {symbol}: {bar.total_volume} volume")
+            if volume >= capacity:
+                self._complete_bucket(symbol, bar.close_time)
+    
+    def _complete_bucket(self, symbol: str, timestamp: datetime):
+        """Store the symbol's full bucket as a volume bar and start the next one"""
+        bucket = self.current_bucket[symbol]
+        
+        # Create volume bar
+        bar = VolumeBar(
+            timestamp=bucket["timestamp"],
+            buy_volume=bucket["buy_volume"],
+            sell_volume=bucket["sell_volume"],
+            total_volume=bucket["total_volume"],
+        )
+        
+        # Store bar
+        if symbol not in self.volume_bars:
+            self.volume_bars[symbol] = []
+        self.volume_bars[symbol].append(bar)
+        
+        # Keep only recent buckets
+        if len(self.volume_bars[symbol]) > self.num_buckets * 2:
+            self.volume_bars[symbol] = self.volume_bars[symbol][-self.num_buckets * 2:]
+        
+        # Reset bucket
+        self.current_bucket[symbol] = {
+            "timestamp": timestamp,
+            "buy_volume": 0.0,
+            "sell_volume": 0.0,
+            "total_volume": 0.0,
+        }
+        
+        logger.debug(f"Completed volume bucket {symbol}: {bar.total_volume} volume")
     
     def calculate_vpin(self, symbol: str) -> Optional[VPINMetrics]:
         """Calculate VPIN for symbol"""
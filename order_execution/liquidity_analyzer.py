@@ -54,11 +54,12 @@ class OrderBookAnalyzer:
         symbol: str,
         bids: List[OrderBookLevel],
         asks: List[OrderBookLevel],
+        presorted: bool = False,
     ):
-        """Update order book snapshot"""
+        """Update order book snapshot (presorted=True: levels are already best-first)"""
         self.order_books[symbol] = {
-            "bids": sorted(bids, key=lambda x: x.price, reverse=True),
-            "asks": sorted(asks, key=lambda x: x.price),
+            "bids": bids if presorted else sorted(bids, key=lambda x: x.price, reverse=True),
+            "asks": asks if presorted else sorted(asks, key=lambda x: x.price),
             "timestamp": datetime.utcnow(),
         }
     
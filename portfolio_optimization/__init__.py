@@ -27,6 +27,7 @@ from .risk_models import (
     CovarianceEstimator,
     RiskModelType,
     FactorRiskModel,
+    StreamingRiskModel,
 )
 from .black_litterman import (
     BlackLittermanModel,
@@ -62,6 +63,7 @@ __all__ = [
     "CovarianceEstimator",
     "RiskModelType",
     "FactorRiskModel",
+    "StreamingRiskModel",
     
     # Black-Litterman
     "BlackLittermanModel",
@@ -60,6 +60,7 @@ class EfficientFrontierRequest(BaseModel):
     num_points: int = Field(50, ge=10, le=200, description="Number of frontier points")
     constraints: Optional[Dict] = None
     risk_free_rate: float = Field(0.02)
+    n_workers: int = Field(1, ge=1, le=8, description="Worker processes for numerical frontier points")
 
 
 class RiskModelRequest(BaseModel):
@@ -147,8 +148,8 @@ async def generate_efficient_frontier(request: EfficientFrontierRequest):
     Generate efficient frontier for given assets.
     """
     try:
-        # Convert to DataFrames
-        expected_returns = pd.Series(request.expected_returns)
+        # Convert covariance to DataFrame
+        expected_returns = request.expected_returns
         covariance_matrix = pd.DataFrame(request.covariance_data)
         
         # Convert constraints
@@ -166,7 +167,8 @@ async def generate_efficient_frontier(request: EfficientFrontierRequest):
         # Generate points
         frontier_points = frontier.generate_frontier(
             num_points=request.num_points,
-            constraints=constraints
+            constraints=constraints,
+            n_workers=request.n_workers
         )
         
         # Find optimal portfolios
@@ -175,7 +177,7 @@ async def generate_efficient_frontier(request: EfficientFrontierRequest):
         return {
             "frontier_points": [point.to_dict() for point in frontier_points],
             "optimal_portfolios": optimal_portfolios.to_dict(),
-            "statistics": frontier.get_risk_return_statistics().to_dict()
+            "statistics": frontier.get_risk_return_statistics()
         }
     
     except Exception as e:
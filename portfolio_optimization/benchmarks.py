@@ -0,0 +1,171 @@
+"""
+Optimizer Benchmarks
+
+Compares PortfolioOptimizer with analytic gradients against the
+finite-difference fallback for every gradient-based method. For each
+universe size and case it reports SLSQP iterations, wall time and
+solution quality (volatility, Sharpe ratio, distance between weights).
+
+Usage:
+    python -m portfolio_optimization.benchmarks --assets 20 100 500
+"""
+
+import argparse
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Sequence, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .portfolio_optimizer import (
+    OptimizationMethod, OptimizationObjective, PortfolioConstraints, PortfolioOptimizer
+)
+
+
+@dataclass
+class BenchmarkCase:
+    """One optimization problem to benchmark"""
+    name: str
+    method: OptimizationMethod
+    objective: OptimizationObjective = OptimizationObjective.MAXIMIZE_SHARPE
+    kwargs: Dict = field(default_factory=dict)
+    with_turnover: bool = False
+
+
+BENCHMARK_CASES = [
+    BenchmarkCase("min_variance", OptimizationMethod.MIN_VARIANCE),
+    BenchmarkCase("max_sharpe", OptimizationMethod.MAX_SHARPE),
+    BenchmarkCase("max_utility", OptimizationMethod.MEAN_VARIANCE,
+                  OptimizationObjective.MAXIMIZE_UTILITY, {"risk_aversion": 3.0}),
+    BenchmarkCase("target_return", OptimizationMethod.MEAN_VARIANCE,
+                  OptimizationObjective.TARGET_RETURN),
+    BenchmarkCase("target_risk", OptimizationMethod.MEAN_VARIANCE,
+                  OptimizationObjective.TARGET_RISK),
+    BenchmarkCase("risk_parity", OptimizationMethod.RISK_PARITY),
+    BenchmarkCase("max_diversification", OptimizationMethod.MAX_DIVERSIFICATION),
+    BenchmarkCase("min_variance_turnover", OptimizationMethod.MIN_VARIANCE, with_turnover=True),
+]
+
+
+def make_problem(n_assets: int, n_factors: int = 3, seed: int = 42) -> Tuple[Dict[str, float], pd.DataFrame]:
+    """Synthetic annualised expected returns and factor-model covariance"""
+    rng = np.random.default_rng(seed)
+    assets = [f"ASSET{i:03d}" for i in range(n_assets)]
+
+    loadings = rng.normal(0.0, 1.0, (n_assets, n_factors))
+    factor_vars = rng.uniform(0.01, 0.04, n_factors)
+    specific_vars = rng.uniform(0.02, 0.10, n_assets)
+    covariance = loadings @ np.diag(factor_vars) @ loadings.T + np.diag(specific_vars)
+
+    expected_returns = dict(zip(assets, rng.uniform(0.02, 0.25, n_assets)))
+    return expected_returns, pd.DataFrame(covariance, index=assets, columns=assets)
+
+
+def _case_inputs(
+    case: BenchmarkCase,
+    expected_returns: Dict[str, float],
+    covariance_matrix: pd.DataFrame
+) -> Tuple[PortfolioConstraints, Dict]:
+    """Constraints and method kwargs for a case on a given universe"""
+    n_assets = len(expected_returns)
+    constraints = PortfolioConstraints()
+    kwargs = dict(case.kwargs)
+
+    if case.with_turnover:
+        assets = list(expected_returns)
+        current = np.zeros(n_assets)
+        current[: max(1, n_assets // 4)] = 1.0
+        current /= current.sum()
+        constraints = PortfolioConstraints(
+            max_turnover=0.5,
+            current_weights=dict(zip(assets, current))
+        )
+
+    if case.objective == OptimizationObjective.TARGET_RETURN:
+        kwargs.setdefault("target_return", float(np.median(list(expected_returns.values()))))
+    elif case.objective == OptimizationObjective.TARGET_RISK:
+        equal_weight_vol = np.sqrt(covariance_matrix.values.sum()) / n_assets
+        kwargs.setdefault("target_risk", float(1.2 * equal_weight_vol))
+
+    return constraints, kwargs
+
+
+def _timed_optimize(optimizer: PortfolioOptimizer, expected_returns, covariance_matrix, case, constraints, kwargs):
+    """Optimize one case, returning the result and its wall time in seconds"""
+    start = time.perf_counter()
+    result = optimizer.optimize(
+        expected_returns,
+        covariance_matrix,
+        case.method,
+        case.objective,
+        constraints=constraints,
+        **kwargs
+    )
+    return result, time.perf_counter() - start
+
+
+def run_benchmark(
+    asset_counts: Sequence[int] = (20, 100, 500),
+    cases: Sequence[BenchmarkCase] = BENCHMARK_CASES,
+    seed: int = 42
+) -> pd.DataFrame:
+    """
+    Run every case with analytic and finite-difference gradients
+
+    Returns one row per (n_assets, case) with iterations, wall time,
+    speedup and the quality of both solutions.
+    """
+    analytic = PortfolioOptimizer(use_analytic_gradients=True)
+    finite_difference = PortfolioOptimizer(use_analytic_gradients=False)
+    rows: List[dict] = []
+
+    for n_assets in asset_counts:
+        expected_returns, covariance_matrix = make_problem(n_assets, seed=seed)
+        assets = list(expected_returns)
+
+        for case in cases:
+            constraints, kwargs = _case_inputs(case, expected_returns, covariance_matrix)
+            fd_result, fd_time = _timed_optimize(
+                finite_difference, expected_returns, covariance_matrix, case, constraints, kwargs
+            )
+            an_result, an_time = _timed_optimize(
+                analytic, expected_returns, covariance_matrix, case, constraints, kwargs
+            )
+
+            fd_weights = np.array([fd_result.weights[asset] for asset in assets])
+            an_weights = np.array([an_result.weights[asset] for asset in assets])
+
+            rows.append({
+                "n_assets": n_assets,
+                "case": case.name,
+                "fd_success": fd_result.optimization_success,
+                "analytic_success": an_result.optimization_success,
+                "fd_iterations": fd_result.iterations,
+                "analytic_iterations": an_result.iterations,
+                "fd_seconds": fd_time,
+                "analytic_seconds": an_time,
+                "speedup": fd_time / an_time if an_time > 0 else np.nan,
+                "fd_volatility": fd_result.expected_volatility,
+                "analytic_volatility": an_result.expected_volatility,
+                "fd_sharpe": fd_result.sharpe_ratio,
+                "analytic_sharpe": an_result.sharpe_ratio,
+                "weights_l1_diff": float(np.abs(fd_weights - an_weights).sum()),
+            })
+
+    return pd.DataFrame(rows)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark analytic vs finite-difference optimizer gradients")
+    parser.add_argument("--assets", type=int, nargs="+", default=[20, 100, 500], help="Universe sizes")
+    parser.add_argument("--seed", type=int, default=42, help="Random seed for the synthetic universe")
+    args = parser.parse_args()
+
+    results = run_benchmark(asset_counts=args.assets, seed=args.seed)
+    with pd.option_context("display.width", 200, "display.max_columns", None):
+        print(results.to_string(index=False, float_format=lambda x: f"{x:.4g}"))
+
+
+if __name__ == "__main__":
+    main()
@@ -5,16 +5,27 @@ Generates and analyzes the efficient frontier for portfolio optimization.
 Provides multiple optimal portfolio points and frontier visualization.
 """
 
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from types import SimpleNamespace
 from typing import Dict, List, Optional, Tuple
 import logging
 import numpy as np
 import pandas as pd
+from scipy import linalg, optimize
 
-from .portfolio_optimizer import PortfolioOptimizer, OptimizationMethod, OptimizationObjective, PortfolioConstraints
+from .portfolio_optimizer import (
+    PortfolioOptimizer, OptimizationMethod, PortfolioConstraints, OptimizationResult
+)
 
 logger = logging.getLogger(__name__)
 
+# Stand-in for a scipy result on points solved in closed form
+_CLOSED_FORM_RESULT = SimpleNamespace(success=True, message='Closed-form frontier solution', nit=0)
+
+# Slack allowed when checking closed-form weights against the weight bounds
+_BOUND_TOLERANCE = 1e-10
+
 
 @dataclass
 class FrontierPoint:
@@ -62,12 +73,94 @@ class OptimalPortfolios:
         }
 
 
+def _solve_min_variance(
+    optimizer: PortfolioOptimizer,
+    mu: np.ndarray,
+    cov: np.ndarray,
+    assets: List[str],
+    constraints: PortfolioConstraints,
+    target_returns: List[Optional[float]],
+    initial_weights: np.ndarray
+) -> List[Optional[OptimizationResult]]:
+    """
+    Solve minimum-variance problems for a sequence of target returns
+    
+    - A target of None solves without a return constraint (the minimum
+      variance portfolio)
+    - Each solve warm-starts from the previous solution, so neighbouring
+      frontier points converge in a few SLSQP iterations
+    - Returns one result per target, None where the solver failed
+    """
+    n_assets = len(assets)
+    base_constraints = optimizer._build_constraints(n_assets, assets, constraints)
+    bounds = optimizer._build_bounds(n_assets, assets, constraints)
+    
+    def variance(w):
+        return w @ cov @ w
+    
+    def variance_gradient(w):
+        return 2.0 * (cov @ w)
+    
+    x0 = np.asarray(initial_weights, dtype=float)
+    results = []
+    
+    for target_return in target_returns:
+        constraint_list = base_constraints
+        if target_return is not None:
+            constraint_list = base_constraints + [{
+                'type': 'eq',
+                'fun': lambda w, target=target_return: w @ mu - target,
+                'jac': lambda w: mu,
+            }]
+        
+        try:
+            solution = optimize.minimize(
+                variance,
+                x0,
+                jac=variance_gradient,
+                method='SLSQP',
+                bounds=bounds,
+                constraints=constraint_list,
+                options={'maxiter': optimizer.max_iterations, 'ftol': optimizer.tolerance}
+            )
+        except Exception as e:
+            logger.warning(f"Failed to optimize for return {target_return}: {e}")
+            results.append(None)
+            continue
+        
+        if solution.success:
+            results.append(optimizer._create_result(solution.x, mu, cov, assets, solution))
+            x0 = solution.x
+        else:
+            results.append(None)
+    
+    return results
+
+
+def _solve_min_variance_in_worker(
+    risk_free_rate: float,
+    mu: np.ndarray,
+    cov: np.ndarray,
+    assets: List[str],
+    constraints: PortfolioConstraints,
+    target_returns: List[Optional[float]],
+    initial_weights: np.ndarray
+) -> List[Optional[OptimizationResult]]:
+    """Process-pool entry point for a contiguous run of frontier targets"""
+    optimizer = PortfolioOptimizer(risk_free_rate=risk_free_rate)
+    return _solve_min_variance(optimizer, mu, cov, assets, constraints, target_returns, initial_weights)
+
+
 class EfficientFrontier:
     """
     Efficient Frontier generator and analyzer.
     
     Generates the mean-variance efficient frontier and identifies
     key portfolio points (min variance, max Sharpe, etc.).
+    
+    The Cholesky factor of the covariance matrix is computed once and
+    reused for the closed-form frontier; numerical frontier solves are
+    warm-started from the neighbouring point.
     """
     
     def __init__(
@@ -89,6 +182,110 @@ class EfficientFrontier:
         # Get return bounds
         self.min_return = min(expected_returns.values())
         self.max_return = max(expected_returns.values())
+        
+        # Array views shared by every frontier solve
+        self._assets = list(expected_returns.keys())
+        self._mu = np.array([expected_returns[asset] for asset in self._assets], dtype=float)
+        self._cov = covariance_matrix.loc[self._assets, self._assets].to_numpy(dtype=float, copy=True)
+        self._cov_factor = self._factorize_covariance()
+        
+        # Closed-form frontier terms: Σ⁻¹1, Σ⁻¹μ and their quadratic forms
+        ones = np.ones(len(self._assets))
+        self._inv_ones = linalg.cho_solve(self._cov_factor, ones)
+        self._inv_mu = linalg.cho_solve(self._cov_factor, self._mu)
+        self._a = ones @ self._inv_ones
+        self._b = ones @ self._inv_mu
+        self._c = self._mu @ self._inv_mu
+        self._d = self._a * self._c - self._b ** 2
+    
+    def _factorize_covariance(self):
+        """Cholesky factor of the covariance matrix, regularised if not positive definite"""
+        try:
+            return linalg.cho_factor(self._cov)
+        except linalg.LinAlgError:
+            logger.warning("Covariance matrix is not positive definite")
+            min_eigenval = np.min(np.linalg.eigvalsh(self._cov))
+            self._cov += np.eye(len(self._assets)) * (abs(min_eigenval) + 1e-8)
+            return linalg.cho_factor(self._cov)
+    
+    @staticmethod
+    def _frontier_point(result: OptimizationResult) -> FrontierPoint:
+        """Frontier point from an optimization result"""
+        return FrontierPoint(
+            expected_return=result.expected_return,
+            expected_volatility=result.expected_volatility,
+            sharpe_ratio=result.sharpe_ratio,
+            weights=result.weights,
+            diversification_ratio=result.diversification_ratio,
+            effective_assets=result.effective_assets,
+        )
+    
+    @staticmethod
+    def _budget_only(constraints: PortfolioConstraints) -> bool:
+        """Whether the only constraints besides weight bounds are the budget"""
+        has_turnover = constraints.max_turnover is not None and bool(constraints.current_weights)
+        return constraints.sum_to_one and not has_turnover
+    
+    def _within_bounds(self, weights: np.ndarray, constraints: PortfolioConstraints) -> np.ndarray:
+        """Mask of weight rows that satisfy every asset's weight bounds"""
+        bounds = np.array(self.optimizer._build_bounds(len(self._assets), self._assets, constraints))
+        return np.all(
+            (weights >= bounds[:, 0] - _BOUND_TOLERANCE) &
+            (weights <= bounds[:, 1] + _BOUND_TOLERANCE),
+            axis=-1
+        )
+    
+    def _closed_form_result(self, weights: np.ndarray) -> OptimizationResult:
+        """Optimization result for closed-form weights"""
+        return self.optimizer._create_result(weights, self._mu, self._cov, self._assets, _CLOSED_FORM_RESULT)
+    
+    def _min_variance_result(self, constraints: PortfolioConstraints) -> Optional[OptimizationResult]:
+        """Minimum variance portfolio, in closed form when the constraints allow it"""
+        if self._budget_only(constraints):
+            weights = self._inv_ones / self._a
+            if self._within_bounds(weights, constraints):
+                return self._closed_form_result(weights)
+        
+        x0 = np.ones(len(self._assets)) / len(self._assets)
+        return _solve_min_variance(
+            self.optimizer, self._mu, self._cov, self._assets, constraints, [None], x0
+        )[0]
+    
+    def _tangency_result(self, constraints: PortfolioConstraints) -> Optional[OptimizationResult]:
+        """
+        Maximum Sharpe portfolio in closed form, Σ⁻¹(μ - rf) normalised to one
+        
+        Returns None when the constraints or bounds rule out the closed form,
+        or no portfolio earns more than the risk-free rate.
+        """
+        if not self._budget_only(constraints):
+            return None
+        
+        excess_weights = self._inv_mu - self.risk_free_rate * self._inv_ones
+        budget = excess_weights.sum()
+        if budget <= 0:
+            return None
+        
+        weights = excess_weights / budget
+        if not self._within_bounds(weights, constraints):
+            return None
+        
+        return self._closed_form_result(weights)
+    
+    def _closed_form_frontier(self, target_returns: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Budget-constrained frontier weights for every target return
+        
+        w(r) = ((c - r·b)·Σ⁻¹1 + (r·a - b)·Σ⁻¹μ) / d, one row per target.
+        Returns None when all expected returns coincide (d ≈ 0).
+        """
+        if self._d <= 1e-12 * abs(self._a * self._c):
+            return None
+        
+        return (
+            np.outer(self._c - self._b * target_returns, self._inv_ones) +
+            np.outer(self._a * target_returns - self._b, self._inv_mu)
+        ) / self._d
     
     def _validate_inputs(self):
         """Validate inputs"""
@@ -103,14 +300,22 @@ class EfficientFrontier:
     def generate_frontier(
         self,
         num_points: int = 100,
-        constraints: Optional[PortfolioConstraints] = None
+        constraints: Optional[PortfolioConstraints] = None,
+        n_workers: int = 1
     ) -> List[FrontierPoint]:
         """
         Generate efficient frontier points.
         
+        When only the budget constraint and weight bounds apply, every
+        target whose closed-form weights respect the bounds is solved
+        analytically. The remaining targets are solved with SLSQP, each
+        warm-started from the previous point's weights.
+        
         Args:
             num_points: Number of frontier points to generate
             constraints: Portfolio constraints
+            n_workers: Worker processes for the numerical solves (>1 splits
+                the targets into contiguous runs, one per worker)
             
         Returns:
             List of frontier points sorted by risk
@@ -119,18 +324,14 @@ class EfficientFrontier:
             constraints = PortfolioConstraints()
         
         # Find minimum variance portfolio
-        min_var_result = self.optimizer.optimize(
-            self.expected_returns,
-            self.covariance_matrix,
-            OptimizationMethod.MIN_VARIANCE,
-            constraints=constraints
-        )
+        min_var_result = self._min_variance_result(constraints)
         
-        if not min_var_result.optimization_success:
+        if min_var_result is None or not min_var_result.optimization_success:
             logger.error("Failed to find minimum variance portfolio")
             return []
         
         min_var_return = min_var_result.expected_return
+        min_var_weights = np.array([min_var_result.weights[asset] for asset in self._assets])
         
         # Adjust return bounds based on constraints
         effective_min_return = max(self.min_return, min_var_return)
@@ -138,41 +339,91 @@ class EfficientFrontier:
         
         # Generate target returns
         target_returns = np.linspace(effective_min_return, effective_max_return, num_points)
-        
-        frontier_points = []
-        
-        for target_return in target_returns:
-            try:
-                # Optimize for target return
-                result = self.optimizer.optimize(
-                    self.expected_returns,
-                    self.covariance_matrix,
-                    OptimizationMethod.MEAN_VARIANCE,
-                    OptimizationObjective.TARGET_RETURN,
-                    constraints=constraints,
-                    target_return=target_return
-                )
-                
-                if result.optimization_success:
-                    point = FrontierPoint(
-                        expected_return=result.expected_return,
-                        expected_volatility=result.expected_volatility,
-                        sharpe_ratio=result.sharpe_ratio,
-                        weights=result.weights,
-                        diversification_ratio=result.diversification_ratio,
-                        effective_assets=result.effective_assets,
-                    )
-                    frontier_points.append(point)
-                
-            except Exception as e:
-                logger.warning(f"Failed to optimize for return {target_return:.4f}: {e}")
-                continue
+        results: List[Optional[OptimizationResult]] = [None] * num_points
+        pending = list(range(num_points))
+        
+        # Closed-form points where the bounds are not binding
+        if self._budget_only(constraints):
+            closed_form_weights = self._closed_form_frontier(target_returns)
+            if closed_form_weights is not None:
+                feasible = self._within_bounds(closed_form_weights, constraints)
+                for i in np.flatnonzero(feasible):
+                    results[i] = self._closed_form_result(closed_form_weights[i])
+                pending = np.flatnonzero(~feasible).tolist()
+        
+        if pending:
+            logger.debug(f"Solving {len(pending)}/{num_points} frontier points numerically")
+            self._solve_pending_targets(
+                results, pending, target_returns, min_var_weights, constraints, n_workers
+            )
+        
+        frontier_points = [
+            self._frontier_point(result)
+            for result in results
+            if result is not None and result.optimization_success
+        ]
         
         # Sort by volatility
         frontier_points.sort(key=lambda p: p.expected_volatility)
         
         return frontier_points
     
+    def _solve_pending_targets(
+        self,
+        results: List[Optional[OptimizationResult]],
+        pending: List[int],
+        target_returns: np.ndarray,
+        min_var_weights: np.ndarray,
+        constraints: PortfolioConstraints,
+        n_workers: int
+    ):
+        """
+        Fill results for the pending target positions numerically
+        
+        - Pending positions are split into contiguous runs (one per worker)
+        - Each run warm-starts from the nearest solved point below it, or the
+          minimum variance weights
+        """
+        n_runs = max(1, min(n_workers, len(pending)))
+        runs = [run.tolist() for run in np.array_split(np.array(pending), n_runs)]
+        
+        def initial_weights(position: int) -> np.ndarray:
+            for previous in range(position - 1, -1, -1):
+                if results[previous] is not None:
+                    return np.array([results[previous].weights[asset] for asset in self._assets])
+            return min_var_weights
+        
+        run_args = [
+            ([float(target_returns[i]) for i in run], initial_weights(run[0]))
+            for run in runs
+        ]
+        
+        if n_runs == 1:
+            targets, x0 = run_args[0]
+            run_results = [_solve_min_variance(
+                self.optimizer, self._mu, self._cov, self._assets, constraints, targets, x0
+            )]
+        else:
+            with ProcessPoolExecutor(max_workers=n_runs) as pool:
+                futures = [
+                    pool.submit(
+                        _solve_min_variance_in_worker,
+                        self.risk_free_rate,
+                        self._mu,
+                        self._cov,
+                        self._assets,
+                        constraints,
+                        targets,
+                        x0
+                    )
+                    for targets, x0 in run_args
+                ]
+                run_results = [future.result() for future in futures]
+        
+        for run, solved in zip(runs, run_results):
+            for position, result in zip(run, solved):
+                results[position] = result
+    
     def find_optimal_portfolios(
         self,
         constraints: Optional[PortfolioConstraints] = None,
@@ -192,12 +443,14 @@ class EfficientFrontier:
             constraints = PortfolioConstraints()
         
         # Minimum Variance Portfolio
-        min_var_result = self.optimizer.optimize(
-            self.expected_returns,
-            self.covariance_matrix,
-            OptimizationMethod.MIN_VARIANCE,
-            constraints=constraints
-        )
+        min_var_result = self._min_variance_result(constraints)
+        if min_var_result is None:
+            min_var_result = self.optimizer.optimize(
+                self.expected_returns,
+                self.covariance_matrix,
+                OptimizationMethod.MIN_VARIANCE,
+                constraints=constraints
+            )
         
         min_variance = FrontierPoint(
             expected_return=min_var_result.expected_return,
@@ -209,12 +462,14 @@ class EfficientFrontier:
         )
         
         # Maximum Sharpe Portfolio
-        max_sharpe_result = self.optimizer.optimize(
-            self.expected_returns,
-            self.covariance_matrix,
-            OptimizationMethod.MAX_SHARPE,
-            constraints=constraints
-        )
+        max_sharpe_result = self._tangency_result(constraints)
+        if max_sharpe_result is None:
+            max_sharpe_result = self.optimizer.optimize(
+                self.expected_returns,
+                self.covariance_matrix,
+                OptimizationMethod.MAX_SHARPE,
+                constraints=constraints
+            )
         
         max_sharpe = FrontierPoint(
             expected_return=max_sharpe_result.expected_return,
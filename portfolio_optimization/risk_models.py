@@ -7,13 +7,15 @@ Implements various risk models for portfolio optimization:
 - Factor risk models (Fama-French, custom factors)
 - Exponentially weighted covariance
 - Robust covariance estimators
+- Streaming EWMA / shrinkage state updated one bar at a time
 """
 
 from dataclasses import dataclass
 from datetime import datetime
 from enum import Enum
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple, Union
 import logging
+import os
 import numpy as np
 import pandas as pd
 from scipy import linalg
@@ -78,6 +80,26 @@ class RiskModelResult:
         return result
 
 
+def _shrinkage_intensity(sample_cov: np.ndarray, target_cov: np.ndarray, n_periods: float) -> float:
+    """Simplified Ledoit-Wolf shrinkage intensity, clipped to [0, 1]"""
+    # Frobenius norm of difference
+    diff = sample_cov - target_cov
+    norm_diff_sq = np.sum(diff ** 2)
+    
+    if norm_diff_sq == 0:
+        return 0.0  # No shrinkage needed
+    
+    # Estimate asymptotic variance (simplified)
+    # In practice, this would use the full Ledoit-Wolf formula
+    asymptotic_var = np.sum(sample_cov ** 2) / n_periods
+    
+    # Optimal shrinkage intensity
+    shrinkage = min(asymptotic_var / norm_diff_sq, 1.0)
+    shrinkage = max(shrinkage, 0.0)
+    
+    return shrinkage
+
+
 class RiskModel:
     """
     Risk model for portfolio optimization.
@@ -351,25 +373,7 @@ class RiskModel:
         sample_cov_np = sample_cov.values
         target_cov_np = target_cov.values
         
-        # Asymptotic variance of sample covariance estimator
-        # This is a simplified version - full LW formula is more complex
-        
-        # Frobenius norm of difference
-        diff = sample_cov_np - target_cov_np
-        norm_diff_sq = np.sum(diff ** 2)
-        
-        if norm_diff_sq == 0:
-            return 0.0  # No shrinkage needed
-        
-        # Estimate asymptotic variance (simplified)
-        # In practice, this would use the full Ledoit-Wolf formula
-        asymptotic_var = np.sum(sample_cov_np ** 2) / n_periods
-        
-        # Optimal shrinkage intensity
-        shrinkage = min(asymptotic_var / norm_diff_sq, 1.0)
-        shrinkage = max(shrinkage, 0.0)
-        
-        return shrinkage
+        return _shrinkage_intensity(sample_cov_np, target_cov_np, n_periods)
     
     def _create_result(self, cov_matrix: pd.DataFrame) -> RiskModelResult:
         """Create risk model result with diagnostics"""
@@ -416,6 +420,253 @@ class RiskModel:
         return cov_matrix
 
 
+class StreamingRiskModel:
+    """
+    Streaming risk model state.
+    
+    Ingests one return vector per bar and updates, in O(N²) per bar:
+    - EWMA mean and covariance (same weighting as the batch EWMA estimator)
+    - Sample mean and covariance feeding Ledoit-Wolf shrinkage, optionally
+      decayed so the state follows a rolling horizon without storing it
+    
+    Covariance queries never revisit history, and the state can be saved
+    to disk and loaded back for a fast restart.
+    """
+    
+    STATE_VERSION = 1
+    
+    def __init__(
+        self,
+        assets: Sequence[str],
+        decay_factor: float = 0.94,    # EWMA decay per bar
+        sample_decay: float = 1.0,     # Shrinkage-statistics decay (1.0 = equal weights)
+        periods_per_year: int = 252,   # Annualization factor for the bar frequency
+        min_periods: int = 60,         # Minimum bars before covariance queries
+    ):
+        if not 0 < decay_factor < 1:
+            raise ValueError(f"decay_factor must be in (0, 1): {decay_factor}")
+        if not 0 < sample_decay <= 1:
+            raise ValueError(f"sample_decay must be in (0, 1]: {sample_decay}")
+        
+        self.assets = list(assets)
+        self.decay_factor = decay_factor
+        self.sample_decay = sample_decay
+        self.periods_per_year = periods_per_year
+        self.min_periods = min_periods
+        self.n_updates = 0
+        
+        n_assets = len(self.assets)
+        
+        # EWMA state (normalized weighted moments and total weight)
+        self._ewma_weight = 0.0
+        self._ewma_mean = np.zeros(n_assets)
+        self._ewma_cov = np.zeros((n_assets, n_assets))
+        
+        # Shrinkage state; the sum of squared weights gives the effective sample size
+        self._sample_weight = 0.0
+        self._sample_weight_sq = 0.0
+        self._sample_mean = np.zeros(n_assets)
+        self._sample_cov = np.zeros((n_assets, n_assets))
+        
+        self._result_builder = RiskModel(min_periods=min_periods)
+    
+    @staticmethod
+    def _decayed_update(
+        mean: np.ndarray,
+        cov: np.ndarray,
+        total_weight: float,
+        decay: float,
+        observation: np.ndarray
+    ) -> float:
+        """
+        Weighted mean/covariance update in place, returning the new total weight
+        
+        Older weights are scaled by decay and the new bar gets weight 1, so
+        alpha = 1 / total weight and C ← (1 - alpha)(C + alpha·δδ').
+        """
+        total_weight = decay * total_weight + 1.0
+        alpha = 1.0 / total_weight
+        
+        delta = observation - mean
+        mean += alpha * delta
+        cov += alpha * np.outer(delta, delta)
+        cov *= 1.0 - alpha
+        
+        return total_weight
+    
+    def update(self, returns: Union[Mapping[str, float], pd.Series, np.ndarray]) -> bool:
+        """
+        Ingest one bar of returns.
+        
+        Args:
+            returns: Returns keyed by asset, or an array in asset order
+            
+        Returns:
+            False if the bar was skipped for missing values
+        """
+        if isinstance(returns, (Mapping, pd.Series)):
+            observation = np.array([returns.get(asset, np.nan) for asset in self.assets], dtype=float)
+        else:
+            observation = np.asarray(returns, dtype=float)
+            if observation.shape != (len(self.assets),):
+                raise ValueError(f"Expected {len(self.assets)} returns, got shape {observation.shape}")
+        
+        # Mirrors dropna() in the batch estimators
+        if not np.all(np.isfinite(observation)):
+            logger.debug("Skipping return vector with missing values")
+            return False
+        
+        self._ewma_weight = self._decayed_update(
+            self._ewma_mean, self._ewma_cov, self._ewma_weight, self.decay_factor, observation
+        )
+        self._sample_weight = self._decayed_update(
+            self._sample_mean, self._sample_cov, self._sample_weight, self.sample_decay, observation
+        )
+        self._sample_weight_sq = self.sample_decay ** 2 * self._sample_weight_sq + 1.0
+        self.n_updates += 1
+        
+        return True
+    
+    def update_many(self, returns: pd.DataFrame) -> int:
+        """Seed the state from historical returns (dates x assets), returning bars ingested"""
+        ingested = 0
+        for observation in returns[self.assets].to_numpy(dtype=float):
+            ingested += self.update(observation)
+        return ingested
+    
+    @property
+    def effective_periods(self) -> float:
+        """Effective number of bars behind the shrinkage statistics"""
+        if self._sample_weight_sq == 0:
+            return 0.0
+        return self._sample_weight ** 2 / self._sample_weight_sq
+    
+    def estimate_covariance(
+        self,
+        method: CovarianceEstimator = CovarianceEstimator.EWMA,
+        shrinkage_target: str = "single_factor"
+    ) -> RiskModelResult:
+        """
+        Current covariance estimate from the streamed state.
+        
+        Args:
+            method: SAMPLE, LEDOIT_WOLF or EWMA
+            shrinkage_target: Ledoit-Wolf target ("single_factor",
+                "constant_correlation" or "identity")
+            
+        Returns:
+            Risk model result with annualized covariance matrix and diagnostics
+        """
+        if self.n_updates < self.min_periods:
+            raise ValueError(f"Insufficient data: {self.n_updates} < {self.min_periods}")
+        
+        if method == CovarianceEstimator.EWMA:
+            return self._create_result(self._ewma_cov * self.periods_per_year)
+        
+        sample_cov = self._unbiased_sample_covariance() * self.periods_per_year
+        
+        if method == CovarianceEstimator.SAMPLE:
+            return self._create_result(sample_cov)
+        elif method == CovarianceEstimator.LEDOIT_WOLF:
+            target = self._shrinkage_target(sample_cov, shrinkage_target)
+            shrinkage_intensity = _shrinkage_intensity(sample_cov, target, self.effective_periods)
+            
+            result = self._create_result((1 - shrinkage_intensity) * sample_cov + shrinkage_intensity * target)
+            result.shrinkage_intensity = shrinkage_intensity
+            return result
+        else:
+            raise ValueError(f"Unsupported streaming covariance estimator: {method}")
+    
+    def _unbiased_sample_covariance(self) -> np.ndarray:
+        """Sample covariance with the reliability-weights bias correction (n/(n-1) for equal weights)"""
+        weight_sq_total = self._sample_weight ** 2
+        if weight_sq_total <= self._sample_weight_sq:
+            return self._sample_cov.copy()
+        return self._sample_cov * weight_sq_total / (weight_sq_total - self._sample_weight_sq)
+    
+    def _shrinkage_target(self, sample_cov: np.ndarray, shrinkage_target: str) -> np.ndarray:
+        """Shrinkage target built from the covariance alone (no return history)"""
+        n_assets = len(self.assets)
+        variances = np.diag(sample_cov)
+        
+        if shrinkage_target == "single_factor":
+            # Equal-weighted portfolio as market proxy
+            market_cov = sample_cov.sum(axis=1) / n_assets
+            market_var = sample_cov.sum() / n_assets ** 2
+            betas = market_cov / market_var if market_var > 0 else np.zeros(n_assets)
+            
+            factor_vars = betas ** 2 * market_var
+            specific_vars = np.maximum(variances - factor_vars, 0.01 * variances)  # At least 1% specific risk
+            return np.outer(betas, betas) * market_var + np.diag(specific_vars)
+        elif shrinkage_target == "constant_correlation":
+            volatilities = np.sqrt(variances)
+            vol_outer = np.outer(volatilities, volatilities)
+            correlations = np.divide(sample_cov, vol_outer, out=np.zeros_like(sample_cov), where=vol_outer > 0)
+            avg_corr = (correlations.sum() - np.trace(correlations)) / (n_assets * (n_assets - 1)) if n_assets > 1 else 0.0
+            
+            target_corr = np.full((n_assets, n_assets), avg_corr)
+            np.fill_diagonal(target_corr, 1.0)
+            return vol_outer * target_corr
+        elif shrinkage_target == "identity":
+            return np.eye(n_assets) * np.trace(sample_cov) / n_assets
+        else:
+            raise ValueError(f"Unknown shrinkage target: {shrinkage_target}")
+    
+    def _create_result(self, cov_matrix: np.ndarray) -> RiskModelResult:
+        """Wrap an annualized covariance array in a risk model result"""
+        cov_df = pd.DataFrame(cov_matrix, index=self.assets, columns=self.assets)
+        return self._result_builder._create_result(cov_df)
+    
+    def save(self, path: str):
+        """Write the state to an .npz file, replacing any previous file atomically"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            np.savez(
+                f,
+                version=self.STATE_VERSION,
+                assets=np.array(self.assets, dtype=str),
+                decay_factor=self.decay_factor,
+                sample_decay=self.sample_decay,
+                periods_per_year=self.periods_per_year,
+                min_periods=self.min_periods,
+                n_updates=self.n_updates,
+                ewma_weight=self._ewma_weight,
+                ewma_mean=self._ewma_mean,
+                ewma_cov=self._ewma_cov,
+                sample_weight=self._sample_weight,
+                sample_weight_sq=self._sample_weight_sq,
+                sample_mean=self._sample_mean,
+                sample_cov=self._sample_cov,
+            )
+        os.replace(tmp_path, path)
+    
+    @classmethod
+    def load(cls, path: str) -> 'StreamingRiskModel':
+        """Restore a state written by save()"""
+        with np.load(path, allow_pickle=False) as data:
+            version = int(data["version"])
+            if version != cls.STATE_VERSION:
+                raise ValueError(f"Unsupported risk model state version: {version}")
+            
+            model = cls(
+                assets=data["assets"].tolist(),
+                decay_factor=float(data["decay_factor"]),
+                sample_decay=float(data["sample_decay"]),
+                periods_per_year=int(data["periods_per_year"]),
+                min_periods=int(data["min_periods"]),
+            )
+            model.n_updates = int(data["n_updates"])
+            model._ewma_weight = float(data["ewma_weight"])
+            model._ewma_mean = data["ewma_mean"].copy()
+            model._ewma_cov = data["ewma_cov"].copy()
+            model._sample_weight = float(data["sample_weight"])
+            model._sample_weight_sq = float(data["sample_weight_sq"])
+            model._sample_mean = data["sample_mean"].copy()
+            model._sample_cov = data["sample_cov"].copy()
+        
+        return model
+
+
 @dataclass 
 class FactorRiskModel:
     """
@@ -0,0 +1,85 @@
+import unittest
+
+import numpy as np
+
+from portfolio_optimization.benchmarks import make_problem
+from portfolio_optimization.efficient_frontier import EfficientFrontier, _solve_min_variance
+from portfolio_optimization.portfolio_optimizer import OptimizationMethod, PortfolioConstraints
+
+# Bounds wide enough never to bind, so only the budget constraint applies
+UNCONSTRAINED = PortfolioConstraints(min_weight=-10.0, max_weight=10.0)
+
+
+def _weights(result, assets):
+    return np.array([result.weights[asset] for asset in assets])
+
+
+class EfficientFrontierTests(unittest.TestCase):
+    def setUp(self):
+        self.expected_returns, self.covariance = make_problem(8, seed=5)
+        self.frontier = EfficientFrontier(self.expected_returns, self.covariance)
+        self.assets = self.frontier._assets
+
+    def test_closed_form_frontier_matches_slsqp(self):
+        points = self.frontier.generate_frontier(num_points=12, constraints=UNCONSTRAINED)
+        self.assertEqual(len(points), 12)
+
+        x0 = np.ones(len(self.assets)) / len(self.assets)
+        for point in points:
+            numerical = _solve_min_variance(
+                self.frontier.optimizer, self.frontier._mu, self.frontier._cov, self.assets,
+                UNCONSTRAINED, [point.expected_return], x0
+            )[0]
+            self.assertIsNotNone(numerical)
+            self.assertAlmostEqual(point.expected_volatility, numerical.expected_volatility, places=6)
+            np.testing.assert_allclose(
+                _weights(point, self.assets), _weights(numerical, self.assets), atol=1e-3
+            )
+
+    def test_closed_form_min_variance_and_tangency_match_optimizer(self):
+        min_variance = self.frontier._min_variance_result(UNCONSTRAINED)
+        tangency = self.frontier._tangency_result(UNCONSTRAINED)
+        self.assertEqual(min_variance.iterations, 0)
+        self.assertIsNotNone(tangency)
+
+        optimizer = self.frontier.optimizer
+        numerical_min_variance = optimizer.optimize(
+            self.expected_returns, self.covariance, OptimizationMethod.MIN_VARIANCE, constraints=UNCONSTRAINED
+        )
+        numerical_tangency = optimizer.optimize(
+            self.expected_returns, self.covariance, OptimizationMethod.MAX_SHARPE, constraints=UNCONSTRAINED
+        )
+
+        self.assertAlmostEqual(min_variance.expected_volatility, numerical_min_variance.expected_volatility, places=6)
+        self.assertAlmostEqual(tangency.sharpe_ratio, numerical_tangency.sharpe_ratio, places=5)
+        np.testing.assert_allclose(
+            _weights(tangency, self.assets), _weights(numerical_tangency, self.assets), atol=1e-3
+        )
+
+    def test_warm_started_solves_match_cold_solves(self):
+        # Long-only bounds bind along the frontier, so every point goes through SLSQP
+        constraints = PortfolioConstraints(max_weight=0.3)
+        mu = self.frontier._mu
+        # Up to the equal-weighted top four, which the 30% cap still allows
+        targets = np.linspace(mu.mean(), np.sort(mu)[-4:].mean(), 10).tolist()
+        x0 = np.ones(len(self.assets)) / len(self.assets)
+
+        args = (self.frontier.optimizer, mu, self.frontier._cov, self.assets, constraints)
+        warm = _solve_min_variance(*args, targets, x0)
+        cold = [_solve_min_variance(*args, [target], x0)[0] for target in targets]
+
+        for warm_result, cold_result in zip(warm, cold):
+            self.assertIsNotNone(warm_result)
+            self.assertIsNotNone(cold_result)
+            self.assertAlmostEqual(warm_result.expected_volatility, cold_result.expected_volatility, places=5)
+            np.testing.assert_allclose(
+                _weights(warm_result, self.assets), _weights(cold_result, self.assets), atol=1e-3
+            )
+
+        self.assertLessEqual(
+            sum(result.iterations for result in warm), sum(result.iterations for result in cold)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+from scipy import optimize
+
+from portfolio_optimization.benchmarks import make_problem, run_benchmark
+from portfolio_optimization.portfolio_optimizer import (
+    OptimizationMethod, OptimizationObjective, PortfolioConstraints, PortfolioOptimizer
+)
+
+_minimize = optimize.minimize
+
+
+class GradientCheckTests(unittest.TestCase):
+    def setUp(self):
+        self.expected_returns, self.covariance = make_problem(6, seed=9)
+        self.assets = list(self.expected_returns)
+        self.optimizer = PortfolioOptimizer()
+        rng = np.random.default_rng(0)
+        # Interior long-only points away from the equal-weight start
+        self.points = [weights / weights.sum() for weights in rng.uniform(0.05, 1.0, (5, len(self.assets)))]
+
+    def _capture(self, method, objective=OptimizationObjective.MAXIMIZE_SHARPE, constraints=None, **kwargs):
+        """Objective, gradient and constraints the optimizer hands to scipy"""
+        calls = []
+
+        def recording_minimize(fun, x0, **options):
+            calls.append((fun, options))
+            return _minimize(fun, x0, **options)
+
+        with patch("portfolio_optimization.portfolio_optimizer.optimize.minimize", side_effect=recording_minimize):
+            self.optimizer.optimize(
+                self.expected_returns, self.covariance, method, objective, constraints=constraints, **kwargs
+            )
+
+        self.assertEqual(len(calls), 1)
+        return calls[0]
+
+    def _assert_gradient(self, fun, jac, points=None):
+        self.assertIsNotNone(jac)
+        for w in points if points is not None else self.points:
+            error = optimize.check_grad(fun, jac, w)
+            self.assertLess(error, 1e-5 * max(1.0, np.linalg.norm(jac(w))))
+
+    def test_min_variance_gradient(self):
+        fun, options = self._capture(OptimizationMethod.MIN_VARIANCE)
+        self._assert_gradient(fun, options["jac"])
+
+    def test_sharpe_gradient(self):
+        fun, options = self._capture(OptimizationMethod.MAX_SHARPE)
+        self._assert_gradient(fun, options["jac"])
+
+    def test_utility_gradient(self):
+        fun, options = self._capture(
+            OptimizationMethod.MEAN_VARIANCE, OptimizationObjective.MAXIMIZE_UTILITY, risk_aversion=3.0
+        )
+        self._assert_gradient(fun, options["jac"])
+
+    def test_risk_parity_gradient(self):
+        fun, options = self._capture(OptimizationMethod.RISK_PARITY)
+        self._assert_gradient(fun, options["jac"])
+
+    def test_max_diversification_gradient(self):
+        fun, options = self._capture(OptimizationMethod.MAX_DIVERSIFICATION)
+        self._assert_gradient(fun, options["jac"])
+
+    def test_budget_and_turnover_constraint_gradients(self):
+        current = np.zeros(len(self.assets))
+        current[:2] = 0.5
+        constraints = PortfolioConstraints(max_turnover=0.5, current_weights=dict(zip(self.assets, current)))
+        _, options = self._capture(OptimizationMethod.MIN_VARIANCE, constraints=constraints)
+
+        budget, turnover = options["constraints"]
+        self.assertEqual(turnover["type"], "ineq")
+        # No point sits on a kink of |w - current|
+        self.assertTrue(all(np.all(w != current) for w in self.points))
+        self._assert_gradient(budget["fun"], budget["jac"])
+        self._assert_gradient(turnover["fun"], turnover["jac"])
+
+    def test_finite_difference_mode_passes_no_gradients(self):
+        self.optimizer = PortfolioOptimizer(use_analytic_gradients=False)
+        _, options = self._capture(OptimizationMethod.MIN_VARIANCE)
+
+        self.assertIsNone(options["jac"])
+        self.assertTrue(all(constraint["jac"] is None for constraint in options["constraints"]))
+
+
+class AnalyticVsFiniteDifferenceTests(unittest.TestCase):
+    def test_solutions_agree_for_every_benchmark_case(self):
+        results = run_benchmark(asset_counts=(10,), seed=3)
+
+        for row in results.itertuples():
+            with self.subTest(case=row.case):
+                self.assertTrue(row.analytic_success)
+                self.assertTrue(row.fd_success)
+                self.assertLess(row.weights_l1_diff, 0.02)
+                self.assertAlmostEqual(row.analytic_volatility, row.fd_volatility, places=3)
+
+
+if __name__ == "__main__":
+    unittest.main()
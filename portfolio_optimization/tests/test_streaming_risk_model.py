@@ -0,0 +1,112 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from portfolio_optimization.risk_models import CovarianceEstimator, RiskModel, StreamingRiskModel
+
+
+def _returns(n_periods=150, seed=21):
+    rng = np.random.default_rng(seed)
+    market = rng.normal(0.0004, 0.01, n_periods)
+    data = {
+        "AAA": market + rng.normal(0, 0.008, n_periods),
+        "BBB": 0.6 * market + rng.normal(0, 0.012, n_periods),
+        "CCC": -0.3 * market + rng.normal(0, 0.006, n_periods),
+        "DDD": rng.normal(0.0002, 0.015, n_periods),
+    }
+    return pd.DataFrame(data, index=pd.date_range("2024-01-01", periods=n_periods, freq="B"))
+
+
+class StreamingRiskModelTests(unittest.TestCase):
+    def setUp(self):
+        self.returns = _returns()
+        self.assets = list(self.returns.columns)
+        # Batch reference over the whole history, however long
+        self.batch = RiskModel(lookback_window=10_000, min_periods=20)
+
+    def _assert_matches_batch(self, streaming, window, method):
+        expected = self.batch.estimate_covariance(window, method=method).covariance_matrix
+        actual = streaming.estimate_covariance(method=method).covariance_matrix
+        np.testing.assert_allclose(actual.values, expected.loc[self.assets, self.assets].values, rtol=1e-10)
+
+    def test_per_bar_updates_match_batch_ewma(self):
+        model = StreamingRiskModel(self.assets, decay_factor=0.94, min_periods=20)
+        for t, (_, row) in enumerate(self.returns.iterrows(), start=1):
+            self.assertTrue(model.update(row))
+            if t >= 20 and t % 13 == 0:
+                self._assert_matches_batch(model, self.returns.iloc[:t], CovarianceEstimator.EWMA)
+
+    def test_per_bar_updates_match_batch_sample_covariance(self):
+        model = StreamingRiskModel(self.assets, min_periods=20)
+        for t, observation in enumerate(self.returns.to_numpy(), start=1):
+            model.update(observation)
+            if t >= 20 and t % 13 == 0:
+                self._assert_matches_batch(model, self.returns.iloc[:t], CovarianceEstimator.SAMPLE)
+                np.testing.assert_allclose(
+                    model.estimate_covariance(CovarianceEstimator.SAMPLE).covariance_matrix.values,
+                    self.returns.iloc[:t].cov().values * 252,
+                    rtol=1e-10
+                )
+        self.assertAlmostEqual(model.effective_periods, len(self.returns))
+
+    def test_bars_with_missing_values_are_skipped(self):
+        returns = self.returns.copy()
+        returns.iloc[[5, 40, 41], 1] = np.nan
+        returns.iloc[70, 3] = np.inf
+
+        model = StreamingRiskModel(self.assets, min_periods=20)
+        ingested = model.update_many(returns)
+        clean = returns.replace(np.inf, np.nan).dropna()
+
+        self.assertEqual(ingested, len(clean))
+        self.assertEqual(model.n_updates, len(clean))
+        self.assertFalse(model.update({"AAA": 0.01, "BBB": 0.0, "CCC": 0.0}))  # DDD missing
+        self._assert_matches_batch(model, clean, CovarianceEstimator.EWMA)
+        self._assert_matches_batch(model, clean, CovarianceEstimator.SAMPLE)
+
+    def test_short_history_and_bad_shapes_are_rejected(self):
+        model = StreamingRiskModel(self.assets, min_periods=60)
+        model.update_many(self.returns.iloc[:59])
+
+        for method in (CovarianceEstimator.EWMA, CovarianceEstimator.SAMPLE, CovarianceEstimator.LEDOIT_WOLF):
+            with self.assertRaises(ValueError):
+                model.estimate_covariance(method)
+        with self.assertRaises(ValueError):
+            model.update(np.zeros(len(self.assets) + 1))
+
+        model.update(self.returns.iloc[59])
+        self.assertEqual(model.estimate_covariance().covariance_matrix.shape, (4, 4))
+
+    def test_state_survives_save_and_load(self):
+        model = StreamingRiskModel(self.assets, decay_factor=0.97, sample_decay=0.995, min_periods=20)
+        model.update_many(self.returns.iloc[:100])
+        reference = StreamingRiskModel(self.assets, decay_factor=0.97, sample_decay=0.995, min_periods=20)
+        reference.update_many(self.returns)
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "risk_state.npz")
+            model.save(path)
+            self.assertFalse(os.path.exists(f"{path}.tmp"))
+            restored = StreamingRiskModel.load(path)
+
+        self.assertEqual(restored.assets, self.assets)
+        self.assertEqual(restored.n_updates, 100)
+        self.assertEqual(restored.sample_decay, 0.995)
+
+        # Resuming after the restart gives the same state as never stopping
+        restored.update_many(self.returns.iloc[100:])
+        self.assertEqual(restored.n_updates, reference.n_updates)
+        self.assertAlmostEqual(restored.effective_periods, reference.effective_periods)
+        for method in (CovarianceEstimator.EWMA, CovarianceEstimator.SAMPLE, CovarianceEstimator.LEDOIT_WOLF):
+            np.testing.assert_allclose(
+                restored.estimate_covariance(method).covariance_matrix.values,
+                reference.estimate_covariance(method).covariance_matrix.values,
+                rtol=1e-12
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
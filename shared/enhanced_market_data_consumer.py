@@ -7,7 +7,6 @@ and correlation data. It can be used by order_executor, strategy_service, and ot
 """
 
 import asyncio
-import json
 import aiohttp
 import aio_pika
 from typing import Dict, List, Optional, Any, Callable
@@ -15,6 +14,8 @@ from datetime import datetime, timezone
 from dataclasses import dataclass
 import structlog
 
+from shared.rabbitmq_publisher import decode_body
+
 logger = structlog.get_logger()
 
 @dataclass
@@ -217,8 +218,8 @@ class EnhancedMarketDataConsumer:
                         
                     async with message.process():
                         try:
-                            # Parse message
-                            message_data = json.loads(message.body.decode())
+                            # Parse message (JSON or msgpack, by content type)
+                            message_data = decode_body(message.body, message.content_type)
                             
                             # Create structured message
                             market_message = MarketDataMessage(
@@ -0,0 +1,209 @@
+"""
+In-Process LRU Cache for MasterTrade System
+
+Bounded cache with least-recently-used eviction and per-entry TTL. Values
+are stored as-is (model objects are not serialised or re-validated), and
+every operation is O(1): lookups and updates move entries to the end of an
+OrderedDict and eviction pops its head.
+
+Hit/miss/set/eviction/expiration counts and held bytes are tracked per
+category (for example the indicator type) and can be mirrored to
+Prometheus metrics.
+"""
+
+import sys
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Generic, Hashable, Optional, TypeVar
+
+V = TypeVar('V')
+
+DEFAULT_CATEGORY = 'default'
+
+# Metric operation label -> CacheCategoryStats field
+_OPERATION_STATS = {
+    'hit': 'hits',
+    'miss': 'misses',
+    'set': 'sets',
+    'eviction': 'evictions',
+    'expired': 'expirations',
+}
+
+
+@dataclass
+class _CacheEntry(Generic[V]):
+    value: V
+    expires_at: Optional[float]  # Clock time after which the entry is stale; None never expires
+    category: str
+    size_bytes: int
+
+
+@dataclass
+class CacheCategoryStats:
+    """Per-category cache counters"""
+    hits: int = 0
+    misses: int = 0
+    sets: int = 0
+    evictions: int = 0  # Live entries dropped to make room
+    expirations: int = 0  # Stale entries dropped on access or purge
+    entries: int = 0
+    size_bytes: int = 0
+
+
+class LRUCache(Generic[V]):
+    """
+    Bounded LRU cache with TTL expiry
+
+    Args:
+        max_entries: Maximum number of entries; the least recently used entry
+            is evicted when a new key is stored at capacity
+        default_ttl_seconds: TTL applied when ``set`` gets none; None keeps
+            entries until they are evicted
+        size_of: Estimates the byte size of a value (default ``sys.getsizeof``)
+        operations_counter: Optional Prometheus Counter labelled
+            (operation, category), incremented with hit/miss/set/eviction/expired
+        bytes_gauge: Optional Prometheus Gauge labelled (category) with the
+            bytes currently held
+        clock: Monotonic time source in seconds
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        default_ttl_seconds: Optional[float] = None,
+        *,
+        size_of: Optional[Callable[[V], int]] = None,
+        operations_counter: Any = None,
+        bytes_gauge: Any = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if max_entries <= 0:
+            raise ValueError("max_entries must be positive")
+        self.max_entries = max_entries
+        self.default_ttl_seconds = default_ttl_seconds
+        self._size_of = size_of or sys.getsizeof
+        self._operations_counter = operations_counter
+        self._bytes_gauge = bytes_gauge
+        self._clock = clock
+        self._entries: 'OrderedDict[Hashable, _CacheEntry[V]]' = OrderedDict()
+        self._stats: Dict[str, CacheCategoryStats] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        entry = self._entries.get(key)
+        return entry is not None and not self._is_expired(entry)
+
+    def get(self, key: Hashable, category: str = DEFAULT_CATEGORY) -> Optional[V]:
+        """Return a live value and mark it most recently used, or None"""
+        entry = self._entries.get(key)
+        if entry is not None and self._is_expired(entry):
+            self._remove(key, 'expired')
+            entry = None
+
+        if entry is None:
+            self._record(category, 'miss')
+            return None
+
+        self._entries.move_to_end(key)
+        self._record(entry.category, 'hit')
+        return entry.value
+
+    def set(
+        self,
+        key: Hashable,
+        value: V,
+        ttl_seconds: Optional[float] = None,
+        category: str = DEFAULT_CATEGORY,
+    ) -> None:
+        """Store a value as most recently used, evicting the LRU entry at capacity"""
+        if key in self._entries:
+            self._remove(key, None)
+        elif len(self._entries) >= self.max_entries:
+            self._remove(next(iter(self._entries)), 'eviction')
+
+        ttl = self.default_ttl_seconds if ttl_seconds is None else ttl_seconds
+        entry = _CacheEntry(
+            value=value,
+            expires_at=self._clock() + ttl if ttl is not None else None,
+            category=category,
+            size_bytes=self._size_of(value),
+        )
+        self._entries[key] = entry
+
+        stats = self._category_stats(category)
+        stats.entries += 1
+        stats.size_bytes += entry.size_bytes
+        self._record(category, 'set')
+        self._update_bytes_gauge(category)
+
+    def pop(self, key: Hashable) -> Optional[V]:
+        """Remove a key and return its value (None if absent)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._remove(key, None)
+        return entry.value
+
+    def clear(self) -> None:
+        """Remove every entry; counters are kept"""
+        self._entries.clear()
+        for category, stats in self._stats.items():
+            stats.entries = 0
+            stats.size_bytes = 0
+            self._update_bytes_gauge(category)
+
+    def purge_expired(self) -> int:
+        """Drop every stale entry (O(n)); returns the number removed"""
+        expired = [key for key, entry in self._entries.items() if self._is_expired(entry)]
+        for key in expired:
+            self._remove(key, 'expired')
+        return len(expired)
+
+    def statistics(self) -> Dict[str, Any]:
+        """Totals plus per-category counters"""
+        categories = {category: vars(stats).copy() for category, stats in self._stats.items()}
+        hits = sum(stats['hits'] for stats in categories.values())
+        misses = sum(stats['misses'] for stats in categories.values())
+        return {
+            'entries': len(self._entries),
+            'max_entries': self.max_entries,
+            'size_bytes': sum(stats['size_bytes'] for stats in categories.values()),
+            'hits': hits,
+            'misses': misses,
+            'evictions': sum(stats['evictions'] for stats in categories.values()),
+            'expirations': sum(stats['expirations'] for stats in categories.values()),
+            'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+            'categories': categories,
+        }
+
+    def _is_expired(self, entry: _CacheEntry) -> bool:
+        return entry.expires_at is not None and self._clock() >= entry.expires_at
+
+    def _remove(self, key: Hashable, operation: Optional[str]) -> None:
+        entry = self._entries.pop(key)
+        stats = self._category_stats(entry.category)
+        stats.entries -= 1
+        stats.size_bytes -= entry.size_bytes
+        if operation is not None:
+            self._record(entry.category, operation)
+        self._update_bytes_gauge(entry.category)
+
+    def _category_stats(self, category: str) -> CacheCategoryStats:
+        stats = self._stats.get(category)
+        if stats is None:
+            stats = self._stats[category] = CacheCategoryStats()
+        return stats
+
+    def _record(self, category: str, operation: str) -> None:
+        stats = self._category_stats(category)
+        field_name = _OPERATION_STATS[operation]
+        setattr(stats, field_name, getattr(stats, field_name) + 1)
+        if self._operations_counter is not None:
+            self._operations_counter.labels(operation, category).inc()
+
+    def _update_bytes_gauge(self, category: str) -> None:
+        if self._bytes_gauge is not None:
+            self._bytes_gauge.labels(category).set(self._stats[category].size_bytes)
@@ -9,25 +9,15 @@ services like the order executor and risk manager can easily incorporate
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Any, Dict, Optional
 
 import aiohttp
 import structlog
 
-logger = structlog.get_logger()
-
-
-@dataclass
-class _CachedPrediction:
-    """Internal structure for cached prediction responses."""
+from shared.lru_cache import LRUCache
 
-    data: Dict[str, Any]
-    cached_at: datetime
-
-    def is_expired(self, ttl: timedelta) -> bool:
-        return datetime.now(timezone.utc) - self.cached_at > ttl
+logger = structlog.get_logger()
 
 
 class PricePredictionClient:
@@ -40,13 +30,17 @@ class PricePredictionClient:
         service_name: str = "shared_client",
         request_timeout: float = 5.0,
         cache_ttl_seconds: int = 300,
+        cache_max_entries: int = 256,
     ) -> None:
         self.base_url = base_url.rstrip("/")
         self.service_name = service_name
         self._timeout = aiohttp.ClientTimeout(total=request_timeout)
         self._cache_ttl = timedelta(seconds=max(cache_ttl_seconds, 0))
         self._session: Optional[aiohttp.ClientSession] = None
-        self._cache: Dict[str, _CachedPrediction] = {}
+        self._cache: LRUCache[Dict[str, Any]] = LRUCache(
+            max(cache_max_entries, 1),
+            default_ttl_seconds=self._cache_ttl.total_seconds(),
+        )
         self._lock = asyncio.Lock()
 
     async def initialize(self) -> None:
@@ -83,8 +77,8 @@ class PricePredictionClient:
         # Return cached value when appropriate to reduce API load.
         if not force_refresh and self._cache_ttl.total_seconds() > 0:
             cached = self._cache.get(normalized_symbol)
-            if cached and not cached.is_expired(self._cache_ttl):
-                return cached.data
+            if cached is not None:
+                return cached
 
         url = f"{self.base_url}/api/v1/predictions/{normalized_symbol}"
         params = {"force_refresh": str(force_refresh).lower()}
@@ -93,8 +87,8 @@ class PricePredictionClient:
             # Re-check cache after waiting for lock to avoid duplicate refreshes.
             if not force_refresh and self._cache_ttl.total_seconds() > 0:
                 cached = self._cache.get(normalized_symbol)
-                if cached and not cached.is_expired(self._cache_ttl):
-                    return cached.data
+                if cached is not None:
+                    return cached
 
             try:
                 async with self._session.get(url, params=params) as response:
@@ -106,10 +100,7 @@ class PricePredictionClient:
                             "source_service": self.service_name,
                         }
                         if self._cache_ttl.total_seconds() > 0:
-                            self._cache[normalized_symbol] = _CachedPrediction(
-                                data=prediction,
-                                cached_at=datetime.now(timezone.utc),
-                            )
+                            self._cache.set(normalized_symbol, prediction)
                         return prediction
 
                     logger.warning(
@@ -0,0 +1,244 @@
+"""
+Batched RabbitMQ Publisher for MasterTrade System
+
+Publishing one aio_pika message at a time and awaiting its broker confirm
+before the next costs a round trip per message. BatchedPublisher buffers
+messages and publishes each batch concurrently on one reused channel: the
+frames are pipelined and the publisher confirms (often acknowledged in bulk by
+the broker) are awaited together.
+
+Bodies are serialised with orjson (JSON) or msgpack when installed, falling
+back to the standard json module. The content type travels with every message
+so consumers decode with ``decode_body`` regardless of the publisher's format.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, Sequence
+
+import aio_pika
+import structlog
+
+try:
+    import orjson
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    orjson = None
+
+try:
+    import msgpack
+except ModuleNotFoundError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+logger = structlog.get_logger()
+
+CONTENT_TYPE_JSON = "application/json"
+CONTENT_TYPE_MSGPACK = "application/msgpack"
+
+# Content types a consumer may receive; "application/x-msgpack" is the legacy name
+_MSGPACK_CONTENT_TYPES = (CONTENT_TYPE_MSGPACK, "application/x-msgpack")
+
+
+def negotiate_content_type(preferred: Optional[str]) -> str:
+    """Preferred content type if it can be encoded here, otherwise JSON"""
+    if preferred in _MSGPACK_CONTENT_TYPES:
+        if msgpack is not None:
+            return CONTENT_TYPE_MSGPACK
+        logger.warning("msgpack is not installed, publishing JSON instead")
+    return CONTENT_TYPE_JSON
+
+
+def encode_body(data: Any, content_type: str = CONTENT_TYPE_JSON) -> bytes:
+    """Serialise a message body; non-native values are stringified like json.dumps(default=str)"""
+    if content_type in _MSGPACK_CONTENT_TYPES:
+        return msgpack.packb(data, default=str, use_bin_type=True)
+    if orjson is not None:
+        # Datetimes are passed to default=str so payloads match json.dumps(default=str)
+        return orjson.dumps(
+            data,
+            default=str,
+            option=orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME
+        )
+    return json.dumps(data, default=str).encode()
+
+
+def decode_body(body: bytes, content_type: Optional[str] = None) -> Any:
+    """Deserialise a message body by its content type (JSON when unset)"""
+    if content_type in _MSGPACK_CONTENT_TYPES:
+        if msgpack is None:
+            raise ValueError(f"Cannot decode {content_type} message: msgpack is not installed")
+        return msgpack.unpackb(body, raw=False)
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+@dataclass
+class OutgoingMessage:
+    """A message waiting to be published"""
+    routing_key: str
+    body: Any  # Serialised with the publisher's content type
+    headers: Optional[Dict[str, Any]] = None
+    persistent: bool = False
+    timestamp: Optional[datetime] = None
+
+
+class BatchedPublisher:
+    """
+    Buffers messages for one exchange and publishes them in confirmed batches
+
+    Args:
+        exchange: Declared aio_pika exchange; its channel should have publisher
+            confirms enabled (the aio_pika default) for delivery to be confirmed
+        content_type: Preferred body format, negotiated by ``negotiate_content_type``
+        max_batch_size: Messages published per batch
+        flush_interval_ms: Longest a buffered message waits for a batch to fill
+        max_buffer_size: Buffered messages before ``publish`` waits for a flush
+        messages_counter: Optional Prometheus Counter labelled (exchange, status)
+        name: Exchange label for metrics and logs (default: the exchange name)
+    """
+
+    def __init__(
+        self,
+        exchange: aio_pika.abc.AbstractExchange,
+        *,
+        content_type: str = CONTENT_TYPE_JSON,
+        max_batch_size: int = 200,
+        flush_interval_ms: int = 20,
+        max_buffer_size: int = 10000,
+        messages_counter: Any = None,
+        name: Optional[str] = None,
+    ):
+        self.exchange = exchange
+        self.name = name or getattr(exchange, 'name', '') or 'default'
+        self.content_type = negotiate_content_type(content_type)
+        self.max_batch_size = max_batch_size
+        self.flush_interval_ms = flush_interval_ms
+        self.max_buffer_size = max_buffer_size
+        self._messages_counter = messages_counter
+        self._buffer: List[OutgoingMessage] = []
+        self._wakeup = asyncio.Event()  # Buffer is not empty
+        self._batch_full = asyncio.Event()  # Buffer holds a full batch
+        self._space = asyncio.Condition()
+        self._task: Optional[asyncio.Task] = None
+        self._flush_lock = asyncio.Lock()
+        self.published = 0
+        self.failed = 0
+        self.batches = 0
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    def start(self):
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run(), name=f"publisher-{self.name}")
+
+    async def stop(self):
+        """Stop the flush task and publish anything still buffered"""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+        await self.flush()
+
+    async def publish(
+        self,
+        routing_key: str,
+        body: Any,
+        headers: Optional[Dict[str, Any]] = None,
+        persistent: bool = False,
+    ) -> None:
+        """Buffer a message; waits for a flush when the buffer is full"""
+        if len(self._buffer) >= self.max_buffer_size:
+            async with self._space:
+                await self._space.wait_for(lambda: len(self._buffer) < self.max_buffer_size)
+        self._buffer.append(OutgoingMessage(
+            routing_key, body, headers, persistent, datetime.now(timezone.utc)
+        ))
+        if self._task is None:
+            await self.flush()  # Not started: publish synchronously
+        else:
+            self._wakeup.set()
+            if len(self._buffer) >= self.max_batch_size:
+                self._batch_full.set()
+
+    async def flush(self) -> int:
+        """Publish everything buffered; returns the number of confirmed messages"""
+        confirmed = 0
+        async with self._flush_lock:
+            while self._buffer:
+                batch = self._buffer[:self.max_batch_size]
+                del self._buffer[:self.max_batch_size]
+                async with self._space:
+                    self._space.notify_all()
+                confirmed += await self.publish_batch(batch)
+        return confirmed
+
+    async def publish_batch(self, messages: Sequence[OutgoingMessage]) -> int:
+        """Publish messages concurrently and await their confirms; returns the number confirmed"""
+        if not messages:
+            return 0
+
+        results = await asyncio.gather(
+            *(self.exchange.publish(self._build(message), routing_key=message.routing_key)
+              for message in messages),
+            return_exceptions=True
+        )
+
+        failures = [(m, r) for m, r in zip(messages, results) if isinstance(r, BaseException)]
+        confirmed = len(messages) - len(failures)
+        self.batches += 1
+        self.published += confirmed
+        self.failed += len(failures)
+        if self._messages_counter is not None:
+            if confirmed:
+                self._messages_counter.labels(self.name, 'success').inc(confirmed)
+            if failures:
+                self._messages_counter.labels(self.name, 'error').inc(len(failures))
+        if failures:
+            message, error = failures[0]
+            logger.error("Error publishing to RabbitMQ",
+                         exchange=self.name,
+                         failed=len(failures),
+                         batch_size=len(messages),
+                         routing_key=message.routing_key,
+                         error=str(error))
+        return confirmed
+
+    def statistics(self) -> Dict[str, Any]:
+        return {
+            'exchange': self.name,
+            'content_type': self.content_type,
+            'pending': self.pending,
+            'published': self.published,
+            'failed': self.failed,
+            'batches': self.batches
+        }
+
+    def _build(self, message: OutgoingMessage) -> aio_pika.Message:
+        return aio_pika.Message(
+            encode_body(message.body, self.content_type),
+            content_type=self.content_type,
+            timestamp=message.timestamp or datetime.now(timezone.utc),
+            headers=message.headers,
+            delivery_mode=aio_pika.DeliveryMode.PERSISTENT if message.persistent else None
+        )
+
+    async def _run(self):
+        while True:
+            await self._wakeup.wait()
+            # Let a partial batch fill for up to flush_interval_ms
+            if len(self._buffer) < self.max_batch_size and self.flush_interval_ms:
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval_ms / 1000)
+                except asyncio.TimeoutError:
+                    pass
+            self._wakeup.clear()
+            self._batch_full.clear()
+            try:
+                # Shielded so stop() cannot drop a batch that is already being published
+                await asyncio.shield(self.flush())
+            except Exception as e:
+                logger.error("Error flushing RabbitMQ batch", exchange=self.name, error=str(e))
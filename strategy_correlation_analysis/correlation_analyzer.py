@@ -231,18 +231,15 @@ class CorrelationMatrix:
     
     def get_most_correlated_pairs(self, n: int = 5) -> List[Tuple[str, str, float]]:
         """Get most highly correlated strategy pairs"""
-        pairs = []
-        
-        for i in range(len(self.strategies)):
-            for j in range(i + 1, len(self.strategies)):
-                strategy1 = self.strategies[i]
-                strategy2 = self.strategies[j]
-                correlation = self.correlation_matrix.iloc[i, j]
-                pairs.append((strategy1, strategy2, correlation))
-        
-        # Sort by absolute correlation
-        pairs.sort(key=lambda x: abs(x[2]), reverse=True)
-        return pairs[:n]
+        rows, columns = np.triu_indices(len(self.strategies), k=1)
+        correlations = self.correlation_matrix.values[rows, columns]
+        
+        # Sort by absolute correlation (stable, so ties keep matrix order)
+        top = np.argsort(-np.abs(correlations), kind="stable")[:n]
+        return [
+            (self.strategies[rows[k]], self.strategies[columns[k]], correlations[k])
+            for k in top
+        ]
     
     def to_dict(self) -> Dict:
         """Convert to dictionary"""
@@ -261,6 +258,118 @@ class CorrelationMatrix:
         }
 
 
+def _t_test_p_values(correlations: np.ndarray, sample_sizes: np.ndarray) -> np.ndarray:
+    """
+    Two-sided p-values of Pearson/Spearman correlations (t-test with n - 2 degrees of freedom)
+
+    Same values as ``stats.pearsonr``/``stats.spearmanr``, for whole matrices at once.
+    """
+    dof = np.asarray(sample_sizes, dtype=float) - 2
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r = np.clip(correlations, -1.0, 1.0)
+        t_stat = np.abs(r) * np.sqrt(dof / ((1.0 - r) * (1.0 + r)))
+        p_values = 2 * stats.t.sf(t_stat, dof)
+    return np.where(dof > 0, p_values, np.nan)
+
+
+def _fisher_confidence_intervals(
+    correlations: np.ndarray,
+    sample_sizes: np.ndarray,
+    significance_level: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Fisher z confidence interval bounds for arrays of correlations"""
+    z_critical = stats.norm.ppf(1 - significance_level/2)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z_transform = np.arctanh(correlations)
+        standard_error = 1 / np.sqrt(np.asarray(sample_sizes, dtype=float) - 3)
+    return (
+        np.tanh(z_transform - z_critical * standard_error),
+        np.tanh(z_transform + z_critical * standard_error)
+    )
+
+
+def _correlation_statistics(
+    values: np.ndarray,
+    correlation_type: CorrelationType
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Correlation, p-value and sample size matrices for the columns of ``values``
+
+    Each pair uses the rows where both columns are present (NaN marks missing
+    values), like running ``calculate_correlation`` on every pair. Pearson and
+    Spearman are computed for all pairs at once (Spearman as the Pearson
+    correlation of column ranks); Kendall's tau has no matrix form and is
+    computed once per unordered pair.
+    """
+    valid = ~np.isnan(values)
+    valid_float = valid.astype(float)
+    sample_sizes = valid_float.T @ valid_float
+    n_columns = values.shape[1]
+
+    if correlation_type == CorrelationType.KENDALL:
+        correlations = np.eye(n_columns)
+        p_values = np.zeros((n_columns, n_columns))
+        for i in range(n_columns):
+            for j in range(i + 1, n_columns):
+                rows = valid[:, i] & valid[:, j]
+                tau, p_val = stats.kendalltau(values[rows, i], values[rows, j])
+                correlations[i, j] = correlations[j, i] = tau
+                p_values[i, j] = p_values[j, i] = p_val
+        return correlations, p_values, sample_sizes
+
+    spearman = correlation_type == CorrelationType.SPEARMAN
+    with np.errstate(divide="ignore", invalid="ignore"):
+        if valid.all():
+            data = stats.rankdata(values, axis=0) if spearman else values
+            correlations = np.atleast_2d(np.corrcoef(data, rowvar=False))
+        else:
+            # Ranks depend on each pair's common rows; pandas handles pairwise deletion
+            correlations = pd.DataFrame(values).corr(method="spearman" if spearman else "pearson").to_numpy()
+    p_values = _t_test_p_values(correlations, sample_sizes)
+    np.fill_diagonal(p_values, 0.0)
+    return correlations, p_values, sample_sizes
+
+
+def _rolling_correlations(x: np.ndarray, ys: np.ndarray, window_size: int, min_periods: int) -> np.ndarray:
+    """
+    Rolling Pearson correlation of x with every column of ys
+
+    Uses windowed sums taken from cumulative sums, over the rows where both
+    series are present (NaN marks missing values). Rows whose window has fewer
+    than min_periods common observations or no variance are NaN.
+    """
+    def windowed(values: np.ndarray) -> np.ndarray:
+        sums = np.cumsum(values, axis=0)
+        sums[window_size:] = sums[window_size:] - sums[:-window_size]
+        return sums
+
+    x_missing, y_missing = np.isnan(x), np.isnan(ys)
+    if x_missing.any() or y_missing.any():
+        both = ~x_missing[:, None] & ~y_missing
+        x_values = np.where(both, x[:, None], 0.0)
+        y_values = np.where(both, ys, 0.0)
+        count = windowed(both.astype(float))
+        sum_x, sum_xx = windowed(x_values), windowed(x_values * x_values)
+    else:
+        # Complete data: the window count and x's sums are shared by every column
+        x_values, y_values = x[:, None], ys
+        count = windowed(np.ones(len(x)))[:, None]
+        sum_x, sum_xx = windowed(x_values), windowed(x_values * x_values)
+    sum_y, sum_yy = windowed(y_values), windowed(y_values * y_values)
+    sum_xy = windowed(x_values * y_values)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        covariance = sum_xy - sum_x * sum_y / count
+        variance_x = sum_xx - sum_x * sum_x / count
+        variance_y = sum_yy - sum_y * sum_y / count
+        correlations = covariance / np.sqrt(variance_x * variance_y)
+
+    # Differences of running sums leave rounding noise where a window is constant
+    flat = (variance_x <= 1e-10 * sum_xx) | (variance_y <= 1e-10 * sum_yy)
+    correlations[(count < max(min_periods, 2)) | flat] = np.nan
+    return np.clip(correlations, -1.0, 1.0)
+
+
 class CorrelationAnalyzer:
     """
     Comprehensive strategy correlation analyzer
@@ -388,6 +497,151 @@ class CorrelationAnalyzer:
             correlation_type=correlation_type
         )
     
+    def calculate_pairwise_correlations(
+        self,
+        strategy_returns: Dict[str, pd.Series],
+        correlation_type: CorrelationType = CorrelationType.PEARSON,
+        time_window: TimeWindow = TimeWindow.DAILY,
+        market_condition: Optional[MarketCondition] = None,
+        significance_level: float = 0.05
+    ) -> List[CorrelationResult]:
+        """
+        Calculate correlations between all strategy pairs at once
+        
+        Gives the results of ``calculate_correlation`` for every pair (each pair
+        uses the dates where both strategies have returns). Pairs with fewer than
+        10 common observations are skipped.
+        """
+        returns_df = pd.DataFrame(strategy_returns)
+        strategies = list(returns_df.columns)
+        if not strategies or returns_df.empty:
+            return []
+        
+        values = returns_df.to_numpy(dtype=float)
+        correlations, p_values, sample_sizes = _correlation_statistics(values, correlation_type)
+        lower, upper = _fisher_confidence_intervals(correlations, sample_sizes, significance_level)
+        
+        index = returns_df.index
+        dates = list(index) if hasattr(index[0], 'date') else None
+        valid = ~np.isnan(values)
+        results = []
+        
+        for i, strategy1 in enumerate(strategies):
+            both = valid[:, i:i + 1] & valid[:, i + 1:]
+            first_rows = both.argmax(axis=0)
+            last_rows = len(both) - 1 - both[::-1].argmax(axis=0)
+            
+            for k, strategy2 in enumerate(strategies[i + 1:]):
+                j = i + 1 + k
+                n = int(sample_sizes[i, j])
+                if n < 10:
+                    logger.warning(
+                        f"Correlation analysis failed for {strategy1}-{strategy2}: "
+                        f"Insufficient data for correlation analysis"
+                    )
+                    continue
+                
+                results.append(CorrelationResult(
+                    pair=StrategyPair(strategy1, strategy2),
+                    correlation=float(correlations[i, j]),
+                    p_value=float(p_values[i, j]),
+                    confidence_interval=(float(lower[i, j]), float(upper[i, j])),
+                    sample_size=n,
+                    correlation_type=correlation_type,
+                    time_window=time_window,
+                    market_condition=market_condition,
+                    start_date=dates[first_rows[k]] if dates else None,
+                    end_date=dates[last_rows[k]] if dates else None,
+                    significance_level=significance_level
+                ))
+        
+        return results
+    
+    def calculate_rolling_correlations(
+        self,
+        strategy_returns: Dict[str, pd.Series],
+        window_size: int = 30,
+        min_periods: int = 10,
+        correlation_type: CorrelationType = CorrelationType.ROLLING_PEARSON
+    ) -> List[RollingCorrelation]:
+        """
+        Calculate rolling correlations for all strategy pairs
+        
+        Gives the results of ``calculate_rolling_correlation`` for every pair.
+        Rolling Pearson correlations of one strategy against all later ones are
+        computed together from cumulative sums; exponentially weighted ones, and
+        pairs whose dates have gaps that neither strategy covers, go pair by pair.
+        """
+        returns_df = pd.DataFrame(strategy_returns)
+        strategies = list(returns_df.columns)
+        pairs = [
+            (strategy1, strategy2)
+            for i, strategy1 in enumerate(strategies)
+            for strategy2 in strategies[i + 1:]
+        ]
+        
+        if correlation_type == CorrelationType.EXPONENTIAL_WEIGHTED:
+            return [
+                self.calculate_rolling_correlation(
+                    strategy_returns[strategy1], strategy_returns[strategy2],
+                    strategy1, strategy2, window_size, min_periods, correlation_type
+                )
+                for strategy1, strategy2 in pairs
+            ]
+        
+        index = returns_df.index
+        values = returns_df.to_numpy(dtype=float)
+        # Dates each strategy's own series has (its NaN returns included)
+        members = np.column_stack([index.isin(returns.index) for returns in strategy_returns.values()])
+        # Shifting a series leaves its correlations unchanged and keeps the running sums small
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            values = values - np.nan_to_num(np.nanmean(values, axis=0))
+        
+        index_slices: Dict[Tuple[int, int], pd.Index] = {}
+        results = []
+        for i, strategy1 in enumerate(strategies[:-1]):
+            # One row per later strategy, so each pair's values are a contiguous view
+            correlations = np.ascontiguousarray(
+                _rolling_correlations(values[:, i], values[:, i + 1:], window_size, min_periods).T
+            )
+            
+            # A pair's own series only has the dates of either strategy; other dates
+            # are harmless before and after them, but would shift windows in between
+            pair_rows = members[:, i:i + 1] | members[:, i + 1:]
+            first_rows = pair_rows.argmax(axis=0)
+            last_rows = len(pair_rows) - 1 - pair_rows[::-1].argmax(axis=0)
+            contiguous = pair_rows.sum(axis=0) == last_rows - first_rows + 1
+            keep = pair_rows.T & ~np.isnan(correlations)
+            
+            for k, strategy2 in enumerate(strategies[i + 1:]):
+                if not contiguous[k]:
+                    results.append(self.calculate_rolling_correlation(
+                        strategy_returns[strategy1], strategy_returns[strategy2],
+                        strategy1, strategy2, window_size, min_periods, correlation_type
+                    ))
+                    continue
+                
+                rows = np.flatnonzero(keep[k])
+                if len(rows) and rows[-1] - rows[0] + 1 == len(rows):
+                    # Usual case: one run of valid windows, shared by many pairs
+                    span = (rows[0], rows[-1] + 1)
+                    if span not in index_slices:
+                        index_slices[span] = index[span[0]:span[1]]
+                    pair_correlations = pd.Series(correlations[k, span[0]:span[1]], index=index_slices[span], copy=False)
+                else:
+                    pair_correlations = pd.Series(correlations[k, rows], index=index[rows])
+                
+                results.append(RollingCorrelation(
+                    pair=StrategyPair(strategy1, strategy2),
+                    correlations=pair_correlations,
+                    window_size=window_size,
+                    min_periods=min_periods,
+                    correlation_type=correlation_type
+                ))
+        
+        return results
+    
     def calculate_correlation_matrix(
         self,
         strategy_returns: Dict[str, pd.Series],
@@ -407,39 +661,11 @@ class CorrelationAnalyzer:
         
         strategies = list(returns_df.columns)
         
-        # Calculate correlation matrix
-        if correlation_type == CorrelationType.PEARSON:
-            corr_matrix = returns_df.corr(method='pearson')
-        elif correlation_type == CorrelationType.SPEARMAN:
-            corr_matrix = returns_df.corr(method='spearman')
-        elif correlation_type == CorrelationType.KENDALL:
-            corr_matrix = returns_df.corr(method='kendall')
-        else:
-            corr_matrix = returns_df.corr(method='pearson')
-        
-        # Calculate p-value matrix
-        n_strategies = len(strategies)
-        p_value_matrix = pd.DataFrame(
-            np.ones((n_strategies, n_strategies)),
-            index=strategies,
-            columns=strategies
-        )
+        # Correlation and p-value matrices in one pass (Pearson for other types)
+        correlations, p_values, _ = _correlation_statistics(returns_df.to_numpy(dtype=float), correlation_type)
         
-        for i, strategy1 in enumerate(strategies):
-            for j, strategy2 in enumerate(strategies):
-                if i != j:
-                    if correlation_type == CorrelationType.PEARSON:
-                        _, p_val = stats.pearsonr(returns_df[strategy1], returns_df[strategy2])
-                    elif correlation_type == CorrelationType.SPEARMAN:
-                        _, p_val = stats.spearmanr(returns_df[strategy1], returns_df[strategy2])
-                    elif correlation_type == CorrelationType.KENDALL:
-                        _, p_val = stats.kendalltau(returns_df[strategy1], returns_df[strategy2])
-                    else:
-                        _, p_val = stats.pearsonr(returns_df[strategy1], returns_df[strategy2])
-                    
-                    p_value_matrix.iloc[i, j] = p_val
-                else:
-                    p_value_matrix.iloc[i, j] = 0.0  # Perfect correlation on diagonal
+        corr_matrix = pd.DataFrame(correlations, index=strategies, columns=strategies)
+        p_value_matrix = pd.DataFrame(p_values, index=strategies, columns=strategies)
         
         return CorrelationMatrix(
             strategies=strategies,
@@ -546,40 +772,27 @@ class CorrelationAnalyzer:
         """
         Perform comprehensive correlation analysis for all strategy pairs
         """
-        strategies = list(strategy_returns.keys())
+        # Pairwise correlation analysis (all pairs at once)
+        try:
+            pairwise_correlations = self.calculate_pairwise_correlations(
+                strategy_returns, correlation_type, time_window, market_condition
+            )
+        except Exception as e:
+            logger.error(f"Pairwise correlation analysis failed: {e}")
+            pairwise_correlations = []
         
-        # Pairwise correlation analysis
-        pairwise_correlations = []
+        # Rolling correlation for the pairs analysed above
         rolling_correlations = []
-        
-        for i, strategy1 in enumerate(strategies):
-            for j, strategy2 in enumerate(strategies[i+1:], i+1):
-                try:
-                    # Static correlation
-                    corr_result = self.calculate_correlation(
-                        strategy_returns[strategy1],
-                        strategy_returns[strategy2],
-                        strategy1,
-                        strategy2,
-                        correlation_type,
-                        time_window,
-                        market_condition
-                    )
-                    pairwise_correlations.append(corr_result)
-                    
-                    # Rolling correlation if requested
-                    if include_rolling:
-                        rolling_corr = self.calculate_rolling_correlation(
-                            strategy_returns[strategy1],
-                            strategy_returns[strategy2],
-                            strategy1,
-                            strategy2,
-                            rolling_window
-                        )
-                        rolling_correlations.append(rolling_corr)
-                
-                except Exception as e:
-                    logger.warning(f"Correlation analysis failed for {strategy1}-{strategy2}: {e}")
+        if include_rolling and pairwise_correlations:
+            analysed_pairs = {corr.pair for corr in pairwise_correlations}
+            try:
+                rolling_correlations = [
+                    rolling_corr
+                    for rolling_corr in self.calculate_rolling_correlations(strategy_returns, rolling_window)
+                    if rolling_corr.pair in analysed_pairs
+                ]
+            except Exception as e:
+                logger.error(f"Rolling correlation analysis failed: {e}")
         
         # Correlation matrix
         try:
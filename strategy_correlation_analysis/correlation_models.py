@@ -265,6 +265,8 @@ class GARCHDCCModel(CorrelationModel):
     GARCH Dynamic Conditional Correlation Model
     
     Implements Engle's DCC-GARCH model for time-varying correlations.
+    Dynamic correlations are kept as one (T, N, N) array; DataFrames are
+    only built when a matrix is requested.
     """
     
     def __init__(self, alpha: float = 0.01, beta: float = 0.95):
@@ -274,7 +276,9 @@ class GARCHDCCModel(CorrelationModel):
         self.returns_data = None
         self.garch_models = {}
         self.standardized_residuals = None
-        self.dynamic_correlations = None
+        self.dynamic_correlations: Optional[np.ndarray] = None  # (T, N, N)
+        self.correlation_dates: Optional[pd.Index] = None
+        self.strategies: List[str] = []
         self.unconditional_correlation = None
     
     def fit(self, returns_data: pd.DataFrame) -> 'GARCHDCCModel':
@@ -291,7 +295,8 @@ class GARCHDCCModel(CorrelationModel):
             self.garch_models = {}
             self.standardized_residuals = pd.DataFrame(
                 index=self.returns_data.index,
-                columns=strategies
+                columns=strategies,
+                dtype=float
             )
             
             for strategy in strategies:
@@ -328,7 +333,7 @@ class GARCHDCCModel(CorrelationModel):
                 "beta": self.beta,
                 "n_strategies": len(strategies),
                 "garch_specifications": {
-                    strategy: str(model.model) if strategy in self.garch_models else "fallback"
+                    strategy: str(self.garch_models[strategy].model) if strategy in self.garch_models else "fallback"
                     for strategy in strategies
                 }
             }
@@ -357,47 +362,43 @@ class GARCHDCCModel(CorrelationModel):
         # Unconditional correlation matrix
         self.unconditional_correlation = residuals_matrix.corr()
         
-        # Initialize dynamic correlation matrices
-        n_obs, n_assets = residuals_matrix.shape
-        self.dynamic_correlations = []
-        
-        # Initialize Q matrix (correlation proxy)
-        Q = self.unconditional_correlation.values.copy()
-        
-        # DCC estimation
-        for t in range(n_obs):
-            if t > 0:
-                # Get residual vector
-                resid_t = residuals_matrix.iloc[t].values.reshape(-1, 1)
-                resid_t_prev = residuals_matrix.iloc[t-1].values.reshape(-1, 1)
-                
-                # Update Q matrix: Q_t = (1-α-β)*Q̄ + α*ε_{t-1}ε'_{t-1} + β*Q_{t-1}
-                Q = ((1 - self.alpha - self.beta) * self.unconditional_correlation.values +
-                     self.alpha * np.outer(resid_t_prev.flatten(), resid_t_prev.flatten()) +
-                     self.beta * Q)
-            
-            # Convert Q to correlation matrix
-            diag_sqrt_Q = np.sqrt(np.diag(Q))
-            R = Q / np.outer(diag_sqrt_Q, diag_sqrt_Q)
-            
-            # Ensure correlation matrix properties
-            R = np.clip(R, -0.99, 0.99)
-            np.fill_diagonal(R, 1.0)
-            
-            # Store correlation matrix
-            corr_df = pd.DataFrame(
-                R,
-                index=residuals_matrix.columns,
-                columns=residuals_matrix.columns
-            )
-            self.dynamic_correlations.append(corr_df)
+        residuals = residuals_matrix.to_numpy(dtype=float)
+        n_obs, n_assets = residuals.shape
+        Q_bar = self.unconditional_correlation.to_numpy(dtype=float)
+        constant = (1 - self.alpha - self.beta) * Q_bar
+        
+        # Q_t = (1-α-β)*Q̄ + α*ε_{t-1}ε'_{t-1} + β*Q_{t-1}, built in place, starting from Q̄
+        Q = np.empty((n_obs, n_assets, n_assets))
+        Q[0] = Q_bar
+        for t in range(1, n_obs):
+            np.multiply.outer(residuals[t - 1], residuals[t - 1], out=Q[t])
+            Q[t] *= self.alpha
+            np.add(constant, Q[t], out=Q[t])
+            Q[t] += self.beta * Q[t - 1]
+        
+        # Convert every Q_t to a correlation matrix in place
+        diag_sqrt_Q = np.sqrt(np.diagonal(Q, axis1=1, axis2=2))
+        Q /= diag_sqrt_Q[:, :, None] * diag_sqrt_Q[:, None, :]
+        np.clip(Q, -0.99, 0.99, out=Q)
+        diagonal = np.arange(n_assets)
+        Q[:, diagonal, diagonal] = 1.0
+        
+        self.dynamic_correlations = Q
+        self.correlation_dates = residuals_matrix.index
+        self.strategies = list(residuals_matrix.columns)
     
     def _fallback_to_simple_correlation(self):
         """Fallback to simple correlation if DCC fails"""
         logger.warning("Using simple correlation fallback for GARCH-DCC")
         
         simple_corr = self.returns_data.corr()
-        self.dynamic_correlations = [simple_corr] * len(self.returns_data)
+        # Same matrix on every date: a read-only broadcast view, not T copies
+        self.dynamic_correlations = np.broadcast_to(
+            simple_corr.to_numpy(dtype=float),
+            (len(self.returns_data),) + simple_corr.shape
+        )
+        self.correlation_dates = self.returns_data.index
+        self.strategies = list(simple_corr.columns)
         self.unconditional_correlation = simple_corr
         
         self.parameters = {
@@ -416,25 +417,16 @@ class GARCHDCCModel(CorrelationModel):
     def _calculate_dcc_fit_statistics(self):
         """Calculate DCC model fit statistics"""
         
-        if not self.dynamic_correlations or len(self.dynamic_correlations) < 2:
+        if self.dynamic_correlations is None or len(self.dynamic_correlations) < 2:
             self.fit_statistics = {"status": "insufficient_data"}
             return
         
         try:
-            # Calculate correlation volatility (time-varying nature)
-            correlation_volatilities = {}
-            strategies = list(self.dynamic_correlations[0].columns)
-            
-            for i, strategy1 in enumerate(strategies):
-                for j, strategy2 in enumerate(strategies[i+1:], i+1):
-                    correlations_over_time = [
-                        corr_matrix.loc[strategy1, strategy2]
-                        for corr_matrix in self.dynamic_correlations
-                    ]
-                    
-                    correlation_volatilities[(strategy1, strategy2)] = np.std(correlations_over_time)
+            # Calculate correlation volatility (time-varying nature) of every pair
+            rows, cols = np.triu_indices(len(self.strategies), k=1)
+            correlation_volatilities = self.dynamic_correlations[:, rows, cols].std(axis=0)
             
-            avg_correlation_volatility = np.mean(list(correlation_volatilities.values()))
+            avg_correlation_volatility = np.mean(correlation_volatilities)
             
             self.fit_statistics = {
                 "average_correlation_volatility": avg_correlation_volatility,
@@ -455,11 +447,11 @@ class GARCHDCCModel(CorrelationModel):
     ) -> CorrelationForecast:
         """Predict correlation using DCC dynamics"""
         
-        if not self.is_fitted or not self.dynamic_correlations:
+        if not self.is_fitted or self.dynamic_correlations is None:
             raise ValueError("Model must be fitted before prediction")
         
         # Get latest correlation
-        latest_correlation_matrix = self.dynamic_correlations[-1]
+        latest_correlation_matrix = self.get_correlation_matrix()
         
         if strategy1 not in latest_correlation_matrix.index or strategy2 not in latest_correlation_matrix.columns:
             raise ValueError(f"Strategies {strategy1}, {strategy2} not found in fitted data")
@@ -502,17 +494,24 @@ class GARCHDCCModel(CorrelationModel):
         )
     
     def get_correlation_matrix(self, date: Optional[datetime] = None) -> pd.DataFrame:
-        """Get correlation matrix at specified date"""
+        """Get correlation matrix at specified date (latest one on or before it)"""
         
-        if not self.is_fitted or not self.dynamic_correlations:
+        if not self.is_fitted or self.dynamic_correlations is None:
             raise ValueError("Model must be fitted first")
         
         if date is None:
             # Return latest correlation matrix
-            return self.dynamic_correlations[-1].copy()
-        
-        # For simplicity, return latest (time-series indexing would require date alignment)
-        return self.dynamic_correlations[-1].copy()
+            position = len(self.dynamic_correlations) - 1
+        else:
+            position = self.correlation_dates.searchsorted(date, side="right") - 1
+            if position < 0:
+                raise ValueError(f"No correlation matrix on or before {date}")
+        
+        return pd.DataFrame(
+            self.dynamic_correlations[position].copy(),
+            index=self.strategies,
+            columns=self.strategies
+        )
 
 
 class ShrinkageCorrelationModel(CorrelationModel):
@@ -0,0 +1,128 @@
+import unittest
+import warnings
+
+import numpy as np
+import pandas as pd
+import scipy.stats as stats
+
+from strategy_correlation_analysis.correlation_analyzer import (
+    CorrelationAnalyzer,
+    CorrelationType,
+)
+
+
+def _strategy_returns(n_days=80, seed=5):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2024-01-01", periods=n_days, freq="D")
+    base = rng.normal(0, 0.01, n_days)
+    returns = {
+        "alpha": pd.Series(base + rng.normal(0, 0.005, n_days), index=dates),
+        "beta": pd.Series(-base + rng.normal(0, 0.01, n_days), index=dates),
+        "gamma": pd.Series(rng.normal(0, 0.02, n_days), index=dates),
+    }
+    # Missing returns inside beta's history
+    returns["beta"].iloc[[3, 17, 18, 40]] = np.nan
+    return returns
+
+
+def _with_constant(returns):
+    dates = next(iter(returns.values())).index
+    # A strategy that never trades
+    return {**returns, "flat": pd.Series(0.0, index=dates)}
+
+
+class CorrelationPValueTests(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = CorrelationAnalyzer()
+        self.returns = _strategy_returns()
+
+    def _assert_matches_scipy(self, correlation_type, scipy_test):
+        matrix = self.analyzer.calculate_correlation_matrix(self.returns, correlation_type)
+        aligned = pd.DataFrame(self.returns).dropna()
+
+        for strategy1 in matrix.strategies:
+            for strategy2 in matrix.strategies:
+                if strategy1 == strategy2:
+                    continue
+                expected_r, expected_p = scipy_test(aligned[strategy1], aligned[strategy2])
+                self.assertAlmostEqual(matrix.correlation_matrix.loc[strategy1, strategy2], expected_r, places=12)
+                self.assertAlmostEqual(matrix.p_value_matrix.loc[strategy1, strategy2], expected_p, places=12)
+
+    def test_pearson_matrix_matches_pearsonr(self):
+        self._assert_matches_scipy(CorrelationType.PEARSON, stats.pearsonr)
+
+    def test_spearman_matrix_matches_spearmanr(self):
+        self._assert_matches_scipy(CorrelationType.SPEARMAN, stats.spearmanr)
+
+    def test_pairwise_correlations_use_each_pairs_common_dates(self):
+        results = self.analyzer.calculate_pairwise_correlations(self.returns)
+
+        self.assertEqual(len(results), 3)
+        for result in results:
+            pair = result.pair
+            expected = self.analyzer.calculate_correlation(
+                self.returns[pair.strategy1], self.returns[pair.strategy2], pair.strategy1, pair.strategy2
+            )
+            self.assertEqual(result.sample_size, expected.sample_size)
+            self.assertAlmostEqual(result.correlation, expected.correlation, places=12)
+            self.assertAlmostEqual(result.p_value, expected.p_value, places=12)
+            np.testing.assert_allclose(result.confidence_interval, expected.confidence_interval, rtol=1e-12)
+            self.assertEqual((result.start_date, result.end_date), (expected.start_date, expected.end_date))
+
+        beta_pairs = [result for result in results if "beta" in (result.pair.strategy1, result.pair.strategy2)]
+        self.assertTrue(all(result.sample_size == 76 for result in beta_pairs))
+
+    def test_constant_series_gives_undefined_correlation(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            matrix = self.analyzer.calculate_correlation_matrix(_with_constant(self.returns))
+            results = self.analyzer.calculate_pairwise_correlations(_with_constant(self.returns))
+
+        self.assertTrue(np.isnan(matrix.correlation_matrix.loc["alpha", "flat"]))
+        self.assertTrue(np.isnan(matrix.p_value_matrix.loc["alpha", "flat"]))
+        self.assertFalse(np.isnan(matrix.correlation_matrix.loc["alpha", "gamma"]))
+
+        flat_pairs = [result for result in results if "flat" in (result.pair.strategy1, result.pair.strategy2)]
+        self.assertEqual(len(flat_pairs), 3)
+        self.assertTrue(all(np.isnan(result.correlation) and np.isnan(result.p_value) for result in flat_pairs))
+
+
+class RollingCorrelationTests(unittest.TestCase):
+    def setUp(self):
+        self.analyzer = CorrelationAnalyzer()
+
+    def _assert_matches_pandas(self, returns, window_size=20, min_periods=10):
+        results = self.analyzer.calculate_rolling_correlations(returns, window_size, min_periods)
+        names = list(returns)
+
+        self.assertEqual(
+            [(r.pair.strategy1, r.pair.strategy2) for r in results],
+            [(a, b) for i, a in enumerate(names) for b in names[i + 1:]],
+        )
+        for result in results:
+            s1, s2 = returns[result.pair.strategy1], returns[result.pair.strategy2]
+            expected = s1.rolling(window=window_size, min_periods=min_periods).corr(s2).dropna()
+            pd.testing.assert_index_equal(result.correlations.index, expected.index)
+            np.testing.assert_allclose(result.correlations.values, expected.values, rtol=1e-9, atol=1e-12)
+
+    def test_rolling_correlations_match_pandas_with_missing_values(self):
+        self._assert_matches_pandas(_strategy_returns())
+
+    def test_constant_windows_are_dropped_like_pandas(self):
+        returns = _strategy_returns()
+        # Flat for longer than a window, then trading again
+        returns["gamma"].iloc[30:60] = 0.0
+        self._assert_matches_pandas(returns)
+
+    def test_constant_series_has_no_rolling_correlations(self):
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            results = self.analyzer.calculate_rolling_correlations(_with_constant(_strategy_returns()))
+
+        flat_pairs = [r for r in results if "flat" in (r.pair.strategy1, r.pair.strategy2)]
+        self.assertEqual(len(flat_pairs), 3)
+        self.assertTrue(all(r.correlations.empty for r in flat_pairs))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+from unittest.mock import patch
+
+import numpy as np
+import pandas as pd
+
+from strategy_correlation_analysis.correlation_models import GARCHDCCModel
+
+
+def _returns(n_days=200, seed=3):
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range("2023-01-01", periods=n_days, freq="D")
+    common = rng.normal(0, 0.01, n_days)
+    return pd.DataFrame({
+        "trend": common + rng.normal(0, 0.01, n_days),
+        "reversion": -0.5 * common + rng.normal(0, 0.01, n_days),
+        "carry": rng.normal(0, 0.005, n_days),
+    }, index=dates)
+
+
+def _reference_dcc(residuals_matrix, alpha, beta):
+    """The original per-step recursion, one DataFrame per observation"""
+    unconditional = residuals_matrix.corr()
+    Q = unconditional.values.copy()
+    correlations = []
+    for t in range(len(residuals_matrix)):
+        if t > 0:
+            resid_prev = residuals_matrix.iloc[t - 1].values
+            Q = ((1 - alpha - beta) * unconditional.values +
+                 alpha * np.outer(resid_prev, resid_prev) +
+                 beta * Q)
+        diag_sqrt_Q = np.sqrt(np.diag(Q))
+        R = np.clip(Q / np.outer(diag_sqrt_Q, diag_sqrt_Q), -0.99, 0.99)
+        np.fill_diagonal(R, 1.0)
+        correlations.append(pd.DataFrame(R, index=residuals_matrix.columns, columns=residuals_matrix.columns))
+    return correlations
+
+
+class GARCHDCCModelTests(unittest.TestCase):
+    def setUp(self):
+        self.returns = _returns()
+
+    def test_fit_runs_dcc_path(self):
+        model = GARCHDCCModel().fit(self.returns)
+
+        self.assertTrue(model.is_fitted)
+        self.assertNotIn("model_status", model.parameters)
+        self.assertEqual(set(model.parameters["garch_specifications"]), set(self.returns.columns))
+        self.assertIn("average_correlation_volatility", model.fit_statistics)
+
+    def test_fit_succeeds_when_every_garch_fit_falls_back(self):
+        with patch("strategy_correlation_analysis.correlation_models.arch_model", side_effect=RuntimeError("no fit")):
+            model = GARCHDCCModel().fit(self.returns)
+
+        self.assertTrue(model.is_fitted)
+        self.assertNotIn("model_status", model.parameters)
+        self.assertEqual(set(model.parameters["garch_specifications"].values()), {"fallback"})
+        self.assertEqual(model.dynamic_correlations.shape, (len(self.returns), 3, 3))
+
+    def test_array_recursion_matches_per_step_dataframes(self):
+        model = GARCHDCCModel(alpha=0.05, beta=0.9).fit(self.returns)
+        expected = _reference_dcc(model.standardized_residuals.dropna(), model.alpha, model.beta)
+
+        self.assertIsInstance(model.dynamic_correlations, np.ndarray)
+        self.assertEqual(model.dynamic_correlations.shape, (len(expected), 3, 3))
+        np.testing.assert_allclose(
+            model.dynamic_correlations, np.stack([frame.values for frame in expected]), rtol=1e-12, atol=1e-12
+        )
+
+    def test_correlation_matrix_views_are_built_on_request(self):
+        model = GARCHDCCModel().fit(self.returns)
+        dates = model.correlation_dates
+
+        latest = model.get_correlation_matrix()
+        self.assertEqual(list(latest.index), list(self.returns.columns))
+        self.assertEqual(list(latest.columns), list(self.returns.columns))
+        np.testing.assert_array_equal(latest.values, model.dynamic_correlations[-1])
+
+        # Dates between observations use the latest matrix on or before them
+        on_date = model.get_correlation_matrix(dates[50])
+        between = model.get_correlation_matrix(dates[50] + pd.Timedelta(hours=12))
+        np.testing.assert_array_equal(on_date.values, model.dynamic_correlations[50])
+        np.testing.assert_array_equal(between.values, model.dynamic_correlations[50])
+
+        # Views are copies; editing one leaves the fitted state alone
+        on_date.iloc[0, 1] = 0.0
+        self.assertNotEqual(model.dynamic_correlations[50, 0, 1], 0.0)
+
+        with self.assertRaises(ValueError):
+            model.get_correlation_matrix(dates[0] - pd.Timedelta(days=1))
+
+
+if __name__ == "__main__":
+    unittest.main()
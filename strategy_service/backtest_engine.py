@@ -5,14 +5,26 @@ Simulates trading and calculates performance metrics including monthly returns
 """
 
 import json
+import os
 import asyncio
 import aiohttp
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime, timedelta
-from typing import List, Dict, Any, Tuple, Optional
+from multiprocessing import shared_memory
+from typing import AsyncIterator, Callable, List, Dict, Any, Tuple, Optional
 import statistics
 import math
 from collections import defaultdict
 
+import numpy as np
+
+try:
+    from . import indicator_kernels
+    from .indicator_kernels import IndicatorFrame
+except ImportError:  # executed as a script from strategy_service/
+    import indicator_kernels
+    from indicator_kernels import IndicatorFrame
+
 class BacktestEngine:
     """Backtesting engine for strategy evaluation"""
     
@@ -39,6 +51,14 @@ class BacktestEngine:
             print(f"  Warning: Could not fetch data for {symbol}, using synthetic: {e}")
             return self.generate_synthetic_data(symbol, timeframe, days)
     
+    async def _load_candles(self, symbol: str, timeframe: str, days: int = 90) -> List[Dict[str, Any]]:
+        """Fetch candles and attach a parsed ``datetime`` to every entry"""
+        fetched = await self.fetch_historical_data(symbol, timeframe, days=days)
+        for entry in fetched:
+            entry_dt = self._parse_timestamp(entry.get('timestamp'))
+            entry['datetime'] = entry_dt or datetime.fromisoformat(entry['timestamp'])
+        return fetched
+    
     def generate_synthetic_data(self, symbol: str, timeframe: str, days: int) -> List[Dict]:
         """Generate synthetic OHLCV data for backtesting"""
         import random
@@ -201,133 +221,67 @@ class BacktestEngine:
             merged['global_weight'] = round(merged['global_weight'] / weight_sum, 3)
         return merged
     
-    def calculate_indicators(self, data: List[Dict], strategy: Dict) -> Dict[str, List[float]]:
-        """Calculate technical indicators for strategy signals"""
-        closes = [candle["close"] for candle in data]
-        highs = [candle["high"] for candle in data]
-        lows = [candle["low"] for candle in data]
-        volumes = [candle["volume"] for candle in data]
+    def calculate_indicators(
+        self,
+        data: List[Dict],
+        strategy: Dict,
+        frame: Optional[IndicatorFrame] = None,
+    ) -> Dict[str, List[float]]:
+        """Calculate technical indicators for strategy signals
+
+        The candle set is converted to NumPy columns once (or reused from
+        ``frame``) and each indicator is computed by an O(n) kernel.
+        """
+        if frame is None:
+            frame = IndicatorFrame.from_candles(data)
+        params = strategy.get("parameters", {})
         
         indicators = {}
         
         # RSI calculation
-        rsi_period = strategy.get("parameters", {}).get("rsi_period", 14)
-        indicators["rsi"] = self.calculate_rsi(closes, rsi_period)
+        rsi_period = params.get("rsi_period", 14)
+        indicators["rsi"] = frame.rsi(rsi_period)
         
         # Moving averages
-        indicators["sma_20"] = self.calculate_sma(closes, 20)
-        indicators["ema_12"] = self.calculate_ema(closes, 12)
-        indicators["ema_26"] = self.calculate_ema(closes, 26)
+        indicators["sma_20"] = frame.sma(20)
+        indicators["ema_12"] = frame.ema(12)
+        indicators["ema_26"] = frame.ema(26)
         
         # Bollinger Bands
-        bb_period = strategy.get("parameters", {}).get("bb_period", 20)
-        bb_std = strategy.get("parameters", {}).get("bb_std_dev", 2.0)
+        bb_period = params.get("bb_period", 20)
+        bb_std = params.get("bb_std_dev", 2.0)
         indicators["bb_upper"], indicators["bb_middle"], indicators["bb_lower"] = \
-            self.calculate_bollinger_bands(closes, bb_period, bb_std)
+            frame.bollinger_bands(bb_period, bb_std)
         
         # ATR for volatility
-        atr_period = strategy.get("parameters", {}).get("atr_period", 14)
-        indicators["atr"] = self.calculate_atr(highs, lows, closes, atr_period)
+        atr_period = params.get("atr_period", 14)
+        indicators["atr"] = frame.atr(atr_period)
         
         # Volume MA
-        indicators["volume_ma"] = self.calculate_sma(volumes, 20)
+        indicators["volume_ma"] = frame.sma(20, column="volume")
         
         return indicators
     
     def calculate_rsi(self, prices: List[float], period: int = 14) -> List[float]:
         """Calculate RSI indicator"""
-        if len(prices) < period + 1:
-            return [50.0] * len(prices)
-        
-        deltas = [prices[i] - prices[i-1] for i in range(1, len(prices))]
-        gains = [max(d, 0) for d in deltas]
-        losses = [abs(min(d, 0)) for d in deltas]
-        
-        avg_gain = sum(gains[:period]) / period
-        avg_loss = sum(losses[:period]) / period
-        
-        rsi_values = [50.0] * (period + 1)
-        
-        for i in range(period, len(gains)):
-            avg_gain = (avg_gain * (period - 1) + gains[i]) / period
-            avg_loss = (avg_loss * (period - 1) + losses[i]) / period
-            
-            if avg_loss == 0:
-                rsi = 100
-            else:
-                rs = avg_gain / avg_loss
-                rsi = 100 - (100 / (1 + rs))
-            
-            rsi_values.append(rsi)
-        
-        return rsi_values
+        return indicator_kernels.rsi(prices, period).tolist()
     
     def calculate_sma(self, prices: List[float], period: int) -> List[float]:
         """Calculate Simple Moving Average"""
-        if len(prices) < period:
-            return prices.copy()
-        
-        sma = []
-        for i in range(len(prices)):
-            if i < period - 1:
-                sma.append(prices[i])
-            else:
-                sma.append(sum(prices[i-period+1:i+1]) / period)
-        
-        return sma
+        return indicator_kernels.sma(prices, period).tolist()
     
     def calculate_ema(self, prices: List[float], period: int) -> List[float]:
         """Calculate Exponential Moving Average"""
-        if len(prices) < period:
-            return prices.copy()
-        
-        multiplier = 2 / (period + 1)
-        ema = [sum(prices[:period]) / period]
-        
-        for price in prices[period:]:
-            ema.append((price * multiplier) + (ema[-1] * (1 - multiplier)))
-        
-        return [prices[0]] * (period - 1) + ema
+        return indicator_kernels.ema(prices, period).tolist()
     
     def calculate_bollinger_bands(self, prices: List[float], period: int, std_dev: float) -> Tuple[List, List, List]:
         """Calculate Bollinger Bands"""
-        sma = self.calculate_sma(prices, period)
-        
-        upper = []
-        lower = []
-        
-        for i in range(len(prices)):
-            if i < period - 1:
-                upper.append(prices[i])
-                lower.append(prices[i])
-            else:
-                std = statistics.stdev(prices[i-period+1:i+1])
-                upper.append(sma[i] + (std * std_dev))
-                lower.append(sma[i] - (std * std_dev))
-        
-        return upper, sma, lower
+        upper, middle, lower = indicator_kernels.bollinger_bands(prices, period, std_dev)
+        return upper.tolist(), middle.tolist(), lower.tolist()
     
     def calculate_atr(self, highs: List[float], lows: List[float], closes: List[float], period: int = 14) -> List[float]:
         """Calculate Average True Range"""
-        if len(highs) < period + 1:
-            return [0.0] * len(highs)
-        
-        tr_values = [highs[0] - lows[0]]
-        
-        for i in range(1, len(highs)):
-            tr = max(
-                highs[i] - lows[i],
-                abs(highs[i] - closes[i-1]),
-                abs(lows[i] - closes[i-1])
-            )
-            tr_values.append(tr)
-        
-        atr = [sum(tr_values[:period]) / period]
-        
-        for i in range(period, len(tr_values)):
-            atr.append((atr[-1] * (period - 1) + tr_values[i]) / period)
-        
-        return [tr_values[0]] * (period - 1) + atr
+        return indicator_kernels.atr(highs, lows, closes, period).tolist()
 
     def _prepare_sentiment_points(self, entries: Optional[List[Dict[str, Any]]]) -> List[Tuple[datetime, float]]:
         points: List[Tuple[datetime, float]] = []
@@ -514,37 +468,8 @@ class BacktestEngine:
         return True, max(0.2, min(multiplier, 1.8))
 
     def _infer_regime_labels(self, candles: List[Dict[str, Any]]) -> List[str]:
-        prices = [c['close'] for c in candles]
-        regimes: List[str] = []
-        short_window = 12
-        long_window = 36
-        for idx, price in enumerate(prices):
-            if idx == 0:
-                regimes.append('ranging')
-                continue
-            if idx < long_window:
-                regimes.append('ranging')
-                continue
-            short_ma = sum(prices[idx-short_window:idx]) / short_window
-            long_ma = sum(prices[idx-long_window:idx]) / long_window
-            change = (prices[idx] - prices[idx-1]) / prices[idx-1]
-            vol_window = prices[idx-short_window:idx]
-            stdev = statistics.pstdev(vol_window) if len(vol_window) > 1 else 0.0
-            stdev_ratio = stdev / price if price else 0.0
-
-            if stdev_ratio >= 0.025:
-                regimes.append('high_volatility')
-                continue
-            if stdev_ratio <= 0.005:
-                regimes.append('low_volatility')
-                continue
-            if short_ma > long_ma * 1.002 and change > 0:
-                regimes.append('bull_trend')
-            elif short_ma < long_ma * 0.998 and change < 0:
-                regimes.append('bear_trend')
-            else:
-                regimes.append('ranging')
-        return regimes
+        closes = np.fromiter((c['close'] for c in candles), dtype=np.float64, count=len(candles))
+        return indicator_kernels.moving_average_regimes(closes)
 
     def _compile_regime_metrics(self, trades: List[Dict[str, Any]], preferences: List[str]) -> Dict[str, Any]:
         if not trades:
@@ -703,8 +628,13 @@ class BacktestEngine:
         candles: Optional[List[Dict[str, Any]]] = None,
         symbol_sentiment: Optional[List[Dict[str, Any]]] = None,
         global_sentiment: Optional[List[Dict[str, Any]]] = None,
+        indicator_frame: Optional[IndicatorFrame] = None,
     ) -> Dict[str, Any]:
-        """Backtest a single strategy"""
+        """Backtest a single strategy
+
+        ``indicator_frame`` lets batch runs share one columnar view (and its
+        indicator cache) between every strategy on the same candle set.
+        """
         # Ensure strategy is a dict (handle JSON serialization issues)
         if isinstance(strategy, str):
             import json
@@ -725,17 +655,15 @@ class BacktestEngine:
         if candles is not None:
             data = candles
         else:
-            fetched = await self.fetch_historical_data(symbol, timeframe, days=90)
-            for entry in fetched:
-                entry_dt = self._parse_timestamp(entry.get('timestamp'))
-                entry['datetime'] = entry_dt or datetime.fromisoformat(entry['timestamp'])
-            data = fetched
+            data = await self._load_candles(symbol, timeframe)
         
         if len(data) < 50:
             return self.create_failed_result(strategy, "Insufficient data")
         
         # Calculate indicators
-        indicators = self.calculate_indicators(data, strategy)
+        if indicator_frame is None:
+            indicator_frame = IndicatorFrame.from_candles(data)
+        indicators = self.calculate_indicators(data, strategy, frame=indicator_frame)
 
         sentiment_profile = self._normalise_sentiment_profile(strategy.get('sentiment_profile'))
 
@@ -746,7 +674,7 @@ class BacktestEngine:
             global_sentiment,
         )
 
-        regimes = self._infer_regime_labels(data)
+        regimes = indicator_frame.cached(("regimes",), lambda: self._infer_regime_labels(data))
         
         # Simulation variables
         capital = self.initial_capital
@@ -1020,30 +948,304 @@ class BacktestEngine:
             "win_rate": 0
         }
     
-    async def backtest_all_strategies(self, strategies: List[Dict]) -> List[Dict]:
-        """Backtest all strategies with progress tracking"""
-        results = []
+    @staticmethod
+    def _data_key(strategy: Any) -> Optional[Tuple[str, str]]:
+        """Return the (symbol, timeframe) a strategy trades, or None if malformed"""
+        if not isinstance(strategy, dict) or "symbols" not in strategy:
+            return None
+        symbol = strategy["symbols"][0] if strategy["symbols"] else "BTCUSDT"
+        return symbol, strategy.get("timeframe", "1h")
+    
+    def _group_by_data_key(self, strategies: List[Dict]) -> Dict[Optional[Tuple[str, str]], List[int]]:
+        """Group strategy indices by data key, preserving first-seen order"""
+        groups: Dict[Optional[Tuple[str, str]], List[int]] = {}
+        for position, strategy in enumerate(strategies):
+            groups.setdefault(self._data_key(strategy), []).append(position)
+        return groups
+    
+    async def _load_batch_candles(self, symbol: str, timeframe: str) -> List[Dict[str, Any]]:
+        """Fetch and normalise candles once for every strategy on a data key"""
+        fetched = await self.fetch_historical_data(symbol, timeframe, days=90)
+        return self._normalise_historical_data(fetched) or []
+    
+    async def _run_batch_strategy(
+        self,
+        strategy: Dict,
+        candles: Optional[List[Dict[str, Any]]],
+        frame: Optional[IndicatorFrame],
+        symbol_sentiment: Optional[List[Dict[str, Any]]],
+        global_sentiment: Optional[List[Dict[str, Any]]],
+    ) -> Dict[str, Any]:
+        try:
+            return await self.backtest_strategy(
+                strategy,
+                candles=candles,
+                symbol_sentiment=symbol_sentiment,
+                global_sentiment=global_sentiment,
+                indicator_frame=frame,
+            )
+        except Exception as e:
+            print(f"Error backtesting strategy {strategy['id']}: {e}")
+            return self.create_failed_result(strategy, str(e))
+    
+    async def _iter_sequential_results(
+        self,
+        strategies: List[Dict],
+        groups: Dict[Optional[Tuple[str, str]], List[int]],
+        indicator_cache: Dict[Any, Any],
+        symbol_sentiment: Dict[str, List[Dict[str, Any]]],
+        global_sentiment: Optional[List[Dict[str, Any]]],
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        for data_key, positions in groups.items():
+            candles: Optional[List[Dict[str, Any]]] = None
+            frame: Optional[IndicatorFrame] = None
+            if data_key is not None:
+                candles = await self._load_batch_candles(*data_key)
+                frame = IndicatorFrame.from_candles(candles, cache=indicator_cache, namespace=data_key)
+            symbol_entries = symbol_sentiment.get(data_key[0]) if data_key else None
+            for position in positions:
+                result = await self._run_batch_strategy(
+                    strategies[position], candles, frame, symbol_entries, global_sentiment
+                )
+                yield position, result
+    
+    async def _iter_parallel_results(
+        self,
+        strategies: List[Dict],
+        groups: Dict[Optional[Tuple[str, str]], List[int]],
+        max_workers: int,
+        symbol_sentiment: Dict[str, List[Dict[str, Any]]],
+        global_sentiment: Optional[List[Dict[str, Any]]],
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """Fan strategies out to a process pool, yielding in schedule order
+
+        Candles and sentiment are written to shared memory once per data key /
+        symbol; tasks only carry the strategy dict and the block references.
+        """
+        blocks: List[shared_memory.SharedMemory] = []
+        pending: List[Tuple[int, Optional[asyncio.Future]]] = []
+        try:
+            with ProcessPoolExecutor(
+                max_workers=max_workers,
+                initializer=_init_backtest_worker,
+                initargs=(self.initial_capital,),
+            ) as pool:
+                global_ref = _share_array(_pack_sentiment(self, global_sentiment), blocks)
+                symbol_refs: Dict[str, Optional[Tuple[str, Tuple[int, ...], str]]] = {}
+                for data_key, positions in groups.items():
+                    if data_key is None:
+                        pending.extend((position, None) for position in positions)
+                        continue
+                    candles = await self._load_batch_candles(*data_key)
+                    candle_ref = _share_array(_pack_candles(candles), blocks)
+                    symbol = data_key[0]
+                    if symbol not in symbol_refs:
+                        symbol_refs[symbol] = _share_array(
+                            _pack_sentiment(self, symbol_sentiment.get(symbol)), blocks
+                        )
+                    for position in positions:
+                        future = pool.submit(
+                            _backtest_in_worker,
+                            strategies[position],
+                            data_key,
+                            candle_ref,
+                            symbol_refs[symbol],
+                            global_ref,
+                        )
+                        pending.append((position, asyncio.wrap_future(future)))
+
+                for position, future in pending:
+                    if future is None:
+                        result = await self._run_batch_strategy(
+                            strategies[position], None, None, None, global_sentiment
+                        )
+                    else:
+                        result = await future
+                    yield position, result
+        finally:
+            for block in blocks:
+                block.close()
+                block.unlink()
+    
+    async def backtest_all_strategies(
+        self,
+        strategies: List[Dict],
+        indicator_cache: Optional[Dict[Any, Any]] = None,
+        progress_callback: Optional[Callable[[int, int, Dict[str, Any]], Any]] = None,
+        max_workers: int = 1,
+        symbol_sentiment: Optional[Dict[str, List[Dict[str, Any]]]] = None,
+        global_sentiment: Optional[List[Dict[str, Any]]] = None,
+    ) -> List[Dict]:
+        """Backtest all strategies with progress tracking
+
+        Strategies are grouped by (symbol, timeframe) so candles are fetched,
+        normalised and converted to columns once per data key. Indicators are
+        memoised in ``indicator_cache`` keyed by
+        (symbol, timeframe, indicator, params) and shared by the whole run.
+
+        With ``max_workers > 1`` strategies run in a process pool; each worker
+        keeps its own indicator cache, so ``indicator_cache`` is only filled
+        by the sequential path. Either way results are returned in the order
+        of ``strategies`` and ``progress_callback(completed, total, result)``
+        fires in the same order.
+        """
+        results: List[Optional[Dict]] = [None] * len(strategies)
         total = len(strategies)
+        completed = 0
+        if indicator_cache is None:
+            indicator_cache = {}
+        symbol_sentiment = symbol_sentiment or {}
+        groups = self._group_by_data_key(strategies)
         
         print(f"\nStarting backtest of {total} strategies...")
         print("=" * 80)
         
-        for idx, strategy in enumerate(strategies, 1):
-            try:
-                result = await self.backtest_strategy(strategy)
-                results.append(result)
-                
-                if idx % 50 == 0:
-                    print(f"Progress: {idx}/{total} strategies tested ({(idx/total)*100:.1f}%)")
-                    
-            except Exception as e:
-                print(f"Error backtesting strategy {strategy['id']}: {e}")
-                results.append(self.create_failed_result(strategy, str(e)))
+        if max_workers > 1:
+            outcomes = self._iter_parallel_results(
+                strategies, groups, max_workers, symbol_sentiment, global_sentiment
+            )
+        else:
+            outcomes = self._iter_sequential_results(
+                strategies, groups, indicator_cache, symbol_sentiment, global_sentiment
+            )
+        
+        async for position, result in outcomes:
+            results[position] = result
+            completed += 1
+            if progress_callback is not None:
+                progress_callback(completed, total, result)
+            if completed % 50 == 0:
+                print(f"Progress: {completed}/{total} strategies tested ({(completed/total)*100:.1f}%)")
         
         print(f"\n✓ Completed backtesting {len(results)} strategies")
         return results
 
 
+# ---------------------------------------------------------------------------
+# Process-pool support for backtest_all_strategies(max_workers > 1)
+#
+# Candles travel to workers as one float64 block per data key with columns
+# (epoch microseconds, open, high, low, close, volume); sentiment as
+# (epoch microseconds, score) per symbol. Microsecond epochs stay below 2**53,
+# so timestamps round-trip exactly through float64.
+# ---------------------------------------------------------------------------
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+_WORKER_STATE: Dict[str, Any] = {}
+
+
+def _to_epoch_us(moment: datetime) -> int:
+    return (moment - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: float) -> datetime:
+    return _EPOCH + timedelta(microseconds=int(value))
+
+
+def _pack_candles(candles: List[Dict[str, Any]]) -> np.ndarray:
+    packed = np.empty((len(candles), 6), dtype=np.float64)
+    for row, candle in enumerate(candles):
+        packed[row] = (
+            _to_epoch_us(candle['datetime']),
+            candle['open'],
+            candle['high'],
+            candle['low'],
+            candle['close'],
+            candle['volume'],
+        )
+    return packed
+
+
+def _unpack_candles(packed: np.ndarray) -> List[Dict[str, Any]]:
+    candles = []
+    for epoch_us, open_, high, low, close, volume in packed.tolist():
+        moment = _from_epoch_us(epoch_us)
+        candles.append({
+            'timestamp': moment.isoformat(),
+            'datetime': moment,
+            'open': open_,
+            'high': high,
+            'low': low,
+            'close': close,
+            'volume': volume,
+        })
+    return candles
+
+
+def _pack_sentiment(engine: BacktestEngine, entries: Optional[List[Dict[str, Any]]]) -> np.ndarray:
+    points = engine._prepare_sentiment_points(entries)
+    packed = np.empty((len(points), 2), dtype=np.float64)
+    for row, (moment, score) in enumerate(points):
+        packed[row] = (_to_epoch_us(moment), score)
+    return packed
+
+
+def _unpack_sentiment(packed: np.ndarray) -> List[Dict[str, Any]]:
+    return [
+        {'timestamp': _from_epoch_us(epoch_us), 'aggregated_score': score}
+        for epoch_us, score in packed.tolist()
+    ]
+
+
+def _share_array(array: np.ndarray, blocks: List[shared_memory.SharedMemory]) -> Tuple[str, Tuple[int, ...], str]:
+    block = shared_memory.SharedMemory(create=True, size=max(array.nbytes, 1))
+    np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf)[...] = array
+    blocks.append(block)
+    return block.name, array.shape, array.dtype.str
+
+
+def _attach_array(ref: Tuple[str, Tuple[int, ...], str]) -> np.ndarray:
+    name, shape, dtype = ref
+    block = shared_memory.SharedMemory(name=name)
+    try:
+        return np.ndarray(shape, dtype=dtype, buffer=block.buf).copy()
+    finally:
+        block.close()
+
+
+def _init_backtest_worker(initial_capital: float) -> None:
+    _WORKER_STATE.clear()
+    _WORKER_STATE.update(
+        engine=BacktestEngine(initial_capital=initial_capital),
+        decoded={},
+        frames={},
+        indicator_cache={},
+    )
+
+
+def _worker_decoded(ref: Tuple[str, Tuple[int, ...], str], unpack: Callable[[np.ndarray], Any]) -> Any:
+    decoded = _WORKER_STATE['decoded']
+    if ref[0] not in decoded:
+        decoded[ref[0]] = unpack(_attach_array(ref))
+    return decoded[ref[0]]
+
+
+def _backtest_in_worker(
+    strategy: Dict,
+    data_key: Tuple[str, str],
+    candle_ref: Tuple[str, Tuple[int, ...], str],
+    symbol_ref: Tuple[str, Tuple[int, ...], str],
+    global_ref: Tuple[str, Tuple[int, ...], str],
+) -> Dict[str, Any]:
+    engine: BacktestEngine = _WORKER_STATE['engine']
+    candles = _worker_decoded(candle_ref, _unpack_candles)
+    frames = _WORKER_STATE['frames']
+    if candle_ref[0] not in frames:
+        frames[candle_ref[0]] = IndicatorFrame.from_candles(
+            candles, cache=_WORKER_STATE['indicator_cache'], namespace=data_key
+        )
+    return asyncio.run(
+        engine._run_batch_strategy(
+            strategy,
+            candles,
+            frames[candle_ref[0]],
+            _worker_decoded(symbol_ref, _unpack_sentiment) or None,
+            _worker_decoded(global_ref, _unpack_sentiment) or None,
+        )
+    )
+
+
 async def main():
     """Main execution"""
     print("=" * 80)
@@ -1062,8 +1264,9 @@ async def main():
     # Initialize backtesting engine
     engine = BacktestEngine(initial_capital=10000.0)
     
-    # Run backtests
-    results = await engine.backtest_all_strategies(strategies)
+    # Run backtests (BACKTEST_WORKERS > 1 fans out to a process pool)
+    workers = int(os.getenv("BACKTEST_WORKERS", "1"))
+    results = await engine.backtest_all_strategies(strategies, max_workers=workers)
     
     # Save results
     output = {
@@ -13,7 +13,7 @@ Comprehensive backtesting with:
 from .backtest_engine import BacktestEngine, BacktestConfig, BacktestResult
 from .walk_forward import WalkForwardAnalyzer, WalkForwardConfig
 from .monte_carlo import MonteCarloSimulator, MonteCarloConfig
-from .optimization import ParameterOptimizer, OptimizationConfig
+from .optimization import ParameterOptimizer, OptimizationConfig, ParameterEvaluator
 from .performance_metrics import PerformanceAnalyzer, MetricsCalculator
 
 __all__ = [
@@ -26,6 +26,7 @@ __all__ = [
     'MonteCarloConfig',
     'ParameterOptimizer',
     'OptimizationConfig',
+    'ParameterEvaluator',
     'PerformanceAnalyzer',
     'MetricsCalculator',
 ]
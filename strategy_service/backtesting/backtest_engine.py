@@ -14,6 +14,11 @@ from enum import Enum
 import structlog
 from decimal import Decimal
 
+try:
+    from ..indicator_kernels import trend_volatility_regimes
+except ImportError:  # backtesting imported as a top-level package
+    from indicator_kernels import trend_volatility_regimes
+
 logger = structlog.get_logger()
 
 
@@ -67,6 +72,7 @@ class BacktestConfig:
     # Execution
     order_fill_assumption: str = "realistic"  # "realistic", "optimistic", "pessimistic"
     limit_order_fill_probability: float = 0.7
+    bar_iteration: str = "rows"  # "rows" (DataFrame.iterrows) or "arrays" (pre-extracted columns)
     
     # Risk management
     stop_loss_slippage_bps: float = 20.0  # Additional slippage on stop loss
@@ -228,6 +234,39 @@ class BacktestResult:
     max_consecutive_losses: int = 0
 
 
+class _ColumnCursor:
+    """
+    Row-like cursor over pre-extracted column lists
+    
+    Supports the ``row[key]`` / ``row.get(key, default)`` access used by the
+    position helpers, so the array bar loop shares their fill, slippage and
+    funding logic with the DataFrame loop without building a Series per bar.
+    """
+    
+    __slots__ = ('columns', 'idx')
+    
+    # Columns read by the bar loop and the position helpers
+    FIELDS = (
+        'timestamp', 'high', 'low', 'close', 'volatility', 'signal',
+        'stop_loss', 'take_profit', 'symbol', 'regime',
+    )
+    
+    def __init__(self, df: pd.DataFrame):
+        self.columns: Dict[str, list] = {
+            name: df[name].to_numpy().tolist() if name != 'timestamp' else df[name].tolist()
+            for name in self.FIELDS
+            if name in df.columns
+        }
+        self.idx = 0
+    
+    def __getitem__(self, key: str) -> Any:
+        return self.columns[key][self.idx]
+    
+    def get(self, key: str, default: Any = None) -> Any:
+        column = self.columns.get(key)
+        return default if column is None else column[self.idx]
+
+
 class BacktestEngine:
     """
     Advanced backtesting engine with realistic execution simulation
@@ -299,64 +338,12 @@ class BacktestEngine:
                 df = self._detect_regimes(df)
             
             # Process each bar
-            for idx, row in df.iterrows():
-                self.current_time = row['timestamp']
-                
-                # Update equity curve
-                current_equity = self._calculate_equity(row['close'])
-                self.equity_curve.append((self.current_time, current_equity))
-                
-                # Check circuit breaker
-                if self._check_circuit_breaker(current_equity):
-                    logger.warning(
-                        "Circuit breaker triggered",
-                        drawdown=self._calculate_current_drawdown(current_equity)
-                    )
-                    break
-                
-                # Update position tracking
-                if self.position:
-                    self._update_position_tracking(row)
-                    
-                    # Check stop loss and take profit
-                    if self._check_exit_conditions(row):
-                        self._close_position(
-                            row,
-                            exit_reason="stop_loss_or_take_profit"
-                        )
-                        continue
-                    
-                    # Apply funding fees (every 8 hours)
-                    if self._should_apply_funding(row):
-                        self._apply_funding_fee(row)
-                
-                # Process signal
-                signal = row['signal']
-                
-                if signal != 0 and not self.in_drawdown_protection:
-                    # Close existing position if signal changed
-                    if self.position:
-                        if (signal > 0 and self.position.side == PositionSide.SHORT) or \
-                           (signal < 0 and self.position.side == PositionSide.LONG):
-                            self._close_position(row, exit_reason="signal_change")
-                    
-                    # Open new position
-                    if not self.position:
-                        self._open_position(
-                            row,
-                            signal,
-                            strategy_name,
-                            strategy_params
-                        )
-                
-                elif signal == 0 and self.position:
-                    # Close position on flat signal
-                    self._close_position(row, exit_reason="signal")
-            
-            # Close any remaining position
-            if self.position:
-                last_row = df.iloc[-1]
-                self._close_position(last_row, exit_reason="backtest_end")
+            if self.config.bar_iteration == "arrays":
+                self._run_bar_loop_arrays(df, strategy_name, strategy_params)
+            elif self.config.bar_iteration == "rows":
+                self._run_bar_loop_rows(df, strategy_name, strategy_params)
+            else:
+                raise ValueError(f"Unknown bar_iteration mode: {self.config.bar_iteration}")
             
             # Calculate results
             result = self._calculate_results(
@@ -380,6 +367,93 @@ class BacktestEngine:
             logger.error(f"Error running backtest: {e}", exc_info=True)
             raise
     
+    def _run_bar_loop_rows(self, df: pd.DataFrame, strategy_name: str, strategy_params: Dict):
+        """Simulate bar by bar over DataFrame rows"""
+        for idx, row in df.iterrows():
+            if self._process_bar(row, strategy_name, strategy_params):
+                break
+        
+        # Close any remaining position
+        if self.position:
+            last_row = df.iloc[-1]
+            self._close_position(last_row, exit_reason="backtest_end")
+    
+    def _run_bar_loop_arrays(self, df: pd.DataFrame, strategy_name: str, strategy_params: Dict):
+        """
+        Simulate bar by bar over pre-extracted columns
+        
+        Same fills, slippage, funding and circuit-breaker semantics as
+        ``_run_bar_loop_rows``; the columns are pulled out of the DataFrame
+        once and each bar is read through a reusable cursor.
+        """
+        cursor = _ColumnCursor(df)
+        for idx in range(len(df)):
+            cursor.idx = idx
+            if self._process_bar(cursor, strategy_name, strategy_params):
+                break
+        
+        # Close any remaining position
+        if self.position:
+            cursor.idx = len(df) - 1
+            self._close_position(cursor, exit_reason="backtest_end")
+    
+    def _process_bar(self, row: pd.Series, strategy_name: str, strategy_params: Dict) -> bool:
+        """Process a single bar; returns True when the circuit breaker halts the run"""
+        self.current_time = row['timestamp']
+        
+        # Update equity curve
+        current_equity = self._calculate_equity(row['close'])
+        self.equity_curve.append((self.current_time, current_equity))
+        
+        # Check circuit breaker
+        if self._check_circuit_breaker(current_equity):
+            logger.warning(
+                "Circuit breaker triggered",
+                drawdown=self._calculate_current_drawdown(current_equity)
+            )
+            return True
+        
+        # Update position tracking
+        if self.position:
+            self._update_position_tracking(row)
+            
+            # Check stop loss and take profit
+            if self._check_exit_conditions(row):
+                self._close_position(
+                    row,
+                    exit_reason="stop_loss_or_take_profit"
+                )
+                return False
+            
+            # Apply funding fees (every 8 hours)
+            if self._should_apply_funding(row):
+                self._apply_funding_fee(row)
+        
+        # Process signal
+        signal = row['signal']
+        
+        if signal != 0 and not self.in_drawdown_protection:
+            # Close existing position if signal changed
+            if self.position:
+                if (signal > 0 and self.position.side == PositionSide.SHORT) or \
+                   (signal < 0 and self.position.side == PositionSide.LONG):
+                    self._close_position(row, exit_reason="signal_change")
+            
+            # Open new position
+            if not self.position:
+                self._open_position(
+                    row,
+                    signal,
+                    strategy_name,
+                    strategy_params
+                )
+        
+        elif signal == 0 and self.position:
+            # Close position on flat signal
+            self._close_position(row, exit_reason="signal")
+        
+        return False
+    
     def _calculate_equity(self, current_price: float) -> float:
         """Calculate current equity"""
         equity = self.capital
@@ -670,29 +744,12 @@ class BacktestEngine:
         
         df['returns'] = df['close'].pct_change()
         df['volatility'] = df['returns'].rolling(window=20).std()
-        df['trend'] = df['close'].rolling(window=50).apply(
-            lambda x: 1 if x[-1] > x[0] else -1
-        )
-        
-        # Classify regimes
-        vol_median = df['volatility'].median()
-        
-        def classify_regime(row):
-            if pd.isna(row['volatility']) or pd.isna(row['trend']):
-                return 'unknown'
-            
-            if row['volatility'] > vol_median * 1.5:
-                return 'high_volatility'
-            elif row['volatility'] < vol_median * 0.5:
-                return 'low_volatility'
-            elif row['trend'] > 0:
-                return 'bull_trending'
-            elif row['trend'] < 0:
-                return 'bear_trending'
-            else:
-                return 'sideways'
         
-        df['regime'] = df.apply(classify_regime, axis=1)
+        # Trend sign and regime labels in one vectorised pass
+        df['trend'], df['regime'] = trend_volatility_regimes(
+            df['close'].to_numpy(dtype=float),
+            df['volatility'].to_numpy(dtype=float),
+        )
         
         return df
     
@@ -11,7 +11,7 @@ Tests strategy robustness by:
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
 from enum import Enum
 import structlog
@@ -22,6 +22,8 @@ from .backtest_engine import BacktestEngine, BacktestConfig, BacktestResult, Tra
 
 logger = structlog.get_logger()
 
+METRIC_KEYS = ('total_return_pct', 'sharpe_ratio', 'max_drawdown', 'win_rate', 'profit_factor')
+
 
 class SimulationType(Enum):
     """Monte Carlo simulation types"""
@@ -53,6 +55,11 @@ class MonteCarloConfig:
     # Parallel processing
     n_workers: int = 4
     
+    # Batched simulation: draw every trade-randomization/bootstrap path as one
+    # (n_simulations x n_trades) matrix and compute metrics with array ops
+    batched: bool = False
+    batch_size: int = 10000  # Paths per matrix chunk (bounds peak memory)
+    
     # Random seed for reproducibility
     random_seed: Optional[int] = 42
 
@@ -68,6 +75,7 @@ class MonteCarloResult:
     # Simulation results
     simulations: List[Dict] = field(default_factory=list)
     n_simulations: int = 0
+    simulation_metrics: Dict[str, np.ndarray] = field(default_factory=dict)  # Per-path arrays (batched mode)
     
     # Distribution statistics
     mean_return: float = 0.0
@@ -113,6 +121,9 @@ class MonteCarloSimulator:
         
         if self.config.random_seed is not None:
             np.random.seed(self.config.random_seed)
+        
+        # Dedicated generator for batched mode so results don't depend on global state
+        self._rng = np.random.default_rng(self.config.random_seed)
     
     def simulate(
         self,
@@ -142,6 +153,15 @@ class MonteCarloSimulator:
             
             simulations = []
             
+            if self.config.batched and self.config.simulation_type in BATCHED_SIMULATION_TYPES:
+                mc_result = self._analyze_metrics(
+                    self._batched_simulations(original_result),
+                    original_result,
+                    strategy_name
+                )
+                self._log_completion(strategy_name, mc_result)
+                return mc_result
+            
             # Run simulations based on type
             if self.config.simulation_type == SimulationType.TRADE_RANDOMIZATION:
                 simulations = self._trade_randomization(original_result)
@@ -171,13 +191,7 @@ class MonteCarloSimulator:
                 strategy_name
             )
             
-            logger.info(
-                f"Monte Carlo completed: {strategy_name}",
-                mean_return=f"{mc_result.mean_return:.2f}%",
-                std_return=f"{mc_result.std_return:.2f}%",
-                prob_profit=f"{mc_result.probability_of_profit:.2f}",
-                robustness=f"{mc_result.overall_robustness_score:.2f}"
-            )
+            self._log_completion(strategy_name, mc_result)
             
             return mc_result
             
@@ -185,6 +199,90 @@ class MonteCarloSimulator:
             logger.error(f"Error in Monte Carlo simulation: {e}", exc_info=True)
             raise
     
+    def _log_completion(self, strategy_name: str, mc_result: MonteCarloResult):
+        logger.info(
+            f"Monte Carlo completed: {strategy_name}",
+            mean_return=f"{mc_result.mean_return:.2f}%",
+            std_return=f"{mc_result.std_return:.2f}%",
+            prob_profit=f"{mc_result.probability_of_profit:.2f}",
+            robustness=f"{mc_result.overall_robustness_score:.2f}"
+        )
+    
+    def _batched_simulations(self, original_result: BacktestResult) -> Dict[str, np.ndarray]:
+        """Run the configured simulation type in batched mode"""
+        if self.config.simulation_type == SimulationType.TRADE_RANDOMIZATION:
+            return self._batched_trade_randomization(original_result)
+        if self.config.simulation_type == SimulationType.RETURN_BOOTSTRAPPING:
+            return self._batched_return_bootstrapping(original_result)
+        
+        # COMBINED: both path families, analysed together
+        parts = [
+            self._batched_trade_randomization(original_result),
+            self._batched_return_bootstrapping(original_result)
+        ]
+        parts = [part for part in parts if part]
+        if not parts:
+            return {}
+        return {key: np.concatenate([part[key] for part in parts]) for key in METRIC_KEYS}
+    
+    def _path_chunks(self):
+        """Yield path counts per matrix chunk, summing to n_simulations"""
+        batch_size = max(1, self.config.batch_size)
+        for start in range(0, self.config.n_simulations, batch_size):
+            yield min(batch_size, self.config.n_simulations - start)
+    
+    def _batched_trade_randomization(self, original_result: BacktestResult) -> Dict[str, np.ndarray]:
+        """
+        Trade randomization with all permutations drawn as one P&L matrix
+        
+        Each row is an independent permutation of the closed trades' P&L;
+        win rate and profit factor don't depend on order and are computed once.
+        """
+        logger.info("Running batched trade randomization simulation")
+        
+        trades = original_result.trades
+        if not trades:
+            logger.warning("No trades to randomize")
+            return {}
+        
+        pnl = np.array([t.pnl for t in trades if t.exit_time], dtype=np.float64)
+        all_pnl = np.array([t.pnl for t in trades], dtype=np.float64)
+        
+        win_rate = np.count_nonzero(all_pnl > 0) / all_pnl.size * 100
+        gross_profit = all_pnl[all_pnl > 0].sum()
+        gross_loss = abs(all_pnl[all_pnl < 0].sum())
+        profit_factor = gross_profit / gross_loss if gross_loss != 0 else 0
+        
+        chunks = []
+        for n_paths in self._path_chunks():
+            paths = np.tile(pnl, (n_paths, 1))
+            self._rng.permuted(paths, axis=1, out=paths)
+            chunks.append(_trade_path_metrics(paths, original_result.initial_capital))
+        
+        return _stack_metrics(chunks, win_rate, profit_factor)
+    
+    def _batched_return_bootstrapping(self, original_result: BacktestResult) -> Dict[str, np.ndarray]:
+        """
+        Return bootstrapping with all resamples drawn as one index matrix
+        
+        Every bootstrapped return compounds into the synthetic equity curve.
+        """
+        logger.info("Running batched return bootstrapping simulation")
+        
+        returns = original_result.equity_curve.pct_change().dropna().to_numpy(dtype=np.float64)
+        
+        if returns.size == 0:
+            logger.warning("No returns to bootstrap")
+            return {}
+        
+        chunks = []
+        for n_paths in self._path_chunks():
+            draws = returns[self._rng.integers(0, returns.size, size=(n_paths, returns.size))]
+            chunks.append(_return_path_metrics(draws, original_result.initial_capital))
+        
+        # Not applicable for bootstrapping
+        return _stack_metrics(chunks, 0.0, 0.0)
+    
     def _trade_randomization(self, original_result: BacktestResult) -> List[Dict]:
         """
         Simulate by randomizing trade order
@@ -411,11 +509,34 @@ class MonteCarloSimulator:
                 original_result=original_result
             )
         
-        # Extract metrics
-        returns = [s['total_return_pct'] for s in simulations]
-        sharpes = [s['sharpe_ratio'] for s in simulations]
-        drawdowns = [s['max_drawdown'] for s in simulations]
-        win_rates = [s['win_rate'] for s in simulations if s['win_rate'] > 0]
+        metrics = {
+            key: np.array([s[key] for s in simulations], dtype=np.float64)
+            for key in METRIC_KEYS
+        }
+        
+        return self._analyze_metrics(metrics, original_result, strategy_name, simulations)
+    
+    def _analyze_metrics(
+        self,
+        metrics: Dict[str, np.ndarray],
+        original_result: BacktestResult,
+        strategy_name: str,
+        simulations: Optional[List[Dict]] = None
+    ) -> MonteCarloResult:
+        """Summarize per-path metric arrays into a MonteCarloResult"""
+        
+        if not metrics or metrics['total_return_pct'].size == 0:
+            logger.warning("No simulations to analyze")
+            return MonteCarloResult(
+                config=self.config,
+                strategy_name=strategy_name,
+                original_result=original_result
+            )
+        
+        returns = metrics['total_return_pct']
+        sharpes = metrics['sharpe_ratio']
+        drawdowns = metrics['max_drawdown']
+        win_rates = metrics['win_rate'][metrics['win_rate'] > 0]
         
         # Calculate statistics
         mean_return = np.mean(returns)
@@ -430,8 +551,8 @@ class MonteCarloSimulator:
         std_max_dd = np.std(drawdowns)
         median_max_dd = np.median(drawdowns)
         
-        mean_win_rate = np.mean(win_rates) if win_rates else 0.0
-        std_win_rate = np.std(win_rates) if win_rates else 0.0
+        mean_win_rate = np.mean(win_rates) if win_rates.size else 0.0
+        std_win_rate = np.std(win_rates) if win_rates.size else 0.0
         
         # Confidence intervals
         return_ci = self._calculate_confidence_intervals(returns)
@@ -439,13 +560,13 @@ class MonteCarloSimulator:
         drawdown_ci = self._calculate_confidence_intervals(drawdowns)
         
         # Risk metrics
-        prob_profit = len([r for r in returns if r > 0]) / len(returns)
-        prob_ruin = len([d for d in drawdowns if d > 50]) / len(drawdowns)
+        prob_profit = np.count_nonzero(returns > 0) / returns.size
+        prob_ruin = np.count_nonzero(drawdowns > 50) / drawdowns.size
         
         var_95 = np.percentile(returns, 5)
         # CVaR (Conditional VaR) - average of worst 5%
-        worst_5pct = [r for r in returns if r <= var_95]
-        cvar_95 = np.mean(worst_5pct) if worst_5pct else var_95
+        worst_5pct = returns[returns <= var_95]
+        cvar_95 = np.mean(worst_5pct) if worst_5pct.size else var_95
         
         # Robustness scores
         # Return stability: how consistent are returns (lower CV = better)
@@ -474,8 +595,9 @@ class MonteCarloSimulator:
             config=self.config,
             strategy_name=strategy_name,
             original_result=original_result,
-            simulations=simulations,
-            n_simulations=len(simulations),
+            simulations=simulations if simulations is not None else [],
+            n_simulations=int(returns.size),
+            simulation_metrics=metrics if simulations is None else {},
             mean_return=mean_return,
             std_return=std_return,
             median_return=median_return,
@@ -502,18 +624,87 @@ class MonteCarloSimulator:
     
     def _calculate_confidence_intervals(
         self,
-        values: List[float]
+        values: np.ndarray
     ) -> Dict[float, Tuple[float, float]]:
-        """Calculate confidence intervals"""
-        intervals = {}
-        
-        for conf_level in self.config.confidence_levels:
-            lower_pct = ((1 - conf_level) / 2) * 100
-            upper_pct = (conf_level + (1 - conf_level) / 2) * 100
-            
-            lower = np.percentile(values, lower_pct)
-            upper = np.percentile(values, upper_pct)
-            
-            intervals[conf_level] = (lower, upper)
-        
-        return intervals
+        """Calculate confidence intervals (all levels in one percentile pass)"""
+        levels = self.config.confidence_levels
+        if not levels:
+            return {}
+        
+        lower_pcts = [((1 - conf_level) / 2) * 100 for conf_level in levels]
+        upper_pcts = [(conf_level + (1 - conf_level) / 2) * 100 for conf_level in levels]
+        bounds = np.percentile(values, lower_pcts + upper_pcts)
+        
+        return {
+            conf_level: (bounds[i], bounds[i + len(levels)])
+            for i, conf_level in enumerate(levels)
+        }
+
+
+BATCHED_SIMULATION_TYPES = (
+    SimulationType.TRADE_RANDOMIZATION,
+    SimulationType.RETURN_BOOTSTRAPPING,
+    SimulationType.COMBINED,
+)
+
+
+def _path_sharpe(returns: np.ndarray) -> np.ndarray:
+    """Annualized Sharpe per row; 0 where the volatility is zero or undefined"""
+    n_paths, n_steps = returns.shape
+    if n_steps < 2:
+        return np.zeros(n_paths)
+    mean = returns.mean(axis=1)
+    std = returns.std(axis=1, ddof=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        sharpe = np.sqrt(252) * mean / std
+    return np.where(std > 0, sharpe, 0.0)
+
+
+def _equity_path_metrics(equity: np.ndarray, returns: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+    """Return, Sharpe and max drawdown per row of an (n_paths, n_points) equity matrix"""
+    running_max = np.maximum.accumulate(equity, axis=1)
+    drawdown = (equity - running_max) / running_max
+    
+    return {
+        'total_return_pct': (equity[:, -1] - initial_capital) / initial_capital * 100,
+        'sharpe_ratio': _path_sharpe(returns),
+        'max_drawdown': np.abs(drawdown.min(axis=1)) * 100,
+    }
+
+
+def _trade_path_metrics(pnl_paths: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+    """Metrics for each row of an (n_paths, n_trades) matrix of ordered trade P&L"""
+    n_paths, n_trades = pnl_paths.shape
+    
+    # Leading capital column so the running sum accumulates in trade order
+    equity = np.empty((n_paths, n_trades + 1))
+    equity[:, 0] = initial_capital
+    equity[:, 1:] = pnl_paths
+    np.cumsum(equity, axis=1, out=equity)
+    
+    returns = equity[:, 1:] / equity[:, :-1] - 1
+    return _equity_path_metrics(equity, returns, initial_capital)
+
+
+def _return_path_metrics(return_paths: np.ndarray, initial_capital: float) -> Dict[str, np.ndarray]:
+    """Metrics for each row of an (n_paths, n_periods) matrix of period returns"""
+    n_paths, n_periods = return_paths.shape
+    
+    equity = np.empty((n_paths, n_periods + 1))
+    equity[:, 0] = initial_capital
+    equity[:, 1:] = 1 + return_paths
+    np.cumprod(equity, axis=1, out=equity)
+    
+    return _equity_path_metrics(equity, return_paths, initial_capital)
+
+
+def _stack_metrics(chunks: List[Dict[str, np.ndarray]], win_rate: float, profit_factor: float) -> Dict[str, np.ndarray]:
+    """Join per-chunk metric arrays and add the path-invariant trade statistics"""
+    metrics = {
+        key: np.concatenate([chunk[key] for chunk in chunks])
+        for key in ('total_return_pct', 'sharpe_ratio', 'max_drawdown')
+    }
+    n_paths = metrics['total_return_pct'].size
+    metrics['win_rate'] = np.full(n_paths, float(win_rate))
+    metrics['profit_factor'] = np.full(n_paths, float(profit_factor))
+    return metrics
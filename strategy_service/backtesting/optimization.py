@@ -8,6 +8,7 @@ Implements multiple optimization algorithms:
 - Genetic Algorithm
 """
 
+import pickle
 import numpy as np
 import pandas as pd
 from typing import Dict, List, Optional, Tuple, Any, Callable
@@ -59,8 +60,14 @@ class OptimizationConfig:
     elitism_pct: float = 0.1
     
     # Parallel processing
+    parallel_evaluation: bool = False  # Fan evaluations out to n_workers processes
     n_workers: int = 4
     
+    # Evaluation reuse and early stopping
+    cache_evaluations: bool = True  # Memoise results per canonical parameter set
+    early_stopping: bool = False  # Stop random/genetic search once converged
+    convergence_window: int = 10
+    
     # Overfitting prevention
     use_validation_set: bool = True
     validation_split: float = 0.3
@@ -89,6 +96,143 @@ class OptimizationResult:
     # Validation
     validation_score: Optional[float] = None
     overfitting_ratio: float = 0.0  # (training_score - validation_score) / training_score
+    
+    # Evaluation reuse
+    cache_hits: int = 0
+
+
+def canonical_params_key(params: Dict) -> Tuple:
+    """Hashable, order-independent key for a parameter set"""
+    return tuple(sorted((str(name), _canonical_value(value)) for name, value in params.items()))
+
+
+def _canonical_value(value: Any) -> Any:
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, dict):
+        return canonical_params_key(value)
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(_canonical_value(item) for item in value)
+    try:
+        hash(value)
+    except TypeError:
+        return repr(value)
+    return value
+
+
+def _call_objective(objective_function: Callable, params: Dict) -> Tuple[Any, Optional[str]]:
+    """Run the objective, capturing failures as messages so they survive pickling"""
+    try:
+        return objective_function(params), None
+    except Exception as e:
+        return None, str(e)
+
+
+_WORKER_OBJECTIVE: Optional[Callable] = None
+
+
+def _install_objective(objective_function: Callable):
+    global _WORKER_OBJECTIVE
+    _WORKER_OBJECTIVE = objective_function
+
+
+def _call_installed_objective(params: Dict) -> Tuple[Any, Optional[str]]:
+    return _call_objective(_WORKER_OBJECTIVE, params)
+
+
+class ParameterEvaluator:
+    """
+    Evaluates batches of parameter sets for ParameterOptimizer
+    
+    - Memoises outcomes by canonical parameter key, so repeated chromosomes
+      or random samples are only backtested once per optimization run
+    - With n_workers > 1, fans a batch out to a process pool; the objective
+      is shipped to each worker once via the pool initializer. Objectives
+      that cannot be pickled (closures, lambdas) are evaluated serially.
+    
+    Outcomes are returned in input order as (objective return value, error
+    message) tuples. Subclass and override ``_evaluate_unique`` to plug in
+    other executors.
+    """
+    
+    def __init__(self, n_workers: int = 1, memoize: bool = True):
+        self.n_workers = n_workers
+        self.memoize = memoize
+        self.cache_hits = 0
+        self._objective: Optional[Callable] = None
+        self._memo: Dict[Tuple, Tuple[Any, Optional[str]]] = {}
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._serial_only = False
+    
+    def evaluate(
+        self,
+        objective_function: Callable,
+        param_sets: List[Dict]
+    ) -> List[Tuple[Any, Optional[str]]]:
+        """Evaluate parameter sets, returning outcomes in input order"""
+        if objective_function is not self._objective:
+            self.close()
+            self._objective = objective_function
+            self._serial_only = False
+        
+        outcomes: List[Optional[Tuple[Any, Optional[str]]]] = [None] * len(param_sets)
+        pending: Dict[Any, List[int]] = {}
+        for idx, params in enumerate(param_sets):
+            key = canonical_params_key(params) if self.memoize else idx
+            if key in self._memo:
+                outcomes[idx] = self._memo[key]
+                self.cache_hits += 1
+            elif key in pending:
+                pending[key].append(idx)
+                self.cache_hits += 1
+            else:
+                pending[key] = [idx]
+        
+        unique_params = [param_sets[positions[0]] for positions in pending.values()]
+        for (key, positions), outcome in zip(pending.items(), self._evaluate_unique(unique_params)):
+            if self.memoize:
+                self._memo[key] = outcome
+            for idx in positions:
+                outcomes[idx] = outcome
+        
+        return outcomes
+    
+    def _evaluate_unique(self, param_sets: List[Dict]) -> List[Tuple[Any, Optional[str]]]:
+        pool = self._get_pool() if len(param_sets) > 1 else None
+        if pool is None:
+            return [_call_objective(self._objective, params) for params in param_sets]
+        
+        chunksize = max(1, len(param_sets) // (self.n_workers * 4))
+        return list(pool.map(_call_installed_objective, param_sets, chunksize=chunksize))
+    
+    def _get_pool(self) -> Optional[ProcessPoolExecutor]:
+        if self.n_workers <= 1 or self._serial_only:
+            return None
+        if self._pool is None:
+            try:
+                pickle.dumps(self._objective)
+            except Exception as e:
+                logger.warning("Objective function is not picklable, evaluating serially", error=str(e))
+                self._serial_only = True
+                return None
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.n_workers,
+                initializer=_install_objective,
+                initargs=(self._objective,)
+            )
+        return self._pool
+    
+    def clear_cache(self):
+        """Forget memoised outcomes; the objective may now see different data"""
+        self._memo = {}
+    
+    def close(self):
+        """Shut down the worker pool, if any, and clear memoised outcomes"""
+        if self._pool is not None:
+            self._pool.shutdown()
+            self._pool = None
+        self._objective = None
+        self.clear_cache()
 
 
 class ParameterOptimizer:
@@ -98,8 +242,12 @@ class ParameterOptimizer:
     Finds optimal strategy parameters using various algorithms
     """
     
-    def __init__(self, config: OptimizationConfig):
+    def __init__(self, config: OptimizationConfig, evaluator: Optional[ParameterEvaluator] = None):
         self.config = config
+        self.evaluator = evaluator or ParameterEvaluator(
+            n_workers=config.n_workers if config.parallel_evaluation else 1,
+            memoize=config.cache_evaluations
+        )
     
     def optimize(
         self,
@@ -124,17 +272,25 @@ class ParameterOptimizer:
             objective=self.config.objective_metric
         )
         
-        if self.config.method == OptimizationMethod.GRID_SEARCH:
-            result = self._grid_search(param_space, objective_function)
-            
-        elif self.config.method == OptimizationMethod.RANDOM_SEARCH:
-            result = self._random_search(param_space, objective_function)
-            
-        elif self.config.method == OptimizationMethod.GENETIC_ALGORITHM:
-            result = self._genetic_algorithm(param_space, objective_function)
-            
-        else:
-            raise ValueError(f"Unsupported optimization method: {self.config.method}")
+        # Scores from an earlier run may be stale even for the same objective
+        self.evaluator.clear_cache()
+        hits_before = self.evaluator.cache_hits
+        try:
+            if self.config.method == OptimizationMethod.GRID_SEARCH:
+                result = self._grid_search(param_space, objective_function)
+                
+            elif self.config.method == OptimizationMethod.RANDOM_SEARCH:
+                result = self._random_search(param_space, objective_function)
+                
+            elif self.config.method == OptimizationMethod.GENETIC_ALGORITHM:
+                result = self._genetic_algorithm(param_space, objective_function)
+                
+            else:
+                raise ValueError(f"Unsupported optimization method: {self.config.method}")
+        finally:
+            self.evaluator.close()
+        
+        result.cache_hits = self.evaluator.cache_hits - hits_before
         
         # Validation
         if validation_function and self.config.use_validation_set:
@@ -182,37 +338,37 @@ class ParameterOptimizer:
         convergence = []
         
         # Evaluate each combination
-        for i, combo in enumerate(combinations):
-            params = dict(zip(param_names, combo))
+        param_sets = [dict(zip(param_names, combo)) for combo in combinations]
+        outcomes = self.evaluator.evaluate(objective_function, param_sets)
+        
+        for i, (params, (outcome, error)) in enumerate(zip(param_sets, outcomes)):
+            if error is not None:
+                logger.warning(f"Error evaluating params {params}: {error}")
+                continue
             
-            try:
-                score, backtest_result = objective_function(params)
-                
-                # Check constraints
-                if not self._check_constraints(backtest_result):
-                    continue
-                
-                evaluations.append({
-                    'params': params,
-                    'score': score,
-                    'iteration': i
-                })
-                
-                # Update best
-                if (self.config.maximize and score > best_score) or \
-                   (not self.config.maximize and score < best_score):
-                    best_score = score
-                    best_params = params
-                    best_result = backtest_result
-                
-                convergence.append(best_score)
-                
-                if (i + 1) % 10 == 0:
-                    logger.debug(f"Evaluated {i + 1}/{len(combinations)} combinations")
-                    
-            except Exception as e:
-                logger.warning(f"Error evaluating params {params}: {e}")
+            score, backtest_result = outcome
+            
+            # Check constraints
+            if not self._check_constraints(backtest_result):
                 continue
+            
+            evaluations.append({
+                'params': params,
+                'score': score,
+                'iteration': i
+            })
+            
+            # Update best
+            if (self.config.maximize and score > best_score) or \
+               (not self.config.maximize and score < best_score):
+                best_score = score
+                best_params = params
+                best_result = backtest_result
+            
+            convergence.append(best_score)
+            
+            if (i + 1) % 10 == 0:
+                logger.debug(f"Evaluated {i + 1}/{len(combinations)} combinations")
         
         return OptimizationResult(
             method=OptimizationMethod.GRID_SEARCH,
@@ -241,14 +397,29 @@ class ParameterOptimizer:
         best_result = None
         convergence = []
         
-        for i in range(self.config.n_random_samples):
-            # Sample random parameters
+        # Sample random parameters
+        param_sets = []
+        for _ in range(self.config.n_random_samples):
             params = {}
             for param_name, param_values in param_space.items():
                 params[param_name] = np.random.choice(param_values)
+            param_sets.append(params)
+        
+        # Evaluate in batches so early stopping can cut the run short
+        batch_size = len(param_sets)
+        if self.config.early_stopping:
+            batch_size = max(self.config.convergence_window, self.evaluator.n_workers * 4)
+        
+        for start in range(0, len(param_sets), batch_size):
+            batch = param_sets[start:start + batch_size]
+            outcomes = self.evaluator.evaluate(objective_function, batch)
             
-            try:
-                score, backtest_result = objective_function(params)
+            for i, (params, (outcome, error)) in enumerate(zip(batch, outcomes), start):
+                if error is not None:
+                    logger.warning(f"Error evaluating params {params}: {error}")
+                    continue
+                
+                score, backtest_result = outcome
                 
                 if not self._check_constraints(backtest_result):
                     continue
@@ -266,10 +437,11 @@ class ParameterOptimizer:
                     best_result = backtest_result
                 
                 convergence.append(best_score)
-                
-            except Exception as e:
-                logger.warning(f"Error evaluating params {params}: {e}")
-                continue
+            
+            if self.config.early_stopping and start + batch_size < len(param_sets):
+                if self._check_convergence(convergence, self.config.convergence_window):
+                    logger.info("Random search converged early", evaluated=start + len(batch))
+                    break
         
         return OptimizationResult(
             method=OptimizationMethod.RANDOM_SEARCH,
@@ -310,33 +482,33 @@ class ParameterOptimizer:
         for generation in range(self.config.n_generations):
             # Evaluate population
             fitness_scores = []
+            param_sets = [dict(zip(param_names, individual)) for individual in population]
+            outcomes = self.evaluator.evaluate(objective_function, param_sets)
             
-            for individual in population:
-                params = dict(zip(param_names, individual))
+            for params, (outcome, error) in zip(param_sets, outcomes):
+                if error is not None:
+                    fitness_scores.append(-np.inf if self.config.maximize else np.inf)
+                    continue
+                
+                score, backtest_result = outcome
                 
-                try:
-                    score, backtest_result = objective_function(params)
-                    
-                    if not self._check_constraints(backtest_result):
-                        fitness_scores.append(-np.inf if self.config.maximize else np.inf)
-                        continue
-                    
-                    fitness_scores.append(score)
-                    
-                    evaluations.append({
-                        'params': params,
-                        'score': score,
-                        'generation': generation
-                    })
-                    
-                    if (self.config.maximize and score > best_score) or \
-                       (not self.config.maximize and score < best_score):
-                        best_score = score
-                        best_params = params
-                        best_result = backtest_result
-                        
-                except Exception as e:
+                if not self._check_constraints(backtest_result):
                     fitness_scores.append(-np.inf if self.config.maximize else np.inf)
+                    continue
+                
+                fitness_scores.append(score)
+                
+                evaluations.append({
+                    'params': params,
+                    'score': score,
+                    'generation': generation
+                })
+                
+                if (self.config.maximize and score > best_score) or \
+                   (not self.config.maximize and score < best_score):
+                    best_score = score
+                    best_params = params
+                    best_result = backtest_result
             
             convergence.append(best_score)
             
@@ -345,6 +517,11 @@ class ParameterOptimizer:
                 best_score=f"{best_score:.4f}"
             )
             
+            if self.config.early_stopping and \
+               self._check_convergence(convergence, self.config.convergence_window):
+                logger.info("Genetic algorithm converged early", generation=generation + 1)
+                break
+            
             # Selection
             selected = self._tournament_selection(population, fitness_scores)
             
@@ -376,7 +553,7 @@ class ParameterOptimizer:
             evaluations=evaluations,
             n_evaluations=len(evaluations),
             convergence_curve=convergence,
-            converged=self._check_convergence(convergence)
+            converged=self._check_convergence(convergence, self.config.convergence_window)
         )
     
     def _initialize_population(self, param_space: Dict) -> List[List]:
@@ -10,8 +10,9 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Tuple, Any
 from dataclasses import dataclass, field
+import pickle
 import structlog
-from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, as_completed, wait
 
 from .backtest_engine import BacktestEngine, BacktestConfig, BacktestResult
 
@@ -37,6 +38,10 @@ class WalkForwardConfig:
     # Min data requirements
     min_trades_required: int = 10
     min_data_points: int = 1000
+    
+    # Parallel window processing
+    n_workers: int = 1  # >1 dispatches windows to a process pool
+    max_pending_windows: int = 0  # Windows in flight at once (0 = 2 x n_workers); bounds slice memory
 
 
 @dataclass
@@ -137,23 +142,13 @@ class WalkForwardAnalyzer:
             logger.info(f"Created {len(windows)} walk-forward windows")
             
             # Process each window
-            results = []
-            for window in windows:
-                logger.info(
-                    f"Processing window {window.window_id + 1}/{len(windows)}",
-                    in_sample_start=window.in_sample_start,
-                    out_sample_start=window.out_sample_start
-                )
-                
-                window_result = self._process_window(
-                    window,
-                    data,
-                    strategy_class,
-                    param_ranges,
-                    strategy_name
-                )
-                
-                results.append(window_result)
+            results = self._run_windows(
+                windows,
+                data,
+                strategy_class,
+                param_ranges,
+                strategy_name
+            )
             
             # Aggregate results
             wf_result = self._aggregate_results(
@@ -175,6 +170,117 @@ class WalkForwardAnalyzer:
             logger.error(f"Error in walk-forward analysis: {e}", exc_info=True)
             raise
     
+    def _run_windows(
+        self,
+        windows: List[WalkForwardWindow],
+        data: pd.DataFrame,
+        strategy_class: Any,
+        param_ranges: Dict[str, List],
+        strategy_name: str
+    ) -> List[WalkForwardWindow]:
+        """Process windows sequentially or in a process pool, returning them in window order"""
+        if self.config.n_workers > 1 and len(windows) > 1:
+            try:
+                pickle.dumps((strategy_class, param_ranges))
+            except Exception as e:
+                logger.warning("Strategy class is not picklable, processing windows serially", error=str(e))
+            else:
+                return self._run_windows_parallel(
+                    windows,
+                    data,
+                    strategy_class,
+                    param_ranges,
+                    strategy_name
+                )
+        
+        results = []
+        for window in windows:
+            logger.info(
+                f"Processing window {window.window_id + 1}/{len(windows)}",
+                in_sample_start=window.in_sample_start,
+                out_sample_start=window.out_sample_start
+            )
+            
+            window_result = self._process_window(
+                window,
+                data,
+                strategy_class,
+                param_ranges,
+                strategy_name
+            )
+            
+            results.append(window_result)
+        
+        return results
+    
+    def _run_windows_parallel(
+        self,
+        windows: List[WalkForwardWindow],
+        data: pd.DataFrame,
+        strategy_class: Any,
+        param_ranges: Dict[str, List],
+        strategy_name: str
+    ) -> List[WalkForwardWindow]:
+        """
+        Dispatch windows to worker processes
+        
+        - Each worker receives only the rows its window covers
+        - At most max_pending_windows slices are in flight, so memory stays
+          bounded however many windows there are
+        - Results are slotted back by position, preserving window order
+        """
+        n_workers = self.config.n_workers
+        max_pending = self.config.max_pending_windows or 2 * n_workers
+        results: List[Optional[WalkForwardWindow]] = [None] * len(windows)
+        queue = iter(enumerate(windows))
+        
+        logger.info(
+            f"Processing {len(windows)} windows in parallel",
+            n_workers=n_workers,
+            max_pending=max_pending
+        )
+        
+        with ProcessPoolExecutor(max_workers=n_workers) as pool:
+            pending = {}
+            
+            def submit_next() -> bool:
+                position, window = next(queue, (None, None))
+                if window is None:
+                    return False
+                future = pool.submit(
+                    _process_window_in_worker,
+                    self.config,
+                    self.backtest_config,
+                    window,
+                    self._window_slice(data, window),
+                    strategy_class,
+                    param_ranges,
+                    strategy_name
+                )
+                pending[future] = position
+                return True
+            
+            while len(pending) < max_pending and submit_next():
+                pass
+            
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    position = pending.pop(future)
+                    results[position] = future.result()
+                    logger.info(f"Completed window {position + 1}/{len(windows)}")
+                    submit_next()
+        
+        return results
+    
+    @staticmethod
+    def _window_slice(data: pd.DataFrame, window: WalkForwardWindow) -> pd.DataFrame:
+        """Rows from the window's in-sample start up to its out-sample end"""
+        return data[
+            (data['timestamp'] >= window.in_sample_start) &
+            (data['timestamp'] < window.out_sample_end)
+        ]
+    
     def _create_windows(self, data: pd.DataFrame) -> List[WalkForwardWindow]:
         """Create walk-forward windows"""
         windows = []
@@ -186,13 +292,14 @@ class WalkForwardAnalyzer:
         current_start = data_start
         
         while True:
-            # Calculate window boundaries
+            # Calculate window boundaries; anchored windows keep the start and
+            # grow the in-sample period as the window rolls forward
             if self.config.anchored:
                 in_sample_start = data_start
             else:
                 in_sample_start = current_start
             
-            in_sample_end = in_sample_start + timedelta(days=self.config.in_sample_days)
+            in_sample_end = current_start + timedelta(days=self.config.in_sample_days)
             out_sample_start = in_sample_end
             out_sample_end = out_sample_start + timedelta(days=self.config.out_sample_days)
             
@@ -588,3 +695,23 @@ class WalkForwardAnalyzer:
                 param_values[param_name] = cv
         
         return param_values
+
+
+def _process_window_in_worker(
+    config: WalkForwardConfig,
+    backtest_config: BacktestConfig,
+    window: WalkForwardWindow,
+    window_data: pd.DataFrame,
+    strategy_class: Any,
+    param_ranges: Dict[str, List],
+    strategy_name: str
+) -> WalkForwardWindow:
+    """Process-pool entry point: run one window against its data slice"""
+    analyzer = WalkForwardAnalyzer(config, backtest_config)
+    return analyzer._process_window(
+        window,
+        window_data,
+        strategy_class,
+        param_ranges,
+        strategy_name
+    )
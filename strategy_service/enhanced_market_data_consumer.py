@@ -7,6 +7,8 @@ including real-time streaming, advanced caching, and dynamic indicator requests.
 
 import asyncio
 import json
+import os
+import sys
 import time
 from datetime import datetime, timezone, timedelta
 from typing import Dict, List, Optional, Any, Callable, AsyncGenerator
@@ -20,6 +22,9 @@ import structlog
 
 from dynamic_data_manager import StrategyDataManager, DataRequestType, DataPriority
 
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
+from shared.rabbitmq_publisher import decode_body
+
 logger = structlog.get_logger()
 
 @dataclass
@@ -223,8 +228,8 @@ class EnhancedMarketDataConsumer:
                                   subscription: MarketDataSubscription):
         """Handle incoming real-time market data"""
         try:
-            # Parse message
-            data = json.loads(message.body.decode())
+            # Parse message (JSON or msgpack, per the publisher's content type)
+            data = decode_body(message.body, message.content_type)
             symbol = data.get('symbol')
             timeframe = data.get('timeframe')
             data_type = data.get('data_type')
@@ -0,0 +1,326 @@
+"""
+Vectorised indicator kernels for the strategy backtest engines.
+
+Columnar NumPy implementations of the indicators used by
+``BacktestEngine.calculate_indicators``, plus the regime labellers used by
+both this engine and ``backtesting.BacktestEngine``. Every indicator kernel
+runs in O(n) over the full candle set (rolling windows via prefix sums,
+Wilder/EMA smoothing via a first-order linear filter) and keeps the warm-up
+conventions of the original list-based helpers, so signal evaluation sees
+the same values.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+try:  # Optional dependency guard: scipy gives a C-speed recursive filter
+    from scipy.signal import lfilter as _lfilter
+except ModuleNotFoundError:  # pragma: no cover - dependency resolution
+    _lfilter = None
+
+
+def _as_array(values: Iterable[float]) -> np.ndarray:
+    return np.asarray(values, dtype=np.float64)
+
+
+def _smooth(values: np.ndarray, alpha: float, seed: float) -> np.ndarray:
+    """Run ``y[k] = (1 - alpha) * y[k-1] + alpha * x[k]`` starting from ``seed``."""
+    if values.size == 0:
+        return np.empty(0, dtype=np.float64)
+    decay = 1.0 - alpha
+    if _lfilter is not None:
+        out, _ = _lfilter([alpha], [1.0, -decay], values, zi=[decay * seed])
+        return out
+    out = np.empty(values.size, dtype=np.float64)
+    prev = seed
+    for idx, value in enumerate(values.tolist()):
+        prev = value * alpha + prev * decay
+        out[idx] = prev
+    return out
+
+
+def _rolling_sums(values: np.ndarray, period: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return (sum, sum of squares) for every full window, anchored at values[0].
+
+    Values are shifted by the first element before accumulation so the prefix
+    sums stay small and the window differences keep their precision on
+    high-priced symbols.
+    """
+    anchor = values[0]
+    shifted = values - anchor
+    csum = np.concatenate(([0.0], np.cumsum(shifted)))
+    csq = np.concatenate(([0.0], np.cumsum(shifted * shifted)))
+    window_sum = csum[period:] - csum[:-period]
+    window_sq = csq[period:] - csq[:-period]
+    return window_sum, window_sq
+
+
+def sma(values: Iterable[float], period: int) -> np.ndarray:
+    """Simple moving average; the warm-up bars echo the raw input."""
+    prices = _as_array(values)
+    if prices.size < period:
+        return prices.copy()
+    out = prices.copy()
+    window_sum, _ = _rolling_sums(prices, period)
+    out[period - 1:] = window_sum / period + prices[0]
+    return out
+
+
+def ema(values: Iterable[float], period: int) -> np.ndarray:
+    """Exponential moving average seeded with the SMA of the first window."""
+    prices = _as_array(values)
+    if prices.size < period:
+        return prices.copy()
+    seed = prices[:period].sum() / period
+    out = np.empty(prices.size, dtype=np.float64)
+    out[:period - 1] = prices[0]
+    out[period - 1] = seed
+    out[period:] = _smooth(prices[period:], 2 / (period + 1), seed)
+    return out
+
+
+def rsi(values: Iterable[float], period: int = 14) -> np.ndarray:
+    """Wilder RSI; the first ``period + 1`` bars are reported as neutral (50)."""
+    prices = _as_array(values)
+    if prices.size < period + 1:
+        return np.full(prices.size, 50.0)
+
+    deltas = np.diff(prices)
+    gains = np.maximum(deltas, 0.0)
+    losses = np.maximum(-deltas, 0.0)
+
+    alpha = 1.0 / period
+    avg_gain = _smooth(gains[period:], alpha, gains[:period].sum() / period)
+    avg_loss = _smooth(losses[period:], alpha, losses[:period].sum() / period)
+
+    out = np.full(prices.size, 50.0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        values_rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    out[period + 1:] = np.where(avg_loss == 0, 100.0, values_rsi)
+    return out
+
+
+def bollinger_bands(
+    values: Iterable[float], period: int, std_dev: float
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Bollinger bands using the sample standard deviation of each window."""
+    prices = _as_array(values)
+    middle = prices.copy()
+    upper = prices.copy()
+    lower = prices.copy()
+    if prices.size < period:
+        return upper, middle, lower
+
+    window_sum, window_sq = _rolling_sums(prices, period)
+    middle[period - 1:] = window_sum / period + prices[0]
+    variance = (window_sq - window_sum * window_sum / period) / (period - 1)
+    width = np.sqrt(np.maximum(variance, 0.0)) * std_dev
+    upper[period - 1:] = middle[period - 1:] + width
+    lower[period - 1:] = middle[period - 1:] - width
+    return upper, middle, lower
+
+
+def true_range(highs: Iterable[float], lows: Iterable[float], closes: Iterable[float]) -> np.ndarray:
+    high = _as_array(highs)
+    low = _as_array(lows)
+    close = _as_array(closes)
+    tr = high - low
+    if tr.size > 1:
+        prev_close = close[:-1]
+        tr[1:] = np.maximum.reduce([
+            tr[1:],
+            np.abs(high[1:] - prev_close),
+            np.abs(low[1:] - prev_close),
+        ])
+    return tr
+
+
+def atr(
+    highs: Iterable[float], lows: Iterable[float], closes: Iterable[float], period: int = 14
+) -> np.ndarray:
+    """Wilder average true range; warm-up bars repeat the first true range."""
+    tr = true_range(highs, lows, closes)
+    if tr.size < period + 1:
+        return np.zeros(tr.size)
+    seed = tr[:period].sum() / period
+    out = np.empty(tr.size, dtype=np.float64)
+    out[:period - 1] = tr[0]
+    out[period - 1] = seed
+    out[period:] = _smooth(tr[period:], 1.0 / period, seed)
+    return out
+
+
+def _trailing_windows(values: np.ndarray, window: int) -> np.ndarray:
+    """(n - window + 1, window) view of every full trailing window."""
+    return np.lib.stride_tricks.sliding_window_view(values, window)
+
+
+def moving_average_regimes(
+    closes: Iterable[float], short_window: int = 12, long_window: int = 36
+) -> List[str]:
+    """Label bars with the strategy engine's regime vocabulary.
+
+    Bar ``i`` looks at the ``short_window``/``long_window`` closes strictly
+    before it: population volatility of the short window relative to the
+    current close picks ``high_volatility``/``low_volatility``, otherwise the
+    short/long moving-average spread plus the last bar's direction picks
+    ``bull_trend``/``bear_trend``/``ranging``. The first ``long_window`` bars
+    are ``ranging``.
+    """
+    prices = _as_array(closes)
+    labels = np.full(prices.size, "ranging", dtype=object)
+    if prices.size <= long_window:
+        return labels.tolist()
+
+    # Windows ending at i - 1 for every labelled bar i >= long_window
+    short_windows = _trailing_windows(prices[:-1], short_window)[long_window - short_window:]
+    long_windows = _trailing_windows(prices[:-1], long_window)
+    short_ma = short_windows.mean(axis=1)
+    long_ma = long_windows.mean(axis=1)
+    stdev = short_windows.std(axis=1)
+
+    current = prices[long_window:]
+    previous = prices[long_window - 1:-1]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = (current - previous) / previous
+        stdev_ratio = np.where(current != 0, stdev / current, 0.0)
+
+    labels[long_window:] = np.select(
+        [
+            stdev_ratio >= 0.025,
+            stdev_ratio <= 0.005,
+            (short_ma > long_ma * 1.002) & (change > 0),
+            (short_ma < long_ma * 0.998) & (change < 0),
+        ],
+        ["high_volatility", "low_volatility", "bull_trend", "bear_trend"],
+        default="ranging",
+    )
+    return labels.tolist()
+
+
+def trend_volatility_regimes(
+    closes: Iterable[float], volatility: Iterable[float], trend_window: int = 50
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Label bars with the research backtester's regime vocabulary.
+
+    ``trend`` is +1 when the close is above the close ``trend_window - 1``
+    bars earlier and -1 otherwise (NaN until a full window of valid closes
+    exists). Volatility above 1.5x / below 0.5x its median gives
+    ``high_volatility`` / ``low_volatility``; otherwise the trend sign gives
+    ``bull_trending`` / ``bear_trending``. Bars lacking either input are
+    ``unknown``. Returns ``(trend, labels)``.
+    """
+    prices = _as_array(closes)
+    vol = _as_array(volatility)
+
+    trend = np.full(prices.size, np.nan)
+    if prices.size >= trend_window:
+        valid = ~np.isnan(prices)
+        full_window = _trailing_windows(valid, trend_window).all(axis=1)
+        direction = np.where(prices[trend_window - 1:] > prices[:prices.size - trend_window + 1], 1.0, -1.0)
+        trend[trend_window - 1:] = np.where(full_window, direction, np.nan)
+
+    finite_vol = vol[~np.isnan(vol)]
+    vol_median = np.median(finite_vol) if finite_vol.size else np.nan
+    labels = np.select(
+        [
+            np.isnan(vol) | np.isnan(trend),
+            vol > vol_median * 1.5,
+            vol < vol_median * 0.5,
+            trend > 0,
+            trend < 0,
+        ],
+        ["unknown", "high_volatility", "low_volatility", "bull_trending", "bear_trending"],
+        default="sideways",
+    ).astype(object)
+    return trend, labels
+
+
+class IndicatorFrame:
+    """Columnar OHLCV view of one candle set with memoised indicator results.
+
+    Build it once per candle set; every indicator is computed at most once per
+    parameter combination and returned as a plain list so the per-bar
+    simulation loop keeps indexing Python floats.
+
+    ``cache`` may be shared between frames (e.g. for a whole backtest run);
+    entries are then keyed by ``namespace + (indicator, *params)`` so frames
+    for different symbols/timeframes never collide.
+    """
+
+    __slots__ = ("open", "high", "low", "close", "volume", "namespace", "_cache")
+
+    def __init__(
+        self,
+        close: np.ndarray,
+        high: np.ndarray,
+        low: np.ndarray,
+        volume: np.ndarray,
+        open_: Optional[np.ndarray] = None,
+        cache: Optional[Dict[Hashable, Any]] = None,
+        namespace: Tuple[Hashable, ...] = (),
+    ) -> None:
+        self.close = close
+        self.high = high
+        self.low = low
+        self.volume = volume
+        self.open = open_ if open_ is not None else close
+        self.namespace = tuple(namespace)
+        self._cache: Dict[Hashable, Any] = cache if cache is not None else {}
+
+    @classmethod
+    def from_candles(
+        cls,
+        candles: List[Dict[str, Any]],
+        cache: Optional[Dict[Hashable, Any]] = None,
+        namespace: Tuple[Hashable, ...] = (),
+    ) -> "IndicatorFrame":
+        count = len(candles)
+
+        def column(key: str) -> np.ndarray:
+            return np.fromiter((candle[key] for candle in candles), dtype=np.float64, count=count)
+
+        return cls(
+            close=column("close"),
+            high=column("high"),
+            low=column("low"),
+            volume=column("volume"),
+            open_=column("open") if count and "open" in candles[0] else None,
+            cache=cache,
+            namespace=namespace,
+        )
+
+    def __len__(self) -> int:
+        return int(self.close.size)
+
+    def cached(self, key: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """Return the memoised value for ``key``, computing it on first use."""
+        full_key = self.namespace + key
+        try:
+            return self._cache[full_key]
+        except KeyError:
+            value = compute()
+            self._cache[full_key] = value
+            return value
+
+    def sma(self, period: int, column: str = "close") -> List[float]:
+        return self.cached(("sma", column, period), lambda: sma(getattr(self, column), period).tolist())
+
+    def ema(self, period: int, column: str = "close") -> List[float]:
+        return self.cached(("ema", column, period), lambda: ema(getattr(self, column), period).tolist())
+
+    def rsi(self, period: int) -> List[float]:
+        return self.cached(("rsi", period), lambda: rsi(self.close, period).tolist())
+
+    def bollinger_bands(self, period: int, std_dev: float) -> Tuple[List[float], List[float], List[float]]:
+        def compute():
+            upper, middle, lower = bollinger_bands(self.close, period, std_dev)
+            return upper.tolist(), middle.tolist(), lower.tolist()
+
+        return self.cached(("bollinger", period, float(std_dev)), compute)
+
+    def atr(self, period: int) -> List[float]:
+        return self.cached(("atr", period), lambda: atr(self.high, self.low, self.close, period).tolist())
@@ -24,6 +24,7 @@ import aio_pika
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..'))
 from shared.redis_client import RedisCacheManager
 from shared.cache_decorators import cached, simple_key
+from shared.rabbitmq_publisher import decode_body
 
 # Robust imports with fallbacks
 try:
@@ -821,7 +822,7 @@ class StrategyService:
         """Process incoming market data message"""
         async with message.process():
             try:
-                data = json.loads(message.body.decode())
+                data = decode_body(message.body, message.content_type)
                 market_data = MarketData(**data)
                 
                 # Process with all active strategies
@@ -10,7 +10,6 @@ strategy API without directly importing ML components.
 from __future__ import annotations
 
 import asyncio
-from dataclasses import dataclass
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional
 
@@ -19,21 +18,11 @@ import structlog
 
 from data_utils import fetch_symbol_history
 from ml_models.price_predictor import BTCUSDCPredictor, TORCH_AVAILABLE
+from shared.lru_cache import LRUCache
 
 logger = structlog.get_logger()
 
 
-@dataclass
-class CachedPrediction:
-    """Internal cache structure for predictions."""
-
-    data: Dict
-    cached_at: datetime
-
-    def is_expired(self, ttl: timedelta) -> bool:
-        return datetime.now(timezone.utc) - self.cached_at > ttl
-
-
 class PricePredictionUnavailableError(RuntimeError):
     """Raised when price predictions cannot be generated."""
 
@@ -48,6 +37,7 @@ class PricePredictionService:
         *,
         supported_symbols: Optional[List[str]] = None,
         cache_ttl_seconds: int = 300,
+        cache_max_entries: int = 256,
         training_days: int = 120,
     ) -> None:
         self.database = database
@@ -55,7 +45,10 @@ class PricePredictionService:
         self.supported_symbols = supported_symbols or ["BTCUSDC", "BTCUSDT"]
         self.cache_ttl = timedelta(seconds=max(cache_ttl_seconds, 0))
         self.training_days = training_days
-        self._prediction_cache: Dict[str, CachedPrediction] = {}
+        self._prediction_cache: LRUCache[Dict] = LRUCache(
+            max(cache_max_entries, 1),
+            default_ttl_seconds=self.cache_ttl.total_seconds(),
+        )
         self._lock = asyncio.Lock()
         self._last_training_result: Optional[Dict] = None
 
@@ -119,14 +112,14 @@ class PricePredictionService:
 
         if not force_refresh and self.cache_ttl.total_seconds() > 0:
             cached = self._prediction_cache.get(normalized_symbol)
-            if cached and not cached.is_expired(self.cache_ttl):
-                return cached.data
+            if cached is not None:
+                return cached
 
         async with self._lock:
             if not force_refresh and self.cache_ttl.total_seconds() > 0:
                 cached = self._prediction_cache.get(normalized_symbol)
-                if cached and not cached.is_expired(self.cache_ttl):
-                    return cached.data
+                if cached is not None:
+                    return cached
 
             historical_data = await fetch_symbol_history(
                 self.database,
@@ -163,10 +156,7 @@ class PricePredictionService:
             }
 
             if self.cache_ttl.total_seconds() > 0:
-                self._prediction_cache[normalized_symbol] = CachedPrediction(
-                    data=enriched_prediction,
-                    cached_at=enriched_prediction["generated_at"],
-                )
+                self._prediction_cache.set(normalized_symbol, enriched_prediction)
 
             logger.info(
                 "Generated price prediction",
@@ -181,7 +171,7 @@ class PricePredictionService:
         if symbol is None:
             self._prediction_cache.clear()
         else:
-            self._prediction_cache.pop(symbol.upper(), None)
+            self._prediction_cache.pop(symbol.upper())
 
     async def _ensure_model_ready(self) -> None:
         """Ensure the underlying model is loaded or trained."""
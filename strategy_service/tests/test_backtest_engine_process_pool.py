@@ -0,0 +1,75 @@
+import asyncio
+import random
+import unittest
+from datetime import timedelta
+
+from strategy_service.backtest_engine import BacktestEngine
+
+
+class BacktestProcessPoolTests(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(11)
+        self.engine = BacktestEngine()
+        self.datasets = {
+            ("BTCUSDT", "1h"): self.engine.generate_synthetic_data("BTCUSDT", "1h", 10),
+            ("ETHUSDT", "1h"): self.engine.generate_synthetic_data("ETHUSDT", "1h", 10),
+        }
+
+        async def fake_fetch(symbol, timeframe, days=90):
+            return [dict(row) for row in self.datasets[(symbol, timeframe)]]
+
+        self.engine.fetch_historical_data = fake_fetch
+
+    @staticmethod
+    def _strategy(idx, symbol, strategy_type):
+        return {
+            "id": f"s{idx}",
+            "name": f"strategy {idx}",
+            "type": strategy_type,
+            "symbols": [symbol],
+            "timeframe": "1h",
+            "parameters": {"rsi_period": 14},
+        }
+
+    def test_process_pool_matches_sequential_results_and_progress(self):
+        strategies = [
+            self._strategy(idx, symbol, strategy_type)
+            for idx, (symbol, strategy_type) in enumerate([
+                ("BTCUSDT", "momentum"),
+                ("ETHUSDT", "swing"),
+                ("BTCUSDT", "mean_reversion"),
+                ("ETHUSDT", "scalping"),
+                ("BTCUSDT", "macd"),
+            ])
+        ]
+        strategies[2]["sentiment_profile"] = {"bias": "risk_on", "min_alignment": 0.55}
+        start = self.engine._parse_timestamp(self.datasets[("BTCUSDT", "1h")][0]["timestamp"])
+        symbol_sentiment = {
+            "BTCUSDT": [
+                {"timestamp": (start + timedelta(hours=hour)).isoformat(), "aggregated_score": score}
+                for hour, score in ((0, 0.4), (30, -0.6), (90, 0.9))
+            ]
+        }
+        global_sentiment = [{"timestamp": start.isoformat(), "value": 72}]
+
+        runs = {}
+        for workers in (1, 2):
+            progress = []
+            results = asyncio.run(
+                self.engine.backtest_all_strategies(
+                    strategies,
+                    progress_callback=lambda done, total, result: progress.append((done, total, result["strategy_id"])),
+                    max_workers=workers,
+                    symbol_sentiment=symbol_sentiment,
+                    global_sentiment=global_sentiment,
+                )
+            )
+            runs[workers] = (results, progress)
+
+        self.assertEqual(runs[1], runs[2])
+        self.assertEqual([r["strategy_id"] for r in runs[2][0]], [s["id"] for s in strategies])
+
+
+
+if __name__ == "__main__":
+    unittest.main()
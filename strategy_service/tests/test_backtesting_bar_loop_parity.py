@@ -0,0 +1,149 @@
+import math
+import unittest
+from dataclasses import asdict, replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from strategy_service.backtesting.backtest_engine import BacktestConfig, BacktestEngine
+
+
+def _build_market(n_bars=1500, seed=3):
+    rng = np.random.default_rng(seed)
+    timestamps = pd.date_range("2024-01-01", periods=n_bars, freq="min")
+    close = 30000 * np.exp(np.cumsum(rng.normal(0, 0.002, n_bars)))
+    spread = np.abs(rng.normal(0, 0.001, n_bars)) * close
+    data = pd.DataFrame({
+        "timestamp": timestamps,
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(1, 100, n_bars),
+    })
+
+    # Sparse signal rows, as produced by strategies that only emit on changes
+    signal_idx = np.sort(rng.choice(np.arange(25, n_bars), size=120, replace=False))
+    signal_values = rng.choice([-1, 0, 1], size=signal_idx.size)
+    signal_close = close[signal_idx]
+    signals = pd.DataFrame({
+        "timestamp": timestamps[signal_idx],
+        "signal": signal_values,
+        "stop_loss": np.where(signal_values > 0, signal_close * 0.995, signal_close * 1.005),
+        "take_profit": np.where(signal_values > 0, signal_close * 1.01, signal_close * 0.99),
+    })
+    # Some signals come without protective levels
+    signals.loc[signals.index % 4 == 0, ["stop_loss", "take_profit"]] = np.nan
+    return data, signals
+
+
+def _same(a, b):
+    if isinstance(a, float) and isinstance(b, float) and math.isnan(a) and math.isnan(b):
+        return True
+    return a == b
+
+
+class BarLoopParityTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.data, self.signals = _build_market()
+        self.base_config = BacktestConfig(
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 1, 2),
+            initial_capital=50000.0,
+        )
+
+    def _run(self, config, data=None, signals=None):
+        engine = BacktestEngine(config)
+        return engine.run(
+            self.data if data is None else data,
+            self.signals if signals is None else signals,
+            strategy_name="parity",
+            strategy_params={"lookback": 20},
+        )
+
+    def assertParity(self, config, data=None, signals=None):
+        rows = self._run(replace(config, bar_iteration="rows"), data, signals)
+        arrays = self._run(replace(config, bar_iteration="arrays"), data, signals)
+
+        self.assertEqual(rows.final_capital, arrays.final_capital)
+        self.assertEqual(rows.total_trades, arrays.total_trades)
+        self.assertTrue(rows.equity_curve.equals(arrays.equity_curve))
+        for row_trade, array_trade in zip(rows.trades, arrays.trades):
+            for key, value in asdict(row_trade).items():
+                self.assertTrue(_same(value, asdict(array_trade)[key]), key)
+        self.assertEqual(
+            {k: v["total_trades"] for k, v in rows.performance_by_regime.items()},
+            {k: v["total_trades"] for k, v in arrays.performance_by_regime.items()},
+        )
+        return rows
+
+    def test_default_config_matches(self):
+        result = self.assertParity(self.base_config)
+        self.assertGreater(result.total_trades, 0)
+
+    def test_long_only_without_regimes_matches(self):
+        self.assertParity(replace(self.base_config, allow_short=False, use_regime_detection=False))
+
+    def test_circuit_breaker_halt_matches(self):
+        config = replace(self.base_config, circuit_breaker_drawdown=0.002, fixed_slippage_bps=40.0)
+        result = self.assertParity(config)
+        self.assertLess(len(result.equity_curve), len(self.data))
+
+    def test_funding_and_extra_columns_match(self):
+        data = self.data.copy()
+        data["symbol"] = "BTCUSDT"
+        signals = self.signals.drop(columns=["take_profit"])
+        result = self.assertParity(replace(self.base_config, funding_rate=0.001), data, signals)
+        self.assertTrue(all(trade.symbol == "BTCUSDT" for trade in result.trades))
+
+    def test_unknown_mode_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self._run(replace(self.base_config, bar_iteration="vectorised"))
+
+
+def _reference_regimes(df):
+    """Row-wise regime labelling the vectorised detector replaced."""
+    df = df.copy()
+    df["returns"] = df["close"].pct_change()
+    df["volatility"] = df["returns"].rolling(window=20).std()
+    df["trend"] = df["close"].rolling(window=50).apply(lambda x: 1 if x[-1] > x[0] else -1, raw=True)
+    vol_median = df["volatility"].median()
+
+    def classify_regime(row):
+        if pd.isna(row["volatility"]) or pd.isna(row["trend"]):
+            return "unknown"
+        if row["volatility"] > vol_median * 1.5:
+            return "high_volatility"
+        elif row["volatility"] < vol_median * 0.5:
+            return "low_volatility"
+        elif row["trend"] > 0:
+            return "bull_trending"
+        elif row["trend"] < 0:
+            return "bear_trending"
+        return "sideways"
+
+    df["regime"] = df.apply(classify_regime, axis=1)
+    return df
+
+
+class RegimeDetectionTests(unittest.TestCase):
+    def setUp(self) -> None:
+        self.engine = BacktestEngine(BacktestConfig(start_date=datetime(2024, 1, 1), end_date=datetime(2024, 1, 2)))
+
+    def test_vectorised_labels_match_row_wise_reference(self):
+        data, _ = _build_market(n_bars=3000, seed=9)
+        # Inject a volatility burst and a gap so every branch is exercised
+        data.loc[1200:1400, "close"] *= 1 + np.sin(np.arange(201)) * 0.05
+        data.loc[2000, "close"] = np.nan
+
+        expected = _reference_regimes(data)
+        actual = self.engine._detect_regimes(data.copy())
+
+        self.assertEqual(actual["regime"].tolist(), expected["regime"].tolist())
+        pd.testing.assert_series_equal(actual["trend"], expected["trend"])
+        self.assertTrue({"unknown", "high_volatility", "low_volatility"} <= set(actual["regime"]))
+
+
+if __name__ == "__main__":
+    unittest.main()
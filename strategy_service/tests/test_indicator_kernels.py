@@ -0,0 +1,208 @@
+import asyncio
+import random
+import statistics
+import unittest
+
+from strategy_service.backtest_engine import BacktestEngine
+from strategy_service.indicator_kernels import IndicatorFrame
+
+
+def _reference_rsi(prices, period=14):
+    if len(prices) < period + 1:
+        return [50.0] * len(prices)
+    deltas = [prices[i] - prices[i - 1] for i in range(1, len(prices))]
+    gains = [max(d, 0) for d in deltas]
+    losses = [abs(min(d, 0)) for d in deltas]
+    avg_gain = sum(gains[:period]) / period
+    avg_loss = sum(losses[:period]) / period
+    values = [50.0] * (period + 1)
+    for i in range(period, len(gains)):
+        avg_gain = (avg_gain * (period - 1) + gains[i]) / period
+        avg_loss = (avg_loss * (period - 1) + losses[i]) / period
+        values.append(100 if avg_loss == 0 else 100 - (100 / (1 + avg_gain / avg_loss)))
+    return values
+
+
+def _reference_sma(prices, period):
+    if len(prices) < period:
+        return prices.copy()
+    return [
+        prices[i] if i < period - 1 else sum(prices[i - period + 1:i + 1]) / period
+        for i in range(len(prices))
+    ]
+
+
+def _reference_ema(prices, period):
+    if len(prices) < period:
+        return prices.copy()
+    multiplier = 2 / (period + 1)
+    ema = [sum(prices[:period]) / period]
+    for price in prices[period:]:
+        ema.append((price * multiplier) + (ema[-1] * (1 - multiplier)))
+    return [prices[0]] * (period - 1) + ema
+
+
+def _reference_bollinger(prices, period, std_dev):
+    sma = _reference_sma(prices, period)
+    upper, lower = [], []
+    for i in range(len(prices)):
+        if i < period - 1:
+            upper.append(prices[i])
+            lower.append(prices[i])
+        else:
+            std = statistics.stdev(prices[i - period + 1:i + 1])
+            upper.append(sma[i] + std * std_dev)
+            lower.append(sma[i] - std * std_dev)
+    return upper, sma, lower
+
+
+def _reference_atr(highs, lows, closes, period=14):
+    if len(highs) < period + 1:
+        return [0.0] * len(highs)
+    tr_values = [highs[0] - lows[0]]
+    for i in range(1, len(highs)):
+        tr_values.append(max(
+            highs[i] - lows[i],
+            abs(highs[i] - closes[i - 1]),
+            abs(lows[i] - closes[i - 1]),
+        ))
+    atr = [sum(tr_values[:period]) / period]
+    for i in range(period, len(tr_values)):
+        atr.append((atr[-1] * (period - 1) + tr_values[i]) / period)
+    return [tr_values[0]] * (period - 1) + atr
+
+
+def _reference_regimes(candles):
+    prices = [c["close"] for c in candles]
+    regimes = []
+    for idx, price in enumerate(prices):
+        if idx < 36:
+            regimes.append("ranging")
+            continue
+        short_ma = sum(prices[idx - 12:idx]) / 12
+        long_ma = sum(prices[idx - 36:idx]) / 36
+        change = (prices[idx] - prices[idx - 1]) / prices[idx - 1]
+        stdev_ratio = statistics.pstdev(prices[idx - 12:idx]) / price if price else 0.0
+        if stdev_ratio >= 0.025:
+            regimes.append("high_volatility")
+        elif stdev_ratio <= 0.005:
+            regimes.append("low_volatility")
+        elif short_ma > long_ma * 1.002 and change > 0:
+            regimes.append("bull_trend")
+        elif short_ma < long_ma * 0.998 and change < 0:
+            regimes.append("bear_trend")
+        else:
+            regimes.append("ranging")
+    return regimes
+
+
+class IndicatorKernelParityTests(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(7)
+        self.engine = BacktestEngine()
+        self.candles = self.engine.generate_synthetic_data("BTCUSDT", "1h", 30)
+        self.closes = [c["close"] for c in self.candles]
+        self.highs = [c["high"] for c in self.candles]
+        self.lows = [c["low"] for c in self.candles]
+
+    def assertSeriesEqual(self, actual, expected, rel=1e-9):
+        self.assertEqual(len(actual), len(expected))
+        for got, want in zip(actual, expected):
+            self.assertAlmostEqual(got, want, delta=max(abs(want) * rel, 1e-9))
+
+    def test_moving_averages_match_reference(self):
+        for period in (5, 12, 20, 26):
+            self.assertSeriesEqual(self.engine.calculate_sma(self.closes, period), _reference_sma(self.closes, period))
+            self.assertSeriesEqual(self.engine.calculate_ema(self.closes, period), _reference_ema(self.closes, period))
+
+    def test_rsi_and_atr_match_reference(self):
+        for period in (7, 14, 21):
+            self.assertSeriesEqual(self.engine.calculate_rsi(self.closes, period), _reference_rsi(self.closes, period))
+            self.assertSeriesEqual(
+                self.engine.calculate_atr(self.highs, self.lows, self.closes, period),
+                _reference_atr(self.highs, self.lows, self.closes, period),
+            )
+
+    def test_bollinger_bands_match_reference(self):
+        actual = self.engine.calculate_bollinger_bands(self.closes, 20, 2.0)
+        expected = _reference_bollinger(self.closes, 20, 2.0)
+        for got, want in zip(actual, expected):
+            self.assertSeriesEqual(got, want)
+
+    def test_short_series_keep_warmup_conventions(self):
+        short = self.closes[:10]
+        self.assertEqual(self.engine.calculate_sma(short, 20), short)
+        self.assertEqual(self.engine.calculate_ema(short, 20), short)
+        self.assertEqual(self.engine.calculate_rsi(short, 14), [50.0] * 10)
+        self.assertEqual(self.engine.calculate_atr(self.highs[:10], self.lows[:10], short, 14), [0.0] * 10)
+
+    def test_flat_prices_report_full_rsi(self):
+        self.assertEqual(self.engine.calculate_rsi([1.0] * 30, 14)[-1], 100.0)
+
+    def test_regime_labels_match_reference(self):
+        labels = self.engine._infer_regime_labels(self.candles)
+        self.assertEqual(labels, _reference_regimes(self.candles))
+        self.assertGreater(len(set(labels)), 2)
+        self.assertEqual(self.engine._infer_regime_labels(self.candles[:20]), ["ranging"] * 20)
+
+    def test_frame_memoises_indicators(self):
+        frame = IndicatorFrame.from_candles(self.candles)
+        strategy = {"parameters": {"rsi_period": 14, "bb_period": 20}}
+        first = self.engine.calculate_indicators(self.candles, strategy, frame=frame)
+        second = self.engine.calculate_indicators(self.candles, strategy, frame=frame)
+        self.assertIs(first["rsi"], second["rsi"])
+        self.assertSeriesEqual(first["volume_ma"], _reference_sma([c["volume"] for c in self.candles], 20))
+
+
+class SharedIndicatorCacheTests(unittest.TestCase):
+    def setUp(self) -> None:
+        random.seed(11)
+        self.engine = BacktestEngine()
+        self.fetches = []
+        self.datasets = {
+            ("BTCUSDT", "1h"): self.engine.generate_synthetic_data("BTCUSDT", "1h", 10),
+            ("ETHUSDT", "1h"): self.engine.generate_synthetic_data("ETHUSDT", "1h", 10),
+        }
+
+        async def fake_fetch(symbol, timeframe, days=90):
+            self.fetches.append((symbol, timeframe))
+            return [dict(row) for row in self.datasets[(symbol, timeframe)]]
+
+        self.engine.fetch_historical_data = fake_fetch
+
+    @staticmethod
+    def _strategy(idx, symbol, strategy_type, rsi_period=14):
+        return {
+            "id": f"s{idx}",
+            "name": f"strategy {idx}",
+            "type": strategy_type,
+            "symbols": [symbol],
+            "timeframe": "1h",
+            "parameters": {"rsi_period": rsi_period},
+        }
+
+    def test_batch_fetches_once_per_data_key_and_keeps_order(self):
+        strategies = [
+            self._strategy(0, "BTCUSDT", "momentum"),
+            self._strategy(1, "ETHUSDT", "swing"),
+            self._strategy(2, "BTCUSDT", "scalping", rsi_period=7),
+            self._strategy(3, "ETHUSDT", "macd"),
+        ]
+        cache = {}
+        results = asyncio.run(self.engine.backtest_all_strategies(strategies, indicator_cache=cache))
+
+        self.assertEqual(sorted(self.fetches), [("BTCUSDT", "1h"), ("ETHUSDT", "1h")])
+        self.assertEqual([r["strategy_id"] for r in results], ["s0", "s1", "s2", "s3"])
+        self.assertIn(("BTCUSDT", "1h", "sma", "close", 20), cache)
+        self.assertIn(("BTCUSDT", "1h", "rsi", 7), cache)
+        self.assertIn(("ETHUSDT", "1h", "rsi", 14), cache)
+
+        for strategy, batched in zip(strategies, results):
+            candles = self.engine._normalise_historical_data(self.datasets[self.engine._data_key(strategy)])
+            single = asyncio.run(self.engine.backtest_strategy(strategy, candles=candles))
+            self.assertEqual(batched.get("final_capital"), single.get("final_capital"))
+            self.assertEqual(batched.get("total_trades"), single.get("total_trades"))
+
+
+if __name__ == "__main__":
+    unittest.main()
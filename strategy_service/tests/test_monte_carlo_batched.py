@@ -0,0 +1,116 @@
+import unittest
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+
+from strategy_service.backtesting.backtest_engine import BacktestConfig, BacktestEngine
+from strategy_service.backtesting.monte_carlo import (
+    MonteCarloConfig,
+    MonteCarloSimulator,
+    SimulationType,
+    _return_path_metrics,
+    _trade_path_metrics,
+)
+from strategy_service.tests.test_backtesting_bar_loop_parity import _build_market
+
+
+def _backtest_result():
+    data, signals = _build_market(n_bars=1500, seed=5)
+    config = BacktestConfig(
+        start_date=datetime(2024, 1, 1),
+        end_date=datetime(2024, 1, 2),
+        initial_capital=50000.0,
+        use_regime_detection=False,
+        bar_iteration="arrays",
+    )
+    return BacktestEngine(config).run(data, signals, "mc", {"lookback": 20})
+
+
+class BatchedMonteCarloTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.result = _backtest_result()
+
+    def setUp(self) -> None:
+        self.config = MonteCarloConfig(n_simulations=400, batched=True, batch_size=150, random_seed=7)
+
+    def _simulate(self, config):
+        return MonteCarloSimulator(config).simulate(self.result, strategy_name="mc")
+
+    def test_trade_paths_match_per_path_metrics(self):
+        simulator = MonteCarloSimulator(self.config)
+        closed = [t for t in self.result.trades if t.exit_time]
+        self.assertGreater(len(closed), 5)
+
+        rng = np.random.default_rng(3)
+        orders = [rng.permutation(len(closed)) for _ in range(20)]
+        pnl_paths = np.array([[closed[i].pnl for i in order] for order in orders])
+        batched = _trade_path_metrics(pnl_paths, self.result.initial_capital)
+
+        for row, order in enumerate(orders):
+            _, expected = simulator._calculate_metrics_from_trades(
+                [closed[i] for i in order], self.result.initial_capital
+            )
+            for key in ("total_return_pct", "sharpe_ratio", "max_drawdown"):
+                self.assertAlmostEqual(batched[key][row], expected[key], places=9, msg=key)
+
+    def test_return_paths_compound_every_period(self):
+        draws = np.array([[0.1, -0.5, 0.2], [0.0, 0.0, 0.0]])
+        metrics = _return_path_metrics(draws, 100.0)
+
+        np.testing.assert_allclose(metrics["total_return_pct"], [(1.1 * 0.5 * 1.2 - 1) * 100, 0.0])
+        np.testing.assert_allclose(metrics["max_drawdown"], [50.0, 0.0])
+        self.assertEqual(metrics["sharpe_ratio"][1], 0.0)
+
+    def test_trade_randomization_summary(self):
+        mc = self._simulate(self.config)
+
+        self.assertEqual(mc.n_simulations, 400)
+        self.assertEqual(mc.simulations, [])
+        self.assertEqual(mc.simulation_metrics["sharpe_ratio"].shape, (400,))
+        # Order never changes the final P&L, only the path
+        closed_pnl = sum(t.pnl for t in self.result.trades if t.exit_time)
+        np.testing.assert_allclose(
+            mc.simulation_metrics["total_return_pct"], closed_pnl / self.result.initial_capital * 100
+        )
+        self.assertAlmostEqual(mc.mean_win_rate, self.result.win_rate)
+        self.assertGreater(mc.std_max_dd, 0)
+        lower, upper = mc.drawdown_confidence_intervals[0.95]
+        self.assertLessEqual(lower, mc.median_max_dd)
+        self.assertGreaterEqual(upper, mc.median_max_dd)
+
+    def test_seeded_runs_are_reproducible(self):
+        config = replace(self.config, simulation_type=SimulationType.COMBINED)
+        first = self._simulate(config)
+        second = self._simulate(config)
+        for key, values in first.simulation_metrics.items():
+            np.testing.assert_array_equal(values, second.simulation_metrics[key])
+        self.assertEqual(first.n_simulations, 800)
+
+        bootstrap = self._simulate(replace(self.config, simulation_type=SimulationType.RETURN_BOOTSTRAPPING))
+        one_chunk = self._simulate(
+            replace(self.config, simulation_type=SimulationType.RETURN_BOOTSTRAPPING, batch_size=400)
+        )
+        self.assertEqual(bootstrap.n_simulations, one_chunk.n_simulations)
+        self.assertGreater(bootstrap.std_return, 0)
+        self.assertEqual(bootstrap.mean_win_rate, 0.0)
+
+    def test_batched_summary_matches_list_analysis(self):
+        simulator = MonteCarloSimulator(self.config)
+        metrics = simulator._batched_trade_randomization(self.result)
+        simulations = [
+            {key: float(values[i]) for key, values in metrics.items()}
+            for i in range(metrics["total_return_pct"].size)
+        ]
+
+        from_arrays = simulator._analyze_metrics(metrics, self.result, "mc")
+        from_dicts = simulator._analyze_simulations(simulations, self.result, "mc")
+        for field_name in ("mean_sharpe", "std_sharpe", "value_at_risk_95", "conditional_var_95",
+                           "probability_of_ruin", "overall_robustness_score"):
+            self.assertEqual(getattr(from_arrays, field_name), getattr(from_dicts, field_name), field_name)
+        self.assertEqual(from_arrays.sharpe_confidence_intervals, from_dicts.sharpe_confidence_intervals)
+
+
+if __name__ == "__main__":
+    unittest.main()
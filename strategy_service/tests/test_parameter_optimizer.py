@@ -0,0 +1,114 @@
+import unittest
+from types import SimpleNamespace
+
+import numpy as np
+
+from strategy_service.backtesting.optimization import (
+    OptimizationConfig,
+    OptimizationMethod,
+    ParameterEvaluator,
+    ParameterOptimizer,
+    canonical_params_key,
+)
+
+
+def quadratic_objective(params):
+    """Module-level objective so it can be shipped to worker processes."""
+    if params["fast"] == 13:
+        raise ValueError("unstable parameter")
+    score = -((params["fast"] - 10) ** 2) - (params["slow"] - 30) ** 2 / 10.0
+    return score, SimpleNamespace(total_trades=50, max_drawdown=5.0, win_rate=55.0)
+
+
+PARAM_SPACE = {"fast": list(range(5, 16)), "slow": list(range(20, 41, 2))}
+
+
+class ParameterOptimizerTests(unittest.TestCase):
+    def test_canonical_key_ignores_order_and_numpy_types(self):
+        self.assertEqual(
+            canonical_params_key({"a": np.int64(3), "b": 0.5}),
+            canonical_params_key({"b": np.float64(0.5), "a": 3}),
+        )
+
+    def test_parallel_grid_search_matches_serial(self):
+        serial = ParameterOptimizer(OptimizationConfig(min_trades=1)).optimize(PARAM_SPACE, quadratic_objective)
+        parallel = ParameterOptimizer(
+            OptimizationConfig(min_trades=1, parallel_evaluation=True, n_workers=2)
+        ).optimize(PARAM_SPACE, quadratic_objective)
+
+        self.assertEqual(serial.best_params, {"fast": 10, "slow": 30})
+        self.assertEqual(parallel.best_params, serial.best_params)
+        self.assertEqual(parallel.evaluations, serial.evaluations)
+        self.assertEqual(parallel.convergence_curve, serial.convergence_curve)
+
+    def test_genetic_algorithm_reuses_memoised_evaluations(self):
+        calls = []
+
+        def counting_objective(params):
+            calls.append(canonical_params_key(params))
+            return quadratic_objective(params)
+
+        np.random.seed(4)
+        config = OptimizationConfig(
+            method=OptimizationMethod.GENETIC_ALGORITHM,
+            min_trades=1,
+            population_size=20,
+            n_generations=8,
+        )
+        result = ParameterOptimizer(config).optimize(PARAM_SPACE, counting_objective)
+
+        self.assertEqual(len(calls), len(set(calls)))
+        self.assertGreater(result.cache_hits, 0)
+        self.assertEqual(len(calls) + result.cache_hits, 20 * 8)
+
+    def test_early_stopping_cuts_genetic_run_short(self):
+        np.random.seed(1)
+        config = OptimizationConfig(
+            method=OptimizationMethod.GENETIC_ALGORITHM,
+            min_trades=1,
+            population_size=20,
+            n_generations=60,
+            early_stopping=True,
+            convergence_window=5,
+        )
+        result = ParameterOptimizer(config).optimize(PARAM_SPACE, quadratic_objective)
+
+        self.assertTrue(result.converged)
+        self.assertLess(len(result.convergence_curve), 60)
+
+    def test_memo_does_not_leak_between_runs_with_same_objective(self):
+        dataset = {"target": 10}
+
+        def data_objective(params):
+            score = -((params["fast"] - dataset["target"]) ** 2) - (params["slow"] - 30) ** 2 / 10.0
+            return score, SimpleNamespace(total_trades=50, max_drawdown=5.0, win_rate=55.0)
+
+        optimizer = ParameterOptimizer(OptimizationConfig(min_trades=1))
+        first = optimizer.optimize(PARAM_SPACE, data_objective)
+        dataset["target"] = 7
+        second = optimizer.optimize(PARAM_SPACE, data_objective)
+
+        self.assertEqual(first.best_params, {"fast": 10, "slow": 30})
+        self.assertEqual(second.best_params, {"fast": 7, "slow": 30})
+        self.assertEqual(second.cache_hits, 0)
+
+    def test_close_clears_memo(self):
+        evaluator = ParameterEvaluator()
+        objective = lambda params: (params["fast"], None)
+        evaluator.evaluate(objective, [{"fast": 1}])
+        evaluator.close()
+        evaluator.evaluate(objective, [{"fast": 1}])
+
+        self.assertEqual(evaluator.cache_hits, 0)
+
+    def test_unpicklable_objective_falls_back_to_serial(self):
+        evaluator = ParameterEvaluator(n_workers=2)
+        outcomes = evaluator.evaluate(lambda params: (params["fast"], None), [{"fast": 1}, {"fast": 2}, {"fast": 1}])
+        evaluator.close()
+
+        self.assertEqual([outcome for outcome, _ in outcomes], [(1, None), (2, None), (1, None)])
+        self.assertEqual(evaluator.cache_hits, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,107 @@
+import unittest
+from dataclasses import replace
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from strategy_service.backtesting.backtest_engine import BacktestConfig
+from strategy_service.backtesting.walk_forward import WalkForwardAnalyzer, WalkForwardConfig
+
+
+class CrossoverStrategy:
+    """Moving-average crossover; module level so worker processes can unpickle it."""
+
+    def __init__(self, fast: int = 5, slow: int = 20):
+        self.fast = fast
+        self.slow = slow
+
+    def get_parameters(self):
+        return {"fast": self.fast, "slow": self.slow}
+
+    def generate_signals(self, data):
+        close = data["close"]
+        direction = np.sign(close.rolling(self.fast).mean() - close.rolling(self.slow).mean()).fillna(0)
+        changes = direction.ne(direction.shift()) & direction.ne(0)
+        return pd.DataFrame({
+            "timestamp": data["timestamp"][changes].values,
+            "signal": direction[changes].astype(int).values,
+        })
+
+
+def _build_hourly_market(days=60, seed=21):
+    rng = np.random.default_rng(seed)
+    n_bars = days * 24
+    close = 2000 * np.exp(np.cumsum(rng.normal(0, 0.004, n_bars)))
+    spread = np.abs(rng.normal(0, 0.002, n_bars)) * close
+    return pd.DataFrame({
+        "timestamp": pd.date_range("2024-01-01", periods=n_bars, freq="h"),
+        "open": close,
+        "high": close + spread,
+        "low": close - spread,
+        "close": close,
+        "volume": rng.uniform(10, 500, n_bars),
+    })
+
+
+class ParallelWalkForwardTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.data = _build_hourly_market()
+        cls.backtest_config = BacktestConfig(
+            start_date=datetime(2024, 1, 1),
+            end_date=datetime(2024, 3, 1),
+            initial_capital=10000.0,
+        )
+        cls.config = WalkForwardConfig(
+            in_sample_days=20,
+            out_sample_days=5,
+            step_days=5,
+            min_trades_required=1,
+            min_data_points=50,
+        )
+        cls.param_ranges = {"fast": [3, 5], "slow": [12, 24]}
+
+    def _analyze(self, config):
+        analyzer = WalkForwardAnalyzer(config, self.backtest_config)
+        return analyzer.analyze(self.data, CrossoverStrategy, self.param_ranges, "crossover")
+
+    def assertSameAnalysis(self, serial, parallel):
+        self.assertEqual(serial.total_windows, parallel.total_windows)
+        self.assertEqual([w.window_id for w in parallel.windows], list(range(parallel.total_windows)))
+        for a, b in zip(serial.windows, parallel.windows):
+            self.assertEqual(a.best_params, b.best_params)
+            self.assertEqual(a.out_sample_result.final_capital, b.out_sample_result.final_capital)
+            self.assertEqual(a.is_degradation, b.is_degradation)
+        self.assertTrue(serial.combined_equity_curve.equals(parallel.combined_equity_curve))
+        self.assertEqual(serial.sharpe_ratio, parallel.sharpe_ratio)
+
+    def test_rolling_windows_match_serial_run(self):
+        serial = self._analyze(self.config)
+        parallel = self._analyze(replace(self.config, n_workers=2, max_pending_windows=3))
+        self.assertGreater(serial.total_windows, 3)
+        self.assertSameAnalysis(serial, parallel)
+
+    def test_anchored_windows_grow_and_match_serial_run(self):
+        config = replace(self.config, anchored=True)
+        windows = WalkForwardAnalyzer(config, self.backtest_config)._create_windows(self.data)
+        self.assertGreater(len(windows), 3)
+        self.assertEqual({w.in_sample_start for w in windows}, {self.data["timestamp"].min()})
+        in_sample_ends = [w.in_sample_end for w in windows]
+        self.assertEqual(in_sample_ends, sorted(set(in_sample_ends)))
+
+        serial = self._analyze(config)
+        parallel = self._analyze(replace(config, n_workers=2))
+        self.assertSameAnalysis(serial, parallel)
+
+    def test_window_slice_covers_only_its_period(self):
+        analyzer = WalkForwardAnalyzer(self.config, self.backtest_config)
+        window = analyzer._create_windows(self.data)[2]
+        window_data = analyzer._window_slice(self.data, window)
+        self.assertEqual(window_data["timestamp"].min(), window.in_sample_start)
+        self.assertLess(window_data["timestamp"].max(), window.out_sample_end)
+        self.assertEqual(len(window_data), (self.config.in_sample_days + self.config.out_sample_days) * 24)
+
+
+if __name__ == "__main__":
+    unittest.main()